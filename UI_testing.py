@@ -1,9 +1,10 @@
 import sys
+import os
 import socket
 import json
 import threading
-from heapq import heappush, heappop
-from math import sqrt, atan2, degrees, sin, cos, radians
+import time
+from math import sqrt, sin, cos, radians
 import random
 from datetime import datetime
 from typing import List, Tuple, Optional
@@ -12,7 +13,7 @@ from PyQt5.QtWidgets import (
     QApplication, QGraphicsScene, QGraphicsView, QGraphicsRectItem,
     QGraphicsSimpleTextItem, QGraphicsEllipseItem, QGraphicsPolygonItem,
     QPushButton, QWidget, QVBoxLayout, QHBoxLayout, QGraphicsItem,
-    QLineEdit, QLabel, QMessageBox, QGraphicsItemGroup, QFrame, QGraphicsObject
+    QLineEdit, QLabel, QMessageBox, QGraphicsItemGroup, QFrame, QGraphicsObject, QComboBox
 )
 from PyQt5.QtGui import (
     QBrush, QPainter, QPen, QColor, QPainterPath, QFont, QPolygonF,
@@ -23,6 +24,21 @@ from PyQt5.QtCore import (
     pyqtProperty, QEasingCurve, QParallelAnimationGroup
 )
 
+# 경로 안내 계산은 develop/navigation_core.py의 공용 로직 사용 (Qt 의존성 없음)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'develop'))
+from navigation_core import (
+    RoutePath, update_current_segment, generate_hud_instructions as core_generate_hud_instructions,
+    instructions_from_position,
+    SpeedEstimator
+)
+from route_geometry import RouteGeometry
+from grid_planner import GridPlanner
+from lot_layout import (
+    SCENE_W, SCENE_H, PIXELS_PER_METER, ENTRANCE_POINT, MANDATORY_WAYPOINT,
+    PARKING_SPOT_WAYPOINTS, SPOT_WAYPOINT_TOLERANCE
+)
+from floors import load_building
+
 # ===================================================================
 # WiFi 통신 모듈 (WaypointReceiver)
 # ===================================================================
@@ -844,10 +860,10 @@ class CarItem(QGraphicsObject):
 # 메인 UI: 현대차 스타일 주차장 지도 (WiFi 통합)
 # ===================================================================
 class ParkingLotUI(QWidget):
-    SCENE_W, SCENE_H = 2000, 2000
+    SCENE_W, SCENE_H = SCENE_W, SCENE_H
     CELL, MARGIN, PATH_WIDTH = 30, 10, 50
-    PIXELS_PER_METER = 50
-    ENTRANCE = QPointF(200, 200)
+    PIXELS_PER_METER = PIXELS_PER_METER
+    ENTRANCE = QPointF(*ENTRANCE_POINT)
     
     newWaypointsReceived = pyqtSignal(list)
     carPositionReceived = pyqtSignal(list)
@@ -876,7 +892,18 @@ class ParkingLotUI(QWidget):
         self.view.scale(1, -1)
         self.view.translate(0, -self.SCENE_H)
         self.hud = PremiumHudWidget()
-        main_layout.addWidget(self.view, 3)
+        
+        # 층 선택 (develop/lot_building.json, 층 지도는 처음 표시할 때 로드)
+        self.building = load_building()
+        self.floor_id = self.route_floor = self.building.default_floor
+        self.floor_selector = QComboBox()
+        self.floor_selector.addItems(self.building.floor_ids())
+        self.floor_selector.setCurrentText(self.floor_id)
+        self.floor_selector.currentTextChanged.connect(self.set_floor)
+        map_layout = QVBoxLayout()
+        map_layout.addWidget(self.floor_selector)
+        map_layout.addWidget(self.view)
+        main_layout.addLayout(map_layout, 3)
         main_layout.addWidget(self.hud, 1)
 
     def init_map(self):
@@ -885,6 +912,9 @@ class ParkingLotUI(QWidget):
         self.scene.addItem(self.layer_static)
         self.scene.addItem(self.layer_path)
         self.full_path_points = []
+        self.route_path = RoutePath()  # full_path_points의 array 기반 사본 (navigation_core 계산용)
+        self.route_geometry = RouteGeometry()  # 세그먼트 격자 인덱스 포함 (투영/진행률 질의용)
+        self.speed_estimator = SpeedEstimator()  # 차량 위치 변화 기반 실측 속도 (EWMA)
         self.snapped_waypoints = []
         self.current_path_segment_index = 0
         self.is_exit_scenario = False  # 출차 시나리오 상태 추적
@@ -964,53 +994,17 @@ class ParkingLotUI(QWidget):
             self.car.setPos(original_pos)
 
     def project_point_to_path(self, point: QPointF) -> QPointF:
-        """주어진 점을 직선 경로에 투영하여 가장 가까운 경로 위의 점을 반환합니다."""
+        """주어진 점을 직선 경로에 투영하여 가장 가까운 경로 위의 점을 반환합니다.
+        (세그먼트 격자 인덱스로 주변 셀의 세그먼트만 확인)"""
         if not self.full_path_points or len(self.full_path_points) < 2:
             return point
         
-        min_distance = float('inf')
-        closest_point = point
+        projected = self.route_geometry.project(point.x(), point.y())
+        if projected is None:
+            # 모든 세그먼트 길이가 0인 경우 (경로가 한 점)
+            return QPointF(self.full_path_points[0])
         
-        # 모든 경로 세그먼트에 대해 투영점을 계산
-        for i in range(len(self.full_path_points) - 1):
-            p1 = self.full_path_points[i]
-            p2 = self.full_path_points[i + 1]
-            
-            # 세그먼트에 점을 투영
-            projected = self.project_point_to_segment(point, p1, p2)
-            
-            # 유클리드 거리 계산
-            distance = self.euclidean_distance(point, projected)
-            
-            if distance < min_distance:
-                min_distance = distance
-                closest_point = projected
-        
-        return closest_point
-    
-    def project_point_to_segment(self, point: QPointF, seg_start: QPointF, seg_end: QPointF) -> QPointF:
-        """점을 선분에 투영합니다."""
-        # 선분의 벡터
-        seg_vec = seg_end - seg_start
-        seg_len_sq = QPointF.dotProduct(seg_vec, seg_vec)
-        
-        if seg_len_sq == 0:
-            # 선분이 점인 경우
-            return seg_start
-        
-        # 점에서 선분 시작점까지의 벡터
-        point_vec = point - seg_start
-        
-        # 투영 매개변수 t 계산
-        t = QPointF.dotProduct(point_vec, seg_vec) / seg_len_sq
-        
-        # t를 [0, 1] 범위로 클램프
-        t = max(0.0, min(1.0, t))
-        
-        # 투영점 계산
-        projected = seg_start + t * seg_vec
-        
-        return projected
+        return QPointF(projected[0], projected[1])
     
     def euclidean_distance(self, p1: QPointF, p2: QPointF) -> float:
         """두 점 사이의 유클리드 거리를 계산합니다."""
@@ -1036,6 +1030,8 @@ class ParkingLotUI(QWidget):
         # 경로 초기화
         self.clear_path_layer()
         self.full_path_points = []
+        self.route_path = RoutePath()
+        self.route_geometry = RouteGeometry()
         self.current_path_segment_index = 0
         self.is_exit_scenario = False
         
@@ -1051,20 +1047,9 @@ class ParkingLotUI(QWidget):
         """웨이포인트 좌표를 기반으로 주차구역 번호 감지"""
         x, y = waypoint[0], waypoint[1]
         
-        # sender.py의 주차구역별 waypoint 좌표와 동일
-        parking_waypoints = {
-            # 주차구역 1-5 (상단, 왼쪽→오른쪽)
-            1: [200, 1475], 2: [550, 1475], 3: [850, 1475], 4: [1150, 1475],
-            5: [1450, 1475],
-            # 주차구역 6-7 (우측, 위→아래)  
-            6: [1475, 1400], 7: [1475, 1000],
-            # 주차구역 8-11 (하단, 오른쪽→왼쪽)
-            8: [1475, 925], 9: [1150, 925], 10: [850, 925], 11: [550, 925]
-        }
-        
         # 허용 범위 내에서 매칭 (각각 ±50픽셀 허용)
-        tolerance = 50
-        for spot_num, coord in parking_waypoints.items():
+        tolerance = SPOT_WAYPOINT_TOLERANCE
+        for spot_num, coord in PARKING_SPOT_WAYPOINTS.items():
             if abs(x - coord[0]) <= tolerance and abs(y - coord[1]) <= tolerance:
                 return spot_num
         
@@ -1097,14 +1082,15 @@ class ParkingLotUI(QWidget):
             rect_item = self.parking_spots[parking_spot_num]
             
             # 원래 색상 복원 (일반/장애인/전기차 구역별)
-            if parking_spot_num in [1, 6, 7]:  # 장애인 구역
+            spot_type = self.building.floor(self.floor_id).lot.spot_types.get(parking_spot_num)
+            if spot_type == 'disabled':  # 장애인 구역
                 gradient = QLinearGradient(rect_item.rect().x(), rect_item.rect().y(),
                                         rect_item.rect().x() + rect_item.rect().width(),
                                         rect_item.rect().y() + rect_item.rect().height())
                 gradient.setColorAt(0, QColor(135, 206, 250, 200))
                 gradient.setColorAt(1, QColor(70, 130, 180, 150))
                 rect_item.setBrush(QBrush(gradient))
-            elif parking_spot_num in [4, 5, 10, 11]:  # 전기차 구역
+            elif spot_type == 'ev':  # 전기차 구역
                 gradient = QLinearGradient(rect_item.rect().x(), rect_item.rect().y(),
                                         rect_item.rect().x() + rect_item.rect().width(),
                                         rect_item.rect().y() + rect_item.rect().height())
@@ -1131,6 +1117,9 @@ class ParkingLotUI(QWidget):
 
         print(f"🗺️ 웨이포인트 경로 생성: {self.received_waypoints}")
         
+        # 수신 경로는 기본 층 좌표이므로 다른 층을 보고 있었으면 경로 층으로 전환 (set_floor 호출)
+        self.floor_selector.setCurrentText(self.route_floor)
+        
         # 시작점은 항상 입구 (200, 200)
         start_point = QPointF(200, 200)
         
@@ -1139,6 +1128,8 @@ class ParkingLotUI(QWidget):
         
         # 전체 경로: 시작점 + 웨이포인트들
         self.full_path_points = [start_point] + waypoints_qpoints
+        self.route_path = RoutePath(self.full_path_points)
+        self.route_geometry = RouteGeometry(self.route_path)
         
         # 마지막 웨이포인트가 주차구역인지 확인하고 색상 변경
         if self.received_waypoints:
@@ -1207,8 +1198,8 @@ class ParkingLotUI(QWidget):
             # 주차 구역에 해당하는 경우: 흰색, 20픽셀 테두리
             pen = QPen(QColor("white"), 20)
             r.setPen(pen)
-        elif label in ["백화점 본관 입구", "영화관 입구", "문화시설 입구"]:
-            # 백화점 본관 입구, 영화관 입구, 문화시설 입구: 노랑색 테두리로 통일
+        elif label in self.building.floor(self.floor_id).lot.entrances:
+            # 목적지 입구 (백화점 본관 입구, 영화관 입구, 문화시설 입구 등): 노랑색 테두리로 통일
             pen = QPen(QColor(255, 255, 0), 20)  # 노랑색
             r.setPen(pen)
         elif "입출차" in label:
@@ -1264,105 +1255,65 @@ class ParkingLotUI(QWidget):
         c_dis, c_ele, c_gen, c_obs, c_emp, c_io = QColor(135, 206, 250), QColor(0, 200, 130), QColor("#303030"), QColor(108, 117, 125), QColor(206, 212, 218), QColor("#303030")
         border = QGraphicsRectItem(0, 0, self.SCENE_W, self.SCENE_H); border.setPen(QPen(QColor(0, 170, 210), 12)); border.setBrush(QBrush(Qt.NoBrush)); border.setParentItem(self.layer_static)
         
+        # 주차장 배치는 표시 중인 층의 지도 컴파일 결과 (develop/lot_building.json → 층별 lot_map)
+        lot = self.building.floor(self.floor_id).lot
         # 통행불가 구역을 가장 먼저 추가 (맨 뒤로 보내기 위해)
-        self.add_hatched(400, 0, 1600, 400)
+        for name, rect in lot.no_go_zones.items():
+            if lot.no_go_styles[name] == 'hatched':
+                self.add_hatched(*rect)
         
-        # 입출차 구역 추가
-        self.add_block(0, 0, 400, 400, c_io, "입출차")
+        # 입출차 구역 추가 (지하층은 위층과 연결된 램프)
+        gate_name, gate_zone = lot.gate
+        self.add_block(*gate_zone, c_io, gate_name)
         
-        # 목적지 블록들 (입출차 제외) - 문화시설 입구 제외
-        base = [
-            (-400, 1600, 400, 400, c_emp, "백화점 본관 입구"),  # 백화점 본관 입구
-            (1600, 1600, 400, 400, c_emp, "영화관 입구"),    # 영화관 입구
-            (550, 1050, 800, 300, c_obs, "장애물")    # 금지구역
-        ]
+        # 목적지 블록들과 장애물
+        for name, rect in lot.entrances.items():
+            self.add_block(*rect, c_emp, name)
+        for name, rect in lot.no_go_zones.items():
+            if lot.no_go_styles[name] != 'hatched':
+                self.add_block(*rect, c_obs, name)
         
-        # 새로운 주차구역들 (1~11번) - 7번, 8번 제외
-        parking_spots = [
-            # 1~5번 주차구역 (상단 주차구역)
-            (0, 1600, 400, 400, c_dis, "장애인"),      # 장애인 구역
-            (400, 1600, 300, 400, c_gen, "일반"),    # 일반 구역
-            (700, 1600, 300, 400, c_gen, "일반"),    # 일반 구역
-            (1000, 1600, 300, 400, c_ele, "전기"),   # 전기차 구역
-            (1300, 1600, 300, 400, c_ele, "전기"),   # 전기차 구역
-            
-            # 6번 주차구역 (우측 주차구역)
-            (1600, 1200, 400, 400, c_dis, "장애인"),   # 장애인 구역
-            
-            # 9~11번 주차구역 (하단 주차구역) - 7번, 8번 제외
-            (1000, 400, 300, 400, c_gen, "일반"),     # 일반 구역
-            (700, 400, 300, 400, c_ele, "전기"),    # 전기차 구역
-            (400, 400, 300, 400, c_ele, "전기")      # 전기차 구역
-        ]
-        
-        for x, y, w, h, c, l in base: self.add_block(x, y, w, h, c, l)
-        
-        self.add_dot_label_static(self.ENTRANCE, "입구", QColor(0, 170, 210))
+        self.add_dot_label_static(QPointF(*lot.entrance), "입구", QColor(0, 170, 210))
         
         # 주차구역을 추가하고 딕셔너리에 저장
-        spot_numbers = [1, 2, 3, 4, 5, 6, 9, 10, 11]  # parking_spots 리스트와 매칭
-        for i, (x, y, w, h, c, l) in enumerate(parking_spots):
-            rect_item = self.add_block(x, y, w, h, c, l)
-            if rect_item:  # add_block이 QGraphicsRectItem을 반환한다고 가정
-                self.parking_spots[spot_numbers[i]] = rect_item
-        
-        # 문화시설 입구 추가
-        self.add_block(1600, 400, 400, 400, c_emp, "문화시설 입구")
-        
-        # 7번 주차구역 추가
-        rect_item = self.add_block(1600, 800, 400, 400, c_dis, "장애인")
-        self.parking_spots[7] = rect_item
-        
-        # 8번 주차구역을 가장 마지막에 추가하여 가장 위에 표시되도록 함
-        rect_item = self.add_block(1300, 400, 300, 400, c_gen, "일반")
-        self.parking_spots[8] = rect_item
+        spot_styles = {'disabled': (c_dis, "장애인"), 'general': (c_gen, "일반"), 'ev': (c_ele, "전기")}
+        for spot_num, rect in lot.spot_rects.items():
+            color, label = spot_styles[lot.spot_types[spot_num]]
+            rect_item = self.add_block(*rect, color, label)
+            if rect_item:
+                self.parking_spots[spot_num] = rect_item
 
     def build_occupancy(self):
-        W, H, C = self.SCENE_W, self.SCENE_H, self.CELL; gx, gy = (W + C - 1) // C, (H + C - 1) // C
-        self.grid_w, self.grid_h = gx, gy; self.occ = bytearray(gx * gy)
+        """표시 중인 층의 점유 격자 (CELL/MARGIN 기준, 층별 디스크 캐시)"""
+        grid = self.building.floor(self.floor_id).occupancy(self.CELL, self.MARGIN)
+        gx = grid.width
+        self.grid_w, self.grid_h = grid.width, grid.height; self.occ = bytearray(grid.cells)
         def idx(cx, cy): return cy * gx + cx
-        def block_rect(x, y, w, h):
-            x0,y0,x1,y1 = max(0,x-self.MARGIN), max(0,y-self.MARGIN), min(W,x+w+self.MARGIN), min(H,y+h+self.MARGIN)
-            cx0,cy0,cx1,cy1 = int(x0//C), int(y0//C), int((x1-1)//C), int((y1-1)//C)
-            for cy in range(cy0,cy1+1):
-                for cx in range(cx0,cx1+1):
-                    if 0<=cx<gx and 0<=cy<gy: self.occ[cy*gx+cx] = 1
-        
-        # 목적지 및 장애물 블록들
-        for x,y,w,h,c,l in [
-            (550,1050,800,300,0,""),      # 금지구역
-            (400,0,1600,400,0,""),        # 하단 통행금지구역
-            (1600,400,400,400,0,""),      # 문화시설 입구
-            (1600,1600,400,400,0,""),     # 영화관 입구
-            (-400,1600,400,400,0,""),     # 백화점 본관 입구
-            (0,0,400,400,0,"")            # 입출차
-        ]: 
-            block_rect(x,y,w,h)
-        
-        # 새로운 주차구역들 (1~11번)
-        parking_blocks = [
-            # 1~5번 주차구역 (상단 주차구역)
-            (0, 1600, 400, 400, 0, ""),      # 1번
-            (400, 1600, 300, 400, 0, ""),    # 2번
-            (700, 1600, 300, 400, 0, ""),    # 3번
-            (1000, 1600, 300, 400, 0, ""),   # 4번
-            (1300, 1600, 300, 400, 0, ""),   # 5번
-            
-            # 6~7번 주차구역 (우측 주차구역)
-            (1600, 1200, 400, 400, 0, ""),   # 6번
-            (1600, 800, 400, 400, 0, ""),    # 7번
-            
-            # 8~11번 주차구역 (하단 주차구역)
-            (1300, 400, 300, 400, 0, ""),    # 8번
-            (1000, 400, 300, 400, 0, ""),    # 9번
-            (700, 400, 300, 400, 0, ""),     # 10번
-            (400, 400, 300, 400, 0, "")      # 11번
-        ]
+        self._occ_idx = idx
+        self.planner = GridPlanner.from_grid(grid)
+        self.planner.build_nearest_free()  # 점 → 가장 가까운 자유 셀 표 (2패스 거리 변환)
+
+    def set_floor(self, floor_id):
+        """표시 층 변경 - 층 지도/점유 격자는 처음 표시할 때 로드, 경로와 차량은 경로가 있는 층에서만 표시
+        표시 층과 경로 층이 아닌 층은 메모리에서 내림 (다시 표시하면 디스크 캐시에서 로드)"""
+        if floor_id == self.floor_id or floor_id not in self.building.floors:
+            return
+        self.floor_id = floor_id
+        for child in self.layer_static.childItems(): self.scene.removeItem(child)
+        self.parking_spots = {}
+        self.SCENE_W, self.SCENE_H = self.building.floor(floor_id).lot.scene
+        self.scene.setSceneRect(0, 0, self.SCENE_W, self.SCENE_H)
+        self.build_static_layout()
+        self.build_occupancy()
         
-        for x,y,w,h,c,l in parking_blocks: 
-            block_rect(x,y,w,h)
+        on_route_floor = (floor_id == self.route_floor)
+        self.layer_path.setVisible(on_route_floor)
+        self.car.setVisible(on_route_floor and bool(self.full_path_points))
+        self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
         
-        self._occ_idx = idx
+        released = self.building.retain({floor_id, self.route_floor})
+        print(f"🏢 {floor_id} 표시 (로드된 층: {self.building.loaded_floors()}"
+              f"{f', 내린 층: {released}' if released else ''})")
 
     def clamp_point(self, p: QPointF): return QPointF(min(self.SCENE_W-1.,max(0.,p.x())), min(self.SCENE_H-1.,max(0.,p.y())))
     def pt_to_cell(self, p: QPointF): return int(p.x()//self.CELL), int(p.y()//self.CELL)
@@ -1370,38 +1321,18 @@ class ParkingLotUI(QWidget):
     def is_cell_free(self, cx, cy): return 0<=cx<self.grid_w and 0<=cy<self.grid_h and self.occ[self._occ_idx(cx,cy)]==0
     
     def find_nearest_free_cell_from_point(self, p: QPointF, max_radius_cells=100):
-        """주어진 점에서 가장 가까운 자유 셀을 찾습니다."""
+        """주어진 점에서 가장 가까운 자유 셀을 찾습니다 (build_occupancy에서 만든 거리 변환 표 조회 1번)."""
         sx, sy = self.pt_to_cell(p)
-        print(f"🔍 자유 셀 검색: 원본 좌표 ({p.x():.1f}, {p.y():.1f}) -> 셀 ({sx}, {sy})")
-        
-        # 원본 셀이 자유하면 바로 반환
-        if self.is_cell_free(sx, sy): 
+        free = self.planner.nearest_free(sx, sy)
+        if free is None or max(abs(free[0] - sx), abs(free[1] - sy)) > max_radius_cells:
+            # 자유 셀을 찾지 못한 경우 원본 셀 반환 (강제)
             result = self.cell_to_pt_center((sx, sy))
-            print(f"✅ 원본 셀이 자유함: {result}")
+            print(f"⚠️ 자유 셀을 찾지 못함, 원본 셀 반환: {result}")
             return result
-            
-        # 주변에서 자유 셀 검색
-        for r in range(1, max_radius_cells + 1):
-            for dx in range(-r, r+1):
-                for dy in [-r, r]:
-                    if self.is_cell_free(sx+dx, sy+dy): 
-                        result = self.cell_to_pt_center((sx+dx, sy+dy))
-                        print(f"✅ 자유 셀 발견 (반경 {r}): ({sx+dx}, {sy+dy}) -> {result}")
-                        return result
-            for dy in range(-r+1, r):
-                for dx in [-r, r]:
-                    if self.is_cell_free(sx+dx, sy+dy): 
-                        result = self.cell_to_pt_center((sx+dx, sy+dy))
-                        print(f"✅ 자유 셀 발견 (반경 {r}): ({sx+dx}, {sy+dy}) -> {result}")
-                        return result
-        
-        # 자유 셀을 찾지 못한 경우 원본 셀 반환 (강제)
-        result = self.cell_to_pt_center((sx, sy))
-        print(f"⚠️ 자유 셀을 찾지 못함, 원본 셀 반환: {result}")
-        return result
+        return self.cell_to_pt_center(free)
 
     def astar(self, start_pt: QPointF, goal_pt: QPointF):
-        """A* 알고리즘으로 경로를 찾습니다."""
+        """격자 최단 경로를 찾습니다 (grid_planner 점프 포인트 탐색, 연속된 셀 목록 반환)."""
         sx, sy = self.pt_to_cell(start_pt)
         gx, gy = self.pt_to_cell(goal_pt)
         W, H = self.grid_w, self.grid_h
@@ -1433,53 +1364,19 @@ class ParkingLotUI(QWidget):
             print(f"❌ 시작점 또는 목적지가 여전히 점유됨: 시작({sx}, {sy})={occ[idx(sx, sy)]}, 목적지({gx}, {gy})={occ[idx(gx, gy)]}")
             return None
         
-        openh = [(abs(sx - gx) + abs(sy - gy), 0, (sx, sy))]
-        came, g = {}, {(sx, sy): 0}
-        iterations = 0
-        max_iterations = 10000  # 무한 루프 방지
+        # 배열 기반 점프 포인트 탐색 (develop/grid_planner.py, 반복 횟수 제한 없음)
+        path = self.planner.jps((sx, sy), (gx, gy))
+        if path:
+            print(f"✅ 경로 발견! {len(path)}개 셀, 점프 포인트 {self.planner.expanded}개 확장")
+            return path
         
-        while openh and iterations < max_iterations:
-            iterations += 1
-            _, gc, (x, y) = heappop(openh)
-            
-            if (x, y) == (gx, gy):
-                path = []
-                curr = (x, y)
-                while curr in came:
-                    path.append(curr)
-                    curr = came[curr]
-                path.append((sx, sy))
-                path.reverse()
-                print(f"✅ 경로 발견! {len(path)}개 셀, {iterations}회 반복")
-                return path
-            
-            for dx, dy, cst in [(1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1)]:
-                nx, ny = x + dx, y + dy
-                
-                if not (0 <= nx < W and 0 <= ny < H) or occ[idx(nx, ny)]:
-                    continue
-                
-                ng = gc + cst
-                
-                if (nx, ny) not in g or ng < g[(nx, ny)]:
-                    g[(nx, ny)] = ng
-                    came[(nx, ny)] = (x, y)
-                    heappush(openh, (ng + abs(nx - gx) + abs(ny - gy), ng, (nx, ny)))
-        
-        if iterations >= max_iterations:
-            print(f"❌ 최대 반복 횟수 초과: {max_iterations}회")
-        else:
-            print(f"❌ 경로를 찾을 수 없음: {iterations}회 반복 후 종료")
+        print(f"❌ 경로를 찾을 수 없음: 점프 포인트 {self.planner.expanded}개 확장 후 종료")
         return None
 
     def simplify_cells(self, cells):
+        # 시야가 닿는 셀까지 직선으로 당겨 꺾임 셀만 남김 (계단 모양 경로 → 대각선 직선, grid_planner.smooth_cells)
         if not cells: return []
-        simp = [cells[0]]
-        norm = lambda vx,vy: ((0 if vx==0 else (1 if vx>0 else -1)), (0 if vy==0 else (1 if vy>0 else -1)))
-        for i in range(1, len(cells)-1):
-            if norm(cells[i][0]-simp[-1][0], cells[i][1]-simp[-1][1]) != norm(cells[i+1][0]-cells[i][0], cells[i+1][1]-cells[i][1]): simp.append(cells[i])
-        if len(cells)>1 and cells[-1]!=simp[-1]: simp.append(cells[-1])
-        return simp
+        return self.planner.smooth(cells)
 
     def draw_straight_path(self, pts):
         if len(pts) < 2: return
@@ -1503,135 +1400,43 @@ class ParkingLotUI(QWidget):
             self.scene.addLine(start.x(), start.y(), end.x(), end.y(), center_pen).setParentItem(self.layer_path)
 
     def generate_hud_instructions(self, pts, is_exit_scenario=False):
-        if len(pts) < 2: return []
-        instructions, total_dist = [], 0
-        for i in range(len(pts) - 1):
-            p1, p2 = pts[i], pts[i+1]
-            dist_m = sqrt((p2.x()-p1.x())**2 + (p2.y()-p1.y())**2) / self.PIXELS_PER_METER
-            total_dist += dist_m
-            if i < len(pts) - 2:
-                p3 = pts[i+2]
-                angle = (degrees(atan2(p3.y()-p2.y(),p3.x()-p2.x()))-degrees(atan2(p2.y()-p1.y(),p2.x()-p1.x()))+180)%360-180
-                direction = "좌회전" if angle>45 else ("우회전" if angle<-45 else "")
-                if direction: 
-                    if is_exit_scenario:
-                        direction = f"출차 {direction}"
-                    instructions.append((direction, total_dist)); total_dist = 0
-        
-        if is_exit_scenario:
-            instructions.append(("출차 완료", total_dist))
-        else:
-            instructions.append(("목적지 도착", total_dist))
-        return instructions
+        return core_generate_hud_instructions(pts, is_exit_scenario)
 
     def calculate_route_progress(self, car_pos):
-        if not self.full_path_points or len(self.full_path_points)<2: return 0
-        total_len = sum(sqrt((self.full_path_points[i+1].x()-p.x())**2 + (self.full_path_points[i+1].y()-p.y())**2) for i,p in enumerate(self.full_path_points[:-1]))
-        if total_len==0: return 0
-        min_dist, closest_seg, proj_ratio = float('inf'), 0, 0
-        for i,p1 in enumerate(self.full_path_points[:-1]):
-            p2 = self.full_path_points[i+1]; seg_vec, car_vec = p2-p1, car_pos-p1
-            seg_len_sq = QPointF.dotProduct(seg_vec, seg_vec)
-            if seg_len_sq==0: continue
-            t = max(0, min(1, QPointF.dotProduct(car_vec, seg_vec)/seg_len_sq))
-            proj = p1 + t * seg_vec
-            dist = sqrt((car_pos.x()-proj.x())**2 + (car_pos.y()-proj.y())**2)
-            if dist < min_dist: min_dist, closest_seg, proj_ratio = dist, i, t
-        traveled = sum(sqrt((self.full_path_points[i+1].x()-p.x())**2+(self.full_path_points[i+1].y()-p.y())**2) for i,p in enumerate(self.full_path_points[:closest_seg]))
-        if closest_seg < len(self.full_path_points)-1:
-            p1, p2 = self.full_path_points[closest_seg], self.full_path_points[closest_seg+1]
-            traveled += sqrt((p2.x()-p1.x())**2+(p2.y()-p1.y())**2) * proj_ratio
-        return min(100, (traveled / total_len) * 100)
+        if len(self.route_geometry) < 2: return 0
+        seg, t, _ = self.route_geometry.nearest(car_pos.x(), car_pos.y())
+        return self.route_geometry.progress_at(self.route_geometry.traveled_at(seg, t))
 
     def clear_path_layer(self):
         for child in self.layer_path.childItems(): self.scene.removeItem(child)
 
     def _update_current_segment(self, car_pos):
-        if not self.full_path_points or len(self.full_path_points) < 2:
+        if len(self.route_path) < 2:
             return
-            
-        while self.current_path_segment_index < len(self.full_path_points) - 1:
-            p_curr = self.full_path_points[self.current_path_segment_index]
-            p_next = self.full_path_points[self.current_path_segment_index + 1]
-
-            dist_to_next = sqrt((car_pos.x() - p_next.x())**2 + (car_pos.y() - p_next.y())**2)
-
-            v_seg = p_next - p_curr
-            v_car = car_pos - p_curr
-            seg_len_sq = QPointF.dotProduct(v_seg, v_seg)
-            proj_ratio = 1.0
-            if seg_len_sq > 0:
-                proj_ratio = QPointF.dotProduct(v_car, v_seg) / seg_len_sq
-
-            if dist_to_next < 50 or proj_ratio > 1.0:
-                self.current_path_segment_index += 1
-            else:
-                break
+        self.current_path_segment_index = update_current_segment(
+            self.route_path, self.current_path_segment_index, car_pos.x(), car_pos.y()
+        )
 
     def update_hud_from_car_position(self, car_pos):
         if not self.full_path_points: return
         self._update_current_segment(car_pos)
-        remaining_pts = self.full_path_points[self.current_path_segment_index+1:]
-        path_for_hud = [car_pos] + remaining_pts
-        if len(path_for_hud) < 2:
+        if self.current_path_segment_index + 1 >= len(self.route_path):
             if self.is_exit_scenario:
                 self.hud.update_navigation_info([("출차 완료", 0)], current_speed=0, route_progress=100)
             else:
                 self.hud.update_navigation_info([("목적지 도착", 0)], current_speed=0, route_progress=100)
             return
-        instructions = self.generate_hud_instructions(path_for_hud, self.is_exit_scenario)
+        instructions = instructions_from_position(
+            self.route_path, self.current_path_segment_index, car_pos.x(), car_pos.y(), self.is_exit_scenario
+        )
         progress = self.calculate_route_progress(car_pos)
         speed = self.calculate_realistic_speed(instructions, progress, car_pos)
         self.hud.update_navigation_info(instructions, current_speed=speed, route_progress=progress)
 
     def calculate_realistic_speed(self, instructions, progress, car_pos):
-        """현재 상황에 맞는 현실적인 속도 계산 (0-30km/h 범위)"""
-        if not instructions:
-            return 0
-        
-        direction, distance = instructions[0]
-        
-        # 기본 속도 설정
-        base_speed = 20  # 기본 20km/h
-        
-        # 거리에 따른 속도 조절
-        if distance <= 5:
-            # 목적지가 가까우면 감속 (5-15km/h)
-            speed = 5 + (distance / 5) * 10
-        elif distance <= 20:
-            # 중간 거리면 적당한 속도 (15-25km/h)
-            speed = 15 + (distance / 20) * 10
-        else:
-            # 먼 거리면 정상 속도 (20-30km/h)
-            speed = 20 + min(10, (distance - 20) / 50 * 10)
-        
-        # 방향에 따른 속도 조절
-        if "좌회전" in direction or "우회전" in direction:
-            # 회전 시 감속 (5-15km/h)
-            speed = min(speed, 15)
-        elif "목적지" in direction or "도착" in direction:
-            # 목적지 근처에서 감속 (5-15km/h)
-            speed = min(speed, 15)
-        elif "출차" in direction:
-            # 출차 시 조심스럽게 (10-20km/h)
-            speed = min(speed, 20)
-        
-        # 진행률에 따른 미세 조절
-        if progress < 20:
-            # 시작 구간에서는 조금 더 신중하게
-            speed *= 0.8
-        elif progress > 80:
-            # 마지막 구간에서는 더 조심스럽게
-            speed *= 0.7
-        
-        # 출차 시나리오에서는 더 조심스럽게
-        if self.is_exit_scenario:
-            speed *= 0.75
-        
-        # 최종 속도 범위 제한 (0-30km/h)
-        speed = max(0, min(30, int(speed)))
-        
-        return speed
+        """차량 위치 변화로 측정한 실제 속도 (km/h) - navigation_core.SpeedEstimator"""
+        self.speed_estimator.update(car_pos.x(), car_pos.y(), time.monotonic())
+        return self.speed_estimator.speed_kmh
 
     def start_exit_scenario(self):
         """출차 시나리오 시작 - 시계방향으로 출차 경로 생성"""
@@ -1694,46 +1499,32 @@ class ParkingLotUI(QWidget):
 
     def generate_exit_waypoints(self, parking_spot):
         """sender.py의 입차 로직을 역으로 사용하여 출차 웨이포인트 생성"""
-        # sender.py의 MANDATORY_WAYPOINT와 동일
-        MANDATORY_WAYPOINT = [200, 925]
-        
-        # sender.py의 주차구역별 waypoint 좌표와 동일
-        parking_waypoints = {
-            # 주차구역 1-5 (상단, 왼쪽→오른쪽)
-            1: [200, 1475], 2: [550, 1475], 3: [850, 1475], 4: [1150, 1475],
-            5: [1450, 1475],
-            # 주차구역 6-7 (우측, 위→아래)  
-            6: [1475, 1400], 7: [1475, 1000],
-            # 주차구역 8-11 (하단, 오른쪽→왼쪽)
-            8: [1475, 925], 9: [1150, 925], 10: [850, 925], 11: [550, 925]
-        }
-        
-        current_waypoint = parking_waypoints.get(parking_spot)
+        current_waypoint = PARKING_SPOT_WAYPOINTS.get(parking_spot)
         if not current_waypoint:
             return None
         
-        # 출차 최종 목적지는 무조건 (200, 200)으로 설정
-        FINAL_DESTINATION = [200, 200]  # 최종 목적지 (입구)
+        # 출차 최종 목적지는 무조건 입구로 설정
+        FINAL_DESTINATION = list(ENTRANCE_POINT)  # 최종 목적지 (입구)
         exit_waypoints = []
         
         if parking_spot == 1:  # 1번: (200,1475) -> (200,925) -> (200,200)
-            exit_waypoints.append(MANDATORY_WAYPOINT)
+            exit_waypoints.append(list(MANDATORY_WAYPOINT))
             exit_waypoints.append(FINAL_DESTINATION)
         elif parking_spot in [2, 3, 4, 5]:  # 2~5번: 현재위치 -> (200, 1475) -> (200, 925) -> (200,200)
             exit_waypoints.append([200, 1475])
-            exit_waypoints.append(MANDATORY_WAYPOINT)
+            exit_waypoints.append(list(MANDATORY_WAYPOINT))
             exit_waypoints.append(FINAL_DESTINATION)
         elif parking_spot == 6:  # 6번: (1475, 1400) -> (1475, 1475) -> (200, 1475) -> (200, 925) -> (200,200)
             exit_waypoints.append([1475, 1475])
             exit_waypoints.append([200, 1475])
-            exit_waypoints.append(MANDATORY_WAYPOINT)
+            exit_waypoints.append(list(MANDATORY_WAYPOINT))
             exit_waypoints.append(FINAL_DESTINATION)
         elif parking_spot == 7:  # 7번: (1475, 1000) -> (1475, 925) -> (200, 925) -> (200,200)
             exit_waypoints.append([1475, 925])
-            exit_waypoints.append(MANDATORY_WAYPOINT)
+            exit_waypoints.append(list(MANDATORY_WAYPOINT))
             exit_waypoints.append(FINAL_DESTINATION)
         elif parking_spot in [8, 9, 10, 11]:  # 8~11번: 현재위치 -> (200, 925) -> (200,200)
-            exit_waypoints.append(MANDATORY_WAYPOINT)
+            exit_waypoints.append(list(MANDATORY_WAYPOINT))
             exit_waypoints.append(FINAL_DESTINATION)
         
         print(f"🚗 출차 경로 생성 - 주차구역 {parking_spot}번")
@@ -1744,19 +1535,8 @@ class ParkingLotUI(QWidget):
 
     def get_parking_spot_start_waypoint(self, parking_spot):
         """주차구역별 시작 웨이포인트 반환 - sender.py의 좌표와 동일하게 설정"""
-        # sender.py의 주차구역별 waypoint 좌표와 동일
-        parking_waypoints = {
-            # 주차구역 1-5 (상단, 왼쪽→오른쪽)
-            1: [200, 1475], 2: [550, 1475], 3: [850, 1475], 4: [1150, 1475],
-            5: [1450, 1475],
-            # 주차구역 6-7 (우측, 위→아래)  
-            6: [1475, 1400], 7: [1475, 1000],
-            # 주차구역 8-11 (하단, 오른쪽→왼쪽)
-            8: [1475, 925], 9: [1150, 925], 10: [850, 925], 11: [550, 925]
-        }
-        
-        if parking_spot in parking_waypoints:
-            return parking_waypoints[parking_spot]
+        if parking_spot in PARKING_SPOT_WAYPOINTS:
+            return PARKING_SPOT_WAYPOINTS[parking_spot]
         
         return None
 
@@ -1773,6 +1553,8 @@ class ParkingLotUI(QWidget):
         # 전체 경로 구성: 핀포인트 → 웨이포인트들 (직선 연결)
         waypoints_qpoints = [QPointF(p[0], p[1]) for p in exit_waypoints]
         self.full_path_points = [start_point] + waypoints_qpoints
+        self.route_path = RoutePath(self.full_path_points)
+        self.route_geometry = RouteGeometry(self.route_path)
         
         print(f"✅ 출차 경로: {len(self.full_path_points)}개 포인트")
         for i, point in enumerate(self.full_path_points):
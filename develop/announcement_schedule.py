@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+안내 스케줄 - 경로 수신 시 회전/직진/도착 안내 전환 지점을 누적 거리로 미리 계산
+위치 업데이트마다 안내 목록을 다시 만들지 않고, 커서를 앞으로만 이동시키며
+8m(회전 안내 시작) / 2m(회전 완료) / 5m(목적지 도착) 임계점을 지날 때 이벤트를 발생시킵니다.
+"""
+
+from typing import List, Optional, Tuple
+
+from navigation_core import (
+    PIXELS_PER_METER, SHORT_TURN_PIXELS, ARRIVAL_TEXT, EXIT_COMPLETE_TEXT, turn_direction
+)
+from route_geometry import RouteGeometry
+
+# navigation_hud.update_navigation_info와 동일한 전환 거리 (미터)
+TURN_ANNOUNCE_METERS = 8       # 회전까지 8m 이내면 회전 안내 표시
+TURN_COMPLETE_METERS = 2       # 회전까지 2m 이내면 회전 완료로 보고 다음 안내로 전환
+ARRIVAL_ANNOUNCE_METERS = 5    # 목적지까지 5m 이내면 목적지 도착 표시
+ARRIVAL_ZERO_METERS = 1.0      # 목적지까지 1m 이하면 거리 0으로 고정
+
+STRAIGHT_TEXT = "직진"
+
+# 안내 단계
+PHASE_APPROACH = 'approach'    # 다음 안내 지점까지 직진
+PHASE_TURN = 'turn'            # 회전 안내
+PHASE_ARRIVAL = 'arrival'      # 목적지 도착 / 출차 완료
+
+
+class Maneuver:
+    """경로 위 안내 지점 (회전 또는 목적지)"""
+
+    __slots__ = ('direction', 's', 'vertex')
+
+    def __init__(self, direction: str, s: float, vertex: int):
+        self.direction = direction  # "좌회전", "출차 우회전", "목적지 도착" 등
+        self.s = s                  # 경로 시작점부터의 누적 거리 (픽셀)
+        self.vertex = vertex        # 경로 포인트 인덱스
+
+    def __repr__(self):
+        return f"Maneuver({self.direction!r}, s={self.s:.1f}, vertex={self.vertex})"
+
+
+class Trigger:
+    """안내 단계가 시작되는 누적 거리"""
+
+    __slots__ = ('s', 'phase', 'maneuver')
+
+    def __init__(self, s: float, phase: str, maneuver: int):
+        self.s = s
+        self.phase = phase
+        self.maneuver = maneuver    # maneuvers 리스트 인덱스
+
+    def __repr__(self):
+        return f"Trigger({self.phase}, s={self.s:.1f}, maneuver={self.maneuver})"
+
+
+def build_maneuvers(geometry: RouteGeometry, is_exit_scenario: bool = False) -> List[Maneuver]:
+    """generate_hud_instructions와 같은 규칙으로 회전 지점을 골라 누적 거리와 함께 반환
+
+    - 45도를 넘는 방향 변화만 회전으로 안내
+    - 출차 시나리오: 회전 직전 세그먼트가 100픽셀 이내이면 회전 무시
+    - 목적지 직전 100픽셀 이내 회전은 안내 생략
+    - 마지막 항목은 항상 "목적지 도착" 또는 "출차 완료"
+    """
+    n = len(geometry)
+    maneuvers = []
+    if n < 2:
+        return maneuvers
+
+    last_index = n - 1
+    for v in range(1, last_index):
+        direction = turn_direction(geometry.turn_angle[v])
+        if not direction:
+            continue
+        if is_exit_scenario and geometry.seg_len[v - 1] <= SHORT_TURN_PIXELS:
+            continue
+        if v + 1 == last_index and geometry.seg_len[v] <= SHORT_TURN_PIXELS:
+            continue
+        if is_exit_scenario:
+            direction = f"출차 {direction}"
+        maneuvers.append(Maneuver(direction, geometry.cum[v], v))
+
+    final_text = EXIT_COMPLETE_TEXT if is_exit_scenario else ARRIVAL_TEXT
+    maneuvers.append(Maneuver(final_text, geometry.total_length, last_index))
+    return maneuvers
+
+
+def build_triggers(maneuvers: List[Maneuver]) -> List[Trigger]:
+    """안내 지점마다 단계 시작 위치를 계산 (누적 거리 오름차순)
+
+    회전 k: [이전 단계 끝 ~ s_k-8m) 직진, [s_k-8m ~ s_k-2m) 회전 안내, s_k-2m부터 다음 안내
+    목적지: [이전 단계 끝 ~ s_end-5m) 직진, s_end-5m부터 도착 안내
+    """
+    announce = TURN_ANNOUNCE_METERS * PIXELS_PER_METER
+    complete = TURN_COMPLETE_METERS * PIXELS_PER_METER
+    arrival = ARRIVAL_ANNOUNCE_METERS * PIXELS_PER_METER
+
+    triggers = []
+    start = float('-inf')
+    last = len(maneuvers) - 1
+    for k, m in enumerate(maneuvers):
+        triggers.append(Trigger(start, PHASE_APPROACH, k))
+        if k == last:
+            triggers.append(Trigger(max(start, m.s - arrival), PHASE_ARRIVAL, k))
+        else:
+            triggers.append(Trigger(max(start, m.s - announce), PHASE_TURN, k))
+            start = max(start, m.s - complete)
+    return triggers
+
+
+class AnnouncementSchedule:
+    """경로별 안내 스케줄 - 누적 거리 커서로 현재 안내 단계를 추적
+
+    사용법:
+        schedule = AnnouncementSchedule(geometry, is_exit_scenario)
+        events = schedule.advance(traveled)     # 임계점을 지난 단계 목록
+        direction, distance, next_direction = schedule.display(traveled)
+        instructions = schedule.instructions(traveled)
+    """
+
+    def __init__(self, geometry: Optional[RouteGeometry] = None, is_exit_scenario: bool = False):
+        self.is_exit_scenario = is_exit_scenario
+        self.maneuvers = build_maneuvers(geometry, is_exit_scenario) if geometry is not None else []
+        self.triggers = build_triggers(self.maneuvers)
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.maneuvers)
+
+    def reset(self):
+        """커서를 경로 시작으로 되돌림 (캐시된 스케줄로 안내를 다시 시작할 때)"""
+        self.cursor = 0
+
+    @property
+    def current(self) -> Optional[Trigger]:
+        return self.triggers[self.cursor] if self.triggers else None
+
+    def advance(self, s: float) -> List[Trigger]:
+        """누적 거리 s까지 커서를 전진 - 새로 진입한 단계 목록 반환 (뒤로는 이동하지 않음)"""
+        events = []
+        triggers = self.triggers
+        while self.cursor + 1 < len(triggers) and triggers[self.cursor + 1].s <= s:
+            self.cursor += 1
+            events.append(triggers[self.cursor])
+        return events
+
+    def _remaining(self, k: int, s: float) -> float:
+        return max(0.0, (self.maneuvers[k].s - s) / PIXELS_PER_METER)
+
+    def display(self, s: float) -> Tuple[str, float, str]:
+        """HUD에 표시할 (방향, 거리(m), 다음 방향) - update_navigation_info의 8m/5m/2m 규칙 결과"""
+        trigger = self.current
+        if trigger is None:
+            return "", 0.0, ""
+
+        k = trigger.maneuver
+        direction = self.maneuvers[k].direction
+        distance = self._remaining(k, s)
+
+        if trigger.phase == PHASE_ARRIVAL:
+            return direction, (distance if distance > ARRIVAL_ZERO_METERS else 0.0), ""
+        if trigger.phase == PHASE_TURN:
+            next_direction = self.maneuvers[k + 1].direction if k + 1 < len(self.maneuvers) else ""
+            return direction, distance, next_direction
+        return STRAIGHT_TEXT, distance, direction
+
+    def instructions(self, s: float, count: int = 2) -> List[Tuple[str, float]]:
+        """현재 안내 지점부터 [(방향, 거리(m)), ...] - 기존 instructions 형식 (거리는 직전 안내 지점 기준)"""
+        trigger = self.current
+        if trigger is None:
+            return []
+
+        k = trigger.maneuver
+        result = []
+        prev_s = s
+        for m in self.maneuvers[k:k + count]:
+            distance = max(0.0, (m.s - prev_s) / PIXELS_PER_METER)
+            if m is self.maneuvers[-1] and distance <= ARRIVAL_ZERO_METERS:
+                distance = 0.0
+            result.append((m.direction, distance))
+            prev_s = m.s
+        return result
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+배치 네비게이션 - 여러 차량의 안내 계산을 NumPy 벡터 연산 한 번으로 처리
+등록된 경로들을 하나의 평탄화된 세그먼트 배열로 묶어 두고,
+차량 위치 배열 + 경로 ID 배열을 받아 세그먼트 진행, 가장 가까운 세그먼트 투영,
+진행률/남은 거리, 현재/다음 안내를 차량 수만큼의 Python 루프 없이 계산합니다.
+세그먼트 인덱스와 안내 커서는 호출 간에 차량별 배열(seg_hints, maneuver_hints)로 넘겨받아
+AnnouncementSchedule 커서처럼 앞으로만 이동시킵니다 (투영 위치가 잡음으로 뒤로 밀려도 지난 안내로 돌아가지 않음).
+
+경로 구성 규칙(입차는 입구부터, 출차는 주차 좌표부터)과 세그먼트/안내 규칙은
+ExternalServerReceiver가 쓰는 navigation_core / route_geometry / announcement_schedule과 동일합니다.
+"""
+
+from typing import Dict, Hashable, List
+
+import numpy as np
+
+from navigation_core import (
+    PIXELS_PER_METER, SEGMENT_ADVANCE_RADIUS, ARRIVAL_TEXT, EXIT_COMPLETE_TEXT, route_points_from_waypoints
+)
+from route_geometry import RouteGeometry, LOCAL_SEARCH_BEHIND, LOCAL_SEARCH_AHEAD, GLOBAL_SEARCH_DISTANCE
+from announcement_schedule import build_maneuvers, Maneuver, TURN_COMPLETE_METERS, ARRIVAL_ZERO_METERS
+
+# 현재 세그먼트 기준 제한 탐색 오프셋 (RouteGeometry.locate와 동일한 범위)
+WINDOW_OFFSETS = np.arange(-LOCAL_SEARCH_BEHIND, LOCAL_SEARCH_AHEAD + 1)
+
+
+class BatchNavigationResult:
+    """차량별 계산 결과 (모든 속성은 길이 N 배열)
+
+    Attributes:
+        segment: 진행 규칙 적용 후 현재 세그먼트 인덱스 (다음 호출의 seg_hints로 사용)
+        nearest_segment, ratio: 가장 가까운 세그먼트와 투영 비율
+        distance_to_route: 경로까지 거리 (픽셀)
+        traveled: 투영 위치까지의 누적 거리 (픽셀)
+        remaining: 목적지까지 남은 거리 (미터)
+        progress: 경로 진행률 (%)
+        arrived: 마지막 세그먼트를 지났는지 여부
+        maneuver: 경로 안 현재 안내 지점 인덱스 (다음 호출의 maneuver_hints로 사용)
+        instruction, next_instruction: 안내 문자열 코드 (directions 인덱스, 다음 안내 없으면 -1)
+        instruction_distance, next_distance: 안내 거리 (미터)
+    """
+
+    __slots__ = ('directions', 'segment', 'nearest_segment', 'ratio', 'distance_to_route',
+                 'traveled', 'remaining', 'progress', 'arrived', 'maneuver',
+                 'instruction', 'instruction_distance', 'next_instruction', 'next_distance')
+
+    def __init__(self, directions: List[str], **arrays):
+        self.directions = directions
+        for name, value in arrays.items():
+            setattr(self, name, value)
+
+    def __len__(self):
+        return len(self.segment)
+
+    def instructions(self, i: int):
+        """차량 i의 안내를 기존 instructions 형식 [(방향, 거리(m)), ...]으로 변환"""
+        result = [(self.directions[self.instruction[i]], float(self.instruction_distance[i]))]
+        if self.next_instruction[i] >= 0:
+            result.append((self.directions[self.next_instruction[i]], float(self.next_distance[i])))
+        return result
+
+
+class BatchNavigator:
+    """여러 경로를 평탄화된 배열로 보관하고 차량 배치를 한 번에 평가
+
+    사용법:
+        nav = BatchNavigator()
+        nav.set_route('car_1', waypoints, route_type='entry')
+        result = nav.evaluate(xs, ys, route_ids, seg_hints, maneuver_hints)
+        seg_hints, maneuver_hints = result.segment, result.maneuver
+    """
+
+    def __init__(self):
+        self.routes: Dict[Hashable, int] = {}
+        self.geometries: List[RouteGeometry] = []
+        self.exit_flags: List[bool] = []
+        self.directions: List[str] = []
+        self._direction_codes: Dict[str, int] = {}
+        self._dirty = True
+
+    def __len__(self):
+        return len(self.geometries)
+
+    # ---------------------------------------------------------------
+    # 경로 등록
+    # ---------------------------------------------------------------
+    def set_route(self, route_id: Hashable, waypoints, route_type: str = 'entry') -> int:
+        """서버 웨이포인트로 경로 등록/교체 (waypoint, waypoint_reassignment 수신 시)"""
+        points = route_points_from_waypoints(waypoints, route_type)
+        return self.set_route_geometry(route_id, RouteGeometry(points), route_type == 'exit')
+
+    def set_route_geometry(self, route_id: Hashable, geometry: RouteGeometry,
+                           is_exit_scenario: bool = False) -> int:
+        """이미 계산된 RouteGeometry로 경로 등록/교체 - 경로 인덱스 반환"""
+        index = self.routes.get(route_id)
+        if index is None:
+            index = len(self.geometries)
+            self.routes[route_id] = index
+            self.geometries.append(geometry)
+            self.exit_flags.append(is_exit_scenario)
+        else:
+            self.geometries[index] = geometry
+            self.exit_flags[index] = is_exit_scenario
+        self._dirty = True
+        return index
+
+    def route_index(self, route_ids) -> np.ndarray:
+        """경로 ID 목록을 경로 인덱스 배열로 변환"""
+        return np.fromiter((self.routes[r] for r in route_ids), dtype=np.intp)
+
+    def _direction_code(self, direction: str) -> int:
+        code = self._direction_codes.get(direction)
+        if code is None:
+            code = len(self.directions)
+            self._direction_codes[direction] = code
+            self.directions.append(direction)
+        return code
+
+    def _compile(self):
+        """등록된 경로를 평탄화 배열로 변환 (경로 변경 후 첫 evaluate에서 1회)"""
+        seg_count = np.array([g.segment_count for g in self.geometries], dtype=np.intp)
+        seg_start = np.zeros(len(seg_count), dtype=np.intp)
+        if len(seg_count) > 1:
+            np.cumsum(seg_count[:-1], out=seg_start[1:])
+
+        def flat(attr, part=slice(None)):
+            parts = [np.frombuffer(getattr(g, attr), dtype=np.float64)[part] for g in self.geometries]
+            return np.concatenate(parts) if parts else np.zeros(0)
+
+        head, tail = slice(None, -1), slice(1, None)
+
+        self.seg_count = seg_count
+        self.seg_start = seg_start
+        self.seg_x1 = flat('xs', head)
+        self.seg_y1 = flat('ys', head)
+        self.seg_x2 = flat('xs', tail)
+        self.seg_y2 = flat('ys', tail)
+        self.seg_ux = flat('ux')
+        self.seg_uy = flat('uy')
+        self.seg_len = flat('seg_len')
+        self.seg_cum = flat('cum', head)
+        self.route_total = np.array([g.total_length for g in self.geometries], dtype=np.float64)
+        self.route_x0 = np.array([g.xs[0] if len(g) else 0.0 for g in self.geometries])
+        self.route_y0 = np.array([g.ys[0] if len(g) else 0.0 for g in self.geometries])
+
+        # 안내 지점: 경로별 블록으로 정렬된 키(route * stride + s)로 searchsorted 한 번에 조회
+        self.key_stride = float(self.route_total.max() * 2 + 10000) if len(self.route_total) else 1.0
+        man_s, man_dir, man_key, man_start, man_count = [], [], [], [], []
+        for r, (g, is_exit) in enumerate(zip(self.geometries, self.exit_flags)):
+            maneuvers = build_maneuvers(g, is_exit)
+            if not maneuvers:
+                # 포인트가 1개 이하인 경로도 목적지 안내 1개는 갖도록 함
+                maneuvers = [Maneuver(EXIT_COMPLETE_TEXT if is_exit else ARRIVAL_TEXT, 0.0, 0)]
+            man_start.append(len(man_s))
+            man_count.append(len(maneuvers))
+            for m in maneuvers:
+                man_s.append(m.s)
+                man_dir.append(self._direction_code(m.direction))
+                man_key.append(r * self.key_stride + m.s)
+        self.man_s = np.array(man_s, dtype=np.float64)
+        self.man_dir = np.array(man_dir, dtype=np.intp)
+        self.man_key = np.array(man_key, dtype=np.float64)
+        self.man_start = np.array(man_start, dtype=np.intp)
+        self.man_count = np.array(man_count, dtype=np.intp)
+        self._dirty = False
+
+    # ---------------------------------------------------------------
+    # 배치 평가
+    # ---------------------------------------------------------------
+    def _advance(self, x, y, route, seg):
+        """_update_current_segment 규칙을 모든 차량에 반복 적용 (진행할 차량이 없을 때까지)"""
+        count = self.seg_count[route]
+        start = self.seg_start[route]
+        radius_sq = SEGMENT_ADVANCE_RADIUS * SEGMENT_ADVANCE_RADIUS
+        active = np.flatnonzero(seg < count)
+        while active.size:
+            g = start[active] + seg[active]
+            ax, ay = x[active], y[active]
+            near = (ax - self.seg_x2[g]) ** 2 + (ay - self.seg_y2[g]) ** 2 < radius_sq
+            length = self.seg_len[g]
+            along = (ax - self.seg_x1[g]) * self.seg_ux[g] + (ay - self.seg_y1[g]) * self.seg_uy[g]
+            moved = near | (length <= 0) | (along > length)
+            active = active[moved]
+            seg[active] += 1
+            active = active[seg[active] < count[active]]
+        return seg
+
+    def _project(self, x, y, seg_index, valid):
+        """(N, K) 세그먼트 후보에 대한 투영 비율과 거리 제곱 (무효 후보는 inf)"""
+        length = self.seg_len[seg_index]
+        along = ((x[:, None] - self.seg_x1[seg_index]) * self.seg_ux[seg_index] +
+                 (y[:, None] - self.seg_y1[seg_index]) * self.seg_uy[seg_index])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.clip(along / length, 0.0, 1.0)
+        px = self.seg_x1[seg_index] + t * length * self.seg_ux[seg_index]
+        py = self.seg_y1[seg_index] + t * length * self.seg_uy[seg_index]
+        d_sq = (x[:, None] - px) ** 2 + (y[:, None] - py) ** 2
+        valid = valid & (length > 0)
+        return np.where(valid, t, 0.0), np.where(valid, d_sq, np.inf)
+
+    def _locate(self, x, y, route, seg):
+        """RouteGeometry.locate와 같은 제한 탐색 + 먼 차량만 전체 탐색"""
+        count = self.seg_count[route]
+        start = self.seg_start[route]
+        hint = np.minimum(seg, np.maximum(count - 1, 0))
+
+        local = hint[:, None] + WINDOW_OFFSETS[None, :]
+        valid = (local >= 0) & (local < count[:, None])
+        g = start[:, None] + np.where(valid, local, 0)
+        t, d_sq = self._project(x, y, g, valid)
+        best = np.argmin(d_sq, axis=1)
+        rows = np.arange(len(x))
+        nearest = local[rows, best]
+        ratio = t[rows, best]
+        best_sq = d_sq[rows, best]
+
+        # 제한 탐색 결과가 멀고 창이 경로 전체를 덮지 않는 차량만 전체 세그먼트 탐색
+        covers_all = (hint - LOCAL_SEARCH_BEHIND <= 0) & (hint + LOCAL_SEARCH_AHEAD + 1 >= count)
+        far = np.flatnonzero((best_sq > GLOBAL_SEARCH_DISTANCE ** 2) & ~covers_all)
+        if far.size:
+            width = int(count[far].max())
+            full = np.arange(width)[None, :]
+            f_valid = full < count[far, None]
+            f_g = start[far, None] + np.where(f_valid, full, 0)
+            f_t, f_sq = self._project(x[far], y[far], f_g, f_valid)
+            f_best = np.argmin(f_sq, axis=1)
+            f_rows = np.arange(far.size)
+            better = f_sq[f_rows, f_best] < best_sq[far]
+            upd = far[better]
+            nearest[upd] = f_best[better]
+            ratio[upd] = f_t[f_rows, f_best][better]
+            best_sq[upd] = f_sq[f_rows, f_best][better]
+
+        has_seg = np.isfinite(best_sq)
+        if len(self.seg_len):
+            g_best = np.minimum(start + np.where(has_seg, nearest, 0), len(self.seg_len) - 1)
+            traveled = np.where(has_seg, self.seg_cum[g_best] + ratio * self.seg_len[g_best], 0.0)
+        else:
+            traveled = np.zeros(len(x))
+        dist0 = np.sqrt((x - self.route_x0[route]) ** 2 + (y - self.route_y0[route]) ** 2)
+        distance = np.where(has_seg, np.sqrt(np.where(has_seg, best_sq, 0.0)), dist0)
+        return nearest, np.where(has_seg, ratio, 0.0), distance, traveled
+
+    def evaluate(self, xs, ys, routes, seg_hints=None, maneuver_hints=None) -> BatchNavigationResult:
+        """차량 배치 평가
+
+        Args:
+            xs, ys: 차량 위치 (픽셀), 길이 N
+            routes: 경로 인덱스 배열 (route_index()로 변환한 값)
+            seg_hints: 차량별 현재 세그먼트 인덱스 (None이면 0부터)
+            maneuver_hints: 차량별 현재 안내 지점 인덱스 (None이면 0부터, 경로 변경 시 0으로 초기화)
+        """
+        if self._dirty:
+            self._compile()
+
+        x = np.asarray(xs, dtype=np.float64)
+        y = np.asarray(ys, dtype=np.float64)
+        route = np.asarray(routes, dtype=np.intp)
+        seg = np.zeros(len(x), dtype=np.intp) if seg_hints is None else np.array(seg_hints, dtype=np.intp)
+
+        seg = self._advance(x, y, route, seg)
+        nearest, ratio, distance, traveled = self._locate(x, y, route, seg)
+
+        total = self.route_total[route]
+        arrived = seg + 1 > self.seg_count[route]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            progress = np.where(total > 0, np.minimum(100.0, traveled / total * 100.0), 0.0)
+        progress = np.where(arrived, 100.0, progress)
+        remaining = np.where(arrived, 0.0, np.maximum(0.0, total - traveled) / PIXELS_PER_METER)
+
+        # 현재 안내: 회전 완료(2m) 지점을 아직 지나지 않은 첫 안내 지점, 없으면 목적지
+        # (AnnouncementSchedule.advance와 같이 이전 안내 지점보다 뒤로 가지 않음)
+        first = self.man_start[route]
+        last = first + self.man_count[route] - 1
+        key = route * self.key_stride + traveled + TURN_COMPLETE_METERS * PIXELS_PER_METER
+        k = np.minimum(np.searchsorted(self.man_key, key, side='right'), last)
+        if maneuver_hints is not None:
+            k = np.maximum(k, np.minimum(first + np.asarray(maneuver_hints, dtype=np.intp), last))
+        k = np.where(arrived, last, k)
+        k_s = self.man_s[k]
+        instruction_distance = np.maximum(0.0, (k_s - traveled) / PIXELS_PER_METER)
+        instruction_distance = np.where(
+            (k == last) & ((instruction_distance <= ARRIVAL_ZERO_METERS) | arrived), 0.0, instruction_distance)
+
+        has_next = k < last
+        k_next = np.where(has_next, k + 1, k)
+        next_distance = np.where(has_next, (self.man_s[k_next] - k_s) / PIXELS_PER_METER, 0.0)
+        next_distance = np.where(has_next & (k_next == last) & (next_distance <= ARRIVAL_ZERO_METERS),
+                                 0.0, next_distance)
+
+        return BatchNavigationResult(
+            self.directions,
+            segment=seg,
+            nearest_segment=nearest,
+            ratio=ratio,
+            distance_to_route=distance,
+            traveled=traveled,
+            remaining=remaining,
+            progress=progress,
+            arrived=arrived,
+            maneuver=k - first,
+            instruction=self.man_dir[k],
+            instruction_distance=instruction_distance,
+            next_instruction=np.where(has_next, self.man_dir[k_next], -1),
+            next_distance=next_distance,
+        )
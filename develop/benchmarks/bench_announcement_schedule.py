@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+announcement_schedule 벤치마크 - 위치 업데이트 1회당 안내 생성 비용 비교
+
+기존 방식: 매 업데이트마다 instructions_from_position으로 남은 경로 전체 안내 재생성
+스케줄 방식: 경로 수신 시 전환 지점을 1회 계산하고 업데이트마다 커서만 전진
+
+실행:
+    cd develop
+    python benchmarks/bench_announcement_schedule.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_core import RoutePath, instructions_from_position
+from route_geometry import RouteGeometry
+from announcement_schedule import AnnouncementSchedule
+from bench_navigation_core import zigzag_route, sample_positions
+
+
+def run(num_waypoints):
+    points = zigzag_route(num_waypoints)
+    positions = sample_positions(points)
+    path = RoutePath(points)
+    geometry = RouteGeometry(path)
+
+    # 기존 방식
+    seg_idx = 0
+    t0 = time.perf_counter()
+    for x, y in positions:
+        seg_idx = geometry.advance_segment(seg_idx, x, y)
+        instructions_from_position(path, seg_idx, x, y)
+    rebuild_us = (time.perf_counter() - t0) / len(positions) * 1e6
+
+    # 스케줄 방식 (스케줄 생성 비용 별도 측정)
+    t0 = time.perf_counter()
+    schedule = AnnouncementSchedule(geometry)
+    build_us = (time.perf_counter() - t0) * 1e6
+    seg_idx = 0
+    events = 0
+    t0 = time.perf_counter()
+    for x, y in positions:
+        seg_idx = geometry.advance_segment(seg_idx, x, y)
+        _, _, _, traveled = geometry.locate(x, y, seg_idx)
+        events += len(schedule.advance(traveled))
+        schedule.instructions(traveled)
+        schedule.display(traveled)
+    cursor_us = (time.perf_counter() - t0) / len(positions) * 1e6
+
+    return len(positions), rebuild_us, cursor_us, build_us, events
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  announcement_schedule 벤치마크 (위치 업데이트 1회당 평균 시간)")
+    print("=" * 60)
+
+    for n in (4, 16, 64, 256, 1024):
+        updates, rebuild_us, cursor_us, build_us, events = run(n)
+        print(f"  웨이포인트 {n:5d}개 / 업데이트 {updates:6d}회: "
+              f"안내 재생성 {rebuild_us:8.1f}µs | 스케줄 {cursor_us:6.1f}µs "
+              f"({rebuild_us / cursor_us:6.1f}배, 스케줄 생성 {build_us:7.1f}µs, 이벤트 {events}회)")
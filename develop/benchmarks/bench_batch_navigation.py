@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+batch_navigation 벤치마크 - 틱(모든 차량 위치 1회 갱신)당 안내 계산 비용 비교
+
+차량별 루프: 차량마다 RouteGeometry.advance_segment + locate + AnnouncementSchedule
+배치: BatchNavigator.evaluate 한 번으로 전체 차량 계산
+
+경로는 route_sender.generate_route_to_parking과 같은 11개 주차구역 입차 경로를 사용합니다.
+
+실행:
+    cd develop
+    python benchmarks/bench_batch_navigation.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from navigation_core import route_points_from_waypoints
+from route_geometry import RouteGeometry
+from announcement_schedule import AnnouncementSchedule
+from batch_navigation import BatchNavigator
+
+# route_sender.generate_route_to_parking과 동일한 주차구역별 웨이포인트
+SPOT_WAYPOINTS = {
+    1: [[200, 1475]],
+    2: [[200, 1475], [550, 1475]],
+    3: [[200, 1475], [850, 1475]],
+    4: [[200, 1475], [1150, 1475]],
+    5: [[200, 1475], [1450, 1475]],
+    6: [[200, 1475], [1475, 1475], [1475, 1400]],
+    7: [[200, 925], [1475, 925], [1475, 1000]],
+    8: [[200, 925], [1475, 925]],
+    9: [[200, 925], [1150, 925]],
+    10: [[200, 925], [850, 925]],
+    11: [[200, 925], [550, 925]],
+}
+
+TICKS = 50
+STEP_PX = 10.0  # 틱당 이동 거리 (픽셀)
+
+
+def make_traces(num_vehicles, geometries, rng):
+    """차량별 경로 배정 + 틱별 위치 (경로 위 ±10픽셀 노이즈)"""
+    spots = rng.integers(0, len(geometries), num_vehicles)
+    start = rng.uniform(0, 0.5, num_vehicles)
+    xs = np.zeros((TICKS, num_vehicles))
+    ys = np.zeros((TICKS, num_vehicles))
+    for v, r in enumerate(spots):
+        g = geometries[r]
+        for t in range(TICKS):
+            s = min(g.total_length, start[v] * g.total_length + t * STEP_PX)
+            xs[t, v], ys[t, v] = g.point_at(s)
+    xs += rng.uniform(-10, 10, xs.shape)
+    ys += rng.uniform(-10, 10, ys.shape)
+    return spots, xs, ys
+
+
+def run(num_vehicles, rng):
+    geometries = [RouteGeometry(route_points_from_waypoints(wps)) for wps in SPOT_WAYPOINTS.values()]
+    spots, xs, ys = make_traces(num_vehicles, geometries, rng)
+
+    # 차량별 루프 (컨트롤러가 차량 한 대에 하는 계산을 차량 수만큼 반복)
+    schedules = [AnnouncementSchedule(geometries[r]) for r in spots]
+    seg = [0] * num_vehicles
+    t0 = time.perf_counter()
+    for t in range(TICKS):
+        for v in range(num_vehicles):
+            g = geometries[spots[v]]
+            x, y = xs[t, v], ys[t, v]
+            seg[v] = g.advance_segment(seg[v], x, y)
+            _, _, _, traveled = g.locate(x, y, seg[v])
+            g.progress_at(traveled)
+            g.remaining_meters_at(traveled)
+            schedules[v].advance(traveled)
+            schedules[v].instructions(traveled)
+    loop_ms = (time.perf_counter() - t0) / TICKS * 1e3
+
+    # 배치
+    nav = BatchNavigator()
+    for spot, wps in SPOT_WAYPOINTS.items():
+        nav.set_route(spot, wps)
+    routes = nav.route_index(list(SPOT_WAYPOINTS)[r] for r in spots)
+    seg_hints = np.zeros(num_vehicles, dtype=np.intp)
+    maneuver_hints = np.zeros(num_vehicles, dtype=np.intp)
+    nav.evaluate(xs[0], ys[0], routes, seg_hints)  # 평탄화 배열 생성 (경로 변경 시 1회)
+    t0 = time.perf_counter()
+    for t in range(TICKS):
+        result = nav.evaluate(xs[t], ys[t], routes, seg_hints, maneuver_hints)
+        seg_hints, maneuver_hints = result.segment, result.maneuver
+    batch_ms = (time.perf_counter() - t0) / TICKS * 1e3
+
+    return loop_ms, batch_ms
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  batch_navigation 벤치마크 (틱당 평균 시간)")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    for n in (10, 100, 1000):
+        loop_ms, batch_ms = run(n, rng)
+        print(f"  차량 {n:5d}대: 차량별 루프 {loop_ms:8.3f}ms | 배치 {batch_ms:8.3f}ms "
+              f"({loop_ms / batch_ms:5.1f}배)")
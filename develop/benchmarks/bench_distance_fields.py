@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+distance_fields 벤치마크 - 임의 위치에서 각 목표(주차구역 11개, 입출차 지점, 목적지 입구)까지
+거리 조회 / 경로 생성을 GridPlanner.jps 탐색과 CELL=30, 10에서 비교
+
+실행:
+    cd develop
+    python benchmarks/bench_distance_fields.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lot_layout import LOT_MAP
+from grid_planner import GridPlanner
+
+CELL_SIZES = (30, 10)
+MARGIN = 10
+N_QUERIES = 2000
+
+
+def timed(fn, queries):
+    t0 = time.perf_counter()
+    results = [fn(*q) for q in queries]
+    return results, (time.perf_counter() - t0) / len(queries) * 1e3
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  distance_fields 벤치마크 (질의 1회당 평균 시간)")
+    print("=" * 60)
+
+    rng = random.Random(7)
+    for cell in CELL_SIZES:
+        grid = LOT_MAP.occupancy(cell, MARGIN)
+        fields = LOT_MAP.distance_fields(cell, MARGIN)
+        planner = GridPlanner.from_grid(grid)
+        w = grid.width
+
+        # 열린 셀 위의 임의 위치 × 임의 목표
+        queries = []
+        while len(queries) < N_QUERIES:
+            x, y = rng.uniform(0, LOT_MAP.scene[0]), rng.uniform(0, LOT_MAP.scene[1])
+            if grid.is_free(int(x // cell), int(y // cell)):
+                queries.append((rng.choice(fields.names()), x, y))
+
+        def jps(name, x, y):
+            t = fields.targets[name][0]
+            return planner.jps((int(x // cell), int(y // cell)), (t % w, t // w))
+
+        searched, jps_ms = timed(jps, queries)
+        distances, dist_ms = timed(fields.distance, queries)
+        walked, walk_ms = timed(fields.cell_path, queries)
+
+        same = all((p is None and d is None) or (p is not None and d == (len(p) - 1) * cell)
+                   for p, d in zip(searched, distances))
+        same_path = all((p is None and q is None) or (p is not None and q is not None and len(p) == len(q))
+                        for p, q in zip(searched, walked))
+        size_kb = sum(len(d) * 2 + len(fields.next[n]) for n, d in fields.dist.items()) / 1024
+
+        print(f"\n  CELL={cell:2d} (격자 {grid.width}x{grid.height}, 목표 {len(fields.targets)}개, 표 {size_kb:.0f}KB)")
+        print(f"    JPS 탐색   : {jps_ms:8.4f}ms")
+        print(f"    거리 조회  : {dist_ms:8.4f}ms  ({jps_ms / dist_ms:6.1f}배)")
+        print(f"    방향표 순회: {walk_ms:8.4f}ms  ({jps_ms / walk_ms:6.1f}배)")
+        print(f"    JPS와 일치: 거리 {'✅' if same else '❌'}, 경로 길이 {'✅' if same_path else '❌'}")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dynamic_planner 벤치마크 - 정차 차량이 생기고 떠날 때 D* Lite 부분 보정과 전체 재탐색(배열 A*, 새 D* Lite) 비교
+
+입구에서 11개 주차구역 진입 웨이포인트로 가는 경로마다, 안내 차량이 경로를 따라 몇 칸씩 진행하는 동안
+다른 차량이 정차하거나 먼저 정차한 차량이 떠나는 사건을 반복합니다.
+- 경로 위: 남은 경로 위에 정차 (통로 폭 전체를 막으면 다른 통로로 우회)
+- 경로 밖: 경로에서 떨어진 통로에 정차 - 사건마다 전체 재탐색하는 방식은 이때도 A* 1회 비용을 냅니다
+
+실행:
+    cd develop
+    python benchmarks/bench_dynamic_planner.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lot_layout import LOT_MAP, ENTRANCE_POINT, PARKING_SPOT_WAYPOINTS
+from grid_planner import GridPlanner
+from dynamic_planner import DStarLite, DynamicObstacles
+
+CELL_SIZES = (30, 10)
+MARGIN = 10
+EVENTS_PER_ROUTE = 12
+ADVANCE_CELLS = 3  # 사건 사이에 안내 차량이 진행하는 칸 수 (CELL=30 기준)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  dynamic_planner 벤치마크 (사건 1회당 평균 시간)")
+    print("=" * 60)
+
+    rng = random.Random(3)
+    for cell in CELL_SIZES:
+        grid = LOT_MAP.occupancy(cell, MARGIN)
+        w, h = grid.width, grid.height
+        static = bytes(grid.cells)
+        snapper = GridPlanner.from_grid(grid)
+        reference = GridPlanner.from_grid(grid)
+        advance = ADVANCE_CELLS * 30 // cell
+
+        def snap(x, y):
+            cx, cy = snapper.nearest_free(int(x // cell), int(y // cell))
+            return cy * w + cx
+
+        stats = {kind: [0, 0.0, 0.0, 0.0, 0, 0, 0] for kind in ('on', 'off')}  # 사건, 보정/A*/새 D* 시간, 확장 수
+        mismatched = 0
+        free = [c for c in range(w * h) if not static[c]]
+        for spot, (gx, gy) in PARKING_SPOT_WAYPOINTS.items():
+            obstacles = DynamicObstacles(w, h, cell, static)
+            start, goal = snap(*ENTRANCE_POINT), snap(gx, gy)
+            planner = DStarLite(w, h, static, obstacles.counts, start, goal)
+            parked = []
+            for e in range(EVENTS_PER_ROUTE):
+                path = planner.path()
+                if not path or len(path) <= 2 * advance:
+                    break
+                # 안내 차량 진행
+                cx, cy = path[advance]
+                planner.move_start(cy * w + cx)
+                path = path[advance:]
+
+                # 정차 (경로 위 또는 경로 밖) 또는 먼저 정차한 차량 출발
+                if parked and rng.random() < 0.4:
+                    vid, kind = parked.pop(0)
+                    changed = obstacles.remove(vid)
+                else:
+                    vid, kind = f'car_{spot}_{e}', 'on' if e % 2 == 0 else 'off'
+                    if kind == 'on':
+                        px, py = path[rng.randrange(len(path) // 3, len(path) - 1)]
+                    else:
+                        reach = obstacles.radius / cell + 2
+                        while True:
+                            c = rng.choice(free)
+                            px, py = c % w, c // w
+                            if min(max(abs(px - ax), abs(py - ay)) for ax, ay in path) > reach:
+                                break
+                    obstacles.stopped_since[vid] = 0.0
+                    changed = obstacles.update(vid, (px + 0.5) * cell, (py + 0.5) * cell, 0.0, obstacles.stopped_time)
+                    parked.append((vid, kind))
+                if not changed:
+                    continue
+                stat = stats[kind]
+                stat[0] += 1
+
+                # 경로 밖 사건은 DynamicReplanner.repair처럼 탐색 상태만 갱신 (경로 추출은 확인용, 시간 제외)
+                t0 = time.perf_counter()
+                planner.update_cells(changed)
+                if kind == 'on':
+                    repaired = planner.path()
+                else:
+                    planner.compute()
+                stat[1] += time.perf_counter() - t0
+                stat[4] += planner.expanded
+                if kind == 'off':
+                    repaired = planner.path()
+
+                # 전체 재탐색: 정차 차량을 합친 격자에서 A* (astar는 cells만 사용하므로 격자만 교체)
+                s = planner.start
+                combined = bytearray(a | (b > 0) for a, b in zip(static, obstacles.counts))
+                combined[s] = combined[goal] = 0
+                reference.cells = bytes(combined)
+                t0 = time.perf_counter()
+                full = reference.astar((s % w, s // w), (goal % w, goal // w))
+                stat[2] += time.perf_counter() - t0
+                stat[5] += reference.expanded
+
+                t0 = time.perf_counter()
+                scratch = DStarLite(w, h, static, obstacles.counts, s, goal)
+                stat[3] += time.perf_counter() - t0
+                stat[6] += scratch.expanded
+
+                if (full is None) != (repaired is None) or (full and len(full) != len(repaired)):
+                    mismatched += 1
+
+        print(f"\n  CELL={cell:2d} (격자 {w}x{h})")
+        for kind, label in (('on', '경로 위'), ('off', '경로 밖')):
+            n, repair_s, astar_s, scratch_s, repair_x, astar_x, scratch_x = stats[kind]
+            print(f"    [{label} 정차/출발 {n}회]")
+            print(f"      전체 A*      : {astar_s / n * 1e3:8.3f}ms  확장 {astar_x / n:7.0f}개")
+            print(f"      새 D* Lite   : {scratch_s / n * 1e3:8.3f}ms  확장 {scratch_x / n:7.0f}개")
+            print(f"      D* Lite 보정 : {repair_s / n * 1e3:8.3f}ms  확장 {repair_x / n:7.0f}개"
+                  f"  (A* 대비 {astar_s / repair_s:4.1f}배)")
+        print(f"    경로 길이 일치: {'✅' if mismatched == 0 else f'❌ {mismatched}회 불일치'}")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+exit_routes 벤치마크 - 정산 확인 시점에 출차 경로를 만드는 비용을 기존 방식과 사전 계산 캐시로 비교
+
+- 기존: HUD가 주차구역별 분기로 웨이포인트 생성 → 컨트롤러가 경로 포인트/RoutePath/RouteGeometry/AnnouncementSchedule 계산
+  (소켓 왕복은 제외한 계산 시간만)
+- 사전 계산: 주차 시점(체류 이벤트)에 ExitRouteCache.prepare 1회, 정산 확인 시 get + 경로 교체만
+주차구역별로 기존 경로와 새 경로의 길이/안내 수도 출력합니다.
+
+실행:
+    cd develop
+    python benchmarks/bench_exit_route.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from announcement_schedule import AnnouncementSchedule
+from exit_routes import ExitRouteCache
+from lot_layout import ENTRANCE_POINT, MANDATORY_WAYPOINT, PARKING_SPOT_WAYPOINTS, PIXELS_PER_METER
+from navigation_core import RoutePath, route_points_from_waypoints
+from reroute import simplify_waypoints
+from route_geometry import RouteGeometry
+
+N_ROUNDS = 2000
+
+
+def legacy_exit_waypoints(parking_spot):
+    """기존 navigation_hud.generate_exit_waypoints 분기"""
+    current = PARKING_SPOT_WAYPOINTS.get(parking_spot)
+    if not current:
+        return None
+    middle = {1: [], 6: [[1475, 1475], [200, 1475]], 7: [[1475, 925]]}
+    if parking_spot in (2, 3, 4, 5):
+        via = [[200, 1475]]
+    elif parking_spot in (8, 9, 10, 11):
+        via = []
+    else:
+        via = middle.get(parking_spot, [])
+    return [list(current)] + via + [list(MANDATORY_WAYPOINT), list(ENTRANCE_POINT)]
+
+
+def legacy_activate(parking_spot):
+    waypoints = legacy_exit_waypoints(parking_spot)
+    points = route_points_from_waypoints(waypoints, 'exit')
+    geometry = RouteGeometry(RoutePath(points))
+    schedule = AnnouncementSchedule(geometry, True)
+    return geometry, schedule
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  exit_routes 벤치마크 (출차 안내 시작 1회당 평균 시간)")
+    print("=" * 60)
+
+    spots = sorted(PARKING_SPOT_WAYPOINTS)
+
+    t0 = time.perf_counter()
+    for _ in range(N_ROUNDS // 10):
+        for spot in spots:
+            legacy_activate(spot)
+    legacy_s = (time.perf_counter() - t0) / (N_ROUNDS // 10 * len(spots))
+
+    t0 = time.perf_counter()
+    for _ in range(N_ROUNDS // 10):
+        cold = ExitRouteCache(ExitRouteCache().rerouter)
+        for spot in spots:
+            cold.prepare(spot)
+    prepare_s = (time.perf_counter() - t0) / (N_ROUNDS // 10 * len(spots))
+
+    cache = ExitRouteCache()
+    cache.prepare_all()
+    t0 = time.perf_counter()
+    for _ in range(N_ROUNDS):
+        for spot in spots:
+            route = cache.get(spot)
+            path, geometry, schedule = route.path, route.geometry, route.schedule
+    cached_s = (time.perf_counter() - t0) / (N_ROUNDS * len(spots))
+
+    print(f"\n  기존 (분기 + 경로 기하/스케줄 계산) : {legacy_s * 1e6:8.1f}µs  ← 정산 확인 후 UI/수신 스레드")
+    print(f"  사전 계산 (주차 시점 prepare)      : {prepare_s * 1e6:8.1f}µs  ← 체류 이벤트 시 1회")
+    print(f"  사전 계산 (정산 확인 시 get)        : {cached_s * 1e6:8.1f}µs  (기존 대비 {legacy_s / cached_s:5.0f}배)")
+
+    print("\n  주차구역별 출차 경로 (길이 m / 안내 수)")
+    print("   구역    기존            사전 계산")
+    for spot in spots:
+        geometry, schedule = legacy_activate(spot)
+        route = cache.get(spot)
+        mark = "" if route.waypoints == simplify_waypoints(legacy_exit_waypoints(spot)) else "  (경로 다름)"
+        print(f"   {spot:3d}  {geometry.total_length / PIXELS_PER_METER:6.1f}m / {len(schedule):d}개"
+              f"    {route.geometry.total_length / PIXELS_PER_METER:6.1f}m / {len(route.schedule):d}개{mark}")
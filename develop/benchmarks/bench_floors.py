@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+floors 벤치마크 - 층 수가 늘어날 때 시작 시간/메모리가 사용하는 층 수만 따라가는지 확인
+
+1F(lot_map.json) 아래에 B1 지도(lot_map_b1.json)를 주차구역 번호만 바꿔 복제한 지하층을 램프로 이어 붙인
+N층 건물을 임시 디렉터리에 만들고 (디스크 캐시는 미리 컴파일), 다음을 비교합니다.
+- 전체 로드: 모든 층의 지도 + 통로 네트워크 + 점유 격자를 시작 시 로드
+- 지연 로드: 건물 정의만 읽고, 1F 안 경로 / B1까지 경로 / 가장 아래층까지 경로를 요청할 때 필요한 층만 로드
+메모리는 tracemalloc으로 잰 증가량 (1F는 lot_layout이 이미 로드하므로 제외)
+
+실행:
+    cd develop
+    python benchmarks/bench_floors.py
+"""
+
+import copy
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from floors import Building, load_building
+from lot_map import DEFAULT_CELL, DEFAULT_MARGIN, LOT_MAP_PATH
+
+FLOOR_COUNTS = (2, 5, 10, 20)
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_building(tmp: str, floors: int) -> str:
+    """1F + 지하 floors-1개 층 건물 정의 파일 작성 (지하층은 B1 지도 복제, 주차구역 번호는 층마다 7개씩 증가)"""
+    with open(os.path.join(_BASE_DIR, 'lot_map_b1.json'), encoding='utf-8') as f:
+        b1 = json.load(f)
+    spec = {'name': f'{floors}층 건물', 'default_floor': '1F',
+            'floors': [{'id': '1F', 'level': 0, 'map': LOT_MAP_PATH, 'spots': [1, 11]}], 'ramps': []}
+    for k in range(1, floors):
+        floor = copy.deepcopy(b1)
+        floor['name'] = f'B{k}'
+        offset = 7 * (k - 1)
+        for spot in floor['spots']:
+            spot['id'] += offset
+        for edge in floor['aisles']['edges']:
+            for end in ('from', 'to'):
+                if edge[end].startswith('spot_'):
+                    edge[end] = f"spot_{int(edge[end][5:]) + offset}"
+        path = os.path.join(tmp, f'floor_b{k}.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(floor, f, ensure_ascii=False)
+        spec['floors'].append({'id': f'B{k}', 'level': -k, 'map': path, 'spots': [12 + offset, 18 + offset]})
+        upper = ['1F', 'junction_east'] if k == 1 else [f'B{k - 1}', 'junction_south']
+        spec['ramps'].append({'name': f'B{k} 램프', 'from': upper, 'to': [f'B{k}', 'entrance'], 'length': 1000})
+    path = os.path.join(tmp, f'building_{floors}.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(spec, f, ensure_ascii=False)
+    return path
+
+
+def unload_all(building: Building):
+    for floor_id in list(building.floors):
+        if floor_id != building.default_floor:
+            building.floor(floor_id).release()
+    gc.collect()
+
+
+def measure(fn):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, memory
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  floors 벤치마크 (층 수별 시작 시간 / 메모리 증가량)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, 'cache')
+        for floors in FLOOR_COUNTS:
+            path = make_building(tmp, floors)
+            building = load_building(path, cache_dir)
+            # 디스크 캐시 예열 (지도 컴파일 시간은 제외하고 캐시 로드만 비교)
+            for floor_id in building.floors:
+                building.floor(floor_id).occupancy(DEFAULT_CELL, DEFAULT_MARGIN)
+            unload_all(building)
+
+            def eager():
+                for floor_id in building.floors:
+                    floor = building.floor(floor_id)
+                    floor.network, floor.occupancy(DEFAULT_CELL, DEFAULT_MARGIN)
+                return len(building.loaded_floors())
+
+            loaded, eager_s, eager_mem = measure(eager)
+            unload_all(building)
+
+            deepest = f'B{floors - 1}'
+            last_spot = 18 + 7 * (floors - 2)
+            print(f"\n  [{floors}층] 전체 로드     : {eager_s * 1e3:7.1f}ms  {eager_mem / 1024:8.0f}KB  (층 {loaded}개)")
+            for label, spot in (('1F 안 경로', 5), ('B1까지 경로', 16), (f'{deepest}까지 경로', last_spot)):
+                legs, lazy_s, lazy_mem = measure(lambda: building.route_to_spot('1F', 200, 200, spot))
+                ok = legs is not None and legs[-1].floor == building.spot_floor(spot)
+                print(f"  [{floors}층] {label:13s}: {lazy_s * 1e3:7.1f}ms  {lazy_mem / 1024:8.0f}KB  "
+                      f"(로드된 층 {len(building.loaded_floors()):2d}개, 구간 {len(legs) if legs else 0}개) "
+                      f"{'✅' if ok else '❌'}")
+                unload_all(building)
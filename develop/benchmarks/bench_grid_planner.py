@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+grid_planner 벤치마크 - 기존 UI_testing.astar(튜플 키 딕셔너리, 닫힌 집합 없음, 10,000회 제한)와
+배열 기반 A* / 점프 포인트 탐색(JPS)을 CELL=30, 10, 5 점유 격자에서 비교
+
+입구와 통로 노드(필수 경유지, 11개 주차구역 진입 웨이포인트, 교차점) 사이의 모든 순서쌍을 탐색합니다.
+
+실행:
+    cd develop
+    python benchmarks/bench_grid_planner.py
+"""
+
+import os
+import sys
+import time
+from heapq import heappush, heappop
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lot_layout import LOT_MAP, AISLE_NODES, ENTRANCE_POINT
+from grid_planner import GridPlanner
+
+CELL_SIZES = (30, 10, 5)
+MARGIN = 10
+
+
+def legacy_astar(grid, start, goal, max_iterations=10000):
+    """UI_testing.astar와 같은 알고리즘 (출력만 제거)"""
+    sx, sy = start
+    gx, gy = goal
+    W, H, occ = grid.width, grid.height, grid.cells
+    def idx(cx, cy): return cy * W + cx
+    openh = [(abs(sx - gx) + abs(sy - gy), 0, (sx, sy))]
+    came, g = {}, {(sx, sy): 0}
+    iterations = 0
+    while openh and iterations < max_iterations:
+        iterations += 1
+        _, gc, (x, y) = heappop(openh)
+        if (x, y) == (gx, gy):
+            path = []
+            curr = (x, y)
+            while curr in came:
+                path.append(curr)
+                curr = came[curr]
+            path.append((sx, sy))
+            path.reverse()
+            return path
+        for dx, dy, cst in [(1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1)]:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < W and 0 <= ny < H) or occ[idx(nx, ny)]:
+                continue
+            ng = gc + cst
+            if (nx, ny) not in g or ng < g[(nx, ny)]:
+                g[(nx, ny)] = ng
+                came[(nx, ny)] = (x, y)
+                heappush(openh, (ng + abs(nx - gx) + abs(ny - gy), ng, (nx, ny)))
+    return None
+
+
+def nearest_free(planner, cx, cy, max_radius=200):
+    """정사각형 고리 탐색 (UI_testing.find_nearest_free_cell_from_point와 같은 순서)"""
+    if planner.is_free(cx, cy):
+        return cx, cy
+    for r in range(1, max_radius + 1):
+        for dx in range(-r, r + 1):
+            for dy in (-r, r):
+                if planner.is_free(cx + dx, cy + dy):
+                    return cx + dx, cy + dy
+        for dy in range(-r + 1, r):
+            for dx in (-r, r):
+                if planner.is_free(cx + dx, cy + dy):
+                    return cx + dx, cy + dy
+    return cx, cy
+
+
+def timed(fn, queries):
+    t0 = time.perf_counter()
+    results = [fn(s, t) for s, t in queries]
+    return results, (time.perf_counter() - t0) / len(queries) * 1e3
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  grid_planner 벤치마크 (경로 1회당 평균 시간)")
+    print("=" * 60)
+
+    for cell in CELL_SIZES:
+        grid = LOT_MAP.occupancy(cell, MARGIN)
+        t0 = time.perf_counter()
+        planner = GridPlanner.from_grid(grid)
+        build_ms = (time.perf_counter() - t0) * 1e3
+
+        points = [ENTRANCE_POINT] + [xy for name, xy in AISLE_NODES.items() if name != 'entrance']
+        cells = [nearest_free(planner, int(x // cell), int(y // cell)) for x, y in points]
+        queries = [(a, b) for a in cells for b in cells if a != b]
+
+        legacy, legacy_ms = timed(lambda s, t: legacy_astar(grid, s, t), queries)
+        astar, astar_ms = timed(planner.astar, queries)
+        astar_expanded = 0
+        jps_expanded = 0
+        for s, t in queries:
+            planner.astar(s, t)
+            astar_expanded += planner.expanded
+            planner.jps(s, t)
+            jps_expanded += planner.expanded
+        jps, jps_ms = timed(planner.jps, queries)
+
+        failed = sum(1 for p in legacy if p is None)
+        same = all(a is not None and j is not None and len(a) == len(j) for a, j in zip(astar, jps))
+        legacy_same = all(l is None or len(l) == len(a) for l, a in zip(legacy, astar))
+        n = len(queries)
+
+        print(f"\n  CELL={cell:2d} (격자 {grid.width}x{grid.height}, 탐색 {n}회, JPS 행 테이블 {build_ms:.1f}ms)")
+        print(f"    기존 astar : {legacy_ms:8.3f}ms  실패 {failed}회 (10,000회 반복 제한)")
+        print(f"    배열 A*    : {astar_ms:8.3f}ms  확장 {astar_expanded / n:8.0f}개  ({legacy_ms / astar_ms:5.1f}배)")
+        print(f"    JPS        : {jps_ms:8.3f}ms  확장 {jps_expanded / n:8.0f}개  ({legacy_ms / jps_ms:5.1f}배)")
+        print(f"    경로 길이 일치: A*=JPS {'✅' if same else '❌'}, 기존(성공분)=A* {'✅' if legacy_same else '❌'}")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+navigation_core 벤치마크 - 위치 업데이트 1회당 안내 계산 비용 비교
+
+기존 parking_topview.py의 QPointF 기반 계산(세그먼트 갱신 + 안내 생성 + 진행률 + 속도)과
+navigation_core의 array 기반 계산을 같은 경로/같은 위치열로 실행해서 업데이트당 시간을 비교합니다.
+PyQt5가 없는 환경에서는 QPointF 비교를 건너뛰고 navigation_core 결과만 출력합니다.
+
+실행:
+    cd develop
+    python benchmarks/bench_navigation_core.py
+"""
+
+import os
+import sys
+import time
+from math import sqrt, atan2, degrees
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_core import (
+    RoutePath, update_current_segment, instructions_from_position,
+    calculate_route_progress, PIXELS_PER_METER
+)
+
+try:
+    from PyQt5.QtCore import QPointF
+except ImportError:
+    QPointF = None
+
+
+# ===================================================================
+# 기존 parking_topview.py 방식 (QPointF) - 비교 기준
+# ===================================================================
+class QPointFNavigator:
+    """parking_topview.py에 있던 QPointF 기반 계산을 그대로 옮긴 비교용 구현"""
+
+    def __init__(self, points):
+        self.full_path_points = [QPointF(x, y) for x, y in points]
+        self.current_path_segment_index = 0
+
+    def update(self, car_pos):
+        self._update_current_segment(car_pos)
+        remaining_pts = self.full_path_points[self.current_path_segment_index + 1:]
+        path_for_hud = [car_pos] + remaining_pts
+        if len(path_for_hud) < 2:
+            return None
+        instructions = self.generate_hud_instructions(path_for_hud)
+        progress = self.calculate_route_progress(car_pos)
+        return instructions, progress
+
+    def _update_current_segment(self, car_pos):
+        while self.current_path_segment_index < len(self.full_path_points) - 1:
+            p_curr = self.full_path_points[self.current_path_segment_index]
+            p_next = self.full_path_points[self.current_path_segment_index + 1]
+            dist_to_next = sqrt((car_pos.x() - p_next.x())**2 + (car_pos.y() - p_next.y())**2)
+            v_seg = p_next - p_curr
+            v_car = car_pos - p_curr
+            seg_len_sq = QPointF.dotProduct(v_seg, v_seg)
+            proj_ratio = 1.0
+            if seg_len_sq > 0:
+                proj_ratio = QPointF.dotProduct(v_car, v_seg) / seg_len_sq
+            if dist_to_next < 50 or proj_ratio > 1.0:
+                self.current_path_segment_index += 1
+            else:
+                break
+
+    def generate_hud_instructions(self, pts, is_exit_scenario=False):
+        instructions = []
+        total_dist = 0
+        for i in range(len(pts) - 1):
+            p1, p2 = pts[i], pts[i + 1]
+            total_dist += sqrt((p2.x() - p1.x())**2 + (p2.y() - p1.y())**2) / PIXELS_PER_METER
+            if i < len(pts) - 2:
+                p3 = pts[i + 2]
+                angle = (degrees(atan2(p3.y() - p2.y(), p3.x() - p2.x())) -
+                         degrees(atan2(p2.y() - p1.y(), p2.x() - p1.x())) + 180) % 360 - 180
+                direction = "좌회전" if angle > 45 else ("우회전" if angle < -45 else "")
+                if direction:
+                    straight_to_turn_dist = sqrt((p2.x() - p1.x())**2 + (p2.y() - p1.y())**2)
+                    turn_to_next_dist = sqrt((p3.x() - p2.x())**2 + (p3.y() - p2.y())**2)
+                    if is_exit_scenario and straight_to_turn_dist <= 100:
+                        continue
+                    if turn_to_next_dist <= 100 and (i + 2 == len(pts) - 1):
+                        continue
+                    instructions.append((direction, total_dist))
+                    total_dist = 0
+        instructions.append(("목적지 도착", total_dist))
+        return instructions
+
+    def calculate_route_progress(self, car_pos):
+        pts = self.full_path_points
+        total_len = sum(sqrt((pts[i + 1].x() - p.x())**2 + (pts[i + 1].y() - p.y())**2)
+                        for i, p in enumerate(pts[:-1]))
+        if total_len == 0:
+            return 0
+        min_dist, closest_seg, proj_ratio = float('inf'), 0, 0
+        for i, p1 in enumerate(pts[:-1]):
+            p2 = pts[i + 1]
+            seg_vec = p2 - p1
+            car_vec = car_pos - p1
+            seg_len_sq = QPointF.dotProduct(seg_vec, seg_vec)
+            if seg_len_sq == 0:
+                continue
+            t = max(0, min(1, QPointF.dotProduct(car_vec, seg_vec) / seg_len_sq))
+            proj = p1 + t * seg_vec
+            dist = sqrt((car_pos.x() - proj.x())**2 + (car_pos.y() - proj.y())**2)
+            if dist < min_dist:
+                min_dist, closest_seg, proj_ratio = dist, i, t
+        traveled = sum(sqrt((pts[i + 1].x() - p.x())**2 + (pts[i + 1].y() - p.y())**2)
+                       for i, p in enumerate(pts[:closest_seg]))
+        if closest_seg < len(pts) - 1:
+            p1, p2 = pts[closest_seg], pts[closest_seg + 1]
+            traveled += sqrt((p2.x() - p1.x())**2 + (p2.y() - p1.y())**2) * proj_ratio
+        return min(100, (traveled / total_len) * 100)
+
+
+# ===================================================================
+# navigation_core 방식
+# ===================================================================
+class CoreNavigator:
+    """main_controller/parking_topview가 사용하는 navigation_core 호출 순서와 동일"""
+
+    def __init__(self, points):
+        self.route_path = RoutePath(points)
+        self.current_path_segment_index = 0
+
+    def update(self, x, y):
+        self.current_path_segment_index = update_current_segment(
+            self.route_path, self.current_path_segment_index, x, y)
+        if self.current_path_segment_index + 1 >= len(self.route_path):
+            return None
+        instructions = instructions_from_position(
+            self.route_path, self.current_path_segment_index, x, y)
+        progress = calculate_route_progress(self.route_path, x, y)
+        return instructions, progress
+
+
+# ===================================================================
+# 벤치마크 시나리오
+# ===================================================================
+def zigzag_route(num_waypoints):
+    """입구(200, 200)에서 시작하는 계단형 경로 (회전이 많은 재할당 경로 가정)"""
+    points = [(200.0, 200.0)]
+    x, y = 200.0, 200.0
+    for i in range(num_waypoints - 1):
+        if i % 2 == 0:
+            y += 150.0
+        else:
+            x += 150.0
+        points.append((x, y))
+    return points
+
+
+def sample_positions(points, step=10.0):
+    """경로를 따라 step 픽셀 간격으로 위치 샘플 생성"""
+    positions = []
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        length = sqrt((x2 - x1)**2 + (y2 - y1)**2)
+        n = max(1, int(length / step))
+        for k in range(n):
+            r = k / n
+            positions.append((x1 + (x2 - x1) * r, y1 + (y2 - y1) * r))
+    positions.append(points[-1])
+    return positions
+
+
+def run(num_waypoints):
+    points = zigzag_route(num_waypoints)
+    positions = sample_positions(points)
+
+    core = CoreNavigator(points)
+    t0 = time.perf_counter()
+    for x, y in positions:
+        core.update(x, y)
+    core_us = (time.perf_counter() - t0) / len(positions) * 1e6
+
+    qt_us = None
+    if QPointF is not None:
+        legacy = QPointFNavigator(points)
+        t0 = time.perf_counter()
+        for x, y in positions:
+            legacy.update(QPointF(x, y))
+        qt_us = (time.perf_counter() - t0) / len(positions) * 1e6
+
+    return len(positions), core_us, qt_us
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  navigation_core 벤치마크 (위치 업데이트 1회당 평균 시간)")
+    print("=" * 60)
+    if QPointF is None:
+        print("⚠️ PyQt5가 없어 QPointF 비교를 건너뜁니다.")
+
+    for n in (4, 16, 64, 256):
+        updates, core_us, qt_us = run(n)
+        line = f"  웨이포인트 {n:4d}개 / 업데이트 {updates:5d}회: core {core_us:8.1f}µs"
+        if qt_us is not None:
+            line += f" | QPointF {qt_us:8.1f}µs | {qt_us / core_us:4.1f}배"
+        print(line)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+경로 평활화 벤치마크 - 입구에서 11개 주차구역 진입 웨이포인트까지의 격자 경로를
+방향이 바뀌는 셀만 남긴 경우(기존 simplify_cells)와 시야 기반 문자열 당기기(smooth_cells)로 비교
+
+- 웨이포인트 수, HUD 안내 항목 수(generate_hud_instructions), 경로 길이
+- 경로 갱신 1회 비용: generate_hud_instructions + calculate_route_progress
+
+실행:
+    cd develop
+    python benchmarks/bench_path_smoothing.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lot_layout import LOT_MAP, ENTRANCE_POINT, PARKING_SPOT_WAYPOINTS
+from grid_planner import GridPlanner, corner_points
+from navigation_core import generate_hud_instructions, calculate_route_progress
+
+CELL_SIZES = (30, 10)
+MARGIN = 10
+N_UPDATES = 2000
+
+
+def to_points(cells, cell, start, goal):
+    return [list(start)] + corner_points(cells, cell) + [list(goal)]
+
+
+def length(points):
+    return sum(((bx - ax) ** 2 + (by - ay) ** 2) ** 0.5 for (ax, ay), (bx, by) in zip(points, points[1:]))
+
+
+def update_cost(points):
+    """경로 위 지점마다 안내 생성 + 진행률 계산 (1회 평균 ms)"""
+    probes = [points[i * (len(points) - 1) // 8] for i in range(8)]
+    t0 = time.perf_counter()
+    for k in range(N_UPDATES):
+        x, y = probes[k % len(probes)]
+        generate_hud_instructions(points)
+        calculate_route_progress(points, x, y)
+    return (time.perf_counter() - t0) / N_UPDATES * 1e3
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  경로 평활화 벤치마크 (입구 → 주차구역 11개)")
+    print("=" * 60)
+
+    for cell in CELL_SIZES:
+        grid = LOT_MAP.occupancy(cell, MARGIN)
+        planner = GridPlanner.from_grid(grid)
+        planner.build_nearest_free()
+        sx, sy = planner.nearest_free(int(ENTRANCE_POINT[0] // cell), int(ENTRANCE_POINT[1] // cell))
+        print(f"\n  CELL={cell:2d} (격자 {grid.width}x{grid.height})")
+
+        for search in ('astar', 'jps'):
+            totals = {'corner': [0, 0, 0.0, 0.0], 'smooth': [0, 0, 0.0, 0.0]}  # 웨이포인트, 안내, 길이, 갱신 ms
+            smooth_s = 0.0
+            rows = []
+            for spot, (gx, gy) in PARKING_SPOT_WAYPOINTS.items():
+                goal = planner.nearest_free(int(gx // cell), int(gy // cell))
+                cells = getattr(planner, search)((sx, sy), goal)
+                t0 = time.perf_counter()
+                smoothed = planner.smooth(cells)
+                smooth_s += time.perf_counter() - t0
+
+                row = [spot]
+                for kind, path in (('corner', cells), ('smooth', smoothed)):
+                    points = to_points(path, cell, ENTRANCE_POINT, (gx, gy))
+                    n_inst = len(generate_hud_instructions(points))
+                    stat = totals[kind]
+                    stat[0] += len(points)
+                    stat[1] += n_inst
+                    stat[2] += length(points)
+                    stat[3] += update_cost(points)
+                    row += [len(points), n_inst]
+                rows.append(row)
+
+            n = len(rows)
+            print(f"    [{search}] 구역별 웨이포인트/안내 수 (기존 → 평활화)")
+            for spot, cw, ci, sw, si in rows:
+                print(f"      {spot:>3}: 웨이포인트 {cw:3d} → {sw:3d}   안내 {ci:2d} → {si:2d}")
+            (cw, ci, cl, cu), (sw, si, sl, su) = totals['corner'], totals['smooth']
+            print(f"      합계: 웨이포인트 {cw} → {sw} ({(1 - sw / cw) * 100:.0f}% 감소), 안내 {ci} → {si}")
+            print(f"      경로 길이: {cl / n:7.1f}px → {sl / n:7.1f}px (평균)")
+            print(f"      갱신 1회: {cu / n:.4f}ms → {su / n:.4f}ms,  평활화 {smooth_s / n * 1e3:.3f}ms/경로")
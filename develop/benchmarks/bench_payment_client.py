@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+payment_client 벤치마크 - 요청마다 새 소켓을 여는 기존 방식과 연결 풀(PaymentClient)의 정산 요청 지연 비교
+
+같은 프로세스에 더미 정산 서버(요청마다 SERVICE_TIME 처리 후 응답, 한 연결에서 여러 요청을 동시에 처리하고
+request_id를 돌려줌, PAYMENT_API_SPEC대로 정산 확인에는 응답하지 않음)를 띄우고 다음을 측정합니다.
+- 순차 정산 요청: 요청 1개 지연 평균/p99, 서버가 받은 연결 수
+- 동시 출차: 차량 N대가 동시에 정산 요청 + 정산 확인 (전체 시간, 연결 수, 끝난 뒤 TIME_WAIT 소켓 수 - Linux)
+- request_id를 돌려주지 않는 서버: 정산 확인이 섞여도 연결 안 순서 매칭으로 같은 결과인지
+
+실행:
+    cd develop
+    python benchmarks/bench_payment_client.py
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from payment_client import PaymentClient, split_json_objects
+
+N_SEQUENTIAL = 200
+N_CONCURRENT = (10, 50)
+SERVICE_TIME = 0.002  # 서버 처리 시간 (초)
+
+
+class DummyPaymentServer:
+    """더미 정산 서버 (연결 유지, 요청별 스레드 처리 - 응답 순서는 처리 완료 순)"""
+
+    def __init__(self, echo_id: bool = True):
+        self.echo_id = echo_id
+        self.accepts = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(128)
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.accepts += 1
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # 한 연결에 응답을 이어 보내므로 Nagle 지연 방지
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket):
+        send_lock = threading.Lock()
+        buffer = ''
+        # request_id가 없으면 받은 순서대로 응답해야 하므로 한 스레드에서 처리
+        sequential = not self.echo_id
+        while True:
+            try:
+                chunk = conn.recv(4096)
+            except OSError:
+                break
+            if not chunk:
+                break
+            requests, buffer = split_json_objects(buffer + chunk.decode('utf-8'))
+            for request in requests:
+                if sequential:
+                    self._respond(conn, send_lock, request)
+                else:
+                    threading.Thread(target=self._respond, args=(conn, send_lock, request), daemon=True).start()
+        conn.close()
+
+    def _respond(self, conn: socket.socket, send_lock: threading.Lock, request):
+        time.sleep(SERVICE_TIME)
+        if request.get('type') != 'pay':
+            return  # 정산 확인은 TCP 응답 없음
+        response = {'type': 'payment', 'data': {'amount': 1000 * request['parking_spot'],
+                                                'parking_spot': request['parking_spot']}}
+        if self.echo_id and 'request_id' in request:
+            response['request_id'] = request['request_id']
+        with send_lock:
+            try:
+                conn.sendall(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+            except OSError:
+                pass
+
+    def close(self):
+        self.sock.close()
+
+
+def legacy_request(port: int, payload):
+    """기존 request_payment_from_external_server 방식 (요청마다 새 소켓, 중괄호 수가 맞을 때까지 수신)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(5.0)
+    try:
+        sock.connect(('127.0.0.1', port))
+        sock.sendall(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+        data = b''
+        while True:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+            decoded = data.decode('utf-8')
+            if decoded.count('{') == decoded.count('}'):
+                break
+        return json.loads(data.decode('utf-8'))
+    finally:
+        sock.close()
+
+
+def legacy_send(port: int, payload):
+    """기존 send_payment_confirmation_to_external_server 방식 (새 소켓으로 보내고 서버가 닫을 때까지 응답 대기)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(5.0)
+    try:
+        sock.connect(('127.0.0.1', port))
+        sock.sendall(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+        sock.shutdown(socket.SHUT_WR)
+        sock.recv(4096)
+    finally:
+        sock.close()
+
+
+def time_wait_count(port: int) -> int:
+    """127.0.0.1:port 관련 TIME_WAIT 소켓 수 (/proc/net/tcp, Linux 외에는 -1)"""
+    if not os.path.exists('/proc/net/tcp'):
+        return -1
+    hex_port = f'{port:04X}'
+    count = 0
+    with open('/proc/net/tcp') as f:
+        next(f)
+        for line in f:
+            fields = line.split()
+            if fields[3] == '06' and (fields[1].endswith(':' + hex_port) or fields[2].endswith(':' + hex_port)):
+                count += 1
+    return count
+
+
+def summarize(label: str, latencies, accepts: int):
+    values = sorted(latencies)
+    print(f"  {label:10s}: 평균 {sum(values) / len(values) * 1e3:6.2f}ms  "
+          f"p99 {values[int(len(values) * 0.99) - 1] * 1e3:6.2f}ms  서버 연결 {accepts}개")
+
+
+def sequential(request):
+    latencies = []
+    for i in range(N_SEQUENTIAL):
+        t0 = time.perf_counter()
+        response = request({'type': 'pay', 'parking_spot': i % 11 + 1})
+        latencies.append(time.perf_counter() - t0)
+        assert response['data']['amount'] == 1000 * (i % 11 + 1)
+    return latencies
+
+
+def concurrent_exits(n: int, request, send):
+    """차량 n대 동시 출차 (정산 요청 → 정산 확인), 응답 금액 검증 (응답 없음/시간 초과도 오류)"""
+    errors = []
+
+    def exit_flow(spot):
+        response = request({'type': 'pay', 'parking_spot': spot})
+        if response is None or response['data']['amount'] != 1000 * spot:
+            errors.append(spot)
+        send({'type': 'payment_confirmation', 'confirmed': True, 'amount': 1000 * spot, 'parking_spot': spot})
+
+    threads = [threading.Thread(target=exit_flow, args=(i % 11 + 1,)) for i in range(n)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0, errors
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print(f"⏱️  payment_client 벤치마크 (더미 서버 처리 {SERVICE_TIME * 1e3:.0f}ms)")
+    print("=" * 60)
+
+    print(f"\n[순차 정산 요청 {N_SEQUENTIAL}회]")
+    server = DummyPaymentServer()
+    summarize("기존", sequential(lambda p: legacy_request(server.port, p)), server.accepts)
+    server.close()
+    server = DummyPaymentServer()
+    client = PaymentClient('127.0.0.1', server.port)
+    summarize("연결 풀", sequential(client.request), server.accepts)
+    client.close()
+    server.close()
+
+    for n in N_CONCURRENT:
+        print(f"\n[동시 출차 {n}대 - 정산 요청 + 정산 확인]")
+        server = DummyPaymentServer()
+        before = time_wait_count(server.port)
+        elapsed, errors = concurrent_exits(n, lambda p: legacy_request(server.port, p),
+                                           lambda p: legacy_send(server.port, p))
+        print(f"  기존      : {elapsed * 1e3:7.1f}ms  서버 연결 {server.accepts:3d}개  "
+              f"TIME_WAIT {time_wait_count(server.port) - before:3d}개  금액 오류 {len(errors)}")
+        server.close()
+        server = DummyPaymentServer()
+        client = PaymentClient('127.0.0.1', server.port)
+        before = time_wait_count(server.port)
+        elapsed, errors = concurrent_exits(n, client.request, client.send)
+        print(f"  연결 풀   : {elapsed * 1e3:7.1f}ms  서버 연결 {server.accepts:3d}개  "
+              f"TIME_WAIT {time_wait_count(server.port) - before:3d}개  금액 오류 {len(errors)}")
+        client.close()
+        server.close()
+
+    print("\n[request_id를 돌려주지 않는 서버 - 연결 안 순서 매칭]")
+    server = DummyPaymentServer(echo_id=False)
+    client = PaymentClient('127.0.0.1', server.port)
+    elapsed, errors = concurrent_exits(20, client.request, client.send)
+    print(f"  동시 출차 20대: {elapsed * 1e3:.1f}ms, 서버 연결 {server.accepts}개, 금액 오류 {len(errors)}")
+    client.close()
+    server.close()
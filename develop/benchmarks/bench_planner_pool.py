@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+planner_pool 벤치마크 - 격자 경로 탐색을 수신 스레드에서 직접 실행할 때와 프로세스 풀에 넘길 때의 위치 처리 지연 비교
+
+수신 스레드 2개(안내 차량 연결 + 다른 차량 연결)가 위치 메시지를 20Hz로 처리하고, 안내 차량 연결에서는
+메시지 N_PLAN_EVERY개마다 경로 탐색 요청(입구 → 임의 주차구역, 촘촘한 격자)이 섞여 들어옵니다.
+- 직접 실행: 수신 스레드에서 A* + 평활화 (GIL 때문에 다른 연결도 함께 밀림)
+- 프로세스 풀: PlannerPool.submit 후 바로 다음 메시지 처리
+메시지 1개 처리 지연(예정 시각 대비)의 평균/p99/최대와, 같은 요청 합치기·기한 초과 취소 통계를 출력합니다.
+
+실행:
+    cd develop
+    python benchmarks/bench_planner_pool.py
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from grid_planner import GridPlanner, corner_points, smooth_cells
+from lot_layout import ENTRANCE_POINT, PARKING_SPOT_WAYPOINTS
+from lot_map import DEFAULT_MARGIN, load_lot_map
+from planner_pool import PlannerPool
+
+CELL = 5                # 촘촘한 격자 (400x400)
+ALGORITHM = 'astar'
+N_MESSAGES = 200        # 연결별 위치 메시지 수
+MESSAGE_PERIOD = 0.05   # 20Hz
+N_PLAN_EVERY = 10       # 안내 차량 연결에서 메시지 10개마다 탐색 요청
+GOALS = [PARKING_SPOT_WAYPOINTS[spot] for spot in sorted(PARKING_SPOT_WAYPOINTS)]
+
+
+def inline_plan(planner: GridPlanner, start, goal):
+    """수신 스레드에서 직접 탐색 (planner_pool._plan과 같은 처리)"""
+    s = planner.nearest_free(int(start[0] // CELL), int(start[1] // CELL))
+    g = planner.nearest_free(int(goal[0] // CELL), int(goal[1] // CELL))
+    path = planner.astar(s, g)
+    return [list(start)] + corner_points(smooth_cells(planner.width, planner.cells, path), CELL) + [list(goal)]
+
+
+def handle_position(x: float, y: float) -> float:
+    """위치 메시지 1개 처리 비용 흉내 (JSON 파싱/필터/지오펜스 수준의 순수 파이썬 연산)"""
+    acc = 0.0
+    for i in range(300):
+        acc += (x * i + y) % 7.0
+    return acc
+
+
+def run_connection(latencies, plan=None):
+    """예정 시각에 맞춰 위치 메시지를 처리하고 예정 대비 처리 완료 지연을 기록"""
+    rng = random.Random(len(latencies))
+    start = time.perf_counter()
+    for i in range(N_MESSAGES):
+        due = start + i * MESSAGE_PERIOD
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        if plan is not None and i % N_PLAN_EVERY == 0:
+            plan(rng.choice(GOALS))
+        handle_position(rng.random() * 2000, rng.random() * 2000)
+        latencies.append(time.perf_counter() - due)
+
+
+def summarize(label: str, latencies):
+    values = sorted(latencies)
+    p99 = values[int(len(values) * 0.99) - 1]
+    print(f"  {label:24s}: 평균 {sum(values) / len(values) * 1e3:6.2f}ms  p99 {p99 * 1e3:6.2f}ms  "
+          f"최대 {values[-1] * 1e3:6.2f}ms")
+
+
+def run(plan):
+    guided, other = [], []
+    threads = [threading.Thread(target=run_connection, args=(guided, plan)),
+               threading.Thread(target=run_connection, args=(other,))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return guided, other
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print(f"⏱️  planner_pool 벤치마크 (격자 {CELL}px, 위치 메시지 {N_MESSAGES}개 x 연결 2개, "
+          f"{N_PLAN_EVERY}개마다 탐색)")
+    print("=" * 60)
+
+    planner = GridPlanner.from_grid(load_lot_map().occupancy(CELL, DEFAULT_MARGIN))
+    planner.build_nearest_free()
+    t0 = time.perf_counter()
+    for goal in GOALS:
+        inline_plan(planner, ENTRANCE_POINT, goal)
+    print(f"\n  탐색 1회 (직접, 평균)     : {(time.perf_counter() - t0) / len(GOALS) * 1e3:6.2f}ms")
+
+    print("\n[직접 실행 - 수신 스레드에서 A*]")
+    guided, other = run(lambda goal: inline_plan(planner, ENTRANCE_POINT, goal))
+    summarize("안내 차량 연결", guided)
+    summarize("다른 차량 연결", other)
+
+    pool = PlannerPool(cell=CELL)
+    t0 = time.perf_counter()
+    workers = pool.start()
+    print(f"\n  프로세스 {len(workers)}개 예열     : {(time.perf_counter() - t0) * 1e3:6.1f}ms")
+    results = []
+
+    def pooled(goal):
+        pool.submit(ENTRANCE_POINT, goal, algorithm=ALGORITHM).add_done_callback(
+            lambda f: results.append(None if f.cancelled() else f.result()))
+
+    print("\n[프로세스 풀 - submit 후 즉시 복귀]")
+    guided, other = run(pooled)
+    time.sleep(0.5)
+    summarize("안내 차량 연결", guided)
+    summarize("다른 차량 연결", other)
+    done = [r for r in results if r]
+    if done:
+        print(f"  탐색 결과 {len(done)}/{len(results)}개, 작업 프로세스 탐색 평균 "
+              f"{sum(r['elapsed_ms'] for r in done) / len(done):.2f}ms")
+
+    print("\n[같은 요청 합치기 - 같은 출발/도착 20회 동시 요청]")
+    before = dict(pool.stats)
+    futures = [pool.submit(ENTRANCE_POINT, GOALS[5], algorithm=ALGORITHM) for _ in range(20)]
+    same = len({id(f) for f in futures})
+    futures[0].result()
+    print(f"  작업 프로세스로 보낸 요청 {pool.stats['submitted'] - before['submitted']}개, "
+          f"합친 요청 {pool.stats['deduplicated'] - before['deduplicated']}개 (Future {same}개)")
+
+    print("\n[기한 초과 취소 - 서로 다른 요청 40개, 기한 50ms]")
+    before = dict(pool.stats)
+    rng = random.Random(7)
+    futures = [pool.submit((rng.uniform(1500, 1900), rng.uniform(1400, 1550)), rng.choice(GOALS),
+                           algorithm=ALGORITHM, deadline=0.05)
+               for _ in range(40)]
+    time.sleep(1.0)
+    cancelled = sum(f.cancelled() for f in futures)
+    print(f"  취소 {cancelled}개, 기한 안 완료 {len(futures) - cancelled}개 "
+          f"(기한 초과 집계 {pool.stats['expired'] - before['expired']}개)")
+    pool.shutdown(wait=True)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+reroute 벤치마크 - 경로 이탈 시 로컬 재탐색 1회 비용 (통로 네트워크 최단 경로)
+
+주차장 안 임의 위치에서 11개 주차구역 진입 웨이포인트 중 하나로 재탐색하는 시간을 측정합니다.
+(기존 방식은 재할당 서버 TCP 왕복 + ZeroMQ 재수신으로 수 초, 서버가 꺼져 있으면 실패)
+
+실행:
+    cd develop
+    python benchmarks/bench_reroute.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lot_layout import AISLE_NODES, AISLE_EDGES, PARKING_SPOT_WAYPOINTS
+from map_matching import AisleNetwork
+from reroute import LocalRerouter
+
+QUERIES = 20000
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  reroute 벤치마크 (재탐색 1회당 평균 시간)")
+    print("=" * 60)
+
+    t0 = time.perf_counter()
+    network = AisleNetwork(AISLE_NODES, AISLE_EDGES)
+    build_ms = (time.perf_counter() - t0) * 1e3
+
+    rerouter = LocalRerouter(network)
+    rng = random.Random(0)
+    targets = list(PARKING_SPOT_WAYPOINTS.values())
+    queries = [(rng.uniform(0, 2000), rng.uniform(0, 2000), *rng.choice(targets)) for _ in range(QUERIES)]
+
+    t0 = time.perf_counter()
+    lengths = [len(rerouter.reroute(*q) or []) for q in queries]
+    reroute_us = (time.perf_counter() - t0) / QUERIES * 1e6
+
+    print(f"  통로 네트워크 생성 (노드 {len(AISLE_NODES)}개, 최단 거리표 포함): {build_ms:6.2f}ms (시작 시 1회)")
+    print(f"  재탐색 {QUERIES}회: 평균 {reroute_us:5.1f}µs, 평균 웨이포인트 {sum(lengths) / QUERIES:.1f}개")
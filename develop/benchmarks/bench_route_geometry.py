@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+route_geometry 벤치마크 - 위치 업데이트 1회당 진행률 계산 비용 비교
+
+navigation_core.calculate_route_progress (매번 전체 길이 재계산 + 전체 세그먼트 탐색)와
+RouteGeometry (경로 수신 시 1회 캐시 + 현재 세그먼트 주변 제한 탐색)를
+웨이포인트 수를 늘려가며 같은 위치열로 비교합니다.
+
+실행:
+    cd develop
+    python benchmarks/bench_route_geometry.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_core import RoutePath, update_current_segment, calculate_route_progress
+from route_geometry import RouteGeometry
+from bench_navigation_core import zigzag_route, sample_positions
+
+
+def run(num_waypoints):
+    points = zigzag_route(num_waypoints)
+    positions = sample_positions(points)
+    path = RoutePath(points)
+
+    # 기존 방식: 매 업데이트마다 전체 경로 재계산
+    seg_idx = 0
+    t0 = time.perf_counter()
+    for x, y in positions:
+        seg_idx = update_current_segment(path, seg_idx, x, y)
+        calculate_route_progress(path, x, y)
+    full_us = (time.perf_counter() - t0) / len(positions) * 1e6
+
+    # 캐시 방식: 경로 기하 생성 비용 포함
+    t0 = time.perf_counter()
+    geometry = RouteGeometry(path)
+    build_us = (time.perf_counter() - t0) * 1e6
+    seg_idx = 0
+    t0 = time.perf_counter()
+    for x, y in positions:
+        seg_idx = geometry.advance_segment(seg_idx, x, y)
+        _, _, _, traveled = geometry.locate(x, y, seg_idx)
+        geometry.progress_at(traveled)
+        geometry.remaining_at(traveled)
+    cached_us = (time.perf_counter() - t0) / len(positions) * 1e6
+
+    return len(positions), full_us, cached_us, build_us
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  route_geometry 벤치마크 (위치 업데이트 1회당 평균 시간)")
+    print("=" * 60)
+
+    for n in (4, 16, 64, 256, 1024):
+        updates, full_us, cached_us, build_us = run(n)
+        print(f"  웨이포인트 {n:5d}개 / 업데이트 {updates:6d}회: "
+              f"전체 재계산 {full_us:8.1f}µs | 캐시 {cached_us:6.1f}µs "
+              f"({full_us / cached_us:6.1f}배, 캐시 생성 {build_us:7.1f}µs)")
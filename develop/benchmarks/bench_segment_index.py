@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+segment_index 벤치마크 - 경로까지 거리 / 가장 가까운 세그먼트 질의 비용 비교
+
+전체 탐색: navigation_core.distance_to_path (모든 세그먼트 투영)
+격자 인덱스: RouteGeometry.distance_to_route (세그먼트 32개 이상이면 SegmentIndex 주변 셀만 확인)
+인덱스 재구성 비용(waypoint_reassignment 시)도 함께 출력합니다.
+
+실행:
+    cd develop
+    python benchmarks/bench_segment_index.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_core import RoutePath, distance_to_path
+from route_geometry import RouteGeometry
+
+QUERIES = 2000
+
+
+def lot_route(num_waypoints, rng):
+    """2000x2000 주차장 안을 오가는 축 정렬 경로 (재할당이 반복된 긴 경로 가정)"""
+    points = [(200.0, 200.0)]
+    for i in range(num_waypoints - 1):
+        x, y = points[-1]
+        if i % 2 == 0:
+            points.append((x, min(1900.0, max(100.0, y + rng.uniform(-400, 400)))))
+        else:
+            points.append((min(1900.0, max(100.0, x + rng.uniform(-400, 400))), y))
+    return points
+
+
+def run(num_waypoints, rng):
+    points = lot_route(num_waypoints, rng)
+    path = RoutePath(points)
+    geometry = RouteGeometry(path)
+    queries = [(rng.uniform(0, 2000), rng.uniform(0, 2000)) for _ in range(QUERIES)]
+
+    t0 = time.perf_counter()
+    for x, y in queries:
+        distance_to_path(path, x, y)
+    scan_us = (time.perf_counter() - t0) / QUERIES * 1e6
+
+    t0 = time.perf_counter()
+    geometry.segment_index  # 첫 접근 시 인덱스 생성
+    build_us = (time.perf_counter() - t0) * 1e6
+
+    t0 = time.perf_counter()
+    for x, y in queries:
+        geometry.distance_to_route(x, y)
+    index_us = (time.perf_counter() - t0) / QUERIES * 1e6
+
+    return scan_us, index_us, build_us
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  segment_index 벤치마크 (질의 1회당 평균 시간)")
+    print("=" * 60)
+
+    rng = random.Random(0)
+    for n in (16, 64, 256, 1024):
+        scan_us, index_us, build_us = run(n, rng)
+        print(f"  웨이포인트 {n:5d}개: 전체 탐색 {scan_us:8.1f}µs | 격자 인덱스 {index_us:6.1f}µs "
+              f"({scan_us / index_us:5.1f}배, 인덱스 재구성 {build_us:8.1f}µs)")
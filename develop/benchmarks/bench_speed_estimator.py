@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SpeedEstimator 수렴 확인 - 시뮬레이션 주행 기록에서 실측 속도/도착 예상 시간이 참값으로 수렴하는지 출력
+
+시나리오마다 불규칙한 수신 간격(5~50Hz)과 위치 잡음(칼만 필터 이후 수준, 표준편차 5픽셀)을 넣고,
+마지막 속도 변화 후 속도가 참값의 ±10% 안에 처음 들어오기까지 걸린 시간(수렴 시간)과
+그 이후의 평균 속도 오차, ETA 오차를 출력합니다.
+
+실행:
+    cd develop
+    python benchmarks/bench_speed_estimator.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_core import SpeedEstimator, PIXELS_PER_METER
+
+ROUTE_METERS = 60.0
+NOISE_PIXELS = 5.0
+TOLERANCE = 0.1
+
+# (이름, [(시작 시각, 속도 m/s), ...])
+SCENARIOS = [
+    ("서행 1m/s", [(0.0, 1.0)]),
+    ("주행 3m/s", [(0.0, 3.0)]),
+    ("가속 1→4m/s", [(0.0, 1.0), (8.0, 4.0)]),
+    ("감속 4→1.5m/s", [(0.0, 4.0), (6.0, 1.5)]),
+]
+
+
+def speed_at(profile, t):
+    speed = profile[0][1]
+    for start, v in profile:
+        if t >= start:
+            speed = v
+    return speed
+
+
+def simulate(profile, rng):
+    """(시각, x, y, 참 속도, 참 남은 거리) - 직선 통로를 따라 주행"""
+    t, s = 0.0, 0.0
+    samples = []
+    while s < ROUTE_METERS:
+        v = speed_at(profile, t)
+        samples.append((t, 200.0 + s * PIXELS_PER_METER + rng.gauss(0, NOISE_PIXELS),
+                        925.0 + rng.gauss(0, NOISE_PIXELS), v, ROUTE_METERS - s))
+        dt = rng.uniform(0.02, 0.2)
+        t += dt
+        s += v * dt
+    return samples
+
+
+def run(profile, rng):
+    samples = simulate(profile, rng)
+    estimator = SpeedEstimator()
+    last_change = profile[-1][0]
+    converged_at = None
+    speed_errors, eta_errors = [], []
+    elapsed = 0.0
+    for t, x, y, v, remaining in samples:
+        t0 = time.perf_counter()
+        speed = estimator.update(x, y, t)
+        eta = estimator.eta_seconds(remaining)
+        elapsed += time.perf_counter() - t0
+
+        if t < last_change:
+            continue
+        if converged_at is None and abs(speed - v) <= TOLERANCE * v:
+            converged_at = t
+        if converged_at is not None:
+            speed_errors.append(abs(speed - v) / v)
+            if eta is not None:
+                eta_errors.append(abs(eta - remaining / v) / (remaining / v))
+
+    def mean_percent(values):
+        return sum(values) / len(values) * 100 if values else float('nan')
+
+    settle = converged_at - last_change if converged_at is not None else float('nan')
+    return settle, mean_percent(speed_errors), mean_percent(eta_errors), elapsed / len(samples) * 1e6
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  SpeedEstimator 수렴 확인 (마지막 속도 변화 후 ±10% 도달 시간, 이후 평균 오차)")
+    print("=" * 60)
+
+    rng = random.Random(0)
+    for name, profile in SCENARIOS:
+        settle, speed_error, eta_error, us = run(profile, rng)
+        print(f"  {name:14s}: 수렴 {settle:4.1f}초 | 속도 오차 {speed_error:4.1f}% | "
+              f"ETA 오차 {eta_error:4.1f}% | {us:4.2f}µs/위치")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+spot_assignment 벤치마크 - 입구 대기 차량 배치를 최소 비용 일괄 배정과 기존 방식(도착 순서대로 1대씩
+가장 가까운 빈 구역 배정)으로 비교하고, 주차구역이 많은 주차장을 가정한 임의 비용 행렬로 배정 시간을 측정
+
+실행:
+    cd develop
+    python benchmarks/bench_spot_assignment.py
+"""
+
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spot_assignment import SpotAssigner, INFEASIBLE, DESTINATION_NAMES, min_cost_assignment, request_class
+
+BATCH_SIZES = (10, 100, 500)
+MATRIX_SIZES = ((100, 100), (500, 300), (300, 300))
+REPEAT = 20
+
+
+def random_requests(rng, n):
+    requests = []
+    for i in range(n):
+        elec = rng.random() < 0.3
+        disabled = rng.random() < 0.1
+        preferred = 'disabled' if disabled and rng.random() < 0.7 else ('elec' if elec and rng.random() < 0.7 else 'normal')
+        requests.append({'vehicle_id': f'car_{i}', 'elec': 'true' if elec else 'false',
+                         'disabled': 'true' if disabled else 'false', 'preferred': preferred,
+                         'destination': rng.randrange(len(DESTINATION_NAMES))})
+    return requests
+
+
+def greedy(assigner, requests):
+    """도착 순서대로 1대씩 비용이 가장 작은 빈 구역 (기존 1대씩 배정)"""
+    free = ~assigner.occupied.copy()
+    total, count = 0.0, 0
+    for data in requests:
+        cost = np.where(free, assigner.class_cost(request_class(data)), INFEASIBLE)
+        s = int(np.argmin(cost))
+        if cost[s] >= INFEASIBLE:
+            continue
+        free[s] = False
+        total += cost[s]
+        count += 1
+    return count, total
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  spot_assignment 벤치마크")
+    print("=" * 60)
+
+    rng = random.Random(11)
+    assigner = SpotAssigner()
+    print(f"\n  주차구역 {len(assigner.spots)}개, 빈 구역 전체 / 절반")
+    for occupied in (0, len(assigner.spots) // 2):
+        for n in BATCH_SIZES:
+            batches = [random_requests(rng, n) for _ in range(REPEAT)]
+            elapsed = 0.0
+            batch_total = greedy_total = 0.0
+            batch_count = greedy_count = 0
+            for requests in batches:
+                assigner.occupied[:] = False
+                assigner.occupied[rng.sample(range(len(assigner.spots)), occupied)] = True
+                g_count, g_total = greedy(assigner, requests)
+                t0 = time.perf_counter()
+                result = assigner.assign_batch(requests, commit=False)
+                elapsed += time.perf_counter() - t0
+                batch_count += len(result['assignments'])
+                batch_total += result['total_cost']
+                greedy_count += g_count
+                greedy_total += g_total
+            print(f"    점유 {occupied:2d}, 차량 {n:3d}대: 배정 {elapsed / REPEAT * 1e3:6.2f}ms  "
+                  f"배정 수 {batch_count / REPEAT:4.1f} (1대씩 {greedy_count / REPEAT:4.1f})  "
+                  f"구역당 비용 {batch_total / max(1, batch_count):5.1f}m (1대씩 {greedy_total / max(1, greedy_count):5.1f}m)")
+
+    print("\n  임의 비용 행렬 (주차구역이 많은 주차장 가정)")
+    nrng = np.random.default_rng(5)
+    for n, m in MATRIX_SIZES:
+        cost = nrng.uniform(0, 100, (n, m))
+        t0 = time.perf_counter()
+        rows, cols = min_cost_assignment(cost)
+        elapsed = time.perf_counter() - t0
+        print(f"    차량 {n:3d} x 구역 {m:3d}: {elapsed * 1e3:8.2f}ms  (배정 {len(rows)}건, 합계 {cost[rows, cols].sum():.1f})")
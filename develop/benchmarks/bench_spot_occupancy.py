@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+spot_occupancy 벤치마크 - "기준 지점에서 가까운 종류 X 빈 구역" 질의를 비트셋(종류별 마스크 + 가까운 순 목록)과
+점유 집합을 매번 걸러 거리순 정렬하는 방식으로 비교하고, 변경 메시지와 전체 상태 메시지의 크기를 비교
+
+실행:
+    cd develop
+    python benchmarks/bench_spot_occupancy.py
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lot_layout import PARKING_SPOT_TYPES
+from lot_map import SPOT_TYPES
+from spot_occupancy import SpotOccupancy, spot_distances
+
+N_QUERIES = 100000
+N_EVENTS = 2000
+
+
+def naive_nearest(occupied, distances, spot_type, reference, count):
+    """점유 집합 + 구역 종류 사전으로 매번 거르고 정렬"""
+    dist = distances[reference]
+    spots = sorted(PARKING_SPOT_TYPES)
+    free = [(dist[i], s) for i, s in enumerate(spots)
+            if s not in occupied and (spot_type is None or PARKING_SPOT_TYPES[s] == spot_type)]
+    free.sort()
+    return [s for d, s in free[:count] if d != float('inf')]
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  spot_occupancy 벤치마크")
+    print("=" * 60)
+
+    rng = random.Random(4)
+    occupancy = SpotOccupancy(occupied=())
+    distances = spot_distances(occupancy.spots)
+    references = list(distances)
+    types = (None,) + SPOT_TYPES
+
+    # 주차/출차 이벤트 → 변경 메시지와 전체 상태(구역별 점유 여부 목록) 크기
+    diff_bytes = full_bytes = events = 0
+    for i in range(N_EVENTS):
+        spot = rng.choice(occupancy.spots)
+        vid = f'car_{spot}'
+        diff = occupancy.leave(spot, vid) if occupancy.is_occupied(spot) else occupancy.park(spot, vid)
+        if diff:
+            events += 1
+            diff_bytes += len(json.dumps(diff))
+            full = {'version': diff['version'],
+                    'spots': [{'spot': s, 'occupied': occupancy.is_occupied(s)} for s in occupancy.spots]}
+            full_bytes += len(json.dumps(full))
+    print(f"\n  주차/출차 {events}회: 변경 메시지 평균 {diff_bytes / events:5.1f}B, 구역별 전체 상태 {full_bytes / events:5.1f}B")
+
+    queries = [(rng.choice(types), rng.choice(references), rng.randint(1, 3)) for _ in range(N_QUERIES)]
+    states = [rng.getrandbits(len(occupancy.spots)) for _ in range(64)]
+    mismatched = 0
+    bitset_s = naive_s = 0.0
+    for k in range(0, N_QUERIES, 1000):
+        occupancy.mask = states[(k // 1000) % len(states)]
+        occupied = set(occupancy.occupied_spots())
+        batch = queries[k:k + 1000]
+        t0 = time.perf_counter()
+        fast = [occupancy.nearest_free(t, r, c) for t, r, c in batch]
+        bitset_s += time.perf_counter() - t0
+        t0 = time.perf_counter()
+        slow = [naive_nearest(occupied, distances, t, r, c) for t, r, c in batch]
+        naive_s += time.perf_counter() - t0
+        mismatched += sum(a != b for a, b in zip(fast, slow))
+
+    print(f"  가까운 빈 구역 질의 {N_QUERIES}회 (주차구역 {len(occupancy.spots)}개)")
+    print(f"    집합 필터 + 정렬: {naive_s / N_QUERIES * 1e6:6.2f}us")
+    print(f"    비트셋          : {bitset_s / N_QUERIES * 1e6:6.2f}us  ({naive_s / bitset_s:4.1f}배)")
+    print(f"    결과 일치: {'✅' if mismatched == 0 else f'❌ {mismatched}건 불일치'}")
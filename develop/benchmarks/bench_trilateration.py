@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+trilateration 벤치마크 - 한 틱에 들어온 태그 N개의 앵커 거리로 위치를 구하는 시간과 오차 비교
+
+- 태그별 반복: 태그마다 np.linalg.lstsq 선형해 + Gauss-Newton (배열 연산은 쓰지만 태그 수만큼 Python 루프)
+- 배치: Trilaterator.solve 1회 (거리 배열 묶기 포함)
+거리는 지도 앵커(lot_map.json anchors)에서 통로 위 임의 위치까지의 3차원 거리에 측정 잡음(σ=0.1m)을 더하고,
+NLOS 조건에서는 태그마다 앵커 1개에 +0.5~1.5m 지연을 더합니다.
+
+실행:
+    cd develop
+    python benchmarks/bench_trilateration.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trilateration import GN_ITERATIONS, Trilaterator
+
+TAG_COUNTS = (10, 100, 200, 500, 1000)
+N_ROUNDS = 20
+NOISE_SIGMA = 0.1   # 미터
+
+
+def make_tick(trilaterator: Trilaterator, n: int, rng: np.random.Generator, nlos: bool = False):
+    """태그 n개의 실제 위치와 (앵커 id 목록, 거리(m) 목록) 측정"""
+    truth = np.column_stack((rng.uniform(100, 1900, n), rng.uniform(500, 1900, n)))
+    d = truth[:, None, :] - trilaterator.anchor_xy[None, :, :]
+    dist = np.sqrt((d * d).sum(axis=2) + trilaterator.height_sq) / trilaterator.pixels_per_meter
+    dist += rng.normal(0, NOISE_SIGMA, dist.shape)
+    if nlos:
+        dist[np.arange(n), rng.integers(0, dist.shape[1], n)] += rng.uniform(0.5, 1.5, n)
+    return truth, [(trilaterator.ids, row.tolist()) for row in dist]
+
+
+def per_tag(trilaterator: Trilaterator, tags):
+    """태그별 반복 (기존 방식의 단일 태그 풀이를 태그 수만큼 호출)"""
+    result = []
+    for ids, distances in tags:
+        idx = [trilaterator.index[aid] for aid in ids]
+        a = trilaterator.anchor_xy[idx]
+        r = np.sqrt(np.maximum((np.asarray(distances) * trilaterator.pixels_per_meter) ** 2
+                               - trilaterator.height_sq[idx], 0.0))
+        A = 2.0 * (a[1:] - a[0])
+        b = r[0] ** 2 - r[1:] ** 2 + (a[1:] ** 2).sum(axis=1) - (a[0] ** 2).sum()
+        p = np.linalg.lstsq(A, b, rcond=None)[0]
+        for _ in range(GN_ITERATIONS):
+            d = p - a
+            dist = np.sqrt((d * d).sum(axis=1))
+            J = d / dist[:, None]
+            p = p - np.linalg.solve(J.T @ J, J.T @ (dist - r))
+        result.append(p)
+    return np.array(result)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    for _ in range(N_ROUNDS):
+        result = fn(*args)
+    return result, (time.perf_counter() - t0) / N_ROUNDS
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print(f"⏱️  trilateration 벤치마크 (앵커 표 로드 후, {N_ROUNDS}회 평균)")
+    print("=" * 60)
+
+    trilaterator = Trilaterator()
+    rng = np.random.default_rng(0)
+    print(f"\n  앵커 {len(trilaterator.ids)}개, 잡음 σ={NOISE_SIGMA}m, Gauss-Newton {GN_ITERATIONS}회")
+
+    print("\n[틱당 처리 시간]")
+    for n in TAG_COUNTS:
+        truth, tags = make_tick(trilaterator, n, rng)
+        loop_pos, loop_s = timed(per_tag, trilaterator, tags)
+        batch, batch_s = timed(trilaterator.solve, tags)
+        diff = np.abs(loop_pos - np.column_stack((batch.x, batch.y))).max()
+        print(f"  태그 {n:5d}개: 태그별 {loop_s * 1e3:8.2f}ms  배치 {batch_s * 1e3:7.2f}ms  "
+              f"({loop_s / batch_s:5.1f}배, 태그당 {batch_s / n * 1e6:5.1f}µs, 두 방식 차이 {diff:.1e}px)")
+
+    print("\n[위치 오차 - 태그 1000개]")
+    for label, nlos in (('잡음만', False), ('NLOS 앵커 1개', True)):
+        truth, tags = make_tick(trilaterator, 1000, rng, nlos)
+        result = trilaterator.solve(tags)
+        err = np.hypot(result.x - truth[:, 0], result.y - truth[:, 1]) / trilaterator.pixels_per_meter
+        print(f"  {label:14s}: 평균 {err.mean() * 100:5.1f}cm  p95 {np.percentile(err, 95) * 100:5.1f}cm  "
+              f"잔차 평균 {result.residual.mean():5.1f}px  해 {int(result.ok.sum())}/1000")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거리장(distance field) - 주차구역 11개, 입출차 지점, 목적지 입구마다 점유 격자 전체의 최단 거리와 다음 칸 방향표
+
+이 주차장의 경로 질의는 항상 주차구역, 입구, 출구 중 하나에서 끝나므로 목표마다 한 번 BFS(균일 비용 4방향
+Dijkstra)를 돌려 두면 어느 위치에서든 목표까지의 거리는 배열 조회 1번, 경로는 다음 칸 방향을 따라가는
+경로 길이만큼의 순회로 끝납니다 (탐색 없음).
+lot_map이 (CELL, MARGIN)별로 컴파일하여 지도 캐시에 함께 저장하며, `python lot_map.py --rebuild`로 다시 만듭니다.
+"""
+
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from grid_planner import corner_points, smooth_cells
+
+Cell = Tuple[int, int]
+
+UNREACHABLE = 0xFFFF        # 거리표에서 도달 불가 (셀 단위 uint16)
+NO_HOP = 0xFF               # 방향표에서 목표 셀 또는 도달 불가
+SNAP_RADIUS = 50            # 막힌 위치를 가장 가까운 열린 셀로 옮길 때 최대 탐색 반경 (셀)
+
+# 방향 코드 0: +x, 1: -x, 2: +y, 3: -y
+_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_REVERSE = (1, 0, 3, 2)
+
+
+def snap_to_free(width: int, height: int, cells: Sequence[int], cx: int, cy: int,
+                 max_radius: int = SNAP_RADIUS) -> Optional[Cell]:
+    """(cx, cy)에서 가장 가까운 열린 셀 (격자 밖 좌표는 경계로 당긴 뒤 탐색, 반경 안에 없으면 None)"""
+    cx = min(width - 1, max(0, cx))
+    cy = min(height - 1, max(0, cy))
+    if not cells[cy * width + cx]:
+        return cx, cy
+    seen = {(cx, cy)}
+    queue = deque([(cx, cy, 0)])
+    while queue:
+        x, y, r = queue.popleft()
+        if r >= max_radius:
+            continue
+        for dx, dy in _STEPS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and (nx, ny) not in seen:
+                if not cells[ny * width + nx]:
+                    return nx, ny
+                seen.add((nx, ny))
+                queue.append((nx, ny, r + 1))
+    return None
+
+
+def compile_field(width: int, height: int, cells: Sequence[int], target: int) -> Tuple[bytes, bytes]:
+    """목표 셀 1개의 (거리표 uint16, 방향표 uint8) - 각 셀에서 목표 쪽으로 한 칸 가는 방향 코드"""
+    n = width * height
+    dist = array('H', [UNREACHABLE]) * n
+    hop = bytearray([NO_HOP]) * n
+    dist[target] = 0
+    queue = deque([target])
+    while queue:
+        c = queue.popleft()
+        nd = dist[c] + 1
+        x, y = c % width, c // width
+        for code, (dx, dy) in enumerate(_STEPS):
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            m = ny * width + nx
+            if cells[m] or dist[m] != UNREACHABLE:
+                continue
+            dist[m] = nd
+            hop[m] = _REVERSE[code]  # m에서 c로 돌아가는 방향
+            queue.append(m)
+    return dist.tobytes(), bytes(hop)
+
+
+def compile_distance_fields(width: int, height: int, cells: Sequence[int], cell_size: int,
+                            targets: Dict[str, Tuple[float, float]]) -> Dict:
+    """목표 이름 → 픽셀 좌표 목록으로 거리장 묶음 생성 (pickle 가능한 기본 타입만 사용)"""
+    compiled = {'cell': cell_size, 'width': width, 'height': height, 'targets': {}, 'dist': {}, 'next': {}}
+    for name, (px, py) in targets.items():
+        snapped = snap_to_free(width, height, cells, int(px // cell_size), int(py // cell_size))
+        if snapped is None:
+            print(f"⚠️ 거리장 목표 {name}: 주변에 열린 셀이 없어 제외합니다")
+            continue
+        target = snapped[1] * width + snapped[0]
+        compiled['targets'][name] = (target, (px, py))
+        compiled['dist'][name], compiled['next'][name] = compile_field(width, height, cells, target)
+    return compiled
+
+
+class DistanceFields:
+    """컴파일된 거리장 조회 (거리는 배열 조회 1번, 경로는 방향표를 따라가는 순회)"""
+
+    def __init__(self, compiled: Dict, cells: Sequence[int]):
+        self.cell = compiled['cell']
+        self.width = compiled['width']
+        self.height = compiled['height']
+        self.cells = cells
+        self.targets: Dict[str, Tuple[int, Tuple[float, float]]] = compiled['targets']
+        self.dist: Dict[str, array] = {}
+        for name, raw in compiled['dist'].items():
+            d = array('H')
+            d.frombytes(raw)
+            self.dist[name] = d
+        self.next: Dict[str, bytes] = compiled['next']
+
+    def names(self) -> List[str]:
+        return list(self.targets)
+
+    def _start_cell(self, x: float, y: float) -> Optional[int]:
+        snapped = snap_to_free(self.width, self.height, self.cells, int(x // self.cell), int(y // self.cell))
+        return None if snapped is None else snapped[1] * self.width + snapped[0]
+
+    def target_at(self, x: float, y: float, tolerance: float) -> Optional[str]:
+        """픽셀 좌표가 어느 목표인지 (허용 오차 안에서 가장 가까운 목표, 없으면 None)"""
+        best, best_d = None, tolerance * tolerance
+        for name, (_, (px, py)) in self.targets.items():
+            d = (px - x) ** 2 + (py - y) ** 2
+            if d <= best_d:
+                best, best_d = name, d
+        return best
+
+    def distance(self, name: str, x: float, y: float) -> Optional[float]:
+        """(x, y)에서 목표까지 격자 최단 거리 (픽셀, 도달 불가면 None)"""
+        c = self._start_cell(x, y)
+        if c is None:
+            return None
+        d = self.dist[name][c]
+        return None if d == UNREACHABLE else d * self.cell
+
+    def cell_path(self, name: str, x: float, y: float) -> Optional[List[Cell]]:
+        """목표까지 연속된 셀 목록 - 최단 경로를 벗어나지 않는 한 직진을 유지하여 계단 모양 경로를 피함"""
+        c = self._start_cell(x, y)
+        if c is None:
+            return None
+        dist, hop, w = self.dist[name], self.next[name], self.width
+        if dist[c] == UNREACHABLE:
+            return None
+        path = [(c % w, c // w)]
+        direction = NO_HOP
+        while dist[c]:
+            if direction != NO_HOP:
+                dx, dy = _STEPS[direction]
+                nx, ny = c % w + dx, c // w + dy
+                if 0 <= nx < w and 0 <= ny < self.height and dist[ny * w + nx] == dist[c] - 1:
+                    c = ny * w + nx
+                    path.append((nx, ny))
+                    continue
+            direction = hop[c]
+            dx, dy = _STEPS[direction]
+            c += dy * w + dx
+            path.append((c % w, c // w))
+        return path
+
+    def waypoints(self, name: str, x: float, y: float) -> Optional[List[List[float]]]:
+        """(x, y) → 목표 웨이포인트 목록 (현재 위치, 시야가 닿는 꺾임 셀 중심들, 목표 좌표)
+
+        목표 좌표가 막힌 칸이면(건물 입구 구역 중심 등) 차량이 갈 수 있는 목표 셀 중심에서 끝냅니다.
+        """
+        cells = self.cell_path(name, x, y)
+        if cells is None:
+            return None
+        size, half = self.cell, self.cell / 2.0
+        points = [[float(x), float(y)]] + corner_points(smooth_cells(self.width, self.cells, cells), size)
+        target, (px, py) = self.targets[name]
+        tx, ty = target % self.width, target // self.width
+        if (int(px // size), int(py // size)) == (tx, ty):
+            points.append([px, py])
+        else:
+            points.append([tx * size + half, ty * size + half])
+        return points
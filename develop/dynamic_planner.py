@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동적 장애물 증분 재탐색 - 통로에 정차한 다른 차량을 점유 격자에 더하고 D* Lite로 안내 경로만 부분 보정
+
+lot_map의 점유 격자는 정적이라 통로에 서 있는 차량을 무시했습니다. 무언가 움직일 때마다 안내 중인 모든 차량의
+경로를 처음부터 다시 탐색하면 차량 수에 비례해 비용이 늘어나므로,
+- DynamicObstacles: 맵 매칭된 위치에서 STOPPED_TIME 이상 정차한 차량의 반경 안 셀을 차량 수로 표시
+  (바뀐 셀 목록만 반환 - 비어 있으면 재탐색 없음)
+- DStarLite: 목표에서 시작 방향으로 탐색한 g/rhs 표를 유지하므로 셀이 바뀌면 그 주변 정점만 다시 일관되게 만들고,
+  차량이 움직이면 시작 셀만 바꿔 이전 탐색 결과를 재사용 (Koenig & Likhachev, 최적화 버전)
+- DynamicReplanner: 안내 중인 경로마다 D* Lite를 두고, 바뀐 셀이 남은 경로를 막을 때(또는 우회 중 길이 열릴 때)만
+  경로를 보정하여 반환
+"""
+
+from array import array
+from heapq import heappush, heappop
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from grid_planner import Cell, GridPlanner, corner_points, smooth_cells
+from lot_layout import LOT_MAP
+
+Waypoint = List[float]
+
+VEHICLE_RADIUS = 75.0   # 정차 차량이 막는 반경 (픽셀, 1.5m)
+STOPPED_SPEED = 15.0    # 이 속도 이하이면 정차로 판단 (픽셀/초, 0.3m/s)
+STOPPED_TIME = 3.0      # 정차가 이 시간 이상 계속되면 장애물로 표시 (초, 신호 대기 등 잠깐 멈춤 제외)
+
+
+class DStarLite:
+    """목표 셀 1개에 대한 4방향 균일 비용 D* Lite (막힌 셀로 들어가는 간선만 비용 무한대)
+
+    static은 정적 점유 격자, dynamic은 셀별 정차 차량 수 (DynamicObstacles.counts를 공유).
+    목표 셀은 막혀 있어도 들어갈 수 있다고 보고, 시작 셀은 막혀 있어도 나갈 수 있습니다.
+    """
+
+    def __init__(self, width: int, height: int, static: Sequence[int], dynamic: Sequence[int],
+                 start: int, goal: int):
+        self.width = width
+        self.height = height
+        self.static = static
+        self.dynamic = dynamic
+        n = width * height
+        self.inf = 4 * n  # 어떤 경로 길이보다 큰 값
+        self.g = array('l', [self.inf]) * n
+        self.rhs = array('l', [self.inf]) * n
+        self.start = self.last_start = start
+        self.goal = goal
+        self.km = 0
+        self.expanded = 0  # 마지막 compute()에서 확장한 정점 수
+
+        self.rhs[goal] = 0
+        self.heap = [(self._h(goal), 0, goal)]
+        self.compute()
+
+    def _h(self, c: int) -> int:
+        w, s = self.width, self.start
+        return abs(c % w - s % w) + abs(c // w - s // w)
+
+    def _neighbors(self, c: int) -> List[int]:
+        w, x, y = self.width, c % self.width, c // self.width
+        result = []
+        if x + 1 < w:
+            result.append(c + 1)
+        if x > 0:
+            result.append(c - 1)
+        if y + 1 < self.height:
+            result.append(c + w)
+        if y > 0:
+            result.append(c - w)
+        return result
+
+    def _update_vertex(self, c: int):
+        """rhs(c) = min(1 + g(이웃)) 다시 계산, 불일치하면 큐에 추가 (이전 항목은 꺼낼 때 무시)"""
+        g, rhs, w, goal = self.g, self.rhs, self.width, self.goal
+        x, y = c % w, c // w
+        if c != goal:
+            static, dynamic = self.static, self.dynamic
+            best = self.inf
+            for n, ok in ((c + 1, x + 1 < w), (c - 1, x > 0), (c + w, y + 1 < self.height), (c - w, y > 0)):
+                if ok and g[n] + 1 < best and (n == goal or not (static[n] or dynamic[n])):
+                    best = g[n] + 1
+            rhs[c] = best
+        gc, rc = g[c], rhs[c]
+        if gc != rc:
+            s = self.start
+            m = gc if gc < rc else rc
+            heappush(self.heap, (m + abs(x - s % w) + abs(y - s // w) + self.km, m, c))
+
+    def compute(self):
+        """시작 셀의 g가 최단 거리가 될 때까지 불일치 정점 확장 (키/이웃 계산은 반복문 안에 풀어 씀)"""
+        g, rhs, heap, inf = self.g, self.rhs, self.heap, self.inf
+        w, h, km, goal = self.width, self.height, self.km, self.goal
+        static, dynamic = self.static, self.dynamic
+        start = self.start
+        sx, sy = start % w, start // w
+        expanded = 0
+        while heap:
+            k1, k2, u = heap[0]
+            gs, rs = g[start], rhs[start]
+            if rs == gs and (k1, k2) >= (gs + km, gs):
+                break
+            heappop(heap)
+            gu, ru = g[u], rhs[u]
+            if gu == ru:
+                continue  # 이미 처리된 중복 항목
+            m = gu if gu < ru else ru
+            x, y = u % w, u // w
+            key = m + abs(x - sx) + abs(y - sy) + km
+            if (k1, k2) < (key, m):
+                heappush(heap, (key, m, u))
+                continue
+            expanded += 1
+            if gu > ru:
+                g[u] = ru
+                if u != goal and (static[u] or dynamic[u]):
+                    continue  # 막힌 셀로 들어가는 간선은 무한대이므로 이웃의 rhs는 그대로
+                cost = ru + 1
+                for p, ok in ((u + 1, x + 1 < w), (u - 1, x > 0), (u + w, y + 1 < h), (u - w, y > 0)):
+                    if ok and p != goal and cost < rhs[p]:
+                        rhs[p] = cost
+                        mp = g[p] if g[p] < cost else cost
+                        heappush(heap, (mp + abs(p % w - sx) + abs(p // w - sy) + km, mp, p))
+            else:
+                # 과소 일관: g를 무한대로 올리고 u와 이웃의 rhs를 다시 계산
+                g[u] = inf
+                for v, vx, vy in ((u, x, y), (u + 1, x + 1, y), (u - 1, x - 1, y), (u + w, x, y + 1), (u - w, x, y - 1)):
+                    if not (0 <= vx < w and 0 <= vy < h):
+                        continue
+                    if v != goal:
+                        best = inf
+                        for n, ok in ((v + 1, vx + 1 < w), (v - 1, vx > 0), (v + w, vy + 1 < h), (v - w, vy > 0)):
+                            if ok and g[n] + 1 < best and (n == goal or not (static[n] or dynamic[n])):
+                                best = g[n] + 1
+                        rhs[v] = best
+                    gv, rv = g[v], rhs[v]
+                    if gv != rv:
+                        mv = gv if gv < rv else rv
+                        heappush(heap, (mv + abs(vx - sx) + abs(vy - sy) + km, mv, v))
+        self.expanded = expanded
+
+    def move_start(self, start: int):
+        """차량이 움직였을 때 시작 셀만 교체 (다음 셀 변경 시 km에 반영)"""
+        self.start = start
+
+    def update_cells(self, changed: Sequence[int]):
+        """막힘 상태가 바뀐 셀로 들어가는 간선의 출발 정점(이웃)만 갱신 - 탐색은 다음 path()에서"""
+        self.km += self._h(self.last_start)
+        self.last_start = self.start
+        update = self._update_vertex
+        for p in {p for c in changed for p in self._neighbors(c)}:
+            update(p)
+
+    def cost(self) -> int:
+        """시작 → 목표 셀 수 (도달 불가면 inf)"""
+        self.compute()
+        return self.g[self.start]
+
+    def path(self) -> Optional[List[Cell]]:
+        """시작 → 목표 연속된 셀 목록 (g가 줄어드는 이웃을 따라가며, 같으면 직진 유지)"""
+        self.compute()
+        g, w, h, c = self.g, self.width, self.height, self.start
+        static, dynamic, goal = self.static, self.dynamic, self.goal
+        if g[c] >= self.inf:
+            return None
+        x, y = c % w, c // w
+        path = [(x, y)]
+        direction = 0
+        for _ in range(len(g)):
+            if c == goal:
+                return path
+            best, best_g = -1, self.inf
+            for n, ok in ((c + 1, x + 1 < w), (c - 1, x > 0), (c + w, y + 1 < h), (c - w, y > 0)):
+                if not ok or (n != goal and (static[n] or dynamic[n])):
+                    continue
+                if g[n] < best_g or (g[n] == best_g and n - c == direction):
+                    best, best_g = n, g[n]
+            if best < 0 or best_g >= g[c]:
+                return None
+            direction, c = best - c, best
+            x, y = c % w, c // w
+            path.append((x, y))
+        return None
+
+
+class DynamicObstacles:
+    """통로에 정차한 차량이 차지하는 셀 (셀별 차량 수, 차량별 셀 목록)"""
+
+    def __init__(self, width: int, height: int, cell: int, static: Sequence[int],
+                 radius: float = VEHICLE_RADIUS, stopped_speed: float = STOPPED_SPEED,
+                 stopped_time: float = STOPPED_TIME):
+        self.width = width
+        self.height = height
+        self.cell = cell
+        self.static = static
+        self.radius = radius
+        self.stopped_speed = stopped_speed
+        self.stopped_time = stopped_time
+        self.counts = bytearray(width * height)
+        self.placed: Dict[str, List[int]] = {}
+        self.stopped_since: Dict[str, float] = {}
+
+    def footprint(self, x: float, y: float) -> List[int]:
+        """(x, y)에서 반경 안에 중심이 있는 열린 셀"""
+        cell, w, r = self.cell, self.width, self.radius
+        half = cell / 2.0
+        cells = []
+        for cy in range(max(0, int((y - r) // cell)), min(self.height, int((y + r) // cell) + 1)):
+            for cx in range(max(0, int((x - r) // cell)), min(w, int((x + r) // cell) + 1)):
+                if (cx * cell + half - x) ** 2 + (cy * cell + half - y) ** 2 <= r * r and not self.static[cy * w + cx]:
+                    cells.append(cy * w + cx)
+        return cells
+
+    def update(self, vehicle_id: str, x: float, y: float, speed: float, now: float) -> List[int]:
+        """통로 위 차량 위치 갱신 - 막힘 상태가 바뀐 셀 목록 (정차 중 위치 잡음으로는 다시 표시하지 않음)"""
+        if speed > self.stopped_speed:
+            return self.remove(vehicle_id)
+        since = self.stopped_since.setdefault(vehicle_id, now)
+        if vehicle_id in self.placed or now - since < self.stopped_time:
+            return []
+        cells = self.placed[vehicle_id] = self.footprint(x, y)
+        changed = []
+        for c in cells:
+            if not self.counts[c]:
+                changed.append(c)
+            self.counts[c] += 1
+        return changed
+
+    def remove(self, vehicle_id: str) -> List[int]:
+        """차량이 출발/주차/출차하면 표시 제거 - 다시 열린 셀 목록"""
+        self.stopped_since.pop(vehicle_id, None)
+        changed = []
+        for c in self.placed.pop(vehicle_id, ()):
+            self.counts[c] -= 1
+            if not self.counts[c]:
+                changed.append(c)
+        return changed
+
+    def blocked(self) -> List[int]:
+        """현재 막힌 셀 번호 (정렬, 경로 탐색 프로세스 풀에 전달용)"""
+        return sorted({c for cells in self.placed.values() for c in cells})
+
+
+class ActiveRoute:
+    """안내 중인 경로 1개 (목표 셀, 경로가 지나는 셀, 차량 위치, D* Lite)"""
+
+    __slots__ = ('goal', 'goal_cell', 'cells', 'position', 'planner', 'detour')
+
+    def __init__(self, goal: Sequence[float], goal_cell: int, cells: List[int]):
+        self.goal = goal
+        self.goal_cell = goal_cell
+        self.cells = cells
+        self.position: Optional[Tuple[float, float]] = None
+        self.planner: Optional[DStarLite] = None
+        self.detour = False  # 정차 차량 때문에 보정된 경로인지 (길이 열리면 다시 짧은 경로로)
+
+
+class DynamicReplanner:
+    """정차 차량을 반영한 안내 경로 증분 보정 (차량 ID별 경로, 컨트롤러 위치 파이프라인에서 호출)"""
+
+    def __init__(self, grid=None):
+        grid = grid or LOT_MAP.occupancy()
+        self.cell = grid.cell
+        self.width = grid.width
+        self.height = grid.height
+        self.static = bytes(grid.cells)
+        self.snapper = GridPlanner.from_grid(grid)
+        self.snapper.build_nearest_free()
+        self.obstacles = DynamicObstacles(self.width, self.height, self.cell, self.static)
+        self.routes: Dict[str, ActiveRoute] = {}
+
+    def snap(self, x: float, y: float) -> Optional[int]:
+        """픽셀 좌표 → 가장 가까운 정적 열린 셀 번호"""
+        free = self.snapper.nearest_free(int(x // self.cell), int(y // self.cell))
+        return None if free is None else free[1] * self.width + free[0]
+
+    def route_cells(self, points: Sequence[Sequence[float]]) -> List[int]:
+        """웨이포인트 경로가 지나는 셀 (반 셀 간격 샘플링, 연속 중복 제거)"""
+        cell, w, h = self.cell, self.width, self.height
+        step = cell / 2.0
+        cells: List[int] = []
+        for (ax, ay), (bx, by) in zip(points, points[1:]):
+            length = ((bx - ax) ** 2 + (by - ay) ** 2) ** 0.5
+            n = max(1, int(length / step))
+            for i in range(n + 1):
+                cx = min(w - 1, max(0, int((ax + (bx - ax) * i / n) // cell)))
+                cy = min(h - 1, max(0, int((ay + (by - ay) * i / n) // cell)))
+                c = cy * w + cx
+                if not cells or cells[-1] != c:
+                    cells.append(c)
+        return cells
+
+    # ---------------------------------------------------------------
+    # 안내 경로
+    # ---------------------------------------------------------------
+    def set_route(self, vehicle_id: str, points: Sequence[Sequence[float]]):
+        """새 안내 경로 - 목표 셀이 같으면 기존 D* Lite 탐색 결과를 계속 사용"""
+        if len(points) < 2:
+            self.routes.pop(vehicle_id, None)
+            return
+        goal = points[-1]
+        goal_cell = self.snap(goal[0], goal[1])
+        if goal_cell is None:
+            self.routes.pop(vehicle_id, None)
+            return
+        previous = self.routes.get(vehicle_id)
+        route = self.routes[vehicle_id] = ActiveRoute(goal, goal_cell, self.route_cells(points))
+        if previous is not None:
+            route.position = previous.position
+            if previous.goal_cell == goal_cell:
+                route.planner = previous.planner
+
+    def clear_route(self, vehicle_id: str):
+        self.routes.pop(vehicle_id, None)
+
+    def move(self, vehicle_id: str, x: float, y: float):
+        """안내 중인 차량 위치 - D* Lite 시작 셀만 교체"""
+        route = self.routes.get(vehicle_id)
+        if route is None:
+            return
+        route.position = (x, y)
+        if route.planner is not None:
+            start = self.snap(x, y)
+            if start is not None:
+                route.planner.move_start(start)
+
+    # ---------------------------------------------------------------
+    # 동적 장애물
+    # ---------------------------------------------------------------
+    def update_vehicle(self, vehicle_id: str, x: float, y: float, speed: float, now: float) -> List[int]:
+        """통로 위 다른 차량 위치 (안내 중인 차량은 장애물로 표시하지 않음) - 바뀐 셀 목록"""
+        if vehicle_id in self.routes:
+            self.move(vehicle_id, x, y)
+            return self.obstacles.remove(vehicle_id)
+        return self.obstacles.update(vehicle_id, x, y, speed, now)
+
+    def remove_vehicle(self, vehicle_id: str) -> List[int]:
+        return self.obstacles.remove(vehicle_id)
+
+    def _cells_ahead(self, route: ActiveRoute) -> List[int]:
+        """경로 셀 중 차량 위치에서 가장 가까운 셀 이후 (지나온 구간의 정차 차량은 무시)"""
+        if route.position is None:
+            return route.cells
+        w = self.width
+        px, py = int(route.position[0] // self.cell), int(route.position[1] // self.cell)
+        nearest = min(range(len(route.cells)),
+                      key=lambda i: max(abs(route.cells[i] % w - px), abs(route.cells[i] // w - py)))
+        return route.cells[nearest:]
+
+    def repair(self, changed: Sequence[int]) -> Dict[str, List[Waypoint]]:
+        """바뀐 셀이 있을 때 영향받는 경로만 보정 - {차량 ID: 새 웨이포인트 목록}
+
+        남은 경로가 정차 차량에 막히면 우회 경로로, 우회 중에 더 짧은 길이 열리면 그 경로로 바꿉니다.
+        막힌 경로에 우회로가 없으면 기존 경로를 유지합니다 (차량이 떠나기를 기다림).
+        """
+        repaired: Dict[str, List[Waypoint]] = {}
+        if not changed:
+            return repaired
+        counts = self.obstacles.counts
+        for vehicle_id, route in self.routes.items():
+            # 우회 중이면 변경 전 비용(현재 우회 경로 길이)과 비교하여 더 짧아질 때만 교체
+            before = route.planner.cost() if route.detour else None
+            if route.planner is not None:
+                route.planner.update_cells(changed)
+            ahead = self._cells_ahead(route)
+            blocked = any(counts[c] for c in ahead[1:])
+            if not blocked and not route.detour:
+                continue
+
+            if route.planner is None:
+                start = self.snap(*route.position) if route.position else ahead[0]
+                if start is None:
+                    continue
+                route.planner = DStarLite(self.width, self.height, self.static, counts, start, route.goal_cell)
+            cells = route.planner.path()
+            if cells is None:
+                print(f"⚠️ {vehicle_id}: 정차 차량 우회 경로 없음 - 기존 경로 유지")
+                continue
+            if not blocked and len(cells) - 1 >= before:
+                continue  # 우회 중이지만 더 짧은 길이 열리지 않음
+
+            start_xy = list(route.position) if route.position else \
+                [cells[0][0] * self.cell + self.cell / 2.0, cells[0][1] * self.cell + self.cell / 2.0]
+            # 정차 차량 칸도 막힌 것으로 보고 시야가 닿는 꺾임만 남김
+            corners = smooth_cells(self.width, self.static, cells, counts)
+            waypoints = [start_xy] + corner_points(corners, self.cell) + [list(route.goal)]
+            route.cells = self.route_cells(waypoints)
+            route.detour = bool(self.obstacles.placed)
+            repaired[vehicle_id] = waypoints
+        return repaired
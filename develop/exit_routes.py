@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+출차 경로 사전 계산 - 차량이 주차구역에 자리 잡는 시점(지오펜스 체류 이벤트)에 그 구역의 출차 경로와 안내 스케줄을 미리 만들어 둠
+
+기존에는 HUD가 정산 왕복이 끝난 뒤 UI 스레드에서 주차구역별로 손으로 적은 분기(generate_exit_waypoints)로
+웨이포인트를 만들고, 새 소켓으로 컨트롤러에 보내 컨트롤러가 경로 기하/안내 스케줄을 다시 계산했습니다.
+이제 출차 경로는 통로 네트워크에서 주차구역 진입 웨이포인트 → 필수 경유 지점 → 입출차 지점으로 구하고,
+RouteGeometry(세그먼트 격자 인덱스 포함)와 AnnouncementSchedule까지 주차구역별로 캐시하므로
+정산 확인 시 컨트롤러는 캐시된 경로를 교체하기만 합니다.
+주차구역 경로는 지도에만 의존하므로 한 번 만든 경로는 다른 차량이 같은 구역에 주차해도 그대로 씁니다.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from announcement_schedule import AnnouncementSchedule
+from lot_layout import ENTRANCE_POINT, MANDATORY_WAYPOINT, PARKING_SPOT_WAYPOINTS
+from navigation_core import RoutePath, route_points_from_waypoints
+from reroute import LocalRerouter, simplify_waypoints
+from route_geometry import RouteGeometry
+
+Waypoint = List[float]
+
+
+class ExitRoute:
+    """주차구역 1개의 출차 경로 (웨이포인트, 경로 포인트, 경로 기하, 안내 스케줄)"""
+
+    __slots__ = ('parking_spot', 'waypoints', 'points', 'path', 'geometry', 'schedule')
+
+    def __init__(self, parking_spot: int, waypoints: List[Waypoint]):
+        self.parking_spot = parking_spot
+        self.waypoints = waypoints
+        self.points: List[Tuple[float, float]] = route_points_from_waypoints(waypoints, 'exit')
+        self.path = RoutePath(self.points)
+        self.geometry = RouteGeometry(self.path)
+        self.geometry.segment_index  # 전체 탐색용 격자 인덱스도 미리 생성
+        self.schedule = AnnouncementSchedule(self.geometry, True)
+
+    def __repr__(self):
+        return f"ExitRoute(spot={self.parking_spot}, waypoints={len(self.waypoints)})"
+
+
+class ExitRouteCache:
+    """주차구역 → 사전 계산된 출차 경로 (스레드 안전, 없는 구역은 조회 시 계산)"""
+
+    def __init__(self, rerouter: Optional[LocalRerouter] = None):
+        self.rerouter = rerouter or LocalRerouter()
+        self.routes: Dict[int, ExitRoute] = {}
+        self._lock = threading.Lock()
+
+    def exit_waypoints(self, parking_spot: int) -> Optional[List[Waypoint]]:
+        """주차구역 진입 웨이포인트 → 필수 경유 지점 → 입출차 지점 웨이포인트 (주차 좌표부터 시작, 구할 수 없으면 None)"""
+        start = PARKING_SPOT_WAYPOINTS.get(parking_spot)
+        if start is None:
+            return None
+        to_mandatory = self.rerouter.reroute(start[0], start[1], *MANDATORY_WAYPOINT)
+        to_gate = self.rerouter.reroute(MANDATORY_WAYPOINT[0], MANDATORY_WAYPOINT[1], *ENTRANCE_POINT)
+        if not to_mandatory or not to_gate:
+            return None
+        waypoints = [list(start)] + [list(p) for p in to_mandatory[1:]] + [list(p) for p in to_gate[1:]]
+        return simplify_waypoints(waypoints)
+
+    def prepare(self, parking_spot: int) -> Optional[ExitRoute]:
+        """출차 경로를 계산해 캐시 (이미 있으면 그대로 반환)"""
+        route = self.routes.get(parking_spot)
+        if route is not None:
+            return route
+        waypoints = self.exit_waypoints(parking_spot)
+        if waypoints is None:
+            return None
+        route = ExitRoute(parking_spot, waypoints)
+        with self._lock:
+            return self.routes.setdefault(parking_spot, route)
+
+    def get(self, parking_spot: int) -> Optional[ExitRoute]:
+        """안내 시작용 출차 경로 - 캐시에 없으면 계산하고, 안내 스케줄 커서는 처음으로 되돌림"""
+        route = self.prepare(parking_spot)
+        if route is not None:
+            route.schedule.reset()
+        return route
+
+    def prepare_all(self) -> int:
+        """모든 주차구역의 출차 경로 계산 (벤치마크/시작 시 예열용) - 캐시된 경로 수 반환"""
+        for spot in PARKING_SPOT_WAYPOINTS:
+            self.prepare(spot)
+        return len(self.routes)
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+다층 주차장 - 건물 정의 파일(lot_building.json)의 층별 지도와 층 사이 램프로 여러 층을 하나의 주차장으로 다룸
+
+- 층 지도는 기존 lot_map.json 형식 그대로이며 (층마다 지도 파일 1개, 디스크 캐시도 층별),
+  통로 네트워크/점유 격자/거리장은 그 층을 처음 사용할 때 로드합니다. 건물 정의를 읽는 것만으로는 어느 층도 로드하지 않습니다.
+- 램프는 두 층의 통로 노드를 잇는 간선 (길이는 픽셀, one_way면 from → to 방향만)
+- 층간 경로: 출발/도착 지점과 램프 끝점만 꼭짓점으로 두는 Dijkstra - 꼭짓점을 꺼낼 때 그 층을 로드하므로
+  목적지까지의 거리보다 먼 층은 로드하지 않습니다. 층 안의 구간은 층별 LocalRerouter로 웨이포인트를 만듭니다.
+- 사용하지 않는 층은 release/retain으로 메모리에서 내립니다 (기본 층은 lot_layout이 쓰므로 항상 유지).
+건물 정의 파일이 없으면 lot_map.json 1개 층짜리 건물로 동작합니다.
+
+건물 정의 파일 형식은 develop/README.md의 'floors.py' 항목 참고
+"""
+
+import heapq
+import json
+import os
+import threading
+from math import sqrt
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from lot_map import CACHE_DIR, LOT_MAP_PATH, CompiledLotMap, LotMapError, OccupancyGrid, load_lot_map, unload_lot_map
+from map_matching import AisleNetwork, aisle_network_from_lot
+from reroute import LocalRerouter
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUILDING_PATH = os.environ.get('LOT_BUILDING_PATH') or os.path.join(_BASE_DIR, 'lot_building.json')
+SINGLE_FLOOR_ID = '1F'  # 건물 정의 파일이 없을 때 lot_map.json 층 이름
+
+Waypoint = List[float]
+
+
+def polyline_length(points: Sequence[Sequence[float]]) -> float:
+    return sum(sqrt((b[0] - a[0]) ** 2 + (b[1] - a[1]) ** 2) for a, b in zip(points, points[1:]))
+
+
+class Ramp:
+    """층 사이 램프 (from 층의 통로 노드 ↔ to 층의 통로 노드)"""
+
+    __slots__ = ('name', 'from_floor', 'from_node', 'to_floor', 'to_node', 'length', 'one_way')
+
+    def __init__(self, name: str, from_floor: str, from_node: str, to_floor: str, to_node: str,
+                 length: float, one_way: bool = False):
+        self.name = name
+        self.from_floor = from_floor
+        self.from_node = from_node
+        self.to_floor = to_floor
+        self.to_node = to_node
+        self.length = length
+        self.one_way = one_way
+
+    def __repr__(self):
+        arrow = '→' if self.one_way else '↔'
+        return f"Ramp({self.name}: {self.from_floor}/{self.from_node} {arrow} {self.to_floor}/{self.to_node})"
+
+
+class FloorLeg:
+    """층간 경로의 한 층 구간 - ramp는 이 구간 끝에서 다음 층으로 내려가는/올라가는 램프 (마지막 구간은 None)"""
+
+    __slots__ = ('floor', 'waypoints', 'ramp')
+
+    def __init__(self, floor: str, waypoints: List[Waypoint], ramp: Optional[Ramp] = None):
+        self.floor = floor
+        self.waypoints = waypoints
+        self.ramp = ramp
+
+    def __repr__(self):
+        via = f", ramp={self.ramp.name}" if self.ramp else ""
+        return f"FloorLeg({self.floor}, {len(self.waypoints)}개 웨이포인트{via})"
+
+
+class Floor:
+    """층 1개 - 지도/통로 네트워크/재탐색기는 처음 사용할 때 로드"""
+
+    def __init__(self, building: 'Building', floor_id: str, level: int, map_path: str,
+                 spot_range: Optional[Tuple[int, int]] = None):
+        self.building = building
+        self.id = floor_id
+        self.level = level
+        self.map_path = map_path
+        self.spot_range = spot_range
+        self._lot: Optional[CompiledLotMap] = None
+        self._network: Optional[AisleNetwork] = None
+        self._rerouter: Optional[LocalRerouter] = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Floor({self.id}, level={self.level}, {'loaded' if self.loaded else 'not loaded'})"
+
+    @property
+    def loaded(self) -> bool:
+        return self._lot is not None
+
+    @property
+    def lot(self) -> CompiledLotMap:
+        """층 지도 컴파일 결과 (처음 접근 시 로드, 디스크 캐시가 있으면 컴파일 생략)"""
+        with self._lock:
+            if self._lot is None:
+                lot = load_lot_map(self.map_path, self.building.cache_dir)
+                self.building.check_floor(self, lot)
+                self._lot = lot
+            return self._lot
+
+    @property
+    def network(self) -> AisleNetwork:
+        if self._network is None:
+            self._network = aisle_network_from_lot(self.lot)
+        return self._network
+
+    @property
+    def rerouter(self) -> LocalRerouter:
+        """층 안 경로 (거리장은 목적지 입구 등 통로 노드가 아닌 목표를 처음 요청할 때 로드)"""
+        if self._rerouter is None:
+            lot = self.lot
+            self._rerouter = LocalRerouter(self.network, lot.spot_waypoint_tolerance, lot=lot)
+        return self._rerouter
+
+    def occupancy(self, cell: int, margin: int) -> OccupancyGrid:
+        return self.lot.occupancy(cell, margin)
+
+    def node_xy(self, name: str) -> Tuple[float, float]:
+        return tuple(self.lot.aisle_nodes[name])
+
+    def release(self):
+        """지도/네트워크 참조를 버리고 프로세스 캐시에서도 제거 (다음 사용 시 디스크 캐시에서 다시 로드)"""
+        with self._lock:
+            self._lot = self._network = self._rerouter = None
+            unload_lot_map(self.map_path)
+
+
+class Building:
+    """층 목록 + 램프 (건물 정의만 보관하고 층은 사용할 때 로드)"""
+
+    def __init__(self, spec: Dict[str, Any], base_dir: str = _BASE_DIR, cache_dir: Optional[str] = CACHE_DIR):
+        self.name = spec.get('name', '')
+        self.cache_dir = cache_dir
+        self.floors: Dict[str, Floor] = {}
+        for entry in spec['floors']:
+            floor_id = entry['id']
+            if floor_id in self.floors:
+                raise LotMapError(f"층 이름 중복: {floor_id}")
+            spot_range = tuple(entry['spots']) if 'spots' in entry else None
+            if spot_range is not None and len(spot_range) != 2:
+                raise LotMapError(f"층 {floor_id}: spots는 [첫 번호, 마지막 번호] 형식이어야 합니다 ({entry['spots']!r})")
+            self.floors[floor_id] = Floor(self, floor_id, entry.get('level', 0),
+                                          os.path.join(base_dir, entry['map']), spot_range)
+        self.default_floor = spec.get('default_floor') or next(iter(self.floors))
+        if self.default_floor not in self.floors:
+            raise LotMapError(f"기본 층 {self.default_floor!r}이 층 목록에 없습니다")
+
+        self.ramps: List[Ramp] = []
+        self.ports: Dict[str, List[Tuple[str, Ramp, str, str]]] = {f: [] for f in self.floors}  # 층 → (노드, 램프, 다음 층, 다음 노드)
+        for r in spec.get('ramps', []):
+            (from_floor, from_node), (to_floor, to_node) = r['from'], r['to']
+            for floor_id in (from_floor, to_floor):
+                if floor_id not in self.floors:
+                    raise LotMapError(f"램프 {r.get('name', '')}: 알 수 없는 층 {floor_id!r}")
+            ramp = Ramp(r.get('name', f"{from_floor}-{to_floor}"), from_floor, from_node, to_floor, to_node,
+                        float(r['length']), bool(r.get('one_way', False)))
+            self.ramps.append(ramp)
+            self.ports[from_floor].append((from_node, ramp, to_floor, to_node))
+            if not ramp.one_way:
+                self.ports[to_floor].append((to_node, ramp, from_floor, from_node))
+
+    # ---------------------------------------------------------------
+    # 층 관리
+    # ---------------------------------------------------------------
+    def floor(self, floor_id: str) -> Floor:
+        floor = self.floors.get(floor_id)
+        if floor is None:
+            raise LotMapError(f"알 수 없는 층: {floor_id!r}")
+        return floor
+
+    def floor_ids(self) -> List[str]:
+        """위층부터 순서대로 층 이름 (탑뷰 층 선택 목록)"""
+        return sorted(self.floors, key=lambda f: -self.floors[f].level)
+
+    def loaded_floors(self) -> List[str]:
+        return [f for f, floor in self.floors.items() if floor.loaded]
+
+    def check_floor(self, floor: Floor, lot: CompiledLotMap):
+        """층을 로드할 때 램프 노드와 주차구역 번호 확인 (번호는 이미 로드한 층과 겹치면 안 됨)"""
+        for node, ramp, _, _ in self.ports[floor.id]:
+            if node not in lot.aisle_nodes:
+                raise LotMapError(f"램프 {ramp.name}: 층 {floor.id}에 통로 노드 {node!r}가 없습니다")
+        if floor.spot_range is not None:
+            first, last = floor.spot_range
+            outside = [s for s in lot.spot_ids if not first <= s <= last]
+            if outside:
+                raise LotMapError(f"층 {floor.id}: 주차구역 {outside}이 spots 범위 {first}~{last} 밖입니다")
+        for other in self.floors.values():
+            if other is not floor and other.loaded:
+                shared = set(lot.spot_ids) & set(other._lot.spot_ids)
+                if shared:
+                    raise LotMapError(f"층 {floor.id}와 {other.id}의 주차구역 번호 중복: {sorted(shared)}")
+
+    def spot_floor(self, spot: int) -> Optional[str]:
+        """주차구역이 있는 층 - 건물 정의의 spots 범위로 먼저 찾고, 범위가 없는 층은 로드해서 확인"""
+        unknown = []
+        for floor_id, floor in self.floors.items():
+            if floor.spot_range is not None:
+                if floor.spot_range[0] <= spot <= floor.spot_range[1]:
+                    return floor_id
+            elif floor.loaded and spot in floor.lot.spot_rects:
+                return floor_id
+            elif not floor.loaded:
+                unknown.append(floor)
+        for floor in unknown:
+            if spot in floor.lot.spot_rects:
+                return floor.id
+        return None
+
+    def release(self, floor_id: str) -> bool:
+        """층을 메모리에서 내림 (기본 층은 lot_layout이 사용하므로 유지) - 내렸으면 True"""
+        floor = self.floor(floor_id)
+        if floor_id == self.default_floor or not floor.loaded:
+            return False
+        floor.release()
+        return True
+
+    def retain(self, floor_ids: Iterable[str]) -> List[str]:
+        """floor_ids(와 기본 층)만 남기고 나머지 로드된 층을 내림 - 내린 층 목록 반환"""
+        keep = set(floor_ids)
+        return [f for f in self.loaded_floors() if f not in keep and self.release(f)]
+
+    # ---------------------------------------------------------------
+    # 층간 경로
+    # ---------------------------------------------------------------
+    def route(self, start_floor: str, x: float, y: float,
+              goal_floor: str, goal_x: float, goal_y: float) -> Optional[List[FloorLeg]]:
+        """(출발 층, 좌표) → (도착 층, 좌표) 층별 구간 목록 (경로가 없으면 None)
+
+        같은 층이면 그 층의 통로 경로 1구간, 다른 층이면 램프를 지나는 최단 경로 (층 안은 통로 최단 거리, 램프는 지정 길이)
+        """
+        if start_floor == goal_floor:
+            waypoints = self.floor(start_floor).rerouter.reroute(x, y, goal_x, goal_y)
+            return [FloorLeg(start_floor, waypoints)] if waypoints else None
+
+        start, goal = ('start',), ('goal',)
+        dist: Dict[tuple, float] = {start: 0.0}
+        prev: Dict[tuple, Tuple[tuple, Optional[Ramp]]] = {}
+        legs_cache: Dict[Tuple[tuple, tuple], List[Waypoint]] = {}
+        heap = [(0.0, 0, start)]
+        seq = 0
+
+        def relax(v, d, u, ramp=None):
+            nonlocal seq
+            if d < dist.get(v, float('inf')):
+                dist[v] = d
+                prev[v] = (u, ramp)
+                seq += 1
+                heapq.heappush(heap, (d, seq, v))
+
+        while heap:
+            d, _, u = heapq.heappop(heap)
+            if d > dist.get(u, float('inf')):
+                continue
+            if u == goal:
+                break
+            if u == start:
+                floor_id, here, here_node = start_floor, (x, y), None
+            else:
+                floor_id, here_node = u
+                here = self.floor(floor_id).node_xy(here_node)
+            floor = self.floor(floor_id)  # 이 층의 꼭짓점을 처음 꺼낼 때 로드
+
+            # 층 안: 다른 램프 끝점 / 도착 지점까지 통로 최단 경로
+            for node, _, _, _ in self.ports[floor_id]:
+                if node == here_node:
+                    continue
+                target = (floor_id, node)
+                if here_node is not None:
+                    network = floor.network
+                    length = network.node_dist[network.node_index[here_node]][network.node_index[node]]
+                else:
+                    waypoints = floor.rerouter.reroute(here[0], here[1], *floor.node_xy(node))
+                    if not waypoints:
+                        continue
+                    legs_cache[(u, target)] = waypoints
+                    length = polyline_length([list(here)] + waypoints)
+                relax(target, d + length, u)
+            if floor_id == goal_floor:
+                waypoints = floor.rerouter.reroute(here[0], here[1], goal_x, goal_y)
+                if waypoints:
+                    legs_cache[(u, goal)] = waypoints
+                    relax(goal, d + polyline_length([list(here)] + waypoints), u)
+
+            # 램프: 다음 층은 그 층 꼭짓점을 꺼낼 때 로드
+            if here_node is not None:
+                for node, ramp, next_floor, next_node in self.ports[floor_id]:
+                    if node == here_node:
+                        relax((next_floor, next_node), d + ramp.length, u, ramp)
+
+        if goal not in prev:
+            return None
+
+        # 역추적 → 층별 구간 (같은 층 안의 연속 꼭짓점은 한 구간으로 이어 붙임)
+        chain = [goal]
+        while chain[-1] != start:
+            chain.append(prev[chain[-1]][0])
+        chain.reverse()
+
+        legs: List[FloorLeg] = []
+        current = FloorLeg(start_floor, [[float(x), float(y)]])
+        for u, v in zip(chain, chain[1:]):
+            ramp = prev[v][1]
+            if ramp is not None:
+                current.ramp = ramp
+                legs.append(current)
+                current = FloorLeg(v[0], [list(self.floor(v[0]).node_xy(v[1]))])
+                continue
+            waypoints = legs_cache.get((u, v))
+            if waypoints is None:
+                floor = self.floor(current.floor)
+                here = floor.node_xy(u[1])
+                waypoints = floor.rerouter.reroute(here[0], here[1], *(floor.node_xy(v[1]) if v != goal
+                                                                       else (goal_x, goal_y)))
+            for p in waypoints:
+                if p[0] != current.waypoints[-1][0] or p[1] != current.waypoints[-1][1]:
+                    current.waypoints.append(list(p))
+        legs.append(current)
+        return legs
+
+    def route_to_spot(self, start_floor: str, x: float, y: float, spot: int) -> Optional[List[FloorLeg]]:
+        """주차구역 진입 웨이포인트까지 층간 경로 (주차구역이 없으면 None)"""
+        floor_id = self.spot_floor(spot)
+        if floor_id is None:
+            return None
+        gx, gy = self.floor(floor_id).lot.spot_waypoints[spot]
+        return self.route(start_floor, x, y, floor_id, gx, gy)
+
+
+_buildings: Dict[str, Building] = {}
+_buildings_lock = threading.Lock()
+
+
+def load_building(path: str = BUILDING_PATH, cache_dir: Optional[str] = CACHE_DIR) -> Building:
+    """건물 정의 파일 로드 (프로세스 안에서 1회, 층 지도는 로드하지 않음) - 파일이 없으면 lot_map.json 1개 층"""
+    path = os.path.abspath(path)
+    with _buildings_lock:
+        building = _buildings.get(path)
+        if building is not None:
+            return building
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    spec = json.loads(f.read().decode('utf-8'))
+            except ValueError as e:
+                raise LotMapError(f"{path}: JSON 형식 오류 - {e}") from e
+        else:
+            spec = {'floors': [{'id': SINGLE_FLOOR_ID, 'map': LOT_MAP_PATH}]}
+        building = _buildings[path] = Building(spec, os.path.dirname(path), cache_dir)
+        return building
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description='다층 주차장 층간 경로 (건물 정의 파일 기준)')
+    parser.add_argument('--building', default=BUILDING_PATH, help='건물 정의 파일 경로 (기본: develop/lot_building.json)')
+    parser.add_argument('--from-floor', help='출발 층 (기본: 기본 층)')
+    parser.add_argument('--from', dest='start', type=float, nargs=2, metavar=('X', 'Y'), help='출발 좌표 (기본: 입구)')
+    parser.add_argument('--spot', type=int, required=True, help='도착 주차구역 번호')
+    args = parser.parse_args()
+
+    building = load_building(args.building)
+    start_floor = args.from_floor or building.default_floor
+    print(f"🏢 {building.name}: 층 {building.floor_ids()}, 램프 {len(building.ramps)}개")
+    start = args.start or building.floor(start_floor).lot.entrance
+    t0 = time.perf_counter()
+    legs = building.route_to_spot(start_floor, start[0], start[1], args.spot)
+    elapsed_ms = (time.perf_counter() - t0) * 1e3
+    if legs is None:
+        print(f"❌ 주차구역 {args.spot}번까지 경로 없음")
+    else:
+        for leg in legs:
+            via = f" → {leg.ramp.name}" if leg.ramp else ""
+            print(f"   [{leg.floor}] {leg.waypoints}{via}")
+    print(f"   로드된 층: {building.loaded_floors()} ({elapsed_ms:.1f}ms)")
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+지오펜스 엔진 - 주차구역, 목적지 입구, 통행 불가 구역을 격자 인덱스로 컴파일하여
+위치 → 구역 조회를 셀 1개 확인으로 처리하고, 차량별 진입/이탈 이벤트와 체류 시간을 추적합니다.
+
+각 화면(탑뷰/HUD)이 위치마다 주차구역 사각형을 순회하던 코드를 대체하며,
+main_controller가 위치 수신 시 한 번 계산해 결과를 위치 데이터/이벤트로 브로드캐스트합니다.
+"""
+
+import time
+from math import floor
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from lot_layout import (
+    Rect, rect_contains, PARKING_SPOT_RECTS, PARKING_SPOT_TYPES, PARKING_SPOT_WAYPOINTS,
+    SPOT_WAYPOINT_TOLERANCE, ENTRANCE_ZONES, GATE_ZONE, NO_GO_ZONES
+)
+
+# 구역 종류
+ZONE_SPOT = 'spot'                    # 주차구역
+ZONE_SPOT_WAYPOINT = 'spot_waypoint'  # 주차구역 진입 웨이포인트 주변 (경로 목적지 판별용)
+ZONE_ENTRANCE = 'entrance'            # 목적지 입구
+ZONE_GATE = 'gate'                    # 입출차 구역
+ZONE_NO_GO = 'no_go'                  # 통행 불가 구역
+
+# 구역 종류별 체류 이벤트 기준 시간 (초) - 이 시간 이상 머물면 'dwell' 이벤트 1회 발생
+DWELL_THRESHOLDS = {
+    ZONE_SPOT: 3.0,
+    ZONE_ENTRANCE: 2.0,
+    ZONE_GATE: 2.0,
+    ZONE_NO_GO: 1.0,
+}
+
+DEFAULT_CELL_SIZE = 50  # 픽셀
+
+
+class Zone:
+    """지오펜스 구역 (경계 포함 사각형)"""
+
+    __slots__ = ('zone_id', 'kind', 'name', 'rect', 'order', 'attributes')
+
+    def __init__(self, zone_id: Hashable, kind: str, name: str, rect: Rect,
+                 order: int = 0, attributes: Optional[Dict[str, Any]] = None):
+        self.zone_id = zone_id
+        self.kind = kind
+        self.name = name
+        self.rect = rect
+        self.order = order          # 같은 점에 여러 구역이 겹칠 때 우선순위 (등록 순서)
+        self.attributes = attributes or {}
+
+    def contains(self, x: float, y: float) -> bool:
+        return rect_contains(self.rect, x, y)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'zone_id': self.zone_id, 'kind': self.kind, 'name': self.name}
+
+    def __repr__(self):
+        return f"Zone({self.kind}:{self.zone_id}, {self.rect})"
+
+
+class GeofenceIndex:
+    """구역들을 균일 격자에 컴파일한 조회 인덱스
+
+    셀마다 그 셀과 겹치는 구역 목록(대부분 0~2개)을 튜플로 미리 저장해 두고,
+    조회 시 점이 속한 셀의 후보만 경계 포함 판정합니다.
+    """
+
+    def __init__(self, zones: List[Zone], cell_size: float = DEFAULT_CELL_SIZE):
+        self.zones = sorted(zones, key=lambda z: z.order)
+        self.cell_size = cell_size
+        self.by_id = {(z.kind, z.zone_id): z for z in self.zones}
+        self._compile()
+
+    def _compile(self):
+        if not self.zones:
+            self.x0 = self.y0 = 0.0
+            self.gx = self.gy = 0
+            self.cells = []
+            return
+
+        cell = self.cell_size
+        self.x0 = min(z.rect[0] for z in self.zones)
+        self.y0 = min(z.rect[1] for z in self.zones)
+        x1 = max(z.rect[0] + z.rect[2] for z in self.zones)
+        y1 = max(z.rect[1] + z.rect[3] for z in self.zones)
+        self.gx = int((x1 - self.x0) // cell) + 1
+        self.gy = int((y1 - self.y0) // cell) + 1
+
+        buckets: List[List[Zone]] = [[] for _ in range(self.gx * self.gy)]
+        for z in self.zones:
+            rx, ry, rw, rh = z.rect
+            # 경계 포함 판정이므로 경계선이 걸친 이웃 셀에도 등록
+            ix0, ix1 = self._cell(rx, self.x0, self.gx), self._cell(rx + rw, self.x0, self.gx)
+            iy0, iy1 = self._cell(ry, self.y0, self.gy), self._cell(ry + rh, self.y0, self.gy)
+            for iy in range(iy0, iy1 + 1):
+                row = iy * self.gx
+                for ix in range(ix0, ix1 + 1):
+                    buckets[row + ix].append(z)
+        self.cells = [tuple(b) for b in buckets]
+
+    def _cell(self, v: float, origin: float, size: int) -> int:
+        i = int(floor((v - origin) / self.cell_size))
+        return 0 if i < 0 else (size - 1 if i >= size else i)
+
+    def zones_at(self, x: float, y: float, kind: Optional[str] = None) -> List[Zone]:
+        """점을 포함하는 구역 목록 (우선순위 순)"""
+        if self.gx == 0:
+            return []
+        fx = (x - self.x0) / self.cell_size
+        fy = (y - self.y0) / self.cell_size
+        if fx < 0 or fy < 0 or fx >= self.gx or fy >= self.gy:
+            return []
+        candidates = self.cells[int(fy) * self.gx + int(fx)]
+        return [z for z in candidates if (kind is None or z.kind == kind) and z.contains(x, y)]
+
+    def first_zone(self, x: float, y: float, kind: str) -> Optional[Zone]:
+        """점을 포함하는 해당 종류의 첫 구역"""
+        zones = self.zones_at(x, y, kind)
+        return zones[0] if zones else None
+
+    def spot_at(self, x: float, y: float) -> Optional[int]:
+        """점이 속한 주차구역 번호 (없으면 None)"""
+        zone = self.first_zone(x, y, ZONE_SPOT)
+        return zone.zone_id if zone else None
+
+    def spot_from_waypoint(self, x: float, y: float) -> Optional[int]:
+        """웨이포인트 좌표가 가리키는 주차구역 번호 (진입 웨이포인트 ±50픽셀)"""
+        zone = self.first_zone(x, y, ZONE_SPOT_WAYPOINT)
+        return zone.zone_id if zone else None
+
+    def is_in_parking_spot(self, x: float, y: float) -> bool:
+        return self.first_zone(x, y, ZONE_SPOT) is not None
+
+    def is_no_go(self, x: float, y: float) -> bool:
+        return self.first_zone(x, y, ZONE_NO_GO) is not None
+
+
+def build_lot_zones() -> List[Zone]:
+    """lot_layout 상수로 주차장 전체 구역 목록 생성"""
+    zones = []
+
+    def add(zone_id, kind, name, rect, **attributes):
+        zones.append(Zone(zone_id, kind, name, rect, len(zones), attributes))
+
+    for spot, rect in PARKING_SPOT_RECTS.items():
+        add(spot, ZONE_SPOT, f"주차구역 {spot}번", rect, spot_type=PARKING_SPOT_TYPES.get(spot))
+    tol = SPOT_WAYPOINT_TOLERANCE
+    for spot, (wx, wy) in PARKING_SPOT_WAYPOINTS.items():
+        add(spot, ZONE_SPOT_WAYPOINT, f"주차구역 {spot}번 웨이포인트", (wx - tol, wy - tol, 2 * tol, 2 * tol))
+    for name, rect in ENTRANCE_ZONES.items():
+        add(name, ZONE_ENTRANCE, name, rect)
+    add("입출차", ZONE_GATE, "입출차", GATE_ZONE)
+    for name, rect in NO_GO_ZONES.items():
+        add(name, ZONE_NO_GO, name, rect)
+    return zones
+
+
+_lot_geofence: Optional[GeofenceIndex] = None
+
+
+def lot_geofence() -> GeofenceIndex:
+    """주차장 기본 지오펜스 인덱스 (모듈 내 1회 컴파일)"""
+    global _lot_geofence
+    if _lot_geofence is None:
+        _lot_geofence = GeofenceIndex(build_lot_zones())
+    return _lot_geofence
+
+
+class GeofenceTracker:
+    """차량별 구역 상태 추적 - 진입(enter)/이탈(exit)/체류(dwell) 이벤트 생성
+
+    경로 목적지 판별용 웨이포인트 구역(spot_waypoint)은 이벤트 대상에서 제외합니다.
+    """
+
+    TRACKED_KINDS = (ZONE_SPOT, ZONE_ENTRANCE, ZONE_GATE, ZONE_NO_GO)
+
+    def __init__(self, index: Optional[GeofenceIndex] = None,
+                 dwell_thresholds: Optional[Dict[str, float]] = None):
+        self.index = index or lot_geofence()
+        self.dwell_thresholds = dict(DWELL_THRESHOLDS if dwell_thresholds is None else dwell_thresholds)
+        # vehicle_id -> {(kind, zone_id): [진입 시각, dwell 이벤트 발생 여부]}
+        self.states: Dict[Hashable, Dict[Tuple[str, Hashable], List]] = {}
+
+    def update(self, vehicle_id: Hashable, x: float, y: float,
+               now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """위치 1회 반영 - 이번 위치로 발생한 이벤트 목록 반환"""
+        now = time.monotonic() if now is None else now
+        inside = {(z.kind, z.zone_id): z for z in self.index.zones_at(x, y) if z.kind in self.TRACKED_KINDS}
+        state = self.states.setdefault(vehicle_id, {})
+        events = []
+
+        for key in [k for k in state if k not in inside]:
+            entered_at, _ = state.pop(key)
+            events.append(self._event('exit', vehicle_id, self.index.by_id[key], now - entered_at))
+
+        for key, zone in inside.items():
+            entry = state.get(key)
+            if entry is None:
+                state[key] = [now, False]
+                events.append(self._event('enter', vehicle_id, zone, 0.0))
+                continue
+            threshold = self.dwell_thresholds.get(zone.kind)
+            if threshold is not None and not entry[1] and now - entry[0] >= threshold:
+                entry[1] = True
+                events.append(self._event('dwell', vehicle_id, zone, now - entry[0]))
+
+        return events
+
+    def dwell_time(self, vehicle_id: Hashable, kind: str, zone_id: Hashable,
+                   now: Optional[float] = None) -> float:
+        """현재 구역에 머문 시간 (초), 구역 밖이면 0"""
+        entry = self.states.get(vehicle_id, {}).get((kind, zone_id))
+        if entry is None:
+            return 0.0
+        return (time.monotonic() if now is None else now) - entry[0]
+
+    def current_zones(self, vehicle_id: Hashable) -> List[Zone]:
+        """차량이 현재 머물고 있는 구역 목록"""
+        return [self.index.by_id[k] for k in self.states.get(vehicle_id, {})]
+
+    def remove_vehicle(self, vehicle_id: Hashable):
+        self.states.pop(vehicle_id, None)
+
+    @staticmethod
+    def _event(event_type: str, vehicle_id: Hashable, zone: Zone, dwell: float) -> Dict[str, Any]:
+        event = zone.to_dict()
+        event.update({'event': event_type, 'vehicle_id': vehicle_id, 'dwell': round(dwell, 2)})
+        return event
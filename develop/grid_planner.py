@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+격자 경로 탐색 - 점유 격자(lot_map 컴파일 결과) 위의 4방향 최단 경로 (Qt 의존성 없음)
+
+UI_testing.astar는 (x, y) 튜플 키 딕셔너리로 g/came을 관리하고 닫힌 집합이 없어 같은 셀을 힙에 여러 번 넣으며,
+10,000회 반복에서 포기하므로 CELL을 10이나 5로 줄이면 경로를 찾지 못했습니다.
+GridPlanner는 셀 번호(cy * width + cx)로 인덱싱하는 미리 할당한 배열과 세대(generation) 번호로
+열린/닫힌 집합을 관리하여 탐색마다 배열을 초기화하지 않습니다.
+
+jps()는 균일 비용 4방향 격자용 점프 포인트 탐색(JPS)입니다.
+- 가로 이동 중에는 가로로만 진행하고, 지나온 칸의 위/아래가 막혀 있고 현재 칸의 위/아래가 열린 곳
+  (강제 이웃)에서만 세로로 꺾습니다. 같은 길이의 경로 중 세로 이동을 가능한 한 앞당긴 경로만 남기는 규칙입니다.
+- 세로 이동 중에는 매 칸에서 좌우 가로 점프를 확인하여 점프 포인트가 있으면 멈춥니다.
+- 가로 점프는 행마다 미리 만든 점유/강제 이웃 바이트열에서 bytes.find로 다음 정지 칸을 찾습니다.
+
+nearest_free()는 막힌 칸을 가장 가까운 열린 칸으로 옮기는 표 조회입니다. 2패스 거리 변환(정방향/역방향
+8방향 마스크)으로 칸마다 가장 가까운 열린 칸 번호를 전파하며, 거리는 UI_testing의 정사각형 고리 탐색과
+같은 체비쇼프 거리입니다.
+
+smooth_cells()는 격자 경로의 문자열 당기기(string pulling)입니다. 기준 셀에서 시야(line of sight)가 닿는
+가장 먼 경로 셀까지 직선으로 잇고 그 셀을 다음 기준으로 삼아, 4방향 경로의 계단 모양 꺾임을 대각선 직선
+하나로 바꿉니다. 시야 판정은 선분이 지나는 모든 셀(supercover)이 열려 있어야 하며, 선분이 셀 모서리를 정확히
+지나면 양옆 셀이 모두 열려 있어야 통과로 봅니다.
+"""
+
+from array import array
+from heapq import heappush, heappop
+from typing import List, Optional, Sequence, Tuple
+
+Cell = Tuple[int, int]
+
+_MAX_GENERATION = 0xFFFFFFFF
+
+
+class GridPlanner:
+    """점유 격자 1개에 대한 A*/JPS 탐색기 (배열을 재사용하므로 한 스레드에서 사용)"""
+
+    def __init__(self, width: int, height: int, cells: Sequence[int]):
+        self.width = width
+        self.height = height
+        n = width * height
+        self.cells = bytes(cells)
+
+        # 탐색 상태 - seen/closed 값이 현재 세대와 같을 때만 유효
+        self.g = array('l', [0]) * n
+        self.parent = array('l', [-1]) * n
+        self.seen = array('L', [0]) * n
+        self.closed = array('L', [0]) * n
+        self.generation = 0
+        self.expanded = 0  # 마지막 탐색에서 확장한 노드 수
+        self.nearest: Optional[array] = None  # 칸별 가장 가까운 열린 칸 번호 (build_nearest_free)
+
+        self._build_rows()
+
+    @classmethod
+    def from_grid(cls, grid) -> 'GridPlanner':
+        """lot_map.OccupancyGrid에서 생성"""
+        return cls(grid.width, grid.height, grid.cells)
+
+    def _build_rows(self):
+        """행별 점유 바이트열과 강제 이웃 바이트열 (가로 이동 방향별)
+
+        행을 little-endian 정수로 보면 셀 1개가 8비트이므로, 8비트 시프트가 한 칸 이동입니다.
+        forced_right[y][x] = 위 또는 아래 칸 (x)가 열려 있고 (x - 1)이 막혀 있음 (오른쪽으로 이동 중 세로로 꺾을 곳)
+        """
+        w, h = self.width, self.height
+        ones = int.from_bytes(b'\x01' * w, 'little')
+        self.rows = [self.cells[y * w:(y + 1) * w] for y in range(h)]
+        blocked = [int.from_bytes(row, 'little') for row in self.rows]
+        free = [ones ^ b for b in blocked]
+
+        self.forced_right: List[bytes] = []
+        self.forced_left: List[bytes] = []
+        for y in range(h):
+            right = left = 0
+            for ny in (y - 1, y + 1):
+                if 0 <= ny < h:
+                    right |= free[ny] & (blocked[ny] << 8)
+                    left |= free[ny] & (blocked[ny] >> 8)
+            self.forced_right.append((right & ones).to_bytes(w, 'little'))
+            self.forced_left.append((left & ones).to_bytes(w, 'little'))
+
+    def is_free(self, cx: int, cy: int) -> bool:
+        return 0 <= cx < self.width and 0 <= cy < self.height and self.cells[cy * self.width + cx] == 0
+
+    # ---------------------------------------------------------------
+    # 가장 가까운 열린 칸 (거리 변환)
+    # ---------------------------------------------------------------
+    def build_nearest_free(self) -> array:
+        """칸별 가장 가까운 열린 칸 번호 표 (열린 칸이 하나도 없으면 모두 -1)
+
+        열린 칸은 자기 자신으로 시작하고, 정방향(왼쪽/위 4칸)과 역방향(오른쪽/아래 4칸) 패스에서
+        이웃이 가리키는 열린 칸이 더 가까우면 그 칸으로 바꿉니다 (벡터 전파 거리 변환).
+        """
+        w, h, occ = self.width, self.height, self.cells
+        n = w * h
+        nearest = array('l', (-1 if occ[c] else c for c in range(n)))
+        dist = array('l', (n if occ[c] else 0 for c in range(n)))
+        blocked = [(c % w, c // w, c) for c in range(n) if occ[c]]
+
+        def sweep(order, steps) -> None:
+            masks = [(dx, dy, dy * w + dx) for dx, dy in steps]
+            for x, y, c in order:
+                best, best_d = nearest[c], dist[c]
+                for dx, dy, off in masks:
+                    nx, ny = x + dx, y + dy
+                    if nx < 0 or nx >= w or ny < 0 or ny >= h:
+                        continue
+                    f = nearest[c + off]
+                    if f < 0:
+                        continue
+                    d = max(abs(f % w - x), abs(f // w - y))
+                    if d < best_d:
+                        best, best_d = f, d
+                nearest[c], dist[c] = best, best_d
+
+        # 열린 칸은 이미 거리 0이므로 막힌 칸만 행 우선 순서(정방향)와 그 역순(역방향)으로 갱신
+        sweep(blocked, ((-1, 0), (-1, -1), (0, -1), (1, -1)))
+        sweep(reversed(blocked), ((1, 0), (1, 1), (0, 1), (-1, 1)))
+        self.nearest = nearest
+        return nearest
+
+    def nearest_free(self, cx: int, cy: int) -> Optional[Cell]:
+        """(cx, cy)에서 가장 가까운 열린 칸 (격자 밖 좌표는 경계로 당긴 뒤 조회, 열린 칸이 없으면 None)"""
+        if self.nearest is None:
+            self.build_nearest_free()
+        cx = min(self.width - 1, max(0, cx))
+        cy = min(self.height - 1, max(0, cy))
+        f = self.nearest[cy * self.width + cx]
+        return None if f < 0 else (f % self.width, f // self.width)
+
+    def _next_generation(self) -> int:
+        self.generation += 1
+        if self.generation >= _MAX_GENERATION:
+            n = self.width * self.height
+            self.seen = array('L', [0]) * n
+            self.closed = array('L', [0]) * n
+            self.generation = 1
+        return self.generation
+
+    # ---------------------------------------------------------------
+    # A* (셀 단위)
+    # ---------------------------------------------------------------
+    def astar(self, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        """4방향 A* - 시작부터 목적지까지 연속된 셀 목록 (경로 없으면 None)"""
+        if not (self.is_free(*start) and self.is_free(*goal)):
+            return None
+        w, h, occ = self.width, self.height, self.cells
+        gx, gy = goal
+        s, t = start[1] * w + start[0], gy * w + gx
+        gen = self._next_generation()
+        g, parent, seen, closed = self.g, self.parent, self.seen, self.closed
+
+        g[s], parent[s], seen[s] = 0, -1, gen
+        heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, s)]
+        expanded = 0
+        while heap:
+            _, _, c = heappop(heap)
+            if closed[c] == gen:
+                continue
+            closed[c] = gen
+            expanded += 1
+            if c == t:
+                self.expanded = expanded
+                return self._cell_path(t)
+            x, y = c % w, c // w
+            ng = g[c] + 1
+            for n, ok in ((c + 1, x + 1 < w), (c - 1, x > 0), (c + w, y + 1 < h), (c - w, y > 0)):
+                if not ok or occ[n] or closed[n] == gen:
+                    continue
+                if seen[n] != gen or ng < g[n]:
+                    seen[n], g[n], parent[n] = gen, ng, c
+                    hn = abs(n % w - gx) + abs(n // w - gy)
+                    heappush(heap, (ng + hn, hn, n))  # f가 같으면 목적지에 가까운 셀 우선
+        self.expanded = expanded
+        return None
+
+    # ---------------------------------------------------------------
+    # 점프 포인트 탐색
+    # ---------------------------------------------------------------
+    def _jump_horizontal(self, x: int, y: int, dx: int, gx: int, gy: int) -> int:
+        """(x, y)에서 dx 방향 가로 점프 - 다음 점프 포인트의 x (없으면 -1)"""
+        row = self.rows[y]
+        if dx > 0:
+            end = row.find(1, x + 1)
+            if end < 0:
+                end = self.width
+            stop = self.forced_right[y].find(1, x + 1, end)
+            if gy == y and x < gx < end and (stop < 0 or gx < stop):
+                return gx
+            return stop
+        end = row.rfind(1, 0, x)
+        stop = self.forced_left[y].rfind(1, end + 1, x)
+        if gy == y and end < gx < x and (stop < 0 or gx > stop):
+            return gx
+        return stop
+
+    def _jump_vertical(self, x: int, y: int, dy: int, gx: int, gy: int) -> int:
+        """(x, y)에서 dy 방향 세로 점프 - 다음 점프 포인트의 y (없으면 -1)"""
+        rows, h = self.rows, self.height
+        while True:
+            y += dy
+            if y < 0 or y >= h or rows[y][x]:
+                return -1
+            if y == gy and x == gx:
+                return y
+            if self._jump_horizontal(x, y, 1, gx, gy) >= 0 or self._jump_horizontal(x, y, -1, gx, gy) >= 0:
+                return y
+
+    def jps(self, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        """4방향 점프 포인트 탐색 - astar()와 같은 길이의 연속된 셀 목록 (경로 없으면 None)"""
+        if not (self.is_free(*start) and self.is_free(*goal)):
+            return None
+        w, h, rows = self.width, self.height, self.rows
+        gx, gy = goal
+        s, t = start[1] * w + start[0], gy * w + gx
+        gen = self._next_generation()
+        g, parent, seen, closed = self.g, self.parent, self.seen, self.closed
+        jump_h, jump_v = self._jump_horizontal, self._jump_vertical
+
+        g[s], parent[s], seen[s] = 0, -1, gen
+        heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, s)]
+        expanded = 0
+        while heap:
+            _, _, c = heappop(heap)
+            if closed[c] == gen:
+                continue
+            closed[c] = gen
+            expanded += 1
+            if c == t:
+                self.expanded = expanded
+                return self._cell_path(t)
+            x, y = c % w, c // w
+            p = parent[c]
+
+            # 진행 방향에 따른 후속 점프 포인트 (시작점은 4방향 모두)
+            successors = []
+            if p < 0:
+                for dx in (1, -1):
+                    nx = jump_h(x, y, dx, gx, gy)
+                    if nx >= 0:
+                        successors.append((nx, y))
+                for dy in (1, -1):
+                    ny = jump_v(x, y, dy, gx, gy)
+                    if ny >= 0:
+                        successors.append((x, ny))
+            elif p // w == y:
+                dx = 1 if x > p % w else -1
+                nx = jump_h(x, y, dx, gx, gy)
+                if nx >= 0:
+                    successors.append((nx, y))
+                for dy in (1, -1):
+                    ny = y + dy
+                    if 0 <= ny < h and not rows[ny][x] and rows[ny][x - dx]:
+                        ny = jump_v(x, y, dy, gx, gy)
+                        if ny >= 0:
+                            successors.append((x, ny))
+            else:
+                dy = 1 if y > p // w else -1
+                ny = jump_v(x, y, dy, gx, gy)
+                if ny >= 0:
+                    successors.append((x, ny))
+                for dx in (1, -1):
+                    nx = jump_h(x, y, dx, gx, gy)
+                    if nx >= 0:
+                        successors.append((nx, y))
+
+            gc = g[c]
+            for nx, ny in successors:
+                n = ny * w + nx
+                if closed[n] == gen:
+                    continue
+                ng = gc + abs(nx - x) + abs(ny - y)
+                if seen[n] != gen or ng < g[n]:
+                    seen[n], g[n], parent[n] = gen, ng, c
+                    hn = abs(nx - gx) + abs(ny - gy)
+                    heappush(heap, (ng + hn, hn, n))
+        self.expanded = expanded
+        return None
+
+    def smooth(self, path: Sequence[Cell]) -> List[Cell]:
+        """연속된 셀 경로를 시야가 닿는 꺾임 셀만 남긴 목록으로 (smooth_cells)"""
+        return smooth_cells(self.width, self.cells, path)
+
+    def _cell_path(self, t: int) -> List[Cell]:
+        """parent 배열 역추적 - 점프 포인트 사이는 직선이므로 중간 셀을 채워 연속된 셀 목록으로 반환"""
+        w, parent = self.width, self.parent
+        nodes = []
+        c = t
+        while c >= 0:
+            nodes.append(c)
+            c = parent[c]
+        nodes.reverse()
+
+        path = [(nodes[0] % w, nodes[0] // w)]
+        for c in nodes[1:]:
+            x, y = c % w, c // w
+            px, py = path[-1]
+            sx = (x > px) - (x < px)
+            sy = (y > py) - (y < py)
+            while (px, py) != (x, y):
+                px, py = px + sx, py + sy
+                path.append((px, py))
+        return path
+
+
+def corner_points(cells: Sequence[Cell], cell_size: float) -> List[List[float]]:
+    """셀 목록에서 방향이 바뀌는 셀의 중심 좌표만 (픽셀, 시작/끝 셀 제외, smooth_cells 결과에도 사용)"""
+    half = cell_size / 2.0
+    points = []
+    for i in range(1, len(cells) - 1):
+        (ax, ay), (bx, by), (cx, cy) = cells[i - 1], cells[i], cells[i + 1]
+        if (bx - ax) * (cy - by) != (by - ay) * (cx - bx) or (bx - ax) * (cx - bx) + (by - ay) * (cy - by) <= 0:
+            points.append([bx * cell_size + half, by * cell_size + half])
+    return points
+
+
+def line_of_sight(width: int, cells: Sequence[int], a: Cell, b: Cell,
+                  dynamic: Optional[Sequence[int]] = None) -> bool:
+    """셀 a 중심에서 셀 b 중심까지의 선분이 막힌 셀을 지나지 않는지 (양 끝 셀은 검사하지 않음)
+
+    dynamic이 있으면 값이 0이 아닌 셀(정차 차량 등)도 막힌 것으로 봅니다.
+    """
+    x, y = a
+    dx, dy = abs(b[0] - x), abs(b[1] - y)
+    sx = 1 if b[0] > x else -1
+    sy = 1 if b[1] > y else -1
+    ix = iy = 0
+    while ix < dx or iy < dy:
+        # 다음 세로 경계((0.5 + ix) / dx)와 가로 경계((0.5 + iy) / dy) 중 먼저 만나는 쪽으로 한 칸
+        d = (1 + 2 * ix) * dy - (1 + 2 * iy) * dx
+        if d == 0:
+            # 모서리를 정확히 지남 - 양옆 셀이 모두 열려 있어야 함
+            for side in (y * width + x + sx, (y + sy) * width + x):
+                if cells[side] or (dynamic is not None and dynamic[side]):
+                    return False
+            x += sx
+            y += sy
+            ix += 1
+            iy += 1
+        elif d < 0:
+            x += sx
+            ix += 1
+        else:
+            y += sy
+            iy += 1
+        if ix == dx and iy == dy:
+            break
+        c = y * width + x
+        if cells[c] or (dynamic is not None and dynamic[c]):
+            return False
+    return True
+
+
+def smooth_cells(width: int, cells: Sequence[int], path: Sequence[Cell],
+                 dynamic: Optional[Sequence[int]] = None) -> List[Cell]:
+    """연속된 셀 경로의 문자열 당기기 - 시작/끝 셀과 시야가 끊기기 직전의 꺾임 셀만 남김
+
+    기준 셀에서 경로를 따라가며 다음 셀까지 시야가 닿지 않으면 현재 셀을 꺾임으로 남기고 기준을 옮깁니다.
+    결과의 인접한 두 셀은 항상 시야가 닿으므로 직선으로 이어 주행할 수 있습니다.
+    """
+    if len(path) <= 2:
+        return list(path)
+    smoothed = [path[0]]
+    anchor = path[0]
+    for i in range(1, len(path) - 1):
+        if not line_of_sight(width, cells, anchor, path[i + 1], dynamic):
+            anchor = path[i]
+            smoothed.append(anchor)
+    smoothed.append(path[-1])
+    return smoothed
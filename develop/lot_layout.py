@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+주차장 배치 상수 - lot_map.json을 컴파일한 결과(lot_map.load_lot_map)를 기존 상수 이름으로 노출
+탑뷰/HUD/컨트롤러/route_sender는 이 모듈만 import하고 좌표를 직접 하드코딩하지 않습니다.
+"""
+
+from typing import Dict, List, Tuple
+
+from lot_map import load_lot_map
+
+Rect = Tuple[float, float, float, float]  # (x, y, w, h)
+
+LOT_MAP = load_lot_map()
+
+SCENE_W, SCENE_H = LOT_MAP.scene
+PIXELS_PER_METER = LOT_MAP.pixels_per_meter
+ENTRANCE_POINT: Tuple[float, float] = tuple(LOT_MAP.entrance)  # 입차 경로 시작점 (주차장 입구)
+
+# 주차구역 사각형 (x, y, w, h)
+PARKING_SPOT_RECTS: Dict[int, Rect] = LOT_MAP.spot_rects
+
+# 주차구역 종류 ('disabled' 장애인, 'general' 일반, 'ev' 전기차)
+PARKING_SPOT_TYPES: Dict[int, str] = LOT_MAP.spot_types
+SPOTS_BY_TYPE: Dict[str, List[int]] = LOT_MAP.spots_by_type
+
+# 지도 파일에서 점유로 표시한 주차구역 (컨트롤러 점유 비트셋의 초기 상태)
+INITIALLY_OCCUPIED_SPOTS: List[int] = LOT_MAP.initially_occupied
+
+# 주차구역별 진입 웨이포인트
+PARKING_SPOT_WAYPOINTS: Dict[int, List[float]] = LOT_MAP.spot_waypoints
+SPOT_WAYPOINT_TOLERANCE = LOT_MAP.spot_waypoint_tolerance  # 웨이포인트로 주차구역을 판별할 때 허용 오차 (픽셀)
+
+MANDATORY_WAYPOINT = LOT_MAP.mandatory_waypoint
+
+# 목적지 입구 구역
+ENTRANCE_ZONES: Dict[str, Rect] = LOT_MAP.entrances
+
+# 입출차 구역 (차량 진입/출구)
+GATE_NAME, GATE_ZONE = LOT_MAP.gate
+
+# 통행 불가 구역과 탑뷰 표시 방식 ('hatched' 빗금 영역, 'block' 장애물 블록)
+NO_GO_ZONES: Dict[str, Rect] = LOT_MAP.no_go_zones
+NO_GO_STYLES: Dict[str, str] = LOT_MAP.no_go_styles
+
+# 통로 바닥 영역 (탑뷰 배경)
+FLOOR_AREAS: List[Rect] = LOT_MAP.floor_areas
+
+# 통로(aisle) 네트워크 - 경로 웨이포인트가 놓이는 직선 통로의 노드/간선
+# 주차구역 진입 웨이포인트는 모두 통로 위에 있으므로 'spot_N' 노드로 포함
+AISLE_NODES: Dict[str, Tuple[float, float]] = LOT_MAP.aisle_nodes
+AISLE_EDGES: List[Tuple[str, str]] = LOT_MAP.aisle_edges
+AISLE_ONE_WAY: List[Tuple[str, str]] = LOT_MAP.aisle_one_way  # (from, to) 방향으로만 통행
+
+
+def rect_contains(rect: Rect, x: float, y: float) -> bool:
+    """경계 포함 사각형 판정 (기존 detect_parking_spot과 동일하게 <= 비교)"""
+    rx, ry, rw, rh = rect
+    return rx <= x <= rx + rw and ry <= y <= ry + rh
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+주차장 지도 컴파일러 - lot_map.json 한 파일(주차구역, 통로, 입구, 통행 불가 구역, 일방통행 통로)을
+통로 그래프(노드 간 최단 거리/다음 노드 표), 점유 격자, 주차구역 조회 표로 한 번 컴파일하고 디스크에 캐시
+
+기존에는 route_sender/navigation_hud/parking_topview가 주차구역 웨이포인트 딕셔너리를,
+탑뷰 build_occupancy/build_static_layout이 사각형 좌표를 각자 하드코딩했습니다.
+이제 모든 모듈이 lot_layout을 통해 이 컴파일 결과를 읽습니다.
+캐시 파일 이름은 지도 파일 내용(+ 컴파일러 버전)의 SHA-256이므로 지도를 고치면 다음 시작 시 다시 컴파일됩니다.
+
+지도 파일 형식은 develop/README.md의 '주차장 지도' 항목 참고
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from math import sqrt
+from typing import Any, Dict, List, Optional, Tuple
+
+from distance_fields import DistanceFields, compile_distance_fields
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOT_MAP_PATH = os.environ.get('LOT_MAP_PATH') or os.path.join(_BASE_DIR, 'lot_map.json')
+CACHE_DIR = os.path.join(_BASE_DIR, '.lot_cache')
+COMPILER_VERSION = 4    # 컴파일 결과 형식이 바뀌면 올림 (캐시 키에 포함)
+
+DEFAULT_CELL = 30       # 점유 격자 기본 셀 크기 (탑뷰/UI_testing의 CELL)
+DEFAULT_MARGIN = 10     # 점유 격자 장애물 여유 폭 (MARGIN)
+
+SPOT_TYPES = ('general', 'disabled', 'ev')
+GATE_TARGET = 'gate'    # 거리장 목표 이름 - 입출차 지점 (입차 시작점이자 출차 목적지)
+
+Rect = Tuple[float, float, float, float]  # (x, y, w, h)
+
+
+class LotMapError(ValueError):
+    """지도 파일 형식 오류"""
+
+
+# ===================================================================
+# 컴파일 단계
+# ===================================================================
+def content_hash(raw: bytes) -> str:
+    """지도 파일 내용 해시 (캐시 키)"""
+    digest = hashlib.sha256(f"v{COMPILER_VERSION}\n".encode())
+    digest.update(raw)
+    return digest.hexdigest()
+
+
+def all_pairs_shortest_paths(n: int, edges: List[Tuple[int, int, float, bool]]
+                             ) -> Tuple[List[List[float]], List[List[int]]]:
+    """노드 간 최단 거리와 다음 노드 표 (Floyd-Warshall, one_way 간선은 u → v 방향만)"""
+    inf = float('inf')
+    dist = [[0.0 if i == j else inf for j in range(n)] for i in range(n)]
+    nxt = [[j if i == j else -1 for j in range(n)] for i in range(n)]
+    for u, v, length, one_way in edges:
+        if length < dist[u][v]:
+            dist[u][v] = length
+            nxt[u][v] = v
+        if not one_way and length < dist[v][u]:
+            dist[v][u] = length
+            nxt[v][u] = u
+    for k in range(n):
+        dk = dist[k]
+        for i in range(n):
+            di = dist[i]
+            dik = di[k]
+            if dik == inf:
+                continue
+            ni, nik = nxt[i], nxt[i][k]
+            for j in range(n):
+                alt = dik + dk[j]
+                if alt < di[j]:
+                    di[j] = alt
+                    ni[j] = nik
+    return dist, nxt
+
+
+def compile_occupancy(scene_w: int, scene_h: int, rects: List[Rect],
+                      cell: int = DEFAULT_CELL, margin: int = DEFAULT_MARGIN) -> Dict[str, Any]:
+    """통행 불가 사각형을 margin만큼 넓혀 셀 격자에 표시 (기존 build_occupancy와 같은 규칙, 1 = 점유)"""
+    gx, gy = (scene_w + cell - 1) // cell, (scene_h + cell - 1) // cell
+    cells = bytearray(gx * gy)
+    for x, y, w, h in rects:
+        x0, y0 = max(0, x - margin), max(0, y - margin)
+        x1, y1 = min(scene_w, x + w + margin), min(scene_h, y + h + margin)
+        if x1 <= x0 or y1 <= y0:
+            continue
+        cx0, cy0 = int(x0 // cell), int(y0 // cell)
+        cx1, cy1 = min(gx - 1, int((x1 - 1) // cell)), min(gy - 1, int((y1 - 1) // cell))
+        row = b'\x01' * (cx1 - cx0 + 1)
+        for cy in range(cy0, cy1 + 1):
+            cells[cy * gx + cx0:cy * gx + cx1 + 1] = row
+    return {'cell': cell, 'margin': margin, 'width': gx, 'height': gy, 'cells': bytes(cells)}
+
+
+def _rect(value, where: str) -> Rect:
+    if not isinstance(value, (list, tuple)) or len(value) != 4:
+        raise LotMapError(f"{where}: rect는 [x, y, w, h] 형식이어야 합니다 ({value!r})")
+    return tuple(value)
+
+
+def _point(value, where: str) -> Tuple[float, float]:
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise LotMapError(f"{where}: 좌표는 [x, y] 형식이어야 합니다 ({value!r})")
+    return tuple(value)
+
+
+def compile_lot_map(spec: Dict[str, Any], digest: str = '') -> Dict[str, Any]:
+    """지도 정의(JSON 객체) → 컴파일 표 (pickle 가능한 기본 타입만 사용)"""
+    scene_w, scene_h = spec['scene']['width'], spec['scene']['height']
+
+    # 주차구역 조회 표
+    spot_ids: List[int] = []
+    spot_rects: Dict[int, Rect] = {}
+    spot_types: Dict[int, str] = {}
+    spot_waypoints: Dict[int, List[float]] = {}
+    for spot in spec['spots']:
+        sid = spot['id']
+        if sid in spot_rects:
+            raise LotMapError(f"주차구역 번호 중복: {sid}")
+        if spot['type'] not in SPOT_TYPES:
+            raise LotMapError(f"주차구역 {sid}: 알 수 없는 종류 {spot['type']!r} (허용: {SPOT_TYPES})")
+        spot_ids.append(sid)
+        spot_rects[sid] = _rect(spot['rect'], f"주차구역 {sid}")
+        spot_types[sid] = spot['type']
+        spot_waypoints[sid] = list(_point(spot['waypoint'], f"주차구역 {sid}"))
+    spots_by_type = {t: [sid for sid in spot_ids if spot_types[sid] == t] for t in SPOT_TYPES}
+    initially_occupied = [spot['id'] for spot in spec['spots'] if spot.get('occupied', False)]
+    waypoint_spot = {tuple(wp): sid for sid, wp in spot_waypoints.items()}
+
+    entrances = {e['name']: _rect(e['rect'], e['name']) for e in spec.get('entrances', [])}
+    no_go_zones = {z['name']: _rect(z['rect'], z['name']) for z in spec.get('no_go_zones', [])}
+    no_go_styles = {z['name']: z.get('style', 'block') for z in spec.get('no_go_zones', [])}
+    gate = spec['gate']
+
+    # UWB 앵커 표 - id → (x, y, 태그 높이 기준 앵커 높이), 모두 픽셀
+    anchors: Dict[str, Tuple[float, float, float]] = {}
+    for anchor in spec.get('anchors', []):
+        aid = str(anchor['id'])
+        if aid in anchors:
+            raise LotMapError(f"UWB 앵커 id 중복: {aid}")
+        x, y = _point(anchor['position'], f"UWB 앵커 {aid}")
+        anchors[aid] = (float(x), float(y), float(anchor.get('height', 0)))
+
+    # 통로 그래프 - 명시한 노드 + 주차구역 진입 웨이포인트 노드('spot_N')
+    aisle_nodes: Dict[str, Tuple[float, float]] = {
+        name: _point(xy, f"통로 노드 {name}") for name, xy in spec['aisles']['nodes'].items()
+    }
+    aisle_nodes.update({f'spot_{sid}': tuple(wp) for sid, wp in spot_waypoints.items()})
+    node_names = list(aisle_nodes)
+    node_index = {name: i for i, name in enumerate(node_names)}
+
+    aisle_edges: List[Tuple[str, str]] = []
+    aisle_one_way: List[Tuple[str, str]] = []
+    weighted = []
+    for edge in spec['aisles']['edges']:
+        a, b = edge['from'], edge['to']
+        for name in (a, b):
+            if name not in node_index:
+                raise LotMapError(f"통로 간선 {a} → {b}: 알 수 없는 노드 {name!r}")
+        (x1, y1), (x2, y2) = aisle_nodes[a], aisle_nodes[b]
+        one_way = bool(edge.get('one_way', False))
+        aisle_edges.append((a, b))
+        if one_way:
+            aisle_one_way.append((a, b))
+        weighted.append((node_index[a], node_index[b], sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2), one_way))
+
+    node_dist, node_next = all_pairs_shortest_paths(len(node_names), weighted)
+    if aisle_one_way:
+        # 맵 매칭은 역주행도 실제 이동이므로 방향을 무시한 거리표를 따로 사용
+        match_dist, _ = all_pairs_shortest_paths(len(node_names), [(u, v, l, False) for u, v, l, _ in weighted])
+    else:
+        match_dist = node_dist
+
+    if 'entrance' in node_index:
+        src = node_index['entrance']
+        for sid in spot_ids:
+            if node_dist[src][node_index[f'spot_{sid}']] == float('inf'):
+                raise LotMapError(f"주차구역 {sid}: 입구에서 통로로 도달할 수 없습니다")
+
+    # 점유 격자 - 입출차/입구/통행 불가/주차구역은 통행 불가 (경로 탐색은 통로 위에서만)
+    blocked = [_rect(gate['rect'], gate['name'])] + list(entrances.values()) + \
+        list(no_go_zones.values()) + [spot_rects[sid] for sid in spot_ids]
+
+    return {
+        'version': COMPILER_VERSION,
+        'hash': digest,
+        'name': spec.get('name', ''),
+        'scene': (scene_w, scene_h),
+        'pixels_per_meter': spec.get('pixels_per_meter', 50),
+        'entrance': list(_point(spec['entrance'], "entrance")),
+        'mandatory_waypoint': list(_point(spec['mandatory_waypoint'], "mandatory_waypoint")),
+        'spot_waypoint_tolerance': spec.get('spot_waypoint_tolerance', 50),
+        'gate': (gate['name'], _rect(gate['rect'], gate['name'])),
+        'floor_areas': [_rect(r, "floor_areas") for r in spec.get('floor_areas', [])],
+        'entrances': entrances,
+        'no_go_zones': no_go_zones,
+        'no_go_styles': no_go_styles,
+        'anchors': anchors,
+        'spot_ids': spot_ids,
+        'spot_rects': spot_rects,
+        'spot_types': spot_types,
+        'spot_waypoints': spot_waypoints,
+        'spots_by_type': spots_by_type,
+        'initially_occupied': initially_occupied,
+        'waypoint_spot': waypoint_spot,
+        'aisle_nodes': aisle_nodes,
+        'aisle_edges': aisle_edges,
+        'aisle_one_way': aisle_one_way,
+        'node_dist': node_dist,
+        'node_next': node_next,
+        'match_dist': match_dist,
+        'blocked_rects': blocked,
+        'occupancy': {
+            (DEFAULT_CELL, DEFAULT_MARGIN): compile_occupancy(scene_w, scene_h, blocked),
+        },
+        'fields': {},
+    }
+
+
+def field_targets(tables: Dict[str, Any]) -> Dict[str, Tuple[float, float]]:
+    """거리장 목표 - 주차구역 진입 웨이포인트('spot_N'), 입출차 지점('gate'), 목적지 입구(구역 중심)"""
+    targets = {f'spot_{sid}': tuple(tables['spot_waypoints'][sid]) for sid in tables['spot_ids']}
+    targets[GATE_TARGET] = tuple(tables['entrance'])
+    for name, (x, y, w, h) in tables['entrances'].items():
+        targets[name] = (x + w / 2.0, y + h / 2.0)
+    return targets
+
+
+# ===================================================================
+# 컴파일 결과
+# ===================================================================
+class OccupancyGrid:
+    """점유 격자 (cells[cy * width + cx] == 1 이면 통행 불가)"""
+
+    __slots__ = ('cell', 'margin', 'width', 'height', 'cells')
+
+    def __init__(self, cell: int, margin: int, width: int, height: int, cells: bytes):
+        self.cell = cell
+        self.margin = margin
+        self.width = width
+        self.height = height
+        self.cells = cells
+
+    def is_free(self, cx: int, cy: int) -> bool:
+        return 0 <= cx < self.width and 0 <= cy < self.height and self.cells[cy * self.width + cx] == 0
+
+
+class CompiledLotMap:
+    """컴파일된 주차장 지도 (표는 속성으로 노출, 다른 셀 크기의 점유 격자와 거리장은 처음 요청 시 컴파일 후 캐시에 추가)"""
+
+    def __init__(self, tables: Dict[str, Any], cache_path: Optional[str] = None):
+        self.tables = tables
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        for key, value in tables.items():
+            if key not in ('occupancy', 'fields'):
+                setattr(self, key, value)
+
+    def occupancy(self, cell: int = DEFAULT_CELL, margin: int = DEFAULT_MARGIN) -> OccupancyGrid:
+        key = (cell, margin)
+        with self._lock:
+            grids = self.tables['occupancy']
+            grid = grids.get(key)
+            if grid is None:
+                w, h = self.scene
+                grid = grids[key] = compile_occupancy(w, h, self.blocked_rects, cell, margin)
+                if self.cache_path:
+                    _write_cache(self.cache_path, self.tables)
+        return OccupancyGrid(**grid)
+
+    def distance_fields(self, cell: int = DEFAULT_CELL, margin: int = DEFAULT_MARGIN) -> DistanceFields:
+        """목표별 거리장/방향표 (처음 요청 시 컴파일 후 캐시에 추가)"""
+        grid = self.occupancy(cell, margin)
+        key = (cell, margin)
+        with self._lock:
+            fields = self.tables['fields']
+            compiled = fields.get(key)
+            if compiled is None:
+                compiled = fields[key] = compile_distance_fields(
+                    grid.width, grid.height, grid.cells, cell, field_targets(self.tables))
+                if self.cache_path:
+                    _write_cache(self.cache_path, self.tables)
+        return DistanceFields(compiled, grid.cells)
+
+
+def _write_cache(path: str, tables: Dict[str, Any]):
+    """임시 파일에 쓴 뒤 교체 (동시에 시작한 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록)"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"⚠️ 주차장 지도 캐시 저장 실패 ({path}): {e}")
+
+
+_loaded: Dict[str, CompiledLotMap] = {}
+_load_lock = threading.Lock()
+
+
+def load_lot_map(path: str = LOT_MAP_PATH, cache_dir: Optional[str] = CACHE_DIR) -> CompiledLotMap:
+    """지도 파일을 읽어 컴파일 결과 반환 (프로세스 안에서는 1회, 디스크 캐시가 있으면 컴파일 생략)
+
+    cache_dir=None이면 디스크 캐시를 사용하지 않습니다.
+    """
+    path = os.path.abspath(path)
+    with _load_lock:
+        if path in _loaded:
+            return _loaded[path]
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = content_hash(raw)
+        cache_path = os.path.join(cache_dir, f"lot_map_{digest[:16]}.pickle") if cache_dir else None
+
+        tables = None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    tables = pickle.load(f)
+                if tables.get('hash') != digest:
+                    tables = None
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+                print(f"⚠️ 주차장 지도 캐시 손상, 다시 컴파일합니다: {e}")
+                tables = None
+
+        if tables is None:
+            try:
+                spec = json.loads(raw.decode('utf-8'))
+            except ValueError as e:
+                raise LotMapError(f"{path}: JSON 형식 오류 - {e}") from e
+            tables = compile_lot_map(spec, digest)
+            if cache_path:
+                _write_cache(cache_path, tables)
+            print(f"🗺️ 주차장 지도 컴파일: {os.path.basename(path)} ({digest[:12]})")
+
+        lot = _loaded[path] = CompiledLotMap(tables, cache_path)
+        return lot
+
+
+def unload_lot_map(path: str) -> bool:
+    """프로세스 캐시에서 지도 제거 (사용하지 않는 층의 메모리 해제용, 디스크 캐시는 유지) - 제거했으면 True"""
+    with _load_lock:
+        return _loaded.pop(os.path.abspath(path), None) is not None
+
+
+def rebuild(path: str = LOT_MAP_PATH, cache_dir: str = CACHE_DIR, cells: Tuple[int, ...] = (DEFAULT_CELL,),
+            margin: int = DEFAULT_MARGIN, clean: bool = False) -> CompiledLotMap:
+    """지도 파일이 바뀌었을 때 캐시를 지우고 그래프/점유 격자/거리장을 미리 컴파일"""
+    import time
+    path = os.path.abspath(path)
+    with open(path, 'rb') as f:
+        digest = content_hash(f.read())
+    cache_path = os.path.join(cache_dir, f"lot_map_{digest[:16]}.pickle")
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            full = os.path.join(cache_dir, name)
+            if full == cache_path or (clean and name.startswith('lot_map_')):
+                os.remove(full)
+    _loaded.pop(path, None)
+
+    started = time.perf_counter()
+    lot = load_lot_map(path, cache_dir)
+    for cell in cells:
+        t0 = time.perf_counter()
+        fields = lot.distance_fields(cell, margin)
+        grid = lot.occupancy(cell, margin)
+        print(f"   CELL={cell}: 격자 {grid.width}x{grid.height}, 거리장 {len(fields.targets)}개 "
+              f"({(time.perf_counter() - t0) * 1e3:.0f}ms)")
+    size = os.path.getsize(cache_path) if os.path.exists(cache_path) else 0
+    print(f"✅ 주차장 지도 재컴파일 완료: {(time.perf_counter() - started) * 1e3:.0f}ms, 캐시 {size / 1024:.0f}KB")
+    print(f"   {cache_path}")
+    return lot
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='주차장 지도 컴파일 (통로 그래프, 점유 격자, 거리장)')
+    parser.add_argument('--map', default=LOT_MAP_PATH, help='지도 파일 경로 (기본: develop/lot_map.json)')
+    parser.add_argument('--rebuild', action='store_true', help='캐시를 지우고 다시 컴파일')
+    parser.add_argument('--cell', type=int, nargs='+', default=[DEFAULT_CELL],
+                        help=f'거리장을 미리 만들 점유 격자 셀 크기 (기본: {DEFAULT_CELL})')
+    parser.add_argument('--margin', type=int, default=DEFAULT_MARGIN, help=f'장애물 여유 폭 (기본: {DEFAULT_MARGIN})')
+    parser.add_argument('--clean', action='store_true', help='이전 지도 버전의 캐시 파일도 삭제')
+    args = parser.parse_args()
+
+    if args.rebuild or args.clean:
+        rebuild(args.map, cells=tuple(args.cell), margin=args.margin, clean=args.clean)
+    else:
+        lot = load_lot_map(args.map)
+        for cell in args.cell:
+            lot.distance_fields(cell, args.margin)
+        print(f"🗺️ {lot.name}: 주차구역 {len(lot.spot_ids)}개, 통로 노드 {len(lot.aisle_nodes)}개, "
+              f"간선 {len(lot.aisle_edges)}개 (일방통행 {len(lot.aisle_one_way)}개)")
@@ -13,12 +13,42 @@ import json
 import threading
 import time
 from datetime import datetime
-from typing import Optional, Dict, Any
-from math import sqrt, atan2, degrees
+from typing import Optional, Dict, Any, List
 import zmq
 import signal
 
-# QPointF는 parking_topview에서만 사용하므로 여기서는 튜플로 처리
+# 경로 안내 계산은 Qt 의존성 없는 공용 모듈(navigation_core)을 사용
+from navigation_core import RoutePath, SpeedEstimator, route_points_from_waypoints
+from route_geometry import RouteGeometry
+from announcement_schedule import AnnouncementSchedule
+from geofence import GeofenceTracker, ZONE_SPOT
+from map_matching import OnlineMapMatcher
+from position_filter import VehicleKalmanFilter
+from pose_resampler import PoseResampler, DEFAULT_RATE_HZ
+from off_route import OffRouteDetector
+from reroute import LocalRerouter
+from dynamic_planner import DynamicReplanner
+from spot_occupancy import SpotOccupancy, DESTINATION_NAMES
+from exit_routes import ExitRoute, ExitRouteCache
+from trilateration import Trilaterator
+from planner_pool import PlannerPool, DEFAULT_DEADLINE
+from payment_client import PaymentClient
+
+# 위치 데이터에 vehicle_id가 없을 때 사용하는 기본 차량 ID (단일 차량 운용)
+DEFAULT_VEHICLE_ID = 'vehicle_1'
+
+# 출차 신호 좌표 (parking_topview/UI_testing이 이 좌표를 받으면 출차 처리) - 필터/맵 매칭을 거치지 않고 그대로 전달
+EXIT_SIGNAL_POSITION = (9000, 9000)
+
+POSE_METRICS_LOG_INTERVAL = 10.0  # 포즈 스트림 지표 출력 주기 (초)
+OCCUPANCY_SNAPSHOT_INTERVAL = 5.0  # 주차구역 점유 전체 상태 재전송 주기 (초, 늦게 연결한 탑뷰 동기화)
+
+# 팀원 재할당 서버 (로컬 재탐색 후 비동기로 요청, 응답 경로는 waypoint_reassignment로 수신되어 로컬 경로를 대체)
+REASSIGN_SERVER_HOST = '192.168.0.111'
+REASSIGN_SERVER_PORT = 9999
+REASSIGN_TIMEOUT = 10.0
+
+PLANNER_WORKERS = 2  # 격자 경로 탐색 프로세스 수 (수신 스레드 밖에서 JPS 실행)
 
 # ===================================================================
 # ZeroMQ 브로드캐스터 클래스
@@ -31,6 +61,7 @@ class DataBroadcaster:
         self.context = None
         self.pub_socket = None
         self.running = False
+        self.send_lock = threading.Lock()  # PUB 소켓은 스레드 안전하지 않으므로 송신 직렬화
         
     def start(self):
         """ZeroMQ Publisher 시작"""
@@ -65,7 +96,8 @@ class DataBroadcaster:
                 "sync_id": f"pos_{now.timestamp()}"  # 동기화 ID 추가
             }
             topic = "vehicle_position"
-            self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
+            with self.send_lock:
+                self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
             print(f"📡 위치 데이터 전송: ({data.get('x', 0):.1f}, {data.get('y', 0):.1f}) [ID: {message['sync_id']}]")
             
         except Exception as e:
@@ -83,7 +115,8 @@ class DataBroadcaster:
                 "data": data
             }
             topic = "waypoint_data"
-            self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
+            with self.send_lock:
+                self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
             print(f"📡 웨이포인트 데이터 전송: {len(data.get('waypoints', []))}개 포인트")
             
         except Exception as e:
@@ -106,7 +139,8 @@ class DataBroadcaster:
                 "position_sync": data.get('position_sync_id')  # 위치 데이터와 연결
             }
             topic = "navigation_instruction"
-            self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
+            with self.send_lock:
+                self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
             print(f"📡 네비게이션 안내 전송: {data.get('instruction', 'N/A')} [ID: {message['sync_id']}]")
             
         except Exception as e:
@@ -124,12 +158,116 @@ class DataBroadcaster:
                 "data": data
             }
             topic = "payment_data"
-            self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
+            with self.send_lock:
+                self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
             print(f"📡 정산 데이터 전송: 금액 {data.get('amount', 0):,}원")
             
         except Exception as e:
             print(f"❌ 정산 데이터 전송 실패: {e}")
     
+    def publish_geofence_event(self, data: Dict[str, Any]):
+        """지오펜스 이벤트 브로드캐스트 (구역 진입/이탈/체류)"""
+        if not self.running or not self.pub_socket:
+            return
+            
+        try:
+            now = datetime.now()
+            message = {
+                "timestamp": now.isoformat(),
+                "timestamp_unix": now.timestamp(),
+                "type": "geofence",
+                "data": data
+            }
+            topic = "geofence_event"
+            with self.send_lock:
+                self.pub_socket.send_string(f"{topic} {json.dumps(message, ensure_ascii=False)}")
+            print(f"📡 지오펜스 이벤트 전송: {data.get('name')} {data.get('event')}")
+            
+        except Exception as e:
+            print(f"❌ 지오펜스 이벤트 전송 실패: {e}")
+    
+    def publish_off_route_event(self, data: Dict[str, Any]):
+        """경로 이탈/복귀 이벤트 브로드캐스트"""
+        if not self.running or not self.pub_socket:
+            return
+            
+        try:
+            now = datetime.now()
+            message = {
+                "timestamp": now.isoformat(),
+                "timestamp_unix": now.timestamp(),
+                "type": "off_route",
+                "data": data
+            }
+            topic = "off_route"
+            with self.send_lock:
+                self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
+            print(f"📡 경로 이탈 이벤트 전송: {data.get('event')} (거리 {data.get('distance')}픽셀)")
+            
+        except Exception as e:
+            print(f"❌ 경로 이탈 이벤트 전송 실패: {e}")
+    
+    def publish_reassignment(self, data: Dict[str, Any]):
+        """재할당 경로 브로드캐스트 (waypoint_data 토픽, 메시지 type으로 재할당 표시)"""
+        if not self.running or not self.pub_socket:
+            return
+            
+        try:
+            message = {
+                "timestamp": datetime.now().isoformat(),
+                "type": "waypoint_reassignment",  # 재할당 타입으로 브로드캐스트
+                "data": data
+            }
+            topic = "waypoint_data"  # waypoint_data 토픽으로 브로드캐스트
+            with self.send_lock:
+                self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
+            
+        except Exception as e:
+            print(f"❌ 재할당 경로 전송 실패: {e}")
+    
+    def publish_occupancy(self, data: Dict[str, Any], snapshot: bool = False):
+        """주차구역 점유 변경(비트셋 diff) 또는 전체 상태 브로드캐스트"""
+        if not self.running or not self.pub_socket:
+            return
+            
+        try:
+            message = {
+                "timestamp": datetime.now().isoformat(),
+                "type": "occupancy_snapshot" if snapshot else "occupancy_diff",
+                "data": data
+            }
+            topic = "occupancy"
+            with self.send_lock:
+                self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
+            if not snapshot:
+                print(f"📡 점유 변경 전송: 주차 {data.get('set')}, 출차 {data.get('cleared')} (v{data.get('version')})")
+            
+        except Exception as e:
+            print(f"❌ 점유 상태 전송 실패: {e}")
+    
+    def publish_pose_stream(self, poses: List[Dict[str, Any]], tick: int, route_vehicle_id: Optional[str] = None):
+        """고정 주기 포즈 브로드캐스트 (60Hz이므로 로그 출력 없음)
+
+        poses에는 추적 중인 모든 차량이 들어가므로 안내 대상 차량 id를 함께 보냄 (화면은 이 차량 포즈로 아이콘 이동)
+        """
+        if not self.running or not self.pub_socket:
+            return
+            
+        try:
+            now = datetime.now()
+            message = {
+                "timestamp_unix": now.timestamp(),
+                "type": "pose_stream",
+                "tick": tick,
+                "data": {"poses": poses, "route_vehicle_id": route_vehicle_id}
+            }
+            topic = "pose_stream"
+            with self.send_lock:
+                self.pub_socket.send_string(f"{topic} {json.dumps(message)}")
+            
+        except Exception as e:
+            print(f"❌ 포즈 스트림 전송 실패: {e}")
+    
     def stop(self):
         """ZeroMQ Publisher 종료"""
         try:
@@ -150,7 +288,10 @@ class ExternalServerReceiver:
     """외부 관제 서버로부터 TCP/IP로 데이터 수신"""
     
     def __init__(self, host='0.0.0.0', port=9999, broadcaster: DataBroadcaster = None, 
-                 payment_server_host='localhost', payment_server_port=8888):
+                 payment_server_host='localhost', payment_server_port=8888,
+                 pose_rate_hz: float = DEFAULT_RATE_HZ,
+                 reassign_server_host: Optional[str] = REASSIGN_SERVER_HOST,
+                 reassign_server_port: int = REASSIGN_SERVER_PORT):
         self.host = host
         self.port = port
         self.server_socket = None
@@ -161,14 +302,42 @@ class ExternalServerReceiver:
         # Smart_Parking_GUI.py와 동일하게 현재 세그먼트 인덱스 및 경로 포인트 유지
         self.current_path_segment_index = 0
         self.full_path_points = []
+        self.route_path = RoutePath()  # full_path_points의 array 기반 사본 (경로 수신 시 1회 생성)
+        self.route_geometry = RouteGeometry()  # 누적 거리/방향 벡터 캐시 (경로 수신 시 1회 생성)
+        self.announcement_schedule = AnnouncementSchedule()  # 안내 전환 지점 (경로 수신 시 1회 생성)
+        self.geofence = GeofenceTracker()  # 주차구역/입구/통행 불가 구역 진입·이탈 추적
+        self.position_filters: Dict[str, VehicleKalmanFilter] = {}  # vehicle_id -> 위치 평활화/속도·방향 추정
+        self.map_matchers: Dict[str, OnlineMapMatcher] = {}  # vehicle_id -> 통로 맵 매칭 (HMM)
+        self.pose_resampler = PoseResampler(pose_rate_hz)  # 고정 주기 포즈 스트림 (MainController가 송신)
+        self.speed_estimator = SpeedEstimator()  # 안내 대상 차량의 실측 속도 (EWMA)
+        self.off_route_detector = OffRouteDetector()  # 안내 중인 경로 이탈 감지 (거리/시간 히스테리시스)
+        self.rerouter = LocalRerouter()  # 경로 이탈 시 통로 네트워크 최단 경로 재탐색
+        self.dynamic_replanner = DynamicReplanner()  # 통로에 정차한 다른 차량을 피하는 경로 증분 보정 (D* Lite)
+        self.route_vehicle_id = DEFAULT_VEHICLE_ID  # 안내 경로를 따라가는 차량
+        self.occupancy = SpotOccupancy()  # 주차구역 점유 비트셋 (지오펜스 주차/출차 이벤트로 갱신)
+        self.exit_routes = ExitRouteCache(self.rerouter)  # 주차구역별 출차 경로/안내 스케줄 (주차 시 사전 계산)
+        self.trilaterator = Trilaterator()  # UWB 앵커 거리(ranges) → 위치 (앵커 표는 지도에서 1회 로드)
+        self.planner_pool = PlannerPool(PLANNER_WORKERS)  # 격자 경로 탐색 프로세스 풀 (결과는 Future 콜백으로 반영)
+        self.route_generation = 0  # 안내 경로 교체 횟수 (탐색 중 경로가 바뀌었으면 늦게 도착한 결과를 버림)
+        # 안내 경로 상태(경로 기하/안내 스케줄/세그먼트 인덱스/route_generation) 잠금
+        # 수신 스레드와 격자 탐색 콜백 스레드가 함께 교체/사용 (교체 중 안내 계산이 섞이지 않도록, 재진입 가능)
+        self.route_lock = threading.RLock()
+        # 팀원 재할당 서버 주소 (None이면 로컬 재탐색만 사용)
+        self.reassign_server_host = reassign_server_host
+        self.reassign_server_port = reassign_server_port
+        self.reassign_in_flight = False
         # 외부 정산 서버 주소 (정산 금액을 받아오는 서버)
         self.payment_server_host = payment_server_host
         self.payment_server_port = payment_server_port
+        self.payment_client = PaymentClient(payment_server_host, payment_server_port)  # 연결 유지 + request_id 매칭
         print(f"📡 외부 서버 수신기 초기화됨. 수신 대기 주소: {self.host}:{self.port}")
         print(f"💰 정산 서버 주소: {self.payment_server_host}:{self.payment_server_port}")
 
     def start_receiver(self):
         """수신 서버 시작 (별도 스레드)"""
+        # 격자 탐색 프로세스를 수신 스레드보다 먼저 띄우고 지도 로드까지 끝내 둠 (첫 요청 지연 방지)
+        workers = self.planner_pool.start()
+        print(f"🧭 격자 경로 탐색 프로세스 {len(workers)}개 준비됨 (PID {', '.join(map(str, workers))})")
         def server_thread():
             try:
                 self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -315,11 +484,48 @@ class ExternalServerReceiver:
                     'heading': data.get('heading', 0),
                     'speed': data.get('speed', 0)
                 }
-                self.last_position = position_data
-                self.broadcaster.publish_vehicle_position(position_data)
                 
-                # 위치 기반으로 네비게이션 안내 업데이트
-                self.update_navigation_instruction(position_data)
+                vehicle_id = data.get('vehicle_id') or DEFAULT_VEHICLE_ID
+                
+                if (position_data['x'], position_data['y']) == EXIT_SIGNAL_POSITION:
+                    # 출차 신호: 이상치로 걸러지지 않도록 그대로 전달하고 차량별 추적 상태 초기화
+                    self.reset_vehicle_tracking(vehicle_id)
+                    if vehicle_id == self.route_vehicle_id:
+                        self.last_position = position_data
+                        self.broadcaster.publish_vehicle_position(position_data)
+                    for event in self.geofence.update(vehicle_id, position_data['x'], position_data['y']):
+                        self.broadcaster.publish_geofence_event(event)
+                        self.update_occupancy(event)
+                        self.prepare_exit_route(event)
+                    if vehicle_id == self.route_vehicle_id:
+                        self.update_navigation_instruction(position_data)
+                    return None
+                
+                # 다른 차량(통로 정차 차량 등)은 추적 상태만 갱신 - 위치 화면은 안내 대상 차량 1대만 표시
+                self.handle_position(vehicle_id, position_data, publish=vehicle_id == self.route_vehicle_id)
+            
+            elif data_type == 'ranges' and self.broadcaster:
+                # UWB 앵커 거리 원시 데이터: 틱의 모든 태그를 한 번에 삼변측량한 뒤 위치 파이프라인에 전달
+                # {'tags': [{'vehicle_id', 'anchors': [id, ...], 'distances': [m, ...]}, ...]} 또는 태그 1개를 최상위에
+                tags = data.get('tags') or [data]
+                result = self.trilaterator.solve([(tag.get('anchors', []), tag.get('distances', [])) for tag in tags])
+                # 다른 태그는 추적 상태(필터/지오펜스/점유/동적 장애물/포즈 스트림)만 갱신하고 위치 화면에는 보내지 않음
+                # 안내 대상 차량 태그는 같은 틱의 정차 차량이 반영된 뒤 처리되도록 마지막에
+                vehicle_ids = [tag.get('vehicle_id') or DEFAULT_VEHICLE_ID for tag in tags]
+                route_vehicle_id = self.route_vehicle_id
+                for i in sorted(range(len(tags)), key=lambda i: vehicle_ids[i] == route_vehicle_id):
+                    tag, vehicle_id = tags[i], vehicle_ids[i]
+                    if not result.ok[i]:
+                        print(f"⚠️ 삼변측량 불가: {vehicle_id} (유효 앵커 {int(result.anchors[i])}개)")
+                        continue
+                    position_data = {
+                        'x': float(result.x[i]),
+                        'y': float(result.y[i]),
+                        'heading': tag.get('heading', 0),
+                        'speed': tag.get('speed', 0),
+                        'ranging': {'anchors': int(result.anchors[i]), 'residual': round(float(result.residual[i]), 1)}
+                    }
+                    self.handle_position(vehicle_id, position_data, publish=vehicle_id == route_vehicle_id)
             
             elif data_type == 'waypoint' and self.broadcaster:
                 # 웨이포인트/경로 데이터
@@ -333,18 +539,13 @@ class ExternalServerReceiver:
                 # 전체 경로 포인트 재구성 및 세그먼트 인덱스 초기화
                 route_type = waypoint_data.get('route_type', 'entry')
                 
-                if route_type == 'exit':
-                    # 출차 시나리오: 주차 좌표 포인트부터 시작 (첫 번째 웨이포인트가 주차 좌표)
-                    # waypoints에 주차 좌표부터 전체 경로가 포함되어 있음
-                    self.full_path_points = [(wp[0], wp[1]) for wp in waypoint_data.get('waypoints', [])]
-                else:
-                    # 입차 시나리오: 입구(ENTRANCE)부터 시작
-                    ENTRANCE = [200, 200]
-                    self.full_path_points = [(ENTRANCE[0], ENTRANCE[1])]
-                    for wp in waypoint_data.get('waypoints', []):
-                        self.full_path_points.append((wp[0], wp[1]))
-                
-                self.current_path_segment_index = 0  # 경로 변경 시 인덱스 초기화
+                # 출차 시나리오: 주차 좌표 포인트부터 시작 (첫 번째 웨이포인트가 주차 좌표)
+                # 입차 시나리오: 입구(ENTRANCE)부터 시작
+                self.set_route_vehicle(data.get('vehicle_id') or DEFAULT_VEHICLE_ID)
+                self.set_active_route(
+                    route_points_from_waypoints(waypoint_data.get('waypoints', []), route_type),
+                    route_type == 'exit'
+                )
                 
                 self.broadcaster.publish_waypoint_data(waypoint_data)
                 print(f"✅ 경로 수신 완료: {len(waypoint_data.get('waypoints', []))}개 웨이포인트")
@@ -358,6 +559,7 @@ class ExternalServerReceiver:
                     'assigned_spot': data.get('assigned_spot', None),
                     'vehicle_id': data.get('vehicle_id', None),
                     'assignment_mode': data.get('assignment_mode', None),
+                    'route_type': data.get('route_type', 'entry'),  # 팀원 서버 재할당은 입차 경로 (route_type 없으면)
                     'timestamp': data.get('timestamp', None),
                     'description': data.get('description', None)
                 }
@@ -366,29 +568,20 @@ class ExternalServerReceiver:
                 waypoint_data = {
                     'waypoints': reassignment_data.get('waypoints', []),
                     'parking_spot': reassignment_data.get('assigned_spot', None),
-                    'route_type': 'entry',  # 재할당은 항상 입차 시나리오
+                    'route_type': reassignment_data['route_type'],
                     'type': 'waypoint_reassignment',  # 재할당 표시
                     'assignment_mode': reassignment_data.get('assignment_mode', None)
                 }
                 
                 self.last_waypoints = waypoint_data
                 
-                # 입차 시나리오와 동일하게 처리 (ENTRANCE부터 시작)
-                ENTRANCE = [200, 200]
-                self.full_path_points = [(ENTRANCE[0], ENTRANCE[1])]
-                for wp in waypoint_data.get('waypoints', []):
-                    self.full_path_points.append((wp[0], wp[1]))
-                
-                self.current_path_segment_index = 0
+                # 재할당 경로는 서버가 계산한 전체 경로이므로 그대로 사용 (탑뷰 is_reassigned_route와 동일, 입구 추가 안 함)
+                self.set_route_vehicle(reassignment_data.get('vehicle_id') or DEFAULT_VEHICLE_ID)
+                self.set_active_route([(wp[0], wp[1]) for wp in waypoint_data.get('waypoints', [])],
+                                      reassignment_data['route_type'] == 'exit')
                 
                 # 재할당 데이터를 그대로 브로드캐스트
-                message = {
-                    "timestamp": datetime.now().isoformat(),
-                    "type": "waypoint_reassignment",  # 재할당 타입으로 브로드캐스트
-                    "data": reassignment_data
-                }
-                topic = "waypoint_data"  # waypoint_data 토픽으로 브로드캐스트
-                self.broadcaster.pub_socket.send_string(f"{topic} {json.dumps(message)}")
+                self.broadcaster.publish_reassignment(reassignment_data)
                 print(f"✅ 재할당 경로 수신 완료: {len(reassignment_data.get('waypoints', []))}개 웨이포인트, {reassignment_data.get('assigned_spot')}번 주차구역")
                 
             elif data_type == 'manual_instruction' and self.broadcaster:
@@ -420,6 +613,26 @@ class ExternalServerReceiver:
                 else:
                     print(f"❌ 외부 서버에서 정산 금액을 받아오지 못했습니다.")
                 
+            elif data_type == 'free_spots':
+                # 빈 주차구역 질의: 기준 지점(입출차 'gate' 또는 목적지 입구 이름/번호)에서 가까운 순
+                reference = data.get('reference', 'gate')
+                if isinstance(reference, int) and 0 <= reference < len(DESTINATION_NAMES):
+                    reference = DESTINATION_NAMES[reference]
+                spots = self.occupancy.nearest_free(data.get('spot_type'), reference, int(data.get('count', 1)))
+                return {"status": "success", "spots": spots, "version": self.occupancy.version}
+                
+            elif data_type == 'plan_route':
+                # 격자 경로 탐색 요청: 프로세스 풀에 넘기고 즉시 응답 (경로는 waypoint_reassignment로 브로드캐스트)
+                vehicle_id = data.get('vehicle_id') or DEFAULT_VEHICLE_ID
+                target = data.get('target')
+                if not target or len(target) < 2:
+                    return {"status": "failed", "message": "target 좌표가 필요합니다"}
+                queued = self.request_grid_route(
+                    vehicle_id, float(data.get('x', 0)), float(data.get('y', 0)), float(target[0]), float(target[1]),
+                    '외부 요청 - 컨트롤러 격자 탐색', data.get('parking_spot'),
+                    float(data.get('deadline', DEFAULT_DEADLINE)))
+                return {"status": "queued" if queued else "failed", "in_flight": len(self.planner_pool.in_flight)}
+                
             elif data_type == 'payment_confirmation':
                 # 정산 확인 결과: 외부 서버로 전달 (broadcaster 불필요)
                 confirmed = data.get('confirmed', False)
@@ -428,15 +641,21 @@ class ExternalServerReceiver:
                 
                 print(f"💰 정산 확인 결과 수신: {'확인' if confirmed else '취소'}, 금액: {amount:,}원, 주차구역: {parking_spot}번")
                 
+                # 정산 확인 즉시 사전 계산된 출차 경로로 안내 시작 (외부 서버 전달보다 먼저)
+                exit_started = False
+                if confirmed:
+                    vehicle_id = data.get('vehicle_id') or DEFAULT_VEHICLE_ID
+                    if parking_spot is None:
+                        parking_spot = self.occupancy.vehicle_spot.get(vehicle_id)
+                    exit_started = parking_spot is not None and self.start_exit_route(parking_spot, vehicle_id)
+                
                 # 외부 정산 서버로 정산 확인 전달
                 print(f"➡ 외부 정산 서버로 확인 전달 준비: {self.payment_server_host}:{self.payment_server_port}")
                 self.send_payment_confirmation_to_external_server(confirmed, amount, parking_spot)
                 print(f"✅ 외부 정산 서버로 확인 전달 요청 완료")
                 
                 # HUD에 응답 반환
-                return {"status": "success", "message": "정산 확인 처리 완료"}
-                
-                # 정산 확인 후 출차 경로는 navigation_hud.py에서 처리
+                return {"status": "success", "message": "정산 확인 처리 완료", "exit_route_started": exit_started}
                 
             # 기본적으로 응답 없음
             return None
@@ -447,9 +666,367 @@ class ExternalServerReceiver:
             print(traceback.format_exc())
             return None
 
+    def handle_position(self, vehicle_id: str, position_data: Dict[str, Any], publish: bool = True):
+        """위치 처리 파이프라인 - 칼만 필터 → 지오펜스 → 맵 매칭 → 동적 장애물 → 브로드캐스트 → 이탈 감지/안내
+        
+        position 메시지의 x/y와 ranges 메시지의 삼변측량 위치가 같은 처리를 거침
+        실측 속도, 경로 이탈, 네비게이션 안내는 안내 경로를 따라가는 차량(route_vehicle_id)만 갱신
+        publish: vehicle_position 브로드캐스트 여부 (False면 추적 상태만 갱신)
+        """
+        # 칼만 필터: 위치 평활화 + 속도/방향각 추정 (이상치는 예측값으로 대체)
+        self.apply_position_filter(vehicle_id, position_data)
+        
+        # 지오펜스: 구역 조회 결과를 위치 데이터에 포함 (각 화면이 주차구역을 다시 스캔하지 않도록)
+        # 통로 밖 구역(목적지 입구 등)도 판정되도록 맵 매칭 전 위치 사용
+        filtered_x, filtered_y = position_data['x'], position_data['y']
+        zones = self.geofence.index.zones_at(filtered_x, filtered_y)
+        spot_zone = next((z for z in zones if z.kind == 'spot'), None)
+        position_data['parking_spot'] = spot_zone.zone_id if spot_zone else None
+        position_data['zones'] = [z.name for z in zones if z.kind in GeofenceTracker.TRACKED_KINDS]
+        
+        # 맵 매칭: 통로 위 위치로 보정 (주차구역 안에서는 원래 위치 사용)
+        self.apply_map_matching(vehicle_id, position_data)
+        
+        # 동적 장애물: 통로에 정차한 다른 차량 반영 (안내 경로가 막히면 보정 경로 적용)
+        self.update_dynamic_obstacles(vehicle_id, position_data)
+        
+        if publish:
+            self.last_position = position_data
+            self.broadcaster.publish_vehicle_position(position_data)
+        
+        # 실측 속도/ETA는 안내 경로를 따라가는 차량만 (다른 차량 위치가 섞이지 않도록)
+        if vehicle_id == self.route_vehicle_id:
+            self.speed_estimator.update(position_data['x'], position_data['y'], time.monotonic())
+        
+        # 포즈 스트림용 이력 추가 (보정된 위치 + 필터 속도)
+        state = position_data['filter']
+        self.pose_resampler.add_fix(vehicle_id, position_data['x'], position_data['y'],
+                                    state['vx'], state['vy'], state['heading'])
+        
+        for event in self.geofence.update(vehicle_id, filtered_x, filtered_y):
+            self.broadcaster.publish_geofence_event(event)
+            self.update_occupancy(event)
+            self.prepare_exit_route(event)
+        
+        # 경로 이탈 감지 (맵 매칭 전 위치와 경로 격자 인덱스로 매 위치마다 판정)
+        self.check_off_route(vehicle_id, filtered_x, filtered_y, position_data['parking_spot'] is not None)
+        
+        # 위치 기반으로 네비게이션 안내 업데이트 (세그먼트 인덱스/안내 커서는 안내 대상 차량 기준)
+        if vehicle_id == self.route_vehicle_id:
+            self.update_navigation_instruction(position_data)
+    
+    def set_active_route(self, points, is_exit: bool = False, dynamic_repair: bool = False,
+                         prepared: Optional[ExitRoute] = None):
+        """안내 경로 교체 - 경로 기하/안내 스케줄 1회 계산, 세그먼트 인덱스와 이탈 상태 초기화
+
+        dynamic_repair: 정차 차량 우회 경로 (동적 재탐색기가 이미 경로 상태를 갱신했으므로 다시 등록하지 않음)
+        prepared: 사전 계산된 출차 경로 (경로 기하/안내 스케줄을 다시 계산하지 않고 그대로 사용)
+        """
+        with self.route_lock:
+            self.full_path_points = list(points)
+            if prepared is not None:
+                self.route_path = prepared.path
+                self.route_geometry = prepared.geometry
+                self.announcement_schedule = prepared.schedule
+            else:
+                self.route_path = RoutePath(self.full_path_points)
+                self.route_geometry = RouteGeometry(self.route_path)
+                self.announcement_schedule = AnnouncementSchedule(self.route_geometry, is_exit)
+            self.current_path_segment_index = 0  # 경로 변경 시 인덱스 초기화
+            self.route_generation += 1
+            self.off_route_detector.reset()
+            if not dynamic_repair:
+                self.dynamic_replanner.set_route(self.route_vehicle_id, self.full_path_points)
+    
+    def prepare_exit_route(self, event: Dict[str, Any]):
+        """주차구역 체류(dwell) 이벤트 시 그 구역의 출차 경로/안내 스케줄을 미리 계산 (이미 있으면 캐시 사용)"""
+        if event.get('kind') != ZONE_SPOT or event['event'] != 'dwell':
+            return
+        started = time.perf_counter()
+        route = self.exit_routes.prepare(event['zone_id'])
+        elapsed_ms = (time.perf_counter() - started) * 1e3
+        if route is None:
+            print(f"⚠️ 출차 경로 사전 계산 불가: 주차구역 {event['zone_id']}번")
+        else:
+            print(f"🅿️ 출차 경로 준비: 주차구역 {event['zone_id']}번, {len(route.waypoints)}개 웨이포인트 ({elapsed_ms:.2f}ms)")
+    
+    def start_exit_route(self, parking_spot: int, vehicle_id: str) -> bool:
+        """사전 계산된 출차 경로로 안내 시작 - 경로 교체 후 출차 웨이포인트 브로드캐스트 (HUD/탑뷰 표시용)"""
+        route = self.exit_routes.get(parking_spot)
+        if route is None:
+            print(f"❌ 출차 경로 없음: 주차구역 {parking_spot}번")
+            return False
+        waypoint_data = {
+            'waypoints': route.waypoints,
+            'parking_spot': parking_spot,
+            'route_type': 'exit'
+        }
+        self.last_waypoints = waypoint_data
+        self.set_route_vehicle(vehicle_id)
+        self.set_active_route(route.points, True, prepared=route)
+        if self.broadcaster:
+            self.broadcaster.publish_waypoint_data(waypoint_data)
+        print(f"🚗 출차 안내 시작: 주차구역 {parking_spot}번, {len(route.waypoints)}개 웨이포인트")
+        return True
+    
+    def set_route_vehicle(self, vehicle_id: str):
+        """안내 경로를 따라가는 차량 교체 (이전 차량의 경로는 동적 재탐색 대상에서 제외)"""
+        if vehicle_id != self.route_vehicle_id:
+            self.dynamic_replanner.clear_route(self.route_vehicle_id)
+            self.route_vehicle_id = vehicle_id
+            self.speed_estimator.reset()
+    
+    def update_dynamic_obstacles(self, vehicle_id: str, position_data: Dict[str, Any]):
+        """통로에 정차한 다른 차량을 동적 장애물로 반영하고, 안내 경로가 막히면 D* Lite로 보정한 경로를 적용"""
+        x, y = position_data['x'], position_data['y']
+        replanner = self.dynamic_replanner
+        if vehicle_id == self.route_vehicle_id:
+            replanner.move(vehicle_id, x, y)
+            return
+        
+        if position_data.get('parking_spot') is None and position_data.get('matched'):
+            changed = replanner.update_vehicle(vehicle_id, x, y, position_data['speed'], time.monotonic())
+        else:
+            changed = replanner.remove_vehicle(vehicle_id)  # 주차구역 진입 또는 통로 밖
+        if not changed:
+            return
+        
+        started = time.perf_counter()
+        repaired = replanner.repair(changed)
+        elapsed_ms = (time.perf_counter() - started) * 1e3
+        waypoints = repaired.get(self.route_vehicle_id)
+        if not waypoints:
+            return
+        
+        is_exit_scenario = bool(self.last_waypoints) and self.last_waypoints.get('route_type') == 'exit'
+        self.set_active_route([(wp[0], wp[1]) for wp in waypoints], is_exit_scenario, dynamic_repair=True)
+        parking_spot = self.last_waypoints.get('parking_spot') if self.last_waypoints else None
+        self.broadcaster.publish_reassignment({
+            'type': 'waypoint_reassignment',
+            'waypoints': waypoints,
+            'assigned_spot': parking_spot,
+            'vehicle_id': self.route_vehicle_id,
+            'assignment_mode': 'dynamic_obstacle',
+            'route_type': 'exit' if is_exit_scenario else 'entry',
+            'timestamp': datetime.now().isoformat(),
+            'description': f'정차 차량 {vehicle_id} 회피 - 컨트롤러 D* Lite 보정'
+        })
+        print(f"🚧 정차 차량 {vehicle_id} 회피 경로 적용: {len(waypoints)}개 웨이포인트 ({elapsed_ms:.2f}ms)")
+    
+    def check_off_route(self, vehicle_id: str, x: float, y: float, in_parking_spot: bool):
+        """안내 중인 경로에서 벗어났는지 판정하고 이탈/복귀 시 off_route 이벤트 브로드캐스트 (안내 대상 차량만)"""
+        if vehicle_id != self.route_vehicle_id:
+            return
+        if len(self.route_geometry) < 2 or self.current_path_segment_index + 1 >= len(self.route_path):
+            return
+        
+        distance = self.route_geometry.distance_to_route(x, y)
+        event = self.off_route_detector.update(distance, in_parking_spot)
+        if event is None:
+            return
+        
+        event['vehicle_id'] = vehicle_id
+        event['x'], event['y'] = x, y
+        event['route_type'] = self.last_waypoints.get('route_type', 'entry') if self.last_waypoints else 'entry'
+        if event['event'] == 'off_route':
+            print(f"⚠️ 경로 이탈 감지 - 거리: {distance:.1f}픽셀")
+            event['rerouted'] = self.reroute_locally(vehicle_id, x, y)
+            event['remote_requested'] = self.request_remote_reassign_async(x, y)
+        self.broadcaster.publish_off_route_event(event)
+    
+    def reroute_locally(self, vehicle_id: str, x: float, y: float) -> bool:
+        """현재 위치 → 현재 경로의 목적지로 통로 최단 경로를 계산해 즉시 적용하고 재할당 경로로 브로드캐스트"""
+        is_exit_scenario = bool(self.last_waypoints) and self.last_waypoints.get('route_type') == 'exit'
+        target_x, target_y = self.route_geometry.xs[-1], self.route_geometry.ys[-1]
+        started = time.perf_counter()
+        waypoints = self.rerouter.reroute(x, y, target_x, target_y)
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        if not waypoints or len(waypoints) < 2:
+            # 통로 노드도 거리장 목표도 아닌 목적지는 격자 탐색 (프로세스 풀, 결과는 도착하면 적용)
+            print(f"⚠️ 로컬 재탐색 불가: 목적지 ({target_x:.0f}, {target_y:.0f})가 통로 노드가 아님 → 격자 탐색 요청")
+            self.request_grid_route(vehicle_id, x, y, target_x, target_y, '경로 이탈 - 컨트롤러 격자 탐색')
+            return False
+        
+        self.set_active_route([(wp[0], wp[1]) for wp in waypoints], is_exit_scenario)
+        parking_spot = self.last_waypoints.get('parking_spot') if self.last_waypoints else None
+        # 탑뷰는 재할당 경로를 전체 경로 그대로 표시하므로 재할당 메시지 형식 사용
+        self.broadcaster.publish_reassignment({
+            'type': 'waypoint_reassignment',
+            'waypoints': waypoints,
+            'assigned_spot': parking_spot,
+            'vehicle_id': vehicle_id,
+            'assignment_mode': 'local_reroute',
+            'route_type': 'exit' if is_exit_scenario else 'entry',
+            'timestamp': datetime.now().isoformat(),
+            'description': '경로 이탈 - 컨트롤러 로컬 재탐색'
+        })
+        print(f"🔄 로컬 재탐색 완료: {len(waypoints)}개 웨이포인트 ({elapsed_us:.0f}µs)")
+        return True
+    
+    def request_grid_route(self, vehicle_id: str, x: float, y: float, target_x: float, target_y: float,
+                           description: str, parking_spot: Optional[int] = None,
+                           deadline: float = DEFAULT_DEADLINE) -> bool:
+        """격자 경로 탐색을 프로세스 풀에 요청 (수신 스레드는 기다리지 않음) - 정차 차량 셀은 막힌 칸으로 전달
+
+        결과는 요청 시점 이후 안내 경로가 바뀌지 않았을 때만 적용 (같은 요청이 처리 중이면 그 결과를 함께 받음)
+        """
+        generation = self.route_generation
+        try:
+            future = self.planner_pool.submit((x, y), (target_x, target_y),
+                                              self.dynamic_replanner.obstacles.blocked(), deadline=deadline)
+        except RuntimeError as e:
+            print(f"❌ 격자 탐색 요청 실패: {e}")
+            return False
+        future.add_done_callback(lambda f: self._apply_grid_route(f, generation, vehicle_id, description, parking_spot))
+        return True
+    
+    def _apply_grid_route(self, future, generation: int, vehicle_id: str, description: str,
+                          parking_spot: Optional[int]):
+        """격자 탐색 결과를 세션 상태에 반영 (프로세스 풀 콜백 스레드에서 실행, route_lock 안에서 교체)"""
+        if future.cancelled():
+            print(f"⏱️ 격자 탐색 기한 초과: {vehicle_id}")
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"❌ 격자 탐색 오류: {e}")
+            return
+        if result is None:
+            print(f"⚠️ 격자 탐색 실패: {vehicle_id} (경로 없음)")
+            return
+        # 세대 확인과 경로 교체를 한 잠금 안에서 (확인 직후 수신 스레드가 경로를 바꾸거나 안내 계산 중이면 대기)
+        with self.route_lock:
+            if generation != self.route_generation:
+                print(f"⏭️ 격자 탐색 결과 무시: 탐색 중 안내 경로가 바뀜 ({vehicle_id})")
+                return
+        
+            waypoints = result['waypoints']
+            is_exit_scenario = bool(self.last_waypoints) and self.last_waypoints.get('route_type') == 'exit'
+            if parking_spot is None and self.last_waypoints:
+                parking_spot = self.last_waypoints.get('parking_spot')
+            self.set_route_vehicle(vehicle_id)
+            self.set_active_route([(wp[0], wp[1]) for wp in waypoints], is_exit_scenario)
+            if self.broadcaster:
+                self.broadcaster.publish_reassignment({
+                    'type': 'waypoint_reassignment',
+                    'waypoints': waypoints,
+                    'assigned_spot': parking_spot,
+                    'vehicle_id': vehicle_id,
+                    'assignment_mode': 'grid_plan',
+                    'route_type': 'exit' if is_exit_scenario else 'entry',
+                    'timestamp': datetime.now().isoformat(),
+                    'description': description
+                })
+            print(f"🧭 격자 탐색 경로 적용: {len(waypoints)}개 웨이포인트 "
+                  f"(탐색 {result['elapsed_ms']:.1f}ms, 확장 {result['expanded']}개, PID {result['pid']})")
+    
+    def request_remote_reassign_async(self, x: float, y: float) -> bool:
+        """팀원 재할당 서버에 비동기 요청 - 응답 경로는 waypoint_reassignment로 수신되어 로컬 경로를 대체"""
+        if not self.reassign_server_host or self.reassign_in_flight:
+            return False
+        self.reassign_in_flight = True
+        threading.Thread(target=self._request_remote_reassign, args=(x, y),
+                         daemon=True, name="RemoteReassign").start()
+        return True
+    
+    def _request_remote_reassign(self, x: float, y: float):
+        """재할당 요청 전송 (팀원 서버 형식: {'type': 'reassign', 'current_x', 'current_y'})"""
+        try:
+            client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            client_socket.settimeout(REASSIGN_TIMEOUT)
+            client_socket.connect((self.reassign_server_host, self.reassign_server_port))
+            
+            reassign_request = {'type': 'reassign', 'current_x': float(x), 'current_y': float(y)}
+            client_socket.sendall(json.dumps(reassign_request, ensure_ascii=False).encode('utf-8'))
+            print(f"📤 경로 재할당 요청 전송: {self.reassign_server_host}:{self.reassign_server_port}")
+            
+            # 서버 응답 ({'status': 'success'/'failed', 'message': '...'})
+            response_data = b""
+            while True:
+                chunk = client_socket.recv(4096)
+                if not chunk:
+                    break
+                response_data += chunk
+            client_socket.close()
+            
+            response_json = json.loads(response_data.decode('utf-8'))
+            if response_json.get('status') == 'success':
+                # 새 경로는 서버가 waypoint_reassignment로 보내면 process_received_data에서 적용
+                print(f"✅ 서버 재할당 요청 성공: {response_json.get('message', '')}")
+            else:
+                print(f"❌ 서버 재할당 요청 실패: {response_json.get('message', '')} (로컬 재탐색 경로 유지)")
+        except socket.timeout:
+            print("❌ 경로 재할당 요청 실패: 연결 시간 초과 (로컬 재탐색 경로 유지)")
+        except ConnectionRefusedError:
+            print(f"❌ 경로 재할당 요청 실패: 서버 연결 거부됨 ({self.reassign_server_host}:{self.reassign_server_port})")
+        except Exception as e:
+            print(f"❌ 경로 재할당 요청 실패: {e} (로컬 재탐색 경로 유지)")
+        finally:
+            self.reassign_in_flight = False
+    
+    def reset_vehicle_tracking(self, vehicle_id: str):
+        """차량별 필터/맵 매칭/포즈 이력 제거 (출차 등으로 위치 연속성이 끊길 때)"""
+        self.position_filters.pop(vehicle_id, None)
+        self.map_matchers.pop(vehicle_id, None)
+        self.pose_resampler.remove_vehicle(vehicle_id)
+        self.dynamic_replanner.remove_vehicle(vehicle_id)
+        if vehicle_id == self.route_vehicle_id:
+            self.speed_estimator.reset()
+            self.off_route_detector.reset()
+        diff = self.occupancy.leave_vehicle(vehicle_id)
+        if diff and self.broadcaster:
+            self.broadcaster.publish_occupancy(diff)
+    
+    def update_occupancy(self, event: Dict[str, Any]):
+        """지오펜스 주차구역 이벤트로 점유 비트셋 갱신 - 체류(dwell)는 주차, 주차했던 구역 이탈(exit)은 출차"""
+        if event.get('kind') != ZONE_SPOT:
+            return
+        if event['event'] == 'dwell':
+            diff = self.occupancy.park(event['zone_id'], event['vehicle_id'])
+        elif event['event'] == 'exit':
+            diff = self.occupancy.leave(event['zone_id'], event['vehicle_id'])
+        else:
+            return
+        if diff and self.broadcaster:
+            self.broadcaster.publish_occupancy(diff)
+    
+    def apply_position_filter(self, vehicle_id: str, position_data: Dict[str, Any]):
+        """칼만 필터 적용 - x, y, heading, speed를 필터 추정값으로 바꾸고 필터 상태는 'filter'로 포함"""
+        position_filter = self.position_filters.get(vehicle_id)
+        if position_filter is None:
+            position_filter = self.position_filters[vehicle_id] = VehicleKalmanFilter()
+        
+        position_data['raw_x'], position_data['raw_y'] = position_data['x'], position_data['y']
+        state = position_filter.update(position_data['x'], position_data['y'])
+        if not state['accepted']:
+            print(f"⚠️ 위치 이상치 무시: ({position_data['x']}, {position_data['y']}), 게이트 {state['gate']}")
+        position_data['x'], position_data['y'] = state['x'], state['y']
+        position_data['heading'] = state['heading']
+        position_data['speed'] = state['speed']  # 픽셀/초
+        position_data['filter'] = state
+    
+    def apply_map_matching(self, vehicle_id: str, position_data: Dict[str, Any]):
+        """필터링된 위치를 통로 네트워크 위로 보정 - x, y를 매칭 위치로 바꿈 (수신 위치는 raw_x, raw_y)"""
+        matcher = self.map_matchers.get(vehicle_id)
+        if matcher is None:
+            matcher = self.map_matchers[vehicle_id] = OnlineMapMatcher()
+        
+        if position_data.get('parking_spot') is not None:
+            # 주차구역 안은 통로가 아니므로 매칭하지 않음 (다시 통로로 나오면 새로 시작)
+            matcher.reset()
+            position_data['matched'] = False
+            position_data['aisle_edge'] = None
+            return
+        
+        result = matcher.update(position_data['x'], position_data['y'])
+        position_data['x'], position_data['y'] = result['x'], result['y']
+        position_data['matched'] = result['matched']
+        position_data['aisle_edge'] = result['edge']
+    
     def request_payment_from_external_server(self, parking_spot: int) -> Optional[int]:
         """
         외부 정산 서버에 정산 요청을 보내고 금액을 받아옵니다.
+        (연결은 PaymentClient가 유지하며, 동시에 출차하는 차량의 요청은 request_id로 응답을 구분)
         
         Args:
             parking_spot: 주차 구역 번호
@@ -457,372 +1034,147 @@ class ExternalServerReceiver:
         Returns:
             정산 금액 (원 단위), 실패 시 None
         """
-        try:
-            # 외부 정산 서버에 연결
-            payment_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            payment_socket.settimeout(5.0)
-            
-            try:
-                payment_socket.connect((self.payment_server_host, self.payment_server_port))
-                
-                # 정산 요청 전송
-                pay_request = {
-                    'type': 'pay',
-                    'parking_spot': parking_spot
-                }
-                
-                request_json = json.dumps(pay_request, ensure_ascii=False)
-                payment_socket.sendall(request_json.encode('utf-8'))
-                print(f"📤 외부 정산 서버로 요청 전송: {request_json}")
-                
-                # 응답 수신 (완전한 데이터 수신 보장)
-                response_data = b""
-                while True:
-                    chunk = payment_socket.recv(4096)
-                    if not chunk:
-                        break
-                    response_data += chunk
-                    # JSON이 완성되었는지 확인 (중괄호 매칭)
-                    try:
-                        decoded = response_data.decode('utf-8')
-                        if decoded.count('{') == decoded.count('}'):
-                            break
-                    except:
-                        pass
-                
-                response_str = response_data.decode('utf-8')
-                print(f"📥 외부 서버 응답 수신: {response_str}")
-                response_json = json.loads(response_str)
-                
-                # 응답에서 정산 금액 추출
-                if response_json.get('type') == 'payment':
-                    amount = response_json.get('data', {}).get('amount')
-                    if amount is not None:
-                        print(f"✅ 외부 서버로부터 정산 금액 수신: {amount:,}원")
-                        return amount
-                    else:
-                        print(f"⚠️ 응답에 정산 금액이 없습니다: {response_json}")
-                        return None
-                else:
-                    print(f"⚠️ 예상하지 못한 응답 형식: {response_json.get('type')}")
-                    return None
-                    
-            except socket.timeout:
-                print(f"❌ 외부 정산 서버 연결 시간 초과: {self.payment_server_host}:{self.payment_server_port}")
-                return None
-            except ConnectionRefusedError:
-                print(f"❌ 외부 정산 서버 연결 거부됨: {self.payment_server_host}:{self.payment_server_port}")
+        pay_request = {
+            'type': 'pay',
+            'parking_spot': parking_spot
+        }
+        print(f"📤 외부 정산 서버로 요청 전송: {json.dumps(pay_request, ensure_ascii=False)}")
+        response_json = self.payment_client.request(pay_request)
+        if response_json is None:
+            return None
+        print(f"📥 외부 서버 응답 수신: {json.dumps(response_json, ensure_ascii=False)}")
+        
+        # 응답에서 정산 금액 추출
+        if response_json.get('type') == 'payment':
+            amount = response_json.get('data', {}).get('amount')
+            if amount is not None:
+                print(f"✅ 외부 서버로부터 정산 금액 수신: {amount:,}원")
+                return amount
+            else:
+                print(f"⚠️ 응답에 정산 금액이 없습니다: {response_json}")
                 return None
-            finally:
-                payment_socket.close()
-                
-        except Exception as e:
-            print(f"❌ 외부 서버 정산 요청 실패: {e}")
+        else:
+            print(f"⚠️ 예상하지 못한 응답 형식: {response_json.get('type')}")
             return None
 
     def send_payment_confirmation_to_external_server(self, confirmed: bool, amount: int, parking_spot: int) -> None:
-        """정산 확인 결과를 외부 정산 서버로 전달"""
-        try:
-            print(f"🔌 외부 정산 서버 연결 시도: {self.payment_server_host}:{self.payment_server_port}")
-            
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5.0)
-            try:
-                sock.connect((self.payment_server_host, self.payment_server_port))
-                print(f"✅ 외부 정산 서버 연결 성공")
-                
-                payload = {
-                    'type': 'payment_confirmation',
-                    'confirmed': bool(confirmed),
-                    'amount': int(amount),
-                    'parking_spot': int(parking_spot) if parking_spot is not None else None
-                }
-                json_str = json.dumps(payload, ensure_ascii=False)
-                sock.sendall(json_str.encode('utf-8'))
-                print(f"📤 외부 정산 서버로 확인 전송: {json_str}")
-                try:
-                    resp = sock.recv(4096).decode('utf-8')
-                    print(f"📥 외부 서버 확인 응답: {resp}")
-                except Exception:
-                    pass
-            except socket.timeout:
-                print(f"❌ 정산 확인 전송 타임아웃: {self.payment_server_host}:{self.payment_server_port}")
-            except ConnectionRefusedError:
-                print(f"❌ 정산 확인 전송 실패(연결 거부): {self.payment_server_host}:{self.payment_server_port}")
-            finally:
-                sock.close()
-        except Exception as e:
-            print(f"❌ 정산 확인 전송 실패: {e}")
+        """정산 확인 결과를 외부 정산 서버로 전달 (정산 서버는 TCP 응답을 보내지 않으므로 전송만 함)"""
+        payload = {
+            'type': 'payment_confirmation',
+            'confirmed': bool(confirmed),
+            'amount': int(amount),
+            'parking_spot': int(parking_spot) if parking_spot is not None else None
+        }
+        
+        if self.payment_client.send(payload):
+            print(f"📤 외부 정산 서버로 확인 전송: {json.dumps(payload, ensure_ascii=False)}")
+        else:
+            print(f"❌ 정산 확인 전송 실패: {self.payment_server_host}:{self.payment_server_port}")
 
     def update_navigation_instruction(self, position_data: Dict[str, Any]):
         """현재 위치를 기반으로 네비게이션 안내 업데이트 - Smart_Parking_GUI.py 방식"""
-        if not self.last_waypoints or not self.broadcaster:
-            return
-            
-        try:
-            current_x = position_data['x']
-            current_y = position_data['y']
-            route_type = self.last_waypoints.get('route_type', 'entry')
-            is_exit_scenario = (route_type == 'exit')
-            
-            if not self.full_path_points or len(self.full_path_points) < 2:
+        with self.route_lock:
+            if not self.last_waypoints or not self.broadcaster:
                 return
             
-            current_pos = (current_x, current_y)
+            try:
+                current_x = position_data['x']
+                current_y = position_data['y']
+                route_type = self.last_waypoints.get('route_type', 'entry')
+                is_exit_scenario = (route_type == 'exit')
+            
+                if len(self.route_path) < 2:
+                    return
             
-            # Smart_Parking_GUI.py와 동일하게 while 루프로 여러 세그먼트를 넘어가도록 업데이트
-            self._update_current_segment(current_pos)
+                current_pos = (current_x, current_y)
             
-            # 남은 경로 포인트 계산 (Smart_Parking_GUI.py와 동일)
-            remaining_pts = self.full_path_points[self.current_path_segment_index+1:]
-            path_for_hud = [current_pos] + remaining_pts
+                # Smart_Parking_GUI.py와 동일하게 while 루프로 여러 세그먼트를 넘어가도록 업데이트
+                self._update_current_segment(current_pos)
             
-            if len(path_for_hud) < 2:
-                # 목적지 도착
-                if is_exit_scenario:
-                    instructions = [("출차 완료", 0)]
-                    speed = 0
-                    progress = 100
+                # 남은 경로 포인트가 없으면 목적지 도착 (path_for_hud = [현재 위치] + 남은 포인트)
+                if self.current_path_segment_index + 1 >= len(self.route_path):
+                    # 목적지 도착
+                    if is_exit_scenario:
+                        instructions = [("출차 완료", 0)]
+                        speed = 0
+                        progress = 100
+                    else:
+                        instructions = [("목적지 도착", 0)]
+                        speed = 0
+                        progress = 100
+                    remaining_distance = 0.0
+                    eta_seconds = 0.0
+                    display = (instructions[0][0], 0.0, "")
+                    announcement = None
                 else:
-                    instructions = [("목적지 도착", 0)]
-                    speed = 0
-                    progress = 100
-            else:
-                # 현재 위치부터 남은 경로까지의 instructions 생성
-                instructions = self.generate_hud_instructions(path_for_hud, is_exit_scenario)
-                progress = self.calculate_route_progress(current_pos, self.full_path_points)
-                speed = self.calculate_realistic_speed(instructions, progress, is_exit_scenario)
+                    # 캐시된 세그먼트 인덱스 주변만 탐색하여 진행률/남은 거리 계산
+                    _, _, _, traveled = self.route_geometry.locate(
+                        current_x, current_y, self.current_path_segment_index
+                    )
+                    progress = self.route_geometry.progress_at(traveled)
+                    remaining_distance = self.route_geometry.remaining_meters_at(traveled)
+                
+                    # 안내 스케줄 커서만 전진 (8m/5m/2m 전환 지점을 지났을 때만 이벤트 발생)
+                    events = self.announcement_schedule.advance(traveled)
+                    instructions = self.announcement_schedule.instructions(traveled)
+                    display = self.announcement_schedule.display(traveled)
+                    announcement = None
+                    if events:
+                        announcement = {'phase': events[-1].phase, 'instruction': display[0]}
+                        print(f"📢 안내 전환: {display[0]} ({display[1]:.1f}m)")
+                    speed = self.speed_estimator.speed_kmh
+                    eta_seconds = self.speed_estimator.eta_seconds(remaining_distance)
+                    if eta_seconds is not None:
+                        eta_seconds = round(eta_seconds, 1)
             
-            # HUD 형식으로 변환하여 브로드캐스트
-            if instructions:
-                direction, distance = instructions[0]
+                # HUD 형식으로 변환하여 브로드캐스트
+                if instructions:
+                    direction, distance = instructions[0]
                 
-                # 목적지 도착인 경우 거리 추가 처리
-                if ("목적지" in direction or "도착" in direction) and distance <= 1.0:
-                    distance = 0.0
+                    # 목적지 도착인 경우 거리 추가 처리
+                    if ("목적지" in direction or "도착" in direction) and distance <= 1.0:
+                        distance = 0.0
                 
-                next_instruction = instructions[1][0] if len(instructions) > 1 else ""
-                next_distance = instructions[1][1] if len(instructions) > 1 else 0
+                    next_instruction = instructions[1][0] if len(instructions) > 1 else ""
+                    next_distance = instructions[1][1] if len(instructions) > 1 else 0
                 
-                # 다음 안내도 목적지인 경우 거리 처리
-                if ("목적지" in next_instruction or "도착" in next_instruction) and next_distance <= 1.0:
-                    next_distance = 0.0
+                    # 다음 안내도 목적지인 경우 거리 처리
+                    if ("목적지" in next_instruction or "도착" in next_instruction) and next_distance <= 1.0:
+                        next_distance = 0.0
                 
-                instruction_data = {
-                    'instruction': direction,
-                    'distance': distance,
-                    'action': direction,
-                    'speed': speed,
-                    'progress': progress,
-                    'next_instruction': next_instruction,
-                    'next_distance': next_distance,
-                    'position_sync_id': f"pos_{datetime.now().timestamp()}",
-                    'current_position': {'x': current_x, 'y': current_y}
-                }
+                    instruction_data = {
+                        'instruction': direction,
+                        'distance': distance,
+                        'action': direction,
+                        'speed': speed,
+                        'progress': progress,
+                        'remaining_distance': round(remaining_distance, 1),
+                        'measured_speed': round(self.speed_estimator.speed, 2),  # 미터/초
+                        'eta_seconds': eta_seconds,
+                        'next_instruction': next_instruction,
+                        'next_distance': next_distance,
+                        # HUD 표시 상태 (안내 스케줄에서 계산, HUD는 규칙을 다시 적용하지 않음)
+                        'display_instruction': display[0],
+                        'display_distance': display[1],
+                        'display_next_instruction': display[2],
+                        'announcement': announcement,
+                        'position_sync_id': f"pos_{datetime.now().timestamp()}",
+                        'current_position': {'x': current_x, 'y': current_y}
+                    }
                 
-                self.broadcaster.publish_navigation_instruction(instruction_data)
+                    self.broadcaster.publish_navigation_instruction(instruction_data)
                 
-        except Exception as e:
-            print(f"❌ 네비게이션 안내 업데이트 오류: {e}")
+            except Exception as e:
+                print(f"❌ 네비게이션 안내 업데이트 오류: {e}")
     
     def _update_current_segment(self, current_pos):
-        """Smart_Parking_GUI.py와 동일한 로직으로 현재 세그먼트 인덱스 업데이트"""
-        if not self.full_path_points or len(self.full_path_points) < 2:
+        """Smart_Parking_GUI.py와 동일한 로직으로 현재 세그먼트 인덱스 업데이트 (캐시된 경로 기하 사용)"""
+        if len(self.route_geometry) < 2:
             return
         
-        current_x, current_y = current_pos[0], current_pos[1]
-        
-        # while 루프로 여러 세그먼트를 넘어갈 수 있도록 구현
-        while self.current_path_segment_index < len(self.full_path_points) - 1:
-            p_curr = self.full_path_points[self.current_path_segment_index]
-            p_next = self.full_path_points[self.current_path_segment_index + 1]
-            
-            dist_to_next = sqrt((current_x - p_next[0])**2 + (current_y - p_next[1])**2)
-            
-            # 세그먼트 벡터와 차량 벡터
-            v_seg_x = p_next[0] - p_curr[0]
-            v_seg_y = p_next[1] - p_curr[1]
-            v_car_x = current_x - p_curr[0]
-            v_car_y = current_y - p_curr[1]
-            seg_len_sq = v_seg_x**2 + v_seg_y**2
-            
-            proj_ratio = 1.0
-            if seg_len_sq > 0:
-                proj_ratio = (v_car_x * v_seg_x + v_car_y * v_seg_y) / seg_len_sq
-            
-            # 다음 세그먼트로 넘어가는 조건: 거리가 가깝거나 투영 비율이 1.0을 넘으면
-            if dist_to_next < 50 or proj_ratio > 1.0:
-                self.current_path_segment_index += 1
-            else:
-                break
-    
-    def generate_hud_instructions(self, pts, is_exit_scenario=False):
-        """
-        HUD 안내 메시지 생성 - Smart_Parking_GUI.py와 동일한 로직
-        
-        주차장 크기와 거리 변환 로직:
-        - 주차장 크기: 2000 x 2000 픽셀 (SCENE_W, SCENE_H)
-        - PIXELS_PER_METER = 50 (1미터 = 50픽셀)
-        - 변환 계산: 주차장 한 변 = 2000픽셀 / 50 = 40미터
-        - 따라서 주차장은 실제로 40m x 40m 크기
-        
-        거리 계산 예시:
-        - 두 점 사이 픽셀 거리: sqrt((x2-x1)^2 + (y2-y1)^2)
-        - 미터로 변환: 픽셀 거리 / PIXELS_PER_METER = 픽셀 거리 / 50
-        - 예: (200, 200)에서 (200, 925)까지 = 725픽셀 = 725/50 = 14.5미터
-        """
-        PIXELS_PER_METER = 50
-        
-        if len(pts) < 2:
-            return []
-        
-        instructions = []
-        total_dist = 0
-        
-        for i in range(len(pts) - 1):
-            p1, p2 = pts[i], pts[i+1]
-            # pts는 튜플 리스트 (x, y) 형식
-            dist_m = sqrt((p2[0]-p1[0])**2 + (p2[1]-p1[1])**2) / PIXELS_PER_METER
-            total_dist += dist_m
-            
-            if i < len(pts) - 2:
-                p3 = pts[i+2]
-                angle = (degrees(atan2(p3[1]-p2[1], p3[0]-p2[0])) - 
-                        degrees(atan2(p2[1]-p1[1], p2[0]-p1[0])) + 180) % 360 - 180
-                direction = "좌회전" if angle > 45 else ("우회전" if angle < -45 else "")
-                
-                if direction:
-                    # 직진 구간 시작점(p1)과 회전 좌표(p2) 간 거리 계산 (픽셀 단위)
-                    straight_to_turn_dist = sqrt((p2[0]-p1[0])**2 + (p2[1]-p1[1])**2)
-                    
-                    # 회전 좌표(p2)와 다음 좌표(p3) 간 거리 계산 (픽셀 단위)
-                    turn_to_next_dist = sqrt((p3[0]-p2[0])**2 + (p3[1]-p2[1])**2)
-                    
-                    # 출차 시나리오: 직진 시작점과 회전 좌표가 100픽셀 이내이면 회전 무시
-                    if is_exit_scenario and straight_to_turn_dist <= 100:
-                        # 회전 안내를 추가하지 않고 거리만 누적 (직진으로 처리)
-                        continue
-                    
-                    # 회전이 목적지와 너무 가까운지 확인 (100픽셀 이내)
-                    # p3가 마지막 포인트이거나 그 다음이 마지막 포인트인 경우
-                    is_too_close_to_destination = (
-                        turn_to_next_dist <= 100 and 
-                        (i + 2 == len(pts) - 1)  # p3가 마지막 포인트 (목적지)
-                    )
-                    
-                    # 회전이 목적지와 너무 가까우면 해당 회전 안내를 건너뜀
-                    if is_too_close_to_destination:
-                        # 회전 안내를 추가하지 않고 거리만 누적 (직진으로 처리)
-                        continue
-                    
-                    if is_exit_scenario:
-                        direction = f"출차 {direction}"
-                    instructions.append((direction, total_dist))
-                    total_dist = 0
-        
-        # 목적지 도착 거리 처리: 1m 이하면 0으로 고정
-        final_distance = total_dist
-        if final_distance <= 1.0:
-            final_distance = 0.0
-        
-        if is_exit_scenario:
-            instructions.append(("출차 완료", final_distance))
-        else:
-            instructions.append(("목적지 도착", final_distance))
-        
-        return instructions
-    
-    def calculate_route_progress(self, car_pos, full_path_points):
-        """경로 진행률 계산 - Smart_Parking_GUI.py와 동일한 로직"""
-        if not full_path_points or len(full_path_points) < 2:
-            return 0
-        
-        # 전체 경로 길이 계산 (튜플 형식)
-        total_len = sum(sqrt((full_path_points[i+1][0]-p[0])**2 + 
-                           (full_path_points[i+1][1]-p[1])**2) 
-                       for i, p in enumerate(full_path_points[:-1]))
-        
-        if total_len == 0:
-            return 0
-        
-        # 가장 가까운 세그먼트와 투영 비율 찾기
-        min_dist = float('inf')
-        closest_seg = 0
-        proj_ratio = 0
-        
-        for i, p1 in enumerate(full_path_points[:-1]):
-            p2 = full_path_points[i+1]
-            seg_vec_x = p2[0] - p1[0]
-            seg_vec_y = p2[1] - p1[1]
-            car_vec_x = car_pos[0] - p1[0]
-            car_vec_y = car_pos[1] - p1[1]
-            
-            seg_len_sq = seg_vec_x**2 + seg_vec_y**2
-            
-            if seg_len_sq == 0:
-                continue
-            
-            t = max(0, min(1, (car_vec_x * seg_vec_x + car_vec_y * seg_vec_y) / seg_len_sq))
-            proj_x = p1[0] + t * seg_vec_x
-            proj_y = p1[1] + t * seg_vec_y
-            dist = sqrt((car_pos[0]-proj_x)**2 + (car_pos[1]-proj_y)**2)
-            
-            if dist < min_dist:
-                min_dist = dist
-                closest_seg = i
-                proj_ratio = t
-        
-        # 이동한 거리 계산
-        traveled = sum(sqrt((full_path_points[i+1][0]-p[0])**2 +
-                           (full_path_points[i+1][1]-p[1])**2) 
-                       for i, p in enumerate(full_path_points[:closest_seg]))
-        
-        if closest_seg < len(full_path_points) - 1:
-            p1, p2 = full_path_points[closest_seg], full_path_points[closest_seg+1]
-            traveled += sqrt((p2[0]-p1[0])**2 + (p2[1]-p1[1])**2) * proj_ratio
-        
-        return min(100, (traveled / total_len) * 100)
-    
-    def calculate_realistic_speed(self, instructions, progress, is_exit_scenario):
-        """현실적인 속도 계산 - Smart_Parking_GUI.py와 동일한 로직"""
-        if not instructions:
-            return 0
-        
-        direction, distance = instructions[0]
-        
-        # 기본 속도 설정
-        base_speed = 20  # 기본 20km/h
-        
-        # 거리에 따른 속도 조절
-        if distance <= 5:
-            speed = 5 + (distance / 5) * 10  # 5-15km/h
-        elif distance <= 20:
-            speed = 15 + (distance / 20) * 10  # 15-25km/h
-        else:
-            speed = 20 + min(10, (distance - 20) / 50 * 10)  # 20-30km/h
-        
-        # 방향에 따른 속도 조절
-        if "좌회전" in direction or "우회전" in direction:
-            speed = min(speed, 15)  # 회전 시 감속
-        elif "목적지" in direction or "도착" in direction:
-            speed = min(speed, 15)  # 목적지 근처 감속
-        elif "출차" in direction:
-            speed = min(speed, 20)  # 출차 시 조심스럽게
-        
-        # 진행률에 따른 미세 조절
-        if progress < 20:
-            speed *= 0.8  # 시작 구간
-        elif progress > 80:
-            speed *= 0.7  # 마지막 구간
-        
-        # 출차 시나리오에서는 더 조심스럽게
-        if is_exit_scenario:
-            speed *= 0.75
-        
-        # 최종 속도 범위 제한 (0-30km/h)
-        speed = max(0, min(30, int(speed)))
-        
-        return speed
+        self.current_path_segment_index = self.route_geometry.advance_segment(
+            self.current_path_segment_index, current_pos[0], current_pos[1]
+        )
 
     def stop(self):
         """수신기 종료"""
@@ -833,6 +1185,8 @@ class ExternalServerReceiver:
                     self.server_socket.close()
                 except:
                     pass
+            self.planner_pool.shutdown()
+            self.payment_client.close()
             print("🔄 외부 서버 수신기 종료됨")
         except Exception as e:
             print(f"❌ 수신기 종료 중 오류: {e}")
@@ -843,11 +1197,16 @@ class ExternalServerReceiver:
 class MainController:
     """메인 컨트롤러 - 외부 서버 통신과 ZeroMQ 브로드캐스팅 통합 관리"""
     
-    def __init__(self, tcp_port=9999, zmq_port=5555, payment_host='localhost', payment_port=8888):
+    def __init__(self, tcp_port=9999, zmq_port=5555, payment_host='localhost', payment_port=8888,
+                 pose_rate_hz: float = DEFAULT_RATE_HZ, reassign_host: Optional[str] = REASSIGN_SERVER_HOST,
+                 reassign_port: int = REASSIGN_SERVER_PORT):
         self.tcp_port = tcp_port
         self.zmq_port = zmq_port
+        self.pose_rate_hz = pose_rate_hz
         self.broadcaster = DataBroadcaster(zmq_port)
-        self.receiver = ExternalServerReceiver('0.0.0.0', tcp_port, self.broadcaster, payment_server_host=payment_host, payment_server_port=payment_port)
+        self.receiver = ExternalServerReceiver('0.0.0.0', tcp_port, self.broadcaster, payment_server_host=payment_host,
+                                               payment_server_port=payment_port, pose_rate_hz=pose_rate_hz,
+                                               reassign_server_host=reassign_host, reassign_server_port=reassign_port)
         self.running = False
         
         # 시그널 핸들러 설정 (Ctrl+C 처리)
@@ -876,20 +1235,59 @@ class MainController:
         self.receiver.start_receiver()
         self.running = True
         
+        # 고정 주기 포즈 스트림 송신 시작
+        threading.Thread(target=self._pose_stream_loop, daemon=True, name="PoseStream").start()
+        print(f"   - 포즈 스트림: {self.pose_rate_hz:.0f}Hz (topic: pose_stream)")
+        print(f"   - 주차구역 점유: 변경 시 diff, {OCCUPANCY_SNAPSHOT_INTERVAL:.0f}초마다 전체 상태 (topic: occupancy)")
+        
         print("✅ 메인 컨트롤러 시작 완료")
         print("📱 이제 두 개의 디스플레이 화면을 실행하세요:")
         print("   1. python parking_topview.py")
         print("   2. python navigation_hud.py")
         
-        # 메인 루프 (종료 신호까지 대기)
+        # 메인 루프 (종료 신호까지 대기, 점유 전체 상태 주기 전송)
+        next_snapshot = time.monotonic()
         try:
             while self.running:
+                if time.monotonic() >= next_snapshot:
+                    self.broadcaster.publish_occupancy(self.receiver.occupancy.snapshot(), snapshot=True)
+                    next_snapshot += OCCUPANCY_SNAPSHOT_INTERVAL
                 time.sleep(1)
                 
         except KeyboardInterrupt:
             print("\n🛑 Ctrl+C 감지됨")
             self.stop()
     
+    def _pose_stream_loop(self):
+        """리샘플러를 고정 주기로 샘플링하여 pose_stream 토픽으로 송신 (주기 누적 오차 없이 절대 시각 기준)"""
+        resampler = self.receiver.pose_resampler
+        period = resampler.period
+        next_tick = time.monotonic()
+        next_log = next_tick + POSE_METRICS_LOG_INTERVAL
+        tick = 0
+        while self.running:
+            poses = resampler.sample(next_tick)
+            if poses:
+                self.broadcaster.publish_pose_stream(poses, tick, self.receiver.route_vehicle_id)
+            tick += 1
+            
+            if next_tick >= next_log:
+                metrics = resampler.metrics_summary()
+                if metrics['ticks']:
+                    print(f"📈 포즈 스트림: 보간 {metrics['interpolated_ratio'] * 100:.0f}%, "
+                          f"외삽 {metrics['extrapolated']}회(평균 {metrics['horizon_mean'] * 1000:.0f}ms, "
+                          f"최대 {metrics['horizon_max'] * 1000:.0f}ms), 정지 {metrics['held']}회, "
+                          f"외삽 오차 평균 {metrics['prediction_error_mean']}px / 최대 {metrics['prediction_error_max']}px")
+                next_log += POSE_METRICS_LOG_INTERVAL
+            
+            next_tick += period
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # 처리가 밀렸으면 지난 틱은 건너뜀
+                next_tick = time.monotonic()
+    
     def stop(self):
         """메인 컨트롤러 종료"""
         if not self.running:
@@ -975,6 +1373,13 @@ if __name__ == "__main__":
         payment_port = int(os.environ.get('PAYMENT_SERVER_PORT', '8888'))
     except:
         payment_port = 8888
+    # 팀원 재할당 서버 (빈 문자열이면 로컬 재탐색만 사용)
+    reassign_host = os.environ.get('REASSIGN_SERVER_HOST', REASSIGN_SERVER_HOST) or None
+    try:
+        reassign_port = int(os.environ.get('REASSIGN_SERVER_PORT', str(REASSIGN_SERVER_PORT)))
+    except:
+        reassign_port = REASSIGN_SERVER_PORT
+    pose_rate_hz = DEFAULT_RATE_HZ
     test_mode = False
     
     if len(sys.argv) > 1:
@@ -996,9 +1401,14 @@ if __name__ == "__main__":
             pp_idx = sys.argv.index("--payment-port")
             if pp_idx + 1 < len(sys.argv):
                 payment_port = int(sys.argv[pp_idx + 1])
+        if "--pose-rate" in sys.argv:
+            pr_idx = sys.argv.index("--pose-rate")
+            if pr_idx + 1 < len(sys.argv):
+                pose_rate_hz = float(sys.argv[pr_idx + 1])
     
     # 메인 컨트롤러 시작
-    controller = MainController(tcp_port, zmq_port, payment_host, payment_port)
+    controller = MainController(tcp_port, zmq_port, payment_host, payment_port, pose_rate_hz,
+                                reassign_host, reassign_port)
     
     if test_mode:
         print("🧪 테스트 모드 활성화됨")
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+온라인 맵 매칭 - UWB 위치를 통로(aisle) 네트워크 위의 위치로 보정하는 HMM 단계
+위치마다 주변 통로 간선 후보(최대 K개)를 고르고, 고정 길이 슬라이딩 윈도우 Viterbi로
+"가까운 간선"(방출 비용)과 "이전 위치에서 도로망으로 갈 수 있는 거리"(전이 비용)를 함께 고려합니다.
+
+UI_testing.update_car_position_from_wifi처럼 가장 가까운 경로 세그먼트로 바로 스냅하면
+멀티패스 오차가 클 때 통로 사이를 오가며 튀는데, 전이 비용이 이런 점프를 억제합니다.
+노드 간 최단 거리는 네트워크 생성 시 미리 계산하므로 위치 1회당 비용은 O(K^2)로 고정됩니다.
+"""
+
+from collections import deque
+from math import sqrt, floor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from lot_layout import LOT_MAP
+from lot_map import all_pairs_shortest_paths
+
+# HMM 파라미터 (픽셀)
+EMISSION_SIGMA = 40.0       # UWB 위치 오차 표준편차
+TRANSITION_BETA = 60.0      # 도로망 거리와 직선 거리 차이에 대한 허용 폭
+SEARCH_RADIUS = 150.0       # 후보 간선 탐색 반경 (이보다 멀면 매칭하지 않음)
+MAX_CANDIDATES = 4          # 위치당 후보 간선 수
+WINDOW_SIZE = 5             # Viterbi 슬라이딩 윈도우 길이 (위치 수)
+MAX_MISSES = 3              # 후보 없는 위치가 이 횟수 연속되기 전까지는 직전 매칭 위치 유지 (이상치 무시)
+
+GRID_CELL_SIZE = 100
+
+
+class Candidate:
+    """위치 하나에 대한 간선 후보 (간선 위 투영점)"""
+
+    __slots__ = ('edge', 't', 'x', 'y', 'distance')
+
+    def __init__(self, edge: int, t: float, x: float, y: float, distance: float):
+        self.edge = edge
+        self.t = t
+        self.x = x
+        self.y = y
+        self.distance = distance
+
+    def __repr__(self):
+        return f"Candidate(edge={self.edge}, t={self.t:.2f}, d={self.distance:.1f})"
+
+
+class AisleNetwork:
+    """통로 노드/간선 + 노드 간 최단 거리표 + 후보 탐색용 격자
+
+    node_dist/node_next는 일방통행을 지키는 경로 탐색용, match_dist는 방향을 무시한 맵 매칭용 거리표입니다.
+    tables로 lot_map 컴파일 결과 (node_dist, node_next, match_dist)를 넘기면 Floyd-Warshall을 생략합니다.
+    """
+
+    def __init__(self, nodes: Dict[str, Tuple[float, float]], edges: List[Tuple[str, str]],
+                 search_radius: float = SEARCH_RADIUS, one_way: Iterable[Tuple[str, str]] = (),
+                 tables: Optional[Tuple[List[List[float]], List[List[int]], List[List[float]]]] = None):
+        self.node_names = list(nodes)
+        self.node_index = {name: i for i, name in enumerate(self.node_names)}
+        self.node_xy = [nodes[name] for name in self.node_names]
+        self.search_radius = search_radius
+        one_way = set(one_way)
+
+        self.edge_nodes: List[Tuple[int, int]] = []
+        self.edge_one_way: List[bool] = [(a, b) in one_way for a, b in edges]
+        self.edge_geom: List[Tuple[float, float, float, float, float]] = []  # x1, y1, ux, uy, length
+        for a, b in edges:
+            u, v = self.node_index[a], self.node_index[b]
+            (x1, y1), (x2, y2) = self.node_xy[u], self.node_xy[v]
+            length = sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+            ux, uy = ((x2 - x1) / length, (y2 - y1) / length) if length > 0 else (0.0, 0.0)
+            self.edge_nodes.append((u, v))
+            self.edge_geom.append((x1, y1, ux, uy, length))
+
+        if tables is not None:
+            self.node_dist, self.node_next, self.match_dist = tables
+        else:
+            weighted = [(u, v, geom[4], ow)
+                        for (u, v), geom, ow in zip(self.edge_nodes, self.edge_geom, self.edge_one_way)]
+            self.node_dist, self.node_next = all_pairs_shortest_paths(len(self.node_names), weighted)
+            if one_way:
+                self.match_dist, _ = all_pairs_shortest_paths(
+                    len(self.node_names), [(u, v, length, False) for u, v, length, _ in weighted])
+            else:
+                self.match_dist = self.node_dist
+        self._build_grid()
+
+    def node_path(self, u: int, v: int) -> List[int]:
+        """노드 u → v 최단 경로 노드 목록 (다음 노드 표를 따라가므로 경로 길이에 비례, 연결 없으면 빈 목록)"""
+        if self.node_next[u][v] < 0:
+            return []
+        path = [u]
+        while u != v:
+            u = self.node_next[u][v]
+            path.append(u)
+        return path
+
+    def nearest_node(self, x: float, y: float) -> int:
+        """가장 가까운 노드 번호"""
+        return min(range(len(self.node_xy)),
+                   key=lambda i: (self.node_xy[i][0] - x) ** 2 + (self.node_xy[i][1] - y) ** 2)
+
+    def _build_grid(self):
+        """간선 바운딩 박스를 탐색 반경만큼 넓혀 격자 셀에 등록"""
+        r = self.search_radius
+        xs = [p[0] for p in self.node_xy]
+        ys = [p[1] for p in self.node_xy]
+        self.x0, self.y0 = min(xs) - r, min(ys) - r
+        self.gx = int((max(xs) + r - self.x0) // GRID_CELL_SIZE) + 1
+        self.gy = int((max(ys) + r - self.y0) // GRID_CELL_SIZE) + 1
+        cells: List[List[int]] = [[] for _ in range(self.gx * self.gy)]
+        for e, (u, v) in enumerate(self.edge_nodes):
+            (x1, y1), (x2, y2) = self.node_xy[u], self.node_xy[v]
+            ix0 = int((min(x1, x2) - r - self.x0) // GRID_CELL_SIZE)
+            ix1 = int((max(x1, x2) + r - self.x0) // GRID_CELL_SIZE)
+            iy0 = int((min(y1, y2) - r - self.y0) // GRID_CELL_SIZE)
+            iy1 = int((max(y1, y2) + r - self.y0) // GRID_CELL_SIZE)
+            for iy in range(max(0, iy0), min(self.gy - 1, iy1) + 1):
+                for ix in range(max(0, ix0), min(self.gx - 1, ix1) + 1):
+                    cells[iy * self.gx + ix].append(e)
+        self.cells = [tuple(c) for c in cells]
+
+    def project(self, edge: int, x: float, y: float) -> Candidate:
+        x1, y1, ux, uy, length = self.edge_geom[edge]
+        along = (x - x1) * ux + (y - y1) * uy
+        along = 0.0 if along < 0.0 else (length if along > length else along)
+        px, py = x1 + ux * along, y1 + uy * along
+        t = along / length if length > 0 else 0.0
+        return Candidate(edge, t, px, py, sqrt((x - px) ** 2 + (y - py) ** 2))
+
+    def candidates(self, x: float, y: float, max_candidates: int = MAX_CANDIDATES) -> List[Candidate]:
+        """탐색 반경 안의 간선 후보 (가까운 순, 최대 max_candidates개)"""
+        ix = int(floor((x - self.x0) / GRID_CELL_SIZE))
+        iy = int(floor((y - self.y0) / GRID_CELL_SIZE))
+        if ix < 0 or iy < 0 or ix >= self.gx or iy >= self.gy:
+            return []
+        found = [self.project(e, x, y) for e in self.cells[iy * self.gx + ix]]
+        found = [c for c in found if c.distance <= self.search_radius]
+        found.sort(key=lambda c: c.distance)
+        return found[:max_candidates]
+
+    def route_distance(self, a: Candidate, b: Candidate) -> float:
+        """간선 위 두 점 사이의 통로 최단 거리 (미리 계산한 노드 거리표 사용, 방향 무시)"""
+        la = self.edge_geom[a.edge][4]
+        lb = self.edge_geom[b.edge][4]
+        sa, sb = a.t * la, b.t * lb
+        if a.edge == b.edge:
+            return abs(sb - sa)
+        au, av = self.edge_nodes[a.edge]
+        bu, bv = self.edge_nodes[b.edge]
+        d = self.match_dist
+        return min(
+            sa + d[au][bu] + sb,
+            sa + d[au][bv] + (lb - sb),
+            (la - sa) + d[av][bu] + sb,
+            (la - sa) + d[av][bv] + (lb - sb),
+        )
+
+
+_lot_network: Optional[AisleNetwork] = None
+
+
+def aisle_network_from_lot(lot) -> AisleNetwork:
+    """컴파일된 지도(lot_map.CompiledLotMap)의 통로 네트워크 (거리표는 컴파일 결과 사용, 층별 지도에도 사용)"""
+    return AisleNetwork(lot.aisle_nodes, lot.aisle_edges, one_way=lot.aisle_one_way,
+                        tables=(lot.node_dist, lot.node_next, lot.match_dist))
+
+
+def lot_aisle_network() -> AisleNetwork:
+    """주차장 기본 통로 네트워크 (모듈 내 1회 생성, 거리표는 lot_map 컴파일 결과 사용)"""
+    global _lot_network
+    if _lot_network is None:
+        _lot_network = aisle_network_from_lot(LOT_MAP)
+    return _lot_network
+
+
+class OnlineMapMatcher:
+    """차량 1대의 슬라이딩 윈도우 Viterbi 맵 매칭
+
+    윈도우의 각 열은 (후보 목록, 누적 비용, 역추적 포인터)이며, 가장 오래된 열은 윈도우를 넘으면 버립니다.
+    누적 비용은 매 열마다 최솟값을 빼서 정규화하므로 오래 주행해도 값이 커지지 않습니다.
+    """
+
+    def __init__(self, network: Optional[AisleNetwork] = None,
+                 sigma: float = EMISSION_SIGMA, beta: float = TRANSITION_BETA,
+                 max_candidates: int = MAX_CANDIDATES, window_size: int = WINDOW_SIZE,
+                 max_misses: int = MAX_MISSES):
+        self.network = network or lot_aisle_network()
+        self.inv_two_sigma_sq = 1.0 / (2.0 * sigma * sigma)
+        self.inv_beta = 1.0 / beta
+        self.max_candidates = max_candidates
+        self.max_misses = max_misses
+        self.window: deque = deque(maxlen=window_size)
+        self.last_fix: Optional[Tuple[float, float]] = None
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.misses = 0
+
+    def reset(self):
+        self.window.clear()
+        self.last_fix = None
+        self.last_result = None
+        self.misses = 0
+
+    def update(self, x: float, y: float) -> Dict[str, Any]:
+        """위치 1회 반영 - 매칭 결과 반환
+
+        Returns:
+            {'x', 'y': 매칭 위치, 'matched': 매칭 여부, 'edge': 간선 번호, 'offset': 원래 위치와의 거리}
+            이상치로 직전 위치를 유지한 경우 'held': True 추가
+        """
+        candidates = self.network.candidates(x, y, self.max_candidates)
+        if not candidates:
+            self.misses += 1
+            if self.last_result is not None and self.misses < self.max_misses:
+                # 일시적인 멀티패스 이상치: 직전 매칭 위치 유지
+                return dict(self.last_result, held=True)
+            # 통로에서 계속 멀면 (주차구역 진입, 출차 신호 등) 윈도우를 끊고 원래 위치 사용
+            self.reset()
+            return {'x': x, 'y': y, 'matched': False, 'edge': None, 'offset': 0.0}
+        self.misses = 0
+
+        emission = [c.distance * c.distance * self.inv_two_sigma_sq for c in candidates]
+
+        if not self.window:
+            costs = emission
+            back = [-1] * len(candidates)
+        else:
+            prev_candidates, prev_costs, _ = self.window[-1]
+            lx, ly = self.last_fix
+            straight = sqrt((x - lx) ** 2 + (y - ly) ** 2)
+            costs, back = [], []
+            for c, e_cost in zip(candidates, emission):
+                best, best_j = float('inf'), -1
+                for j, (p, p_cost) in enumerate(zip(prev_candidates, prev_costs)):
+                    route = self.network.route_distance(p, c)
+                    cost = p_cost + abs(route - straight) * self.inv_beta
+                    if cost < best:
+                        best, best_j = cost, j
+                costs.append(best + e_cost)
+                back.append(best_j)
+
+        low = min(costs)
+        costs = [c - low for c in costs]
+        self.window.append((candidates, costs, back))
+        self.last_fix = (x, y)
+
+        best = min(range(len(candidates)), key=costs.__getitem__)
+        c = candidates[best]
+        self.last_result = {'x': c.x, 'y': c.y, 'matched': True, 'edge': c.edge, 'offset': c.distance}
+        return self.last_result
+
+    def window_path(self) -> List[Candidate]:
+        """윈도우 안의 최적 경로 역추적 (오래된 위치부터)"""
+        if not self.window:
+            return []
+        candidates, costs, _ = self.window[-1]
+        i = min(range(len(candidates)), key=costs.__getitem__)
+        path = []
+        for candidates, _, back in reversed(self.window):
+            path.append(candidates[i])
+            i = back[i]
+            if i < 0:
+                break
+        path.reverse()
+        return path
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+네비게이션 코어 - Qt 의존성 없는 경로 안내 계산 모듈
+main_controller.py, parking_topview.py, UI_testing.py가 각각 복사해서 쓰던
+generate_hud_instructions / calculate_route_progress / _update_current_segment /
+속도 계산 로직을 한 곳으로 모은 공용 라이브러리 (속도는 실제 위치 변화 기반 SpeedEstimator)
+
+좌표는 QPointF 대신 __slots__ 기반 Point/Segment와 array('d') 기반 RoutePath로 다루며,
+QPointF가 넘어와도 x()/y() 메서드로 읽어서 처리하므로 Qt를 import하지 않습니다.
+"""
+
+from array import array
+from math import sqrt, atan2, degrees, exp
+from typing import List, Tuple, Iterable, Optional
+
+from lot_layout import PIXELS_PER_METER, ENTRANCE_POINT
+
+# ===================================================================
+# 공용 상수 (Smart_Parking_GUI.py와 동일한 값)
+# ===================================================================
+# PIXELS_PER_METER (1미터 = 50픽셀), ENTRANCE_POINT (입차 경로 시작점)는 lot_map.json에서 읽음
+SEGMENT_ADVANCE_RADIUS = 50    # 다음 웨이포인트까지 50픽셀 이내면 다음 세그먼트로 진행
+TURN_ANGLE_THRESHOLD = 45      # 45도를 넘는 방향 변화만 회전으로 안내
+SHORT_TURN_PIXELS = 100        # 100픽셀 이내 회전은 안내 생략 (출차 시작/목적지 직전)
+
+SPEED_TIME_CONSTANT = 1.5      # 속도 EWMA 시정수 (초)
+SPEED_BASELINE = 0.5           # 이 간격 이상 떨어진 위치끼리만 속도 계산 (초)
+SPEED_MAX_GAP = 2.0            # 이보다 긴 수신 간격 후에는 속도 추정을 다시 시작 (초)
+ETA_MIN_SPEED = 0.2            # 이보다 느리면 (정지) 도착 예상 시간을 계산하지 않음 (미터/초)
+
+ARRIVAL_TEXT = "목적지 도착"
+EXIT_COMPLETE_TEXT = "출차 완료"
+
+Instruction = Tuple[str, float]
+
+
+# ===================================================================
+# 좌표 타입
+# ===================================================================
+def point_xy(p) -> Tuple[float, float]:
+    """튜플/리스트/Point/QPointF 어떤 형식이든 (x, y) 튜플로 변환"""
+    x = getattr(p, 'x', None)
+    if x is None:
+        return float(p[0]), float(p[1])
+    if callable(x):
+        return float(x()), float(p.y())
+    return float(x), float(p.y)
+
+
+class Point:
+    """__slots__ 기반 2D 좌표 (튜플처럼 언패킹 가능)"""
+
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __getitem__(self, i):
+        return (self.x, self.y)[i]
+
+    def __len__(self):
+        return 2
+
+    def __eq__(self, other):
+        try:
+            ox, oy = point_xy(other)
+        except (TypeError, IndexError, AttributeError):
+            return NotImplemented
+        return self.x == ox and self.y == oy
+
+    def __repr__(self):
+        return f"Point({self.x:.1f}, {self.y:.1f})"
+
+    def distance_to(self, other) -> float:
+        ox, oy = point_xy(other)
+        return sqrt((self.x - ox) ** 2 + (self.y - oy) ** 2)
+
+
+class Segment:
+    """__slots__ 기반 선분 - 방향 벡터와 길이를 한 번만 계산해 둠"""
+
+    __slots__ = ('x1', 'y1', 'x2', 'y2', 'dx', 'dy', 'length_sq', 'length')
+
+    def __init__(self, x1: float, y1: float, x2: float, y2: float):
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        self.dx = x2 - x1
+        self.dy = y2 - y1
+        self.length_sq = self.dx * self.dx + self.dy * self.dy
+        self.length = sqrt(self.length_sq)
+
+    def projection_ratio(self, x: float, y: float) -> float:
+        """점을 선분 직선에 투영했을 때의 비율 (클램프하지 않음, 길이 0이면 1.0)"""
+        if self.length_sq <= 0:
+            return 1.0
+        return ((x - self.x1) * self.dx + (y - self.y1) * self.dy) / self.length_sq
+
+    def distance_to(self, x: float, y: float) -> Tuple[float, float]:
+        """점과 선분 사이 최단 거리와 [0, 1]로 클램프한 투영 비율을 반환"""
+        if self.length_sq <= 0:
+            return sqrt((x - self.x1) ** 2 + (y - self.y1) ** 2), 0.0
+        t = ((x - self.x1) * self.dx + (y - self.y1) * self.dy) / self.length_sq
+        t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+        px = self.x1 + t * self.dx
+        py = self.y1 + t * self.dy
+        return sqrt((x - px) ** 2 + (y - py) ** 2), t
+
+    def __repr__(self):
+        return f"Segment(({self.x1:.1f}, {self.y1:.1f}) -> ({self.x2:.1f}, {self.y2:.1f}))"
+
+
+class RoutePath:
+    """경로 포인트를 x/y 두 개의 array('d')로 보관하는 경로 (포인트당 16바이트)"""
+
+    __slots__ = ('xs', 'ys')
+
+    def __init__(self, points: Iterable = ()):
+        self.xs = array('d')
+        self.ys = array('d')
+        for p in points:
+            x, y = point_xy(p)
+            self.xs.append(x)
+            self.ys.append(y)
+
+    @classmethod
+    def from_arrays(cls, xs: array, ys: array) -> 'RoutePath':
+        path = cls()
+        path.xs = xs
+        path.ys = ys
+        return path
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __getitem__(self, i) -> Point:
+        return Point(self.xs[i], self.ys[i])
+
+    def __iter__(self):
+        for x, y in zip(self.xs, self.ys):
+            yield Point(x, y)
+
+    def segment(self, i: int) -> Segment:
+        return Segment(self.xs[i], self.ys[i], self.xs[i + 1], self.ys[i + 1])
+
+    def segments(self) -> List[Segment]:
+        return [self.segment(i) for i in range(len(self.xs) - 1)]
+
+    def to_tuples(self) -> List[Tuple[float, float]]:
+        return list(zip(self.xs, self.ys))
+
+    def remaining_from(self, segment_index: int, x: float, y: float) -> 'RoutePath':
+        """현재 위치 + 현재 세그먼트 이후 포인트들로 이루어진 경로 (path_for_hud)"""
+        xs = array('d', (x,))
+        ys = array('d', (y,))
+        xs.extend(self.xs[segment_index + 1:])
+        ys.extend(self.ys[segment_index + 1:])
+        return RoutePath.from_arrays(xs, ys)
+
+
+def as_route_path(points) -> RoutePath:
+    """RoutePath가 아니면 RoutePath로 변환"""
+    return points if isinstance(points, RoutePath) else RoutePath(points)
+
+
+def route_points_from_waypoints(waypoints, route_type: str = 'entry') -> List[Tuple[float, float]]:
+    """서버 웨이포인트로 전체 경로 포인트 구성 (ExternalServerReceiver 규칙)
+
+    - 입차/재할당: 입구(ENTRANCE_POINT)부터 시작
+    - 출차: 첫 번째 웨이포인트가 주차 좌표이므로 그대로 사용
+    """
+    points = [] if route_type == 'exit' else [ENTRANCE_POINT]
+    points.extend((wp[0], wp[1]) for wp in waypoints)
+    return points
+
+
+# ===================================================================
+# 세그먼트 진행 / 안내 생성 / 진행률 / 속도
+# ===================================================================
+def update_current_segment(path, segment_index: int, x: float, y: float,
+                           advance_radius: float = SEGMENT_ADVANCE_RADIUS) -> int:
+    """while 루프로 여러 세그먼트를 넘어갈 수 있도록 현재 세그먼트 인덱스 갱신
+
+    다음 웨이포인트까지 advance_radius 이내이거나 투영 비율이 1.0을 넘으면 다음 세그먼트로 진행
+    """
+    path = as_route_path(path)
+    xs, ys = path.xs, path.ys
+    last = len(xs) - 1
+    if last < 1:
+        return segment_index
+
+    while segment_index < last:
+        cx, cy = xs[segment_index], ys[segment_index]
+        nx, ny = xs[segment_index + 1], ys[segment_index + 1]
+
+        dist_to_next = sqrt((x - nx) ** 2 + (y - ny) ** 2)
+
+        v_seg_x = nx - cx
+        v_seg_y = ny - cy
+        seg_len_sq = v_seg_x * v_seg_x + v_seg_y * v_seg_y
+
+        proj_ratio = 1.0
+        if seg_len_sq > 0:
+            proj_ratio = ((x - cx) * v_seg_x + (y - cy) * v_seg_y) / seg_len_sq
+
+        if dist_to_next < advance_radius or proj_ratio > 1.0:
+            segment_index += 1
+        else:
+            break
+
+    return segment_index
+
+
+def generate_hud_instructions(pts, is_exit_scenario: bool = False) -> List[Instruction]:
+    """
+    HUD 안내 메시지 생성 - Smart_Parking_GUI.py와 동일한 로직
+
+    - 45도를 넘는 방향 변화만 좌회전/우회전으로 안내
+    - 출차 시나리오: 직진 시작점과 회전 좌표가 100픽셀 이내이면 회전 무시
+    - 목적지 직전 100픽셀 이내 회전은 안내 생략
+    - 목적지까지 남은 거리가 1m 이하면 0으로 고정
+
+    Args:
+        pts: 좌표 시퀀스 (RoutePath, (x, y) 튜플, Point, QPointF 모두 가능)
+    Returns:
+        [(방향, 거리(m)), ...] 마지막 항목은 "목적지 도착" 또는 "출차 완료"
+    """
+    path = as_route_path(pts)
+    xs, ys = path.xs, path.ys
+    n = len(xs)
+    if n < 2:
+        return []
+
+    instructions = []
+    total_dist = 0.0
+    last_index = n - 1
+
+    for i in range(n - 1):
+        x1, y1 = xs[i], ys[i]
+        x2, y2 = xs[i + 1], ys[i + 1]
+        seg_px = sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+        total_dist += seg_px / PIXELS_PER_METER
+
+        if i < n - 2:
+            x3, y3 = xs[i + 2], ys[i + 2]
+            angle = (degrees(atan2(y3 - y2, x3 - x2)) -
+                     degrees(atan2(y2 - y1, x2 - x1)) + 180) % 360 - 180
+            direction = turn_direction(angle)
+
+            if direction:
+                # 출차 시나리오: 직진 시작점(p1)과 회전 좌표(p2)가 100픽셀 이내이면 회전 무시
+                if is_exit_scenario and seg_px <= SHORT_TURN_PIXELS:
+                    continue
+
+                # 회전 좌표(p2)와 목적지(p3)가 100픽셀 이내이면 회전 안내 생략
+                turn_to_next_dist = sqrt((x3 - x2) ** 2 + (y3 - y2) ** 2)
+                if turn_to_next_dist <= SHORT_TURN_PIXELS and i + 2 == last_index:
+                    continue
+
+                if is_exit_scenario:
+                    direction = f"출차 {direction}"
+                instructions.append((direction, total_dist))
+                total_dist = 0.0
+
+    final_distance = total_dist if total_dist > 1.0 else 0.0
+    instructions.append((EXIT_COMPLETE_TEXT if is_exit_scenario else ARRIVAL_TEXT, final_distance))
+    return instructions
+
+
+def turn_direction(angle: float) -> str:
+    """방향 변화 각도(도, 반시계 +)를 회전 안내 문자열로 변환"""
+    if angle > TURN_ANGLE_THRESHOLD:
+        return "좌회전"
+    if angle < -TURN_ANGLE_THRESHOLD:
+        return "우회전"
+    return ""
+
+
+def instructions_from_position(path, segment_index: int, x: float, y: float,
+                               is_exit_scenario: bool = False) -> List[Instruction]:
+    """현재 위치부터 남은 경로까지의 안내 생성 (generate_hud_instructions([현재위치] + 남은 포인트))"""
+    path = as_route_path(path)
+    if segment_index + 1 >= len(path):
+        return [(EXIT_COMPLETE_TEXT if is_exit_scenario else ARRIVAL_TEXT, 0.0)]
+    return generate_hud_instructions(path.remaining_from(segment_index, x, y), is_exit_scenario)
+
+
+def calculate_route_progress(path, x: float, y: float) -> float:
+    """경로 진행률(%) 계산 - 가장 가까운 세그먼트에 투영한 위치까지의 누적 거리 / 전체 길이"""
+    path = as_route_path(path)
+    xs, ys = path.xs, path.ys
+    n = len(xs)
+    if n < 2:
+        return 0
+
+    total_len = 0.0
+    min_dist = float('inf')
+    traveled = 0.0
+    walked = 0.0
+
+    for i in range(n - 1):
+        x1, y1 = xs[i], ys[i]
+        seg_x = xs[i + 1] - x1
+        seg_y = ys[i + 1] - y1
+        seg_len_sq = seg_x * seg_x + seg_y * seg_y
+        seg_len = sqrt(seg_len_sq)
+        total_len += seg_len
+
+        if seg_len_sq == 0:
+            continue
+
+        t = ((x - x1) * seg_x + (y - y1) * seg_y) / seg_len_sq
+        t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+        dist = sqrt((x - (x1 + t * seg_x)) ** 2 + (y - (y1 + t * seg_y)) ** 2)
+
+        if dist < min_dist:
+            min_dist = dist
+            traveled = walked + seg_len * t
+        walked += seg_len
+
+    if total_len == 0:
+        return 0
+
+    return min(100, (traveled / total_len) * 100)
+
+
+class SpeedEstimator:
+    """타임스탬프가 있는 위치 변화로 실제 속도를 추정하는 EWMA (위치 1회당 O(1))
+
+    속도 크기 대신 속도 벡터(vx, vy)를 평균하므로 위치 잡음이 상쇄되어 정지/서행 시 속도가 부풀려지지 않고,
+    위치 변화는 SPEED_BASELINE초 이상 떨어진 위치끼리만 계산합니다 (짧은 간격은 잡음이 속도를 지배).
+    수신 간격이 불규칙하므로 가중치를 간격에 맞춰 alpha = 1 - exp(-dt / tau)로 계산하고,
+    간격이 SPEED_MAX_GAP보다 길면 (수신 끊김, 출차 후 재입차 등) 이전 속도를 버리고 다시 시작합니다.
+    """
+
+    __slots__ = ('time_constant', 'last_x', 'last_y', 'last_time', 'vx', 'vy', 'samples')
+
+    def __init__(self, time_constant: float = SPEED_TIME_CONSTANT):
+        self.time_constant = time_constant
+        self.reset()
+
+    def reset(self):
+        self.last_x = self.last_y = self.last_time = None
+        self.vx = self.vy = 0.0   # 미터/초
+        self.samples = 0
+
+    @property
+    def speed(self) -> float:
+        """추정 속도 (미터/초)"""
+        return sqrt(self.vx * self.vx + self.vy * self.vy)
+
+    def update(self, x: float, y: float, now: float) -> float:
+        """위치 1회 반영 (now는 초 단위 단조 시각) - 추정 속도(미터/초) 반환"""
+        if self.last_time is None or now - self.last_time > SPEED_MAX_GAP:
+            self.last_x, self.last_y, self.last_time = x, y, now
+            self.vx = self.vy = 0.0
+            self.samples = 0
+            return 0.0
+
+        dt = now - self.last_time
+        if dt < SPEED_BASELINE:
+            # 기준 간격이 찰 때까지 기준 위치 유지
+            return self.speed
+
+        ix = (x - self.last_x) / PIXELS_PER_METER / dt
+        iy = (y - self.last_y) / PIXELS_PER_METER / dt
+        if self.samples == 0:
+            self.vx, self.vy = ix, iy
+        else:
+            alpha = 1.0 - exp(-dt / self.time_constant)
+            self.vx += alpha * (ix - self.vx)
+            self.vy += alpha * (iy - self.vy)
+        self.samples += 1
+        self.last_x, self.last_y, self.last_time = x, y, now
+        return self.speed
+
+    @property
+    def speed_kmh(self) -> int:
+        """HUD 표시용 속도 (km/h, 정수)"""
+        return int(round(self.speed * 3.6))
+
+    def eta_seconds(self, remaining_meters: float) -> Optional[float]:
+        """남은 거리 도착 예상 시간 (초) - 정지/추정 전이면 None"""
+        if remaining_meters <= 0:
+            return 0.0
+        if self.samples == 0 or self.speed < ETA_MIN_SPEED:
+            return None
+        return remaining_meters / self.speed
+
+
+def distance_to_path(path, x: float, y: float) -> float:
+    """점에서 경로(모든 세그먼트)까지의 최단 거리 (픽셀)"""
+    path = as_route_path(path)
+    xs, ys = path.xs, path.ys
+    n = len(xs)
+    if n < 2:
+        return float('inf')
+
+    min_sq = float('inf')
+    for i in range(n - 1):
+        x1, y1 = xs[i], ys[i]
+        seg_x = xs[i + 1] - x1
+        seg_y = ys[i + 1] - y1
+        seg_len_sq = seg_x * seg_x + seg_y * seg_y
+        if seg_len_sq == 0:
+            d_sq = (x - x1) ** 2 + (y - y1) ** 2
+        else:
+            t = ((x - x1) * seg_x + (y - y1) * seg_y) / seg_len_sq
+            t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+            d_sq = (x - (x1 + t * seg_x)) ** 2 + (y - (y1 + t * seg_y)) ** 2
+        if d_sq < min_sq:
+            min_sq = d_sq
+    return sqrt(min_sq)
+
+
+def project_to_path(path, x: float, y: float) -> Optional[Tuple[float, float, int, float]]:
+    """점을 경로에 투영 - (투영 x, 투영 y, 세그먼트 인덱스, 투영 비율) 반환, 경로가 없으면 None"""
+    path = as_route_path(path)
+    xs, ys = path.xs, path.ys
+    n = len(xs)
+    if n < 2:
+        return None
+
+    best = None
+    min_sq = float('inf')
+    for i in range(n - 1):
+        x1, y1 = xs[i], ys[i]
+        seg_x = xs[i + 1] - x1
+        seg_y = ys[i + 1] - y1
+        seg_len_sq = seg_x * seg_x + seg_y * seg_y
+        t = 0.0
+        if seg_len_sq > 0:
+            t = ((x - x1) * seg_x + (y - y1) * seg_y) / seg_len_sq
+            t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+        px = x1 + t * seg_x
+        py = y1 + t * seg_y
+        d_sq = (x - px) ** 2 + (y - py) ** 2
+        if d_sq < min_sq:
+            min_sq = d_sq
+            best = (px, py, i, t)
+    return best
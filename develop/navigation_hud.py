@@ -82,6 +82,8 @@ from PyQt5.QtCore import (
     QPropertyAnimation, QPointF, QRectF, QThread
 )
 
+from geofence import lot_geofence
+
 ESP32_CAM_URL = "http://192.168.0.29:81/stream"
 
 # ===================================================================
@@ -923,13 +925,25 @@ class PremiumHudWidget(QFrame):
                     else:
                         self.next_direction = ""
 
+        self._apply_direction_change()
+        self.update()
+
+    def apply_display_state(self, direction, distance, next_direction="", current_speed=0, route_progress=0):
+        """main_controller의 안내 스케줄이 계산한 표시 상태를 그대로 반영 (8m/5m/2m 규칙 재계산 없음)"""
+        self.speed, self.progress = current_speed, route_progress
+        self.current_direction = direction
+        self.current_distance = distance
+        self.next_direction = next_direction
+        self._apply_direction_change()
+        self.update()
+
+    def _apply_direction_change(self):
+        """표시 방향이 바뀌면 전환 애니메이션 시작 및 음성 안내"""
         new_direction = self.current_direction
         if new_direction != self.target_direction:
             self.previous_direction, self.target_direction, self.direction_transition = self.target_direction, new_direction, 0.0
             
             self.play_voice_guidance(new_direction, self.current_distance)
-
-        self.update()
     
     def play_voice_guidance(self, direction, distance):
         """음성 안내 메시지 생성 및 재생"""
@@ -1123,8 +1137,11 @@ class NavigationHUD(QWidget):
             # 차량 위치 저장 (출차 시나리오에서 사용)
             if 'x' in position_data and 'y' in position_data:
                 self.last_position = (position_data['x'], position_data['y'])
-                # 주차 구역 감지
-                self.current_parking_spot = self.detect_parking_spot(self.last_position)
+                # 주차 구역 감지 (main_controller가 지오펜스로 계산한 값이 있으면 그대로 사용)
+                if 'parking_spot' in position_data:
+                    self.current_parking_spot = position_data['parking_spot']
+                else:
+                    self.current_parking_spot = self.detect_parking_spot(self.last_position)
             
             # 속도는 네비게이션 안내에서 함께 업데이트됨
         except Exception as e:
@@ -1140,6 +1157,16 @@ class NavigationHUD(QWidget):
             speed = nav_data.get('speed', 0)
             progress = nav_data.get('progress', 0)
             
+            # 안내 스케줄 기반 표시 상태가 있으면 그대로 사용
+            if 'display_instruction' in nav_data:
+                self.hud_widget.apply_display_state(
+                    nav_data.get('display_instruction', ''),
+                    nav_data.get('display_distance', 0),
+                    nav_data.get('display_next_instruction', ''),
+                    current_speed=speed, route_progress=progress
+                )
+                return
+            
             # HUD 업데이트 (instructions 형식으로 변환)
             instructions = []
             if instruction and distance >= 0:
@@ -1195,87 +1222,8 @@ class NavigationHUD(QWidget):
             print(f"❌ HUD 정산 데이터 처리 오류: {e}")
     
     def detect_parking_spot(self, car_pos):
-        """차량 위치를 기반으로 주차 구역 번호 감지 - Smart_Parking_GUI.py 로직 참고"""
-        x, y = car_pos[0], car_pos[1]
-        
-        # 주차 구역별 좌표 범위 정의 (Smart_Parking_GUI.py와 동일)
-        parking_spots = {
-            # 1~5번 주차구역 (상단 주차구역)
-            1: (0, 1600, 400, 400),      # 장애인 구역
-            2: (400, 1600, 300, 400),    # 일반 구역
-            3: (700, 1600, 300, 400),    # 일반 구역
-            4: (1000, 1600, 300, 400),   # 전기차 구역
-            5: (1300, 1600, 300, 400),   # 전기차 구역
-            
-            # 6~7번 주차구역 (우측 주차구역)
-            6: (1600, 1200, 400, 400),   # 장애인 구역
-            7: (1600, 800, 400, 400),    # 장애인 구역
-            
-            # 8~11번 주차구역 (하단 주차구역)
-            8: (1300, 400, 300, 400),    # 일반 구역
-            9: (1000, 400, 300, 400),    # 일반 구역
-            10: (700, 400, 300, 400),    # 전기차 구역
-            11: (400, 400, 300, 400),     # 전기차 구역
-        }
-        
-        for spot_num, (spot_x, spot_y, spot_w, spot_h) in parking_spots.items():
-            if spot_x <= x <= spot_x + spot_w and spot_y <= y <= spot_y + spot_h:
-                return spot_num
-        
-        return None
-    
-    def generate_exit_waypoints(self, parking_spot):
-        """출차 웨이포인트 생성 - Smart_Parking_GUI.py 로직 참고
-        주차 좌표 포인트부터 시작하는 전체 출차 경로를 반환"""
-        MANDATORY_WAYPOINT = [200, 925]
-        FINAL_DESTINATION = [200, 200]  # 최종 목적지 (입구)
-        
-        # 주차구역별 시작 좌표 (Smart_Parking_GUI.py의 get_parking_spot_start_waypoint와 동일)
-        parking_waypoints = {
-            # 주차구역 1-5 (상단, 왼쪽→오른쪽)
-            1: [200, 1475], 2: [550, 1475], 3: [850, 1475], 4: [1150, 1475],
-            5: [1450, 1475],
-            # 주차구역 6-7 (우측, 위→아래)  
-            6: [1475, 1400], 7: [1475, 1000],
-            # 주차구역 8-11 (하단, 오른쪽→왼쪽)
-            8: [1475, 925], 9: [1150, 925], 10: [850, 925], 11: [550, 925]
-        }
-        
-        current_waypoint = parking_waypoints.get(parking_spot)
-        if not current_waypoint:
-            return None
-        
-        exit_waypoints = []
-        
-        # Smart_Parking_GUI.py의 calculate_and_display_exit_route처럼 주차 좌표 포인트부터 시작
-        # 전체 경로: [주차 좌표 포인트] + [중간 웨이포인트들] + [최종 목적지]
-        
-        if parking_spot == 1:  # 1번: (200,1475) -> (200,925) -> (200,200)
-            exit_waypoints.append(current_waypoint)  # [200, 1475]부터 시작
-            exit_waypoints.append(MANDATORY_WAYPOINT)
-            exit_waypoints.append(FINAL_DESTINATION)
-        elif parking_spot in [2, 3, 4, 5]:  # 2~5번: 주차 좌표 -> (200, 1475) -> (200, 925) -> (200,200)
-            exit_waypoints.append(current_waypoint)  # 주차 좌표부터 시작
-            exit_waypoints.append([200, 1475])
-            exit_waypoints.append(MANDATORY_WAYPOINT)
-            exit_waypoints.append(FINAL_DESTINATION)
-        elif parking_spot == 6:  # 6번: (1475, 1400) -> (1475, 1475) -> (200, 1475) -> (200, 925) -> (200,200)
-            exit_waypoints.append(current_waypoint)  # [1475, 1400]부터 시작
-            exit_waypoints.append([1475, 1475])
-            exit_waypoints.append([200, 1475])
-            exit_waypoints.append(MANDATORY_WAYPOINT)
-            exit_waypoints.append(FINAL_DESTINATION)
-        elif parking_spot == 7:  # 7번: (1475, 1000) -> (1475, 925) -> (200, 925) -> (200,200)
-            exit_waypoints.append(current_waypoint)  # [1475, 1000]부터 시작
-            exit_waypoints.append([1475, 925])
-            exit_waypoints.append(MANDATORY_WAYPOINT)
-            exit_waypoints.append(FINAL_DESTINATION)
-        elif parking_spot in [8, 9, 10, 11]:  # 8~11번: 주차 좌표 -> (200, 925) -> (200,200)
-            exit_waypoints.append(current_waypoint)  # 주차 좌표부터 시작
-            exit_waypoints.append(MANDATORY_WAYPOINT)
-            exit_waypoints.append(FINAL_DESTINATION)
-        
-        return exit_waypoints
+        """차량 위치를 기반으로 주차 구역 번호 감지 (지오펜스 격자 인덱스 조회)"""
+        return lot_geofence().spot_at(car_pos[0], car_pos[1])
     
     def start_exit_scenario(self):
         """출차 시나리오 시작 - 정산 처리 후 출차 로직 시작"""
@@ -1433,57 +1381,19 @@ class NavigationHUD(QWidget):
             self.pending_parking_spot = None
     
     def start_exit_route(self):
-        """출차 경로 생성 및 전송 (기존 로직)"""
+        """출차 안내 시작 알림 - 출차 경로는 컨트롤러가 주차 시점에 미리 계산해 두고 정산 확인 시 바로 적용
+        (경로는 ZeroMQ 웨이포인트로 수신하므로 여기서는 경로를 만들거나 보내지 않음)"""
         from PyQt5.QtWidgets import QMessageBox
-        import socket
         
         parking_spot = self.pending_parking_spot
         if not parking_spot:
             return
         
-        exit_waypoints = self.generate_exit_waypoints(parking_spot)
-        if not exit_waypoints:
-            QMessageBox.warning(self, "출차 오류", "출차 경로를 생성할 수 없습니다.")
-            self.pending_parking_spot = None
-            return
+        QMessageBox.information(self, "출차 시나리오", 
+            f"주차 구역 {parking_spot}번에서 출차 경로를 시작합니다.\n입차 경로의 역순으로 안전하게 출차하세요.")
+        print(f"🚗 출차 안내 시작: 주차구역 {parking_spot}번 (컨트롤러 사전 계산 경로)")
         
-        # TCP/IP 소켓으로 main_controller.py에 출차 웨이포인트 전송
-        try:
-            client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            client_socket.settimeout(5.0)
-            client_socket.connect(('localhost', 9999))
-            
-            waypoint_data = {
-                'type': 'waypoint',
-                'waypoints': exit_waypoints,
-                'parking_spot': parking_spot,
-                'route_type': 'exit'
-            }
-            
-            json_str = json.dumps(waypoint_data, ensure_ascii=False)
-            client_socket.sendall(json_str.encode('utf-8'))
-            time.sleep(0.01)
-            client_socket.close()
-            
-            QMessageBox.information(self, "출차 시나리오", 
-                f"주차 구역 {parking_spot}번에서 출차 경로를 시작합니다.\n입차 경로의 역순으로 안전하게 출차하세요.")
-            print(f"🚗 출차 경로 전송 완료: 주차구역 {parking_spot}번, {len(exit_waypoints)}개 웨이포인트")
-            print(f"   출차 경로: {exit_waypoints}")
-            
-            self.pending_parking_spot = None
-            
-        except socket.timeout:
-            QMessageBox.warning(self, "출차 오류", "서버 연결 시간 초과. main_controller.py가 실행 중인지 확인해주세요.")
-            print(f"❌ 출차 경로 전송 실패: 연결 시간 초과")
-            self.pending_parking_spot = None
-        except ConnectionRefusedError:
-            QMessageBox.warning(self, "출차 오류", "서버에 연결할 수 없습니다. main_controller.py가 실행 중인지 확인해주세요.")
-            print(f"❌ 출차 경로 전송 실패: 연결 거부됨")
-            self.pending_parking_spot = None
-        except Exception as e:
-            QMessageBox.warning(self, "출차 오류", f"출차 경로 전송 실패: {e}")
-            print(f"❌ 출차 경로 전송 실패: {e}")
-            self.pending_parking_spot = None
+        self.pending_parking_spot = None
     
     def closeEvent(self, event):
         """창 닫기 이벤트"""
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+경로 이탈 감지 - 위치 수신마다 경로까지 거리로 이탈/복귀를 판정하는 상태 머신 (거리·시간 히스테리시스)
+
+parking_topview.check_route_deviation은 1초 QTimer로 200픽셀/2초 기준을 확인해 최대 3초 늦게 감지했고,
+탑뷰를 닫으면 감지 자체가 멈췄습니다. main_controller가 위치 파이프라인에서 이 감지기를 갱신하고
+이탈/복귀 시 'off_route' 토픽으로 이벤트를 브로드캐스트합니다.
+
+- 이탈: 경로에서 OFF_ROUTE_ENTER_DISTANCE보다 먼 상태가 OFF_ROUTE_ENTER_TIME 동안 계속될 때
+- 복귀: OFF_ROUTE_EXIT_DISTANCE 안으로 들어온 상태가 OFF_ROUTE_EXIT_TIME 동안 계속될 때
+  (두 거리 사이 구간에서는 현재 상태 유지 - 경계에서 이탈/복귀가 반복되지 않도록)
+- 주차구역 안은 경로 위로 간주 (기존 탑뷰 규칙과 동일)
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+OFF_ROUTE_ENTER_DISTANCE = 200.0  # 픽셀 (기존 route_tolerance)
+OFF_ROUTE_EXIT_DISTANCE = 120.0   # 픽셀
+OFF_ROUTE_ENTER_TIME = 2.0        # 초 (기존 deviation_threshold)
+OFF_ROUTE_EXIT_TIME = 1.0         # 초
+OFF_ROUTE_REPEAT_INTERVAL = 10.0  # 이탈이 계속되면 이 주기로 이벤트 재발행 (재할당 실패 대비, 초)
+
+EVENT_OFF_ROUTE = 'off_route'
+EVENT_BACK_ON_ROUTE = 'back_on_route'
+
+
+class OffRouteDetector:
+    """차량 1대의 경로 이탈 상태 (위치 1회당 O(1), 거리는 호출 측이 격자 인덱스로 계산)"""
+
+    def __init__(self, enter_distance: float = OFF_ROUTE_ENTER_DISTANCE,
+                 exit_distance: float = OFF_ROUTE_EXIT_DISTANCE,
+                 enter_time: float = OFF_ROUTE_ENTER_TIME, exit_time: float = OFF_ROUTE_EXIT_TIME,
+                 repeat_interval: float = OFF_ROUTE_REPEAT_INTERVAL):
+        self.enter_distance = enter_distance
+        self.exit_distance = exit_distance
+        self.enter_time = enter_time
+        self.exit_time = exit_time
+        self.repeat_interval = repeat_interval
+        self.reset()
+
+    def reset(self):
+        """새 경로 수신/출차 시 초기화"""
+        self.off_route = False
+        self.pending_since: Optional[float] = None  # 반대 상태 조건이 시작된 시각
+        self.off_route_since: Optional[float] = None
+        self.last_event_time: Optional[float] = None
+
+    def update(self, distance: float, in_parking_spot: bool = False,
+               now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """경로까지 거리(픽셀) 1회 반영 - 상태가 바뀌거나 이탈 재알림 시점이면 이벤트 반환"""
+        now = time.monotonic() if now is None else now
+        if in_parking_spot:
+            distance = 0.0
+
+        if not self.off_route:
+            if distance <= self.enter_distance:
+                self.pending_since = None
+                return None
+            if self.pending_since is None:
+                self.pending_since = now
+            if now - self.pending_since < self.enter_time:
+                return None
+            self.off_route = True
+            self.off_route_since = self.pending_since
+            self.pending_since = None
+            self.last_event_time = now
+            return self._event(EVENT_OFF_ROUTE, distance, now)
+
+        if distance > self.exit_distance:
+            self.pending_since = None
+            if now - self.last_event_time >= self.repeat_interval:
+                self.last_event_time = now
+                return self._event(EVENT_OFF_ROUTE, distance, now, repeat=True)
+            return None
+        if self.pending_since is None:
+            self.pending_since = now
+        if now - self.pending_since < self.exit_time:
+            return None
+        event = self._event(EVENT_BACK_ON_ROUTE, distance, now)
+        self.reset()
+        return event
+
+    def _event(self, event_type: str, distance: float, now: float, repeat: bool = False) -> Dict[str, Any]:
+        return {
+            'event': event_type,
+            'distance': round(distance, 1),
+            'duration': round(now - self.off_route_since, 2),  # 이탈 시작부터 경과 시간 (초)
+            'repeat': repeat,
+        }
@@ -11,11 +11,9 @@ import json
 import threading
 import tempfile
 import os
-import socket
 import time
-from typing import List, Tuple, Optional, Dict, Any
-from math import sqrt, atan2, degrees, sin, cos, radians
-from datetime import datetime
+from typing import List, Tuple, Dict, Any
+from math import sqrt, sin, cos, radians
 
 import zmq
 import pygame
@@ -32,10 +30,25 @@ from PyQt5.QtGui import (
     QLinearGradient, QRadialGradient, QTransform, QFontMetrics
 )
 from PyQt5.QtCore import (
-    Qt, QPointF, QRectF, pyqtSignal, QTimer, QPropertyAnimation,
+    Qt, QPointF, QRectF, pyqtSignal, QPropertyAnimation,
     pyqtProperty, QEasingCurve, QParallelAnimationGroup, QObject
 )
 
+from navigation_core import (
+    RoutePath, SpeedEstimator
+)
+from route_geometry import RouteGeometry
+from announcement_schedule import AnnouncementSchedule
+from geofence import lot_geofence
+from spot_occupancy import spots_from_mask
+from lot_layout import (
+    LOT_MAP, SCENE_W, SCENE_H, PIXELS_PER_METER, ENTRANCE_POINT, PARKING_SPOT_RECTS, PARKING_SPOT_TYPES,
+    ENTRANCE_ZONES, GATE_NAME, GATE_ZONE, NO_GO_ZONES, NO_GO_STYLES, FLOOR_AREAS
+)
+
+# pose_stream 수신이 이 시간(초) 안에 있으면 차량 아이콘은 포즈 스트림으로만 이동
+POSE_STREAM_TIMEOUT = 0.5
+
 # ===================================================================
 # 개선된 현대차 스타일 컬러 팔레트 - Smart_Parking_GUI.py와 동일
 # ===================================================================
@@ -158,6 +171,9 @@ class ZMQDataReceiver(QObject):
     
     position_received = pyqtSignal(dict)
     waypoint_received = pyqtSignal(dict)
+    pose_received = pyqtSignal(dict)
+    off_route_received = pyqtSignal(dict)
+    occupancy_received = pyqtSignal(dict)
     
     def __init__(self, zmq_host='localhost', zmq_port=5555):
         super().__init__()
@@ -176,6 +192,9 @@ class ZMQDataReceiver(QObject):
             
             self.socket.setsockopt_string(zmq.SUBSCRIBE, "vehicle_position")
             self.socket.setsockopt_string(zmq.SUBSCRIBE, "waypoint_data")
+            self.socket.setsockopt_string(zmq.SUBSCRIBE, "pose_stream")
+            self.socket.setsockopt_string(zmq.SUBSCRIBE, "off_route")
+            self.socket.setsockopt_string(zmq.SUBSCRIBE, "occupancy")
             
             self.socket.setsockopt(zmq.RCVTIMEO, 100)
             
@@ -217,6 +236,12 @@ class ZMQDataReceiver(QObject):
                 self.position_received.emit(data)
             elif topic == "waypoint_data":
                 self.waypoint_received.emit(data)
+            elif topic == "pose_stream":
+                self.pose_received.emit(data)
+            elif topic == "off_route":
+                self.off_route_received.emit(data)
+            elif topic == "occupancy":
+                self.occupancy_received.emit(data)
                 
         except Exception as e:
             print(f"❌ 메시지 처리 오류: {e}")
@@ -311,10 +336,10 @@ class ParkingLotUI(QWidget):
     - 픽셀 거리 = sqrt((x2-x1)^2 + (y2-y1)^2)
     - 미터 거리 = 픽셀 거리 / PIXELS_PER_METER = 픽셀 거리 / 50
     """
-    SCENE_W, SCENE_H = 2000, 2000
+    SCENE_W, SCENE_H = SCENE_W, SCENE_H
     CELL, MARGIN, PATH_WIDTH = 30, 10, 50
-    PIXELS_PER_METER = 50
-    ENTRANCE = QPointF(200, 200)
+    PIXELS_PER_METER = PIXELS_PER_METER
+    ENTRANCE = QPointF(*ENTRANCE_POINT)
     
     # HUD 안내 계산 결과 저장
     last_calculated_instructions = None
@@ -327,22 +352,11 @@ class ParkingLotUI(QWidget):
         self.initial_fit = False
         self.received_waypoints = []
         
-        self.route_deviation_timer = QTimer(self)
-        self.route_deviation_timer.timeout.connect(self.check_route_deviation)
-        self.deviation_start_time = None
-        self.is_deviating = False
-        self.deviation_threshold = 2.0  # 2초 이상 이탈 시 경로 이탈로 인지
-        self.route_tolerance = 200  # 상하좌우 기준 200픽셀 이상 벗어나면 이탈로 인지
-        
         # 음성 안내 모듈 초기화
         self.voice_guide = VoiceGuide()
         
-        # 재할당 서버 설정
-        self.reassign_server_host = '192.168.0.111'  # 팀원 서버 주소
-        self.reassign_server_port = 9999  # 기본 포트, 필요시 변경 가능
-        self.waiting_for_reassignment = False  # 재할당 대기 플래그
+        # 재할당 경로 (경로 이탈 시 main_controller가 로컬 재탐색 후 재할당 서버에 비동기 요청)
         self.is_reassigned_route = False  # 재할당된 경로인지 여부
-        self.requesting_reassignment = False  # 재할당 요청 중인지 여부 (중복 방지)
         
         self.setup_styles()
         self.init_ui()
@@ -374,6 +388,10 @@ class ParkingLotUI(QWidget):
         self.scene.addItem(self.layer_static)
         self.scene.addItem(self.layer_path)
         self.full_path_points = []
+        self.route_path = RoutePath()  # full_path_points의 array 기반 사본 (navigation_core 계산용)
+        self.route_geometry = RouteGeometry()  # 누적 거리/방향 벡터 캐시 (경로 생성 시 1회 계산)
+        self.announcement_schedule = AnnouncementSchedule()  # 안내 전환 지점 (경로 생성 시 1회 계산)
+        self.speed_estimator = SpeedEstimator()  # 차량 위치 변화 기반 실측 속도 (EWMA)
         self.snapped_waypoints = []
         self.current_path_segment_index = 0
         self.is_exit_scenario = False
@@ -390,6 +408,10 @@ class ParkingLotUI(QWidget):
         self.parking_spots = {}
         self.current_parking_spot = None
         
+        # 점유된 주차구역 (main_controller의 점유 비트셋 diff/전체 상태로 갱신, 점유 구역은 주황색)
+        self.occupied_spots = set()
+        self.occupancy_version = -1
+        
         self.build_static_layout()
         self.build_occupancy()
 
@@ -397,6 +419,10 @@ class ParkingLotUI(QWidget):
         self.zmq_receiver = ZMQDataReceiver()
         self.zmq_receiver.position_received.connect(self.on_position_received)
         self.zmq_receiver.waypoint_received.connect(self.on_waypoint_received)
+        self.zmq_receiver.pose_received.connect(self.on_pose_received)
+        self.zmq_receiver.off_route_received.connect(self.on_off_route_received)
+        self.zmq_receiver.occupancy_received.connect(self.on_occupancy_received)
+        self.last_pose_stream_time = 0.0
         
         if self.zmq_receiver.start():
             print("✅ 탑뷰 ZeroMQ 연결 성공")
@@ -417,7 +443,9 @@ class ParkingLotUI(QWidget):
                 return
             
             new_pos = QPointF(x, y)
-            self.car.setPos(new_pos)
+            if time.monotonic() - self.last_pose_stream_time > POSE_STREAM_TIMEOUT:
+                # 포즈 스트림이 없을 때만 수신 위치로 직접 이동
+                self.car.setPos(new_pos)
             if not self.car.isVisible():
                 self.car.show()
             
@@ -427,6 +455,44 @@ class ParkingLotUI(QWidget):
         except Exception as e:
             print(f"❌ 위치 데이터 처리 오류: {e}")
 
+    def on_occupancy_received(self, message_data):
+        """주차구역 점유 변경/전체 상태 수신 - mask가 전체 상태이므로 바뀐 구역만 다시 칠함"""
+        try:
+            data = message_data.get('data', {})
+            version = data.get('version', 0)
+            if message_data.get('type') == 'occupancy_diff' and version <= self.occupancy_version:
+                return
+            self.occupancy_version = version
+            occupied = set(spots_from_mask(data.get('mask', 0), sorted(PARKING_SPOT_RECTS)))
+            for spot in occupied - self.occupied_spots:
+                self.change_parking_spot_color(spot, "orange")
+            freed = self.occupied_spots - occupied
+            self.occupied_spots = occupied
+            for spot in freed:
+                self.restore_parking_spot_color(spot)
+        except Exception as e:
+            print(f"❌ 점유 상태 처리 오류: {e}")
+
+    def on_pose_received(self, message_data):
+        """고정 주기 포즈 수신 - 차량 아이콘만 부드럽게 이동 (안내 갱신은 vehicle_position 기준)"""
+        try:
+            data = message_data.get('data', {})
+            poses = data.get('poses', [])
+            if not poses or not self.car.isVisible():
+                return
+            # 추적 중인 모든 차량의 포즈가 오므로 안내 대상 차량 포즈만 사용 (없으면 vehicle_position으로 이동)
+            route_vehicle_id = data.get('route_vehicle_id')
+            pose = next((p for p in poses if p.get('vehicle_id') == route_vehicle_id), None) if route_vehicle_id else poses[0]
+            if pose is None:
+                return
+            self.last_pose_stream_time = time.monotonic()
+            # 60Hz마다 HUD 안내를 다시 계산하지 않도록 positionChanged 시그널 차단
+            self.car.blockSignals(True)
+            self.car.setPos(QPointF(pose['x'], pose['y']))
+            self.car.blockSignals(False)
+        except Exception as e:
+            print(f"❌ 포즈 스트림 처리 오류: {e}")
+
     def on_waypoint_received(self, message_data):
         """웨이포인트 데이터 수신 처리"""
         try:
@@ -462,10 +528,9 @@ class ParkingLotUI(QWidget):
                     print(f"   웨이포인트: {waypoints}")
                     
                     self.received_waypoints = waypoints
-                    self.is_exit_scenario = False  # 재할당은 항상 입차 시나리오
+                    # 컨트롤러 재탐색/보정 경로는 출차 중에도 오므로 route_type을 따름 (없으면 입차)
+                    self.is_exit_scenario = waypoint_data.get('route_type', 'entry') == 'exit'
                     self.is_reassigned_route = True  # 재할당된 경로 표시
-                    self.waiting_for_reassignment = False
-                    self.requesting_reassignment = False  # 재할당 요청 플래그 리셋
                     
                     self.calculate_and_display_route()
                     
@@ -482,15 +547,13 @@ class ParkingLotUI(QWidget):
             if not waypoints:
                 return
             
-            # 재할당 대기 중이 아닐 때만 일반 경로로 처리
-            if not self.waiting_for_reassignment:
-                self.received_waypoints = waypoints
-                self.is_exit_scenario = (route_type == 'exit')
-                self.is_reassigned_route = False  # 일반 경로는 재할당 아님
-                
-                QMessageBox.information(self, "경로 수신", f"새로운 경로가 수신되었습니다:\n{len(waypoints)}개 웨이포인트\n주차구역: {parking_spot}번\n경로 타입: {route_type}")
-                
-                self.calculate_and_display_route()
+            self.received_waypoints = waypoints
+            self.is_exit_scenario = (route_type == 'exit')
+            self.is_reassigned_route = False  # 일반 경로는 재할당 아님
+            
+            QMessageBox.information(self, "경로 수신", f"새로운 경로가 수신되었습니다:\n{len(waypoints)}개 웨이포인트\n주차구역: {parking_spot}번\n경로 타입: {route_type}")
+            
+            self.calculate_and_display_route()
             
         except Exception as e:
             print(f"❌ 웨이포인트 데이터 처리 오류: {e}")
@@ -507,34 +570,20 @@ class ParkingLotUI(QWidget):
         
         self.clear_path_layer()
         self.full_path_points = []
+        self.route_path = RoutePath()
+        self.route_geometry = RouteGeometry()
+        self.announcement_schedule = AnnouncementSchedule()
+        self.speed_estimator.reset()
         self.current_path_segment_index = 0
         self.is_exit_scenario = False
         
-        self.route_deviation_timer.stop()
-        self.is_deviating = False
-        self.deviation_start_time = None
-        
         self.received_waypoints = []
         
         print("✅ 차량 출차 처리 완료")
 
     def detect_parking_spot_from_waypoint(self, waypoint):
-        """웨이포인트 좌표를 기반으로 주차구역 번호 감지"""
-        x, y = waypoint[0], waypoint[1]
-        
-        parking_waypoints = {
-            1: [200, 1475], 2: [550, 1475], 3: [850, 1475], 4: [1150, 1475],
-            5: [1450, 1475],
-            6: [1475, 1400], 7: [1475, 1000],
-            8: [1475, 925], 9: [1150, 925], 10: [850, 925], 11: [550, 925]
-        }
-        
-        tolerance = 50
-        for spot_num, coord in parking_waypoints.items():
-            if abs(x - coord[0]) <= tolerance and abs(y - coord[1]) <= tolerance:
-                return spot_num
-        
-        return None
+        """웨이포인트 좌표를 기반으로 주차구역 번호 감지 (진입 웨이포인트 ±50픽셀, 지오펜스 조회)"""
+        return lot_geofence().spot_from_waypoint(waypoint[0], waypoint[1])
 
     def change_parking_spot_color(self, parking_spot_num, color):
         """특정 주차구역의 색상을 변경합니다."""
@@ -556,7 +605,7 @@ class ParkingLotUI(QWidget):
         if parking_spot_num in self.parking_spots:
             rect_item = self.parking_spots[parking_spot_num]
             
-            if parking_spot_num in [2, 3, 7, 9]:
+            if parking_spot_num in self.occupied_spots:
                 gradient = QLinearGradient(rect_item.rect().x(), rect_item.rect().y(),
                                         rect_item.rect().x() + rect_item.rect().width(),
                                         rect_item.rect().y() + rect_item.rect().height())
@@ -566,14 +615,15 @@ class ParkingLotUI(QWidget):
                 rect_item.setPen(QPen(QColor("white"), 20))
                 return
             
-            if parking_spot_num in [1, 7]:
+            spot_type = PARKING_SPOT_TYPES.get(parking_spot_num)
+            if spot_type == 'disabled':
                 gradient = QLinearGradient(rect_item.rect().x(), rect_item.rect().y(),
                                         rect_item.rect().x() + rect_item.rect().width(),
                                         rect_item.rect().y() + rect_item.rect().height())
                 gradient.setColorAt(0, QColor(135, 206, 250, 200))
                 gradient.setColorAt(1, QColor(70, 130, 180, 150))
                 rect_item.setBrush(QBrush(gradient))
-            elif parking_spot_num in [4, 5, 10, 11]:
+            elif spot_type == 'ev':
                 gradient = QLinearGradient(rect_item.rect().x(), rect_item.rect().y(),
                                         rect_item.rect().x() + rect_item.rect().width(),
                                         rect_item.rect().y() + rect_item.rect().height())
@@ -631,6 +681,9 @@ class ParkingLotUI(QWidget):
                 self.current_parking_spot = destination_parking_spot
 
         print(f"✅ 최종 경로: {len(self.full_path_points)}개 포인트")
+        self.route_path = RoutePath(self.full_path_points)
+        self.route_geometry = RouteGeometry(self.route_path)
+        self.announcement_schedule = AnnouncementSchedule(self.route_geometry, self.is_exit_scenario)
         
         self.clear_path_layer()
         if self.is_exit_scenario:
@@ -644,216 +697,20 @@ class ParkingLotUI(QWidget):
             self.car.setPos(start_point)
             self.car.show()
         
-        self.route_deviation_timer.start(1000)
-        
         self.update_hud_from_car_position(self.car.pos())
 
-    def check_route_deviation(self):
-        """경로 이탈 상태를 주기적으로 체크"""
-        if not self.full_path_points or not self.car.isVisible():
-            return
-        
-        car_pos = self.car.pos()
-        
-        if self.is_in_parking_spot(car_pos):
-            if self.is_deviating:
-                self.is_deviating = False
-                self.deviation_start_time = None
-            return
-        
-        distance_to_route = self.calculate_distance_to_route(car_pos)
-        
-        if distance_to_route > self.route_tolerance:
-            if not self.is_deviating:
-                self.is_deviating = True
-                self.deviation_start_time = datetime.now()
-                print(f"⚠️ 경로 이탈 감지 - 거리: {distance_to_route:.1f}픽셀")
-            else:
-                if self.deviation_start_time:
-                    deviation_duration = (datetime.now() - self.deviation_start_time).total_seconds()
-                    if deviation_duration >= self.deviation_threshold:
-                        # 재할당 요청 중이 아니고, 재할당 대기 중이 아닐 때만 요청
-                        if not self.requesting_reassignment and not self.waiting_for_reassignment:
-                            self.show_route_recalculation_popup()
-                        else:
-                            print("⚠️ 이미 재할당 요청이 진행 중입니다. 추가 요청을 건너뜁니다.")
-                        self.is_deviating = False
-                        self.deviation_start_time = None
-        else:
-            if self.is_deviating:
-                self.is_deviating = False
-                self.deviation_start_time = None
-
-    def is_in_parking_spot(self, car_pos):
-        """차량이 주차 칸 박스 안에 있는지 확인"""
-        x, y = car_pos.x(), car_pos.y()
-        
-        parking_spots = {
-            1: (0, 1600, 400, 400),
-            2: (400, 1600, 300, 400),
-            3: (700, 1600, 300, 400),
-            4: (1000, 1600, 300, 400),
-            5: (1300, 1600, 300, 400),
-            6: (1600, 1200, 400, 400),
-            7: (1600, 800, 400, 400),
-            8: (1300, 400, 300, 400),
-            9: (1000, 400, 300, 400),
-            10: (700, 400, 300, 400),
-            11: (400, 400, 300, 400),
-        }
-        
-        for spot_num, (spot_x, spot_y, spot_w, spot_h) in parking_spots.items():
-            if spot_x <= x <= spot_x + spot_w and spot_y <= y <= spot_y + spot_h:
-                return True
-        
-        return False
-
-    def calculate_distance_to_route(self, car_pos):
-        """차량 위치에서 가장 가까운 경로까지의 거리 계산"""
-        if not self.full_path_points or len(self.full_path_points) < 2:
-            return float('inf')
-        
-        min_distance = float('inf')
-        
-        for i in range(len(self.full_path_points) - 1):
-            p1 = self.full_path_points[i]
-            p2 = self.full_path_points[i + 1]
-            
-            distance = self.point_to_line_distance(car_pos, p1, p2)
-            min_distance = min(min_distance, distance)
-        
-        return min_distance
-
-    def point_to_line_distance(self, point, line_start, line_end):
-        """점과 선분 사이의 최단 거리 계산"""
-        line_vec = line_end - line_start
-        point_vec = point - line_start
-        
-        line_len_sq = QPointF.dotProduct(line_vec, line_vec)
-        
-        if line_len_sq == 0:
-            return sqrt((point.x() - line_start.x())**2 + (point.y() - line_start.y())**2)
-        
-        t = QPointF.dotProduct(point_vec, line_vec) / line_len_sq
-        t = max(0, min(1, t))
-        
-        closest_point = line_start + t * line_vec
-        
-        return sqrt((point.x() - closest_point.x())**2 + (point.y() - closest_point.y())**2)
-
-    def show_route_recalculation_popup(self):
-        """경로 재탐색 트리거 - 서버에 재할당 요청 (팝업 없이)"""
-        # 이미 재할당 요청 중이면 중복 방지
-        if self.requesting_reassignment:
-            print("⚠️ 이미 재할당 요청이 진행 중입니다. 중복 요청을 방지합니다.")
-            return
-        
-        # 음성 안내 재생
-        self.voice_guide.speak_instruction("경로를 재탐색합니다. 잠시만 기다려주세요")
-        
-        # 현재 차량 위치 가져오기
-        current_car_pos = self.car.pos() if self.car.isVisible() else None
-        
-        # 재할당 요청 플래그 설정 (중복 방지)
-        self.requesting_reassignment = True
-        self.waiting_for_reassignment = True
-        
-        # 서버에 재할당 요청 전송 (팀원 서버 형식에 맞춤)
-        success = self.request_route_reassign(current_car_pos)
-        
-        if success:
-            # 서버가 팀원 노트북으로 waypoints를 전송하므로, 
-            # ZeroMQ로 waypoints가 수신될 때까지 대기
-            # on_waypoint_received에서 처리됨
-            print("✅ 경로 재할당 요청 전송 완료, 서버 응답 대기 중...")
-        else:
-            # 재할당 요청 실패 시 플래그 리셋
-            self.waiting_for_reassignment = False
-            self.requesting_reassignment = False
-            print("❌ 경로 재할당 요청 실패: 서버 연결 실패")
-    
-    def request_route_reassign(self, current_position: Optional[QPointF] = None) -> bool:
-        """
-        서버에 경로 재할당 요청 전송 (팀원 서버 형식에 맞춤)
-        
-        서버는 요청을 받아서 계산한 경로를 팀원 노트북으로 전송하므로,
-        이 메서드는 요청만 보내고 성공/실패만 반환합니다.
-        실제 waypoints는 ZeroMQ를 통해 on_waypoint_received에서 수신됩니다.
-        
-        Args:
-            current_position: 현재 차량 위치 (QPointF)
-        
-        Returns:
-            요청 전송 성공 여부 (bool)
-        """
+    def on_off_route_received(self, message_data):
+        """main_controller의 경로 이탈 이벤트 수신 - 음성 안내만 재생 (재탐색 경로는 재할당 경로로 수신)"""
         try:
-            # TCP/IP 소켓으로 서버에 연결
-            client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            client_socket.settimeout(10.0)  # 10초 타임아웃
-            client_socket.connect((self.reassign_server_host, self.reassign_server_port))
-            
-            # 재할당 요청 메시지 생성 (팀원 서버 형식)
-            reassign_request = {
-                'type': 'reassign'
-            }
-            
-            # 현재 위치 정보가 있으면 추가 (필수)
-            if current_position:
-                reassign_request['current_x'] = float(current_position.x())
-                reassign_request['current_y'] = float(current_position.y())
-            else:
-                # 현재 위치가 없으면 에러
-                print("❌ 경로 재할당 요청 실패: 현재 차량 위치 정보가 없습니다.")
-                client_socket.close()
-                return False
-            
-            # JSON 문자열로 전송
-            json_str = json.dumps(reassign_request, ensure_ascii=False)
-            client_socket.sendall(json_str.encode('utf-8'))
-            
-            print(f"📤 경로 재할당 요청 전송: {self.reassign_server_host}:{self.reassign_server_port}")
-            print(f"   요청 데이터: {json_str}")
-            
-            # 서버 응답 수신 (팀원 서버는 {'status': 'success'/'failed', 'message': '...'} 형식)
-            response_data = b""
-            while True:
-                chunk = client_socket.recv(4096)
-                if not chunk:
-                    break
-                response_data += chunk
-            
-            client_socket.close()
-            
-            # JSON 응답 파싱
-            response_str = response_data.decode('utf-8')
-            response_json = json.loads(response_str)
-            
-            print(f"📥 서버 응답 수신: {response_str}")
-            
-            # 응답 상태 확인
-            status = response_json.get('status', 'failed')
-            message = response_json.get('message', '')
+            event = message_data.get('data', {})
+            if event.get('event') != 'off_route' or event.get('repeat') or not self.full_path_points:
+                return
             
-            if status == 'success':
-                print(f"✅ 서버 재할당 요청 성공: {message}")
-                print("   서버가 팀원 노트북으로 waypoints를 전송 중입니다.")
-                return True
-            else:
-                print(f"❌ 서버 재할당 요청 실패: {message}")
-                return False
-                
-        except socket.timeout:
-            print(f"❌ 경로 재할당 요청 실패: 연결 시간 초과")
-            return False
-        except ConnectionRefusedError:
-            print(f"❌ 경로 재할당 요청 실패: 서버 연결 거부됨 ({self.reassign_server_host}:{self.reassign_server_port})")
-            return False
-        except json.JSONDecodeError as e:
-            print(f"❌ 서버 응답 JSON 파싱 실패: {e}")
-            return False
+            print(f"⚠️ 경로 이탈 이벤트 수신 - 거리: {event.get('distance', 0):.1f}픽셀, "
+                  f"로컬 재탐색: {event.get('rerouted')}, 서버 요청: {event.get('remote_requested')}")
+            self.voice_guide.speak_instruction("경로를 재탐색합니다")
         except Exception as e:
-            print(f"❌ 경로 재할당 요청 중 오류: {e}")
-            return False
+            print(f"❌ 경로 이탈 이벤트 처리 오류: {e}")
 
     def showEvent(self, event):
         super().showEvent(event)
@@ -869,7 +726,6 @@ class ParkingLotUI(QWidget):
     def closeEvent(self, event):
         if self.zmq_receiver:
             self.zmq_receiver.stop()
-        self.route_deviation_timer.stop()
         if hasattr(self, 'voice_guide'):
             self.voice_guide.stop()
         super().closeEvent(event)
@@ -954,64 +810,37 @@ class ParkingLotUI(QWidget):
         
         border = QGraphicsRectItem(0, 0, self.SCENE_W, self.SCENE_H); border.setPen(QPen(QColor("white"), 12)); border.setBrush(QBrush(Qt.NoBrush)); border.setParentItem(self.layer_static)
         
-        self.add_hatched(400, 0, 1600, 400)
-        
-        self.add_block(0, 0, 400, 400, c_io, "입출차")
-        
-        # 일반 주차장 배경 색상 박스 추가
-        # (0, 400, 400, 400) 박스
-        ivory_box1 = QGraphicsRectItem(QRectF(0, 400, 400, 400))
-        gradient1 = QLinearGradient(0, 400, 400, 800)
-        gradient1.setColorAt(0, QColor("#e4dcd3"))
-        gradient1.setColorAt(1, QColor("#e4dcd3"))
-        ivory_box1.setBrush(QBrush(gradient1))
-        ivory_box1.setPen(QPen(Qt.NoPen))
-        ivory_box1.setParentItem(self.layer_static)
-        
-        # (0, 800, 1600, 800) 박스
-        ivory_box2 = QGraphicsRectItem(QRectF(0, 800, 1600, 800))
-        gradient2 = QLinearGradient(0, 800, 1600, 1600)
-        gradient2.setColorAt(0, QColor("#e4dcd3"))
-        gradient2.setColorAt(1, QColor("#e4dcd3"))
-        ivory_box2.setBrush(QBrush(gradient2))
-        ivory_box2.setPen(QPen(Qt.NoPen))
-        ivory_box2.setParentItem(self.layer_static)
-        
-        base = [
-            (-400, 1600, 400, 400, c_emp, "백화점 본관 입구"),
-            (1600, 1600, 400, 400, c_emp, "영화관 입구"),
-            (550, 1050, 800, 300, c_obs, "장애물")
-        ]
-        
-        parking_spots = [
-            (0, 1600, 400, 400, c_dis, "장애인"),
-            (400, 1600, 300, 400, c_gen, "일반"),
-            (700, 1600, 300, 400, c_gen, "일반"),
-            (1000, 1600, 300, 400, c_ele, "전기"),
-            (1300, 1600, 300, 400, c_ele, "전기"),
-            (1600, 1200, 400, 400, c_dis, "장애인"),
-            (1000, 400, 300, 400, c_gen, "일반"),
-            (700, 400, 300, 400, c_ele, "전기"),
-            (400, 400, 300, 400, c_ele, "전기")
-        ]
-        
-        for x, y, w, h, c, l in base: self.add_block(x, y, w, h, c, l)
+        # 주차장 배치는 lot_map.json 컴파일 결과 (lot_layout)
+        for name, rect in NO_GO_ZONES.items():
+            if NO_GO_STYLES[name] == 'hatched':
+                self.add_hatched(*rect)
+        
+        self.add_block(*GATE_ZONE, c_io, GATE_NAME)
+        
+        # 통로 바닥 배경 색상 박스
+        for x, y, w, h in FLOOR_AREAS:
+            floor_box = QGraphicsRectItem(QRectF(x, y, w, h))
+            gradient = QLinearGradient(x, y, x + w, y + h)
+            gradient.setColorAt(0, QColor("#e4dcd3"))
+            gradient.setColorAt(1, QColor("#e4dcd3"))
+            floor_box.setBrush(QBrush(gradient))
+            floor_box.setPen(QPen(Qt.NoPen))
+            floor_box.setParentItem(self.layer_static)
+        
+        for name, rect in ENTRANCE_ZONES.items():
+            self.add_block(*rect, c_emp, name)
+        for name, rect in NO_GO_ZONES.items():
+            if NO_GO_STYLES[name] != 'hatched':
+                self.add_block(*rect, c_obs, name)
         
         self.add_dot_label_static(self.ENTRANCE, "입구", QColor(0, 170, 210))
         
-        spot_numbers = [1, 2, 3, 4, 5, 6, 9, 10, 11]
-        for i, (x, y, w, h, c, l) in enumerate(parking_spots):
-            rect_item = self.add_block(x, y, w, h, c, l)
+        spot_styles = {'disabled': (c_dis, "장애인"), 'general': (c_gen, "일반"), 'ev': (c_ele, "전기")}
+        for spot_num, rect in PARKING_SPOT_RECTS.items():
+            color, label = spot_styles[PARKING_SPOT_TYPES[spot_num]]
+            rect_item = self.add_block(*rect, color, label)
             if rect_item:
-                self.parking_spots[spot_numbers[i]] = rect_item
-        
-        self.add_block(1600, 400, 400, 400, c_emp, "문화시설 입구")
-        
-        rect_item = self.add_block(1600, 800, 400, 400, c_dis, "장애인")
-        self.parking_spots[7] = rect_item
-        
-        rect_item = self.add_block(1300, 400, 300, 400, c_gen, "일반")
-        self.parking_spots[8] = rect_item
+                self.parking_spots[spot_num] = rect_item
         
         # 목적지 입구 글자를 특정 좌표에 추가
         font_large = QFont("Malgun Gothic", int(FONT_SIZES['map_label'] * 2.25), QFont.Bold)
@@ -1048,45 +877,12 @@ class ParkingLotUI(QWidget):
         t4.setParentItem(self.layer_static)
 
     def build_occupancy(self):
-        W, H, C = self.SCENE_W, self.SCENE_H, self.CELL
-        gx, gy = (W + C - 1) // C, (H + C - 1) // C
-        self.grid_w, self.grid_h = gx, gy
-        self.occ = bytearray(gx * gy)
+        """lot_map 컴파일 결과의 점유 격자 (CELL/MARGIN 기준, 디스크 캐시)"""
+        grid = LOT_MAP.occupancy(self.CELL, self.MARGIN)
+        gx = grid.width
+        self.grid_w, self.grid_h = grid.width, grid.height
+        self.occ = bytearray(grid.cells)
         def idx(cx, cy): return cy * gx + cx
-        def block_rect(x, y, w, h):
-            x0,y0,x1,y1 = max(0,x-self.MARGIN), max(0,y-self.MARGIN), min(W,x+w+self.MARGIN), min(H,y+h+self.MARGIN)
-            cx0,cy0,cx1,cy1 = int(x0//C), int(y0//C), int((x1-1)//C), int((y1-1)//C)
-            for cy in range(cy0,cy1+1):
-                for cx in range(cx0,cx1+1):
-                    if 0<=cx<gx and 0<=cy<gy: self.occ[cy*gx+cx] = 1
-        
-        for x,y,w,h,c,l in [
-            (550,1050,800,300,0,""),
-            (400,0,1600,400,0,""),
-            (1600,400,400,400,0,""),
-            (1600,1600,400,400,0,""),
-            (-400,1600,400,400,0,""),
-            (0,0,400,400,0,"")
-        ]: 
-            block_rect(x,y,w,h)
-        
-        parking_blocks = [
-            (0, 1600, 400, 400, 0, ""),
-            (400, 1600, 300, 400, 0, ""),
-            (700, 1600, 300, 400, 0, ""),
-            (1000, 1600, 300, 400, 0, ""),
-            (1300, 1600, 300, 400, 0, ""),
-            (1600, 1200, 400, 400, 0, ""),
-            (1600, 800, 400, 400, 0, ""),
-            (1300, 400, 300, 400, 0, ""),
-            (1000, 400, 300, 400, 0, ""),
-            (700, 400, 300, 400, 0, ""),
-            (400, 400, 300, 400, 0, "")
-        ]
-        
-        for x,y,w,h,c,l in parking_blocks: 
-            block_rect(x,y,w,h)
-        
         self._occ_idx = idx
 
     def clear_path_layer(self):
@@ -1174,26 +970,13 @@ class ParkingLotUI(QWidget):
         self.scene.addItem(arrow_item)
 
     def _update_current_segment(self, car_pos):
-        if not self.full_path_points or len(self.full_path_points) < 2:
+        """현재 세그먼트 인덱스 업데이트 (캐시된 경로 기하 사용)"""
+        if len(self.route_geometry) < 2:
             return
-            
-        while self.current_path_segment_index < len(self.full_path_points) - 1:
-            p_curr = self.full_path_points[self.current_path_segment_index]
-            p_next = self.full_path_points[self.current_path_segment_index + 1]
-
-            dist_to_next = sqrt((car_pos.x() - p_next.x())**2 + (car_pos.y() - p_next.y())**2)
-
-            v_seg = p_next - p_curr
-            v_car = car_pos - p_curr
-            seg_len_sq = QPointF.dotProduct(v_seg, v_seg)
-            proj_ratio = 1.0
-            if seg_len_sq > 0:
-                proj_ratio = QPointF.dotProduct(v_car, v_seg) / seg_len_sq
-
-            if dist_to_next < 50 or proj_ratio > 1.0:
-                self.current_path_segment_index += 1
-            else:
-                break
+        
+        self.current_path_segment_index = self.route_geometry.advance_segment(
+            self.current_path_segment_index, car_pos.x(), car_pos.y()
+        )
 
     def update_hud_from_car_position(self, car_pos):
         """차량 위치 업데이트 - Smart_Parking_GUI.py와 동일한 로직으로 HUD 안내 생성"""
@@ -1203,179 +986,33 @@ class ParkingLotUI(QWidget):
         # 현재 세그먼트 업데이트
         self._update_current_segment(car_pos)
         
-        # 남은 경로 포인트 계산
-        remaining_pts = self.full_path_points[self.current_path_segment_index+1:]
-        path_for_hud = [car_pos] + remaining_pts
-        
-        if len(path_for_hud) < 2:
-            # 목적지 도착
-            if self.is_exit_scenario:
-                instruction_str = "출차 완료"
-            else:
-                instruction_str = "목적지 도착"
-            # main_controller로 전송할 형식으로 변환 (웨이포인트가 없는 경우 처리)
+        # 남은 경로 포인트가 없으면 목적지 도착
+        if self.current_path_segment_index + 1 >= len(self.route_path):
             return
         
-        # HUD 안내 생성 (Smart_Parking_GUI.py와 동일한 로직)
-        instructions = self.generate_hud_instructions(path_for_hud, self.is_exit_scenario)
-        progress = self.calculate_route_progress(car_pos)
-        speed = self.calculate_realistic_speed(instructions, progress, car_pos)
+        # HUD 안내 생성 (안내 스케줄 커서만 전진, QPointF 생성 없이 좌표만 사용)
+        x, y = car_pos.x(), car_pos.y()
+        _, _, _, traveled = self.route_geometry.locate(x, y, self.current_path_segment_index)
+        progress = self.route_geometry.progress_at(traveled)
+        self.announcement_schedule.advance(traveled)
+        instructions = self.announcement_schedule.instructions(traveled)
+        speed_estimator = self.speed_estimator
+        speed_estimator.update(x, y, time.monotonic())
+        remaining_distance = self.route_geometry.remaining_meters_at(traveled)
+        speed = speed_estimator.speed_kmh
         
-        # instructions를 main_controller 형식으로 변환하여 전송
         # main_controller는 별도 프로세스이므로, 여기서는 로컬 변수에 저장
         self.last_calculated_instructions = {
             'instructions': instructions,
             'speed': speed,
             'progress': progress,
+            'remaining_distance': remaining_distance,
+            'eta_seconds': speed_estimator.eta_seconds(remaining_distance),
             'car_pos': car_pos
         }
         
         # main_controller가 위치 수신 시 자동으로 Smart_Parking_GUI.py 방식의 안내를 생성하도록 개선됨
         # parking_topview는 경로 정보를 유지하여 경로 이탈 감지 등에 사용
-    
-    def generate_hud_instructions(self, pts, is_exit_scenario=False):
-        """HUD 안내 메시지 생성 - Smart_Parking_GUI.py와 동일한 로직"""
-        if len(pts) < 2:
-            return []
-        
-        instructions = []
-        total_dist = 0
-        
-        for i in range(len(pts) - 1):
-            p1, p2 = pts[i], pts[i+1]
-            # QPointF 형식 처리
-            dist_m = sqrt((p2.x()-p1.x())**2 + (p2.y()-p1.y())**2) / self.PIXELS_PER_METER
-            total_dist += dist_m
-            
-            if i < len(pts) - 2:
-                p3 = pts[i+2]
-                angle = (degrees(atan2(p3.y()-p2.y(), p3.x()-p2.x())) - 
-                        degrees(atan2(p2.y()-p1.y(), p2.x()-p1.x())) + 180) % 360 - 180
-                direction = "좌회전" if angle > 45 else ("우회전" if angle < -45 else "")
-                
-                if direction:
-                    # 직진 구간 시작점(p1)과 회전 좌표(p2) 간 거리 계산 (픽셀 단위)
-                    straight_to_turn_dist = sqrt((p2.x()-p1.x())**2 + (p2.y()-p1.y())**2)
-                    
-                    # 회전 좌표(p2)와 다음 좌표(p3) 간 거리 계산 (픽셀 단위)
-                    turn_to_next_dist = sqrt((p3.x()-p2.x())**2 + (p3.y()-p2.y())**2)
-                    
-                    # 출차 시나리오: 직진 시작점과 회전 좌표가 100픽셀 이내이면 회전 무시
-                    if is_exit_scenario and straight_to_turn_dist <= 100:
-                        # 회전 안내를 추가하지 않고 거리만 누적 (직진으로 처리)
-                        continue
-                    
-                    # 회전이 목적지와 너무 가까운지 확인 (100픽셀 이내)
-                    # p3가 마지막 포인트이거나 그 다음이 마지막 포인트인 경우
-                    is_too_close_to_destination = (
-                        turn_to_next_dist <= 100 and 
-                        (i + 2 == len(pts) - 1)  # p3가 마지막 포인트 (목적지)
-                    )
-                    
-                    # 회전이 목적지와 너무 가까우면 해당 회전 안내를 건너뜀
-                    if is_too_close_to_destination:
-                        # 회전 안내를 추가하지 않고 거리만 누적 (직진으로 처리)
-                        continue
-                    
-                    if is_exit_scenario:
-                        direction = f"출차 {direction}"
-                    instructions.append((direction, total_dist))
-                    total_dist = 0
-        
-        if is_exit_scenario:
-            instructions.append(("출차 완료", total_dist))
-        else:
-            instructions.append(("목적지 도착", total_dist))
-        
-        return instructions
-    
-    def calculate_route_progress(self, car_pos):
-        """경로 진행률 계산 - Smart_Parking_GUI.py와 동일한 로직"""
-        if not self.full_path_points or len(self.full_path_points) < 2:
-            return 0
-        
-        # 전체 경로 길이 계산
-        total_len = sum(sqrt((self.full_path_points[i+1].x()-p.x())**2 + 
-                           (self.full_path_points[i+1].y()-p.y())**2) 
-                       for i, p in enumerate(self.full_path_points[:-1]))
-        
-        if total_len == 0:
-            return 0
-        
-        # 가장 가까운 세그먼트와 투영 비율 찾기
-        min_dist = float('inf')
-        closest_seg = 0
-        proj_ratio = 0
-        
-        for i, p1 in enumerate(self.full_path_points[:-1]):
-            p2 = self.full_path_points[i+1]
-            seg_vec = p2 - p1
-            car_vec = car_pos - p1
-            seg_len_sq = QPointF.dotProduct(seg_vec, seg_vec)
-            
-            if seg_len_sq == 0:
-                continue
-            
-            t = max(0, min(1, QPointF.dotProduct(car_vec, seg_vec) / seg_len_sq))
-            proj = p1 + t * seg_vec
-            dist = sqrt((car_pos.x()-proj.x())**2 + (car_pos.y()-proj.y())**2)
-            
-            if dist < min_dist:
-                min_dist = dist
-                closest_seg = i
-                proj_ratio = t
-        
-        # 이동한 거리 계산
-        traveled = sum(sqrt((self.full_path_points[i+1].x()-p.x())**2 +
-                           (self.full_path_points[i+1].y()-p.y())**2) 
-                       for i, p in enumerate(self.full_path_points[:closest_seg]))
-        
-        if closest_seg < len(self.full_path_points) - 1:
-            p1, p2 = self.full_path_points[closest_seg], self.full_path_points[closest_seg+1]
-            traveled += sqrt((p2.x()-p1.x())**2 + (p2.y()-p1.y())**2) * proj_ratio
-        
-        return min(100, (traveled / total_len) * 100)
-    
-    def calculate_realistic_speed(self, instructions, progress, car_pos):
-        """현실적인 속도 계산 - Smart_Parking_GUI.py와 동일한 로직"""
-        if not instructions:
-            return 0
-        
-        direction, distance = instructions[0]
-        
-        # 기본 속도 설정
-        base_speed = 20  # 기본 20km/h
-        
-        # 거리에 따른 속도 조절
-        if distance <= 5:
-            speed = 5 + (distance / 5) * 10  # 5-15km/h
-        elif distance <= 20:
-            speed = 15 + (distance / 20) * 10  # 15-25km/h
-        else:
-            speed = 20 + min(10, (distance - 20) / 50 * 10)  # 20-30km/h
-        
-        # 방향에 따른 속도 조절
-        if "좌회전" in direction or "우회전" in direction:
-            speed = min(speed, 15)  # 회전 시 감속
-        elif "목적지" in direction or "도착" in direction:
-            speed = min(speed, 15)  # 목적지 근처 감속
-        elif "출차" in direction:
-            speed = min(speed, 20)  # 출차 시 조심스럽게
-        
-        # 진행률에 따른 미세 조절
-        if progress < 20:
-            speed *= 0.8  # 시작 구간
-        elif progress > 80:
-            speed *= 0.7  # 마지막 구간
-        
-        # 출차 시나리오에서는 더 조심스럽게
-        if self.is_exit_scenario:
-            speed *= 0.75
-        
-        # 최종 속도 범위 제한 (0-30km/h)
-        speed = max(0, min(30, int(speed)))
-        
-        return speed
 
 # ===================================================================
 # 메인 실행부
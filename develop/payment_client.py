@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+정산 서버 클라이언트 - 정산 서버와 연결을 유지하고 요청 여러 개를 한 연결에 이어 보내는(pipelining) 연결 풀
+
+기존에는 정산 요청/정산 확인마다 새 TCP 소켓을 만들고(타임아웃 5초) JSON 1개를 보낸 뒤 중괄호 수가 맞을 때까지 읽었으므로,
+출차마다 연결/핸드셰이크 비용이 들고 닫은 소켓은 TIME_WAIT로 남았으며 동시에 출차하는 차량은 연결을 따로 열었습니다.
+- 연결은 처음 요청할 때 열어 두고 계속 사용 (끊기면 다음 요청에서 다시 연결, 보내기 실패 시 새 연결로 1회 재시도)
+- 요청마다 request_id를 붙여 보내고, 응답의 request_id로 기다리는 요청을 찾음
+  (request_id를 돌려주지 않는 서버는 한 연결 안에서 보낸 순서대로 응답한다고 보고 순서로 매칭)
+- 연결별 수신 스레드가 응답을 읽으므로 한 연결에 여러 요청이 동시에 진행될 수 있음
+요청 결과는 concurrent.futures.Future (request_async) 또는 응답 dict/None (request)으로 돌려줍니다.
+정산 확인처럼 서버가 TCP 응답을 보내지 않는 메시지는 send로 보냅니다 (응답 대기 목록에 넣지 않으므로
+request_id를 돌려주지 않는 서버에서도 다음 요청의 응답 순서가 어긋나지 않음).
+"""
+
+import itertools
+import json
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+DEFAULT_POOL_SIZE = 2           # 정산 서버 연결 수
+DEFAULT_TIMEOUT = 5.0           # 응답 대기 시간 (초, 기존 소켓 타임아웃과 동일)
+CONNECT_TIMEOUT = 3.0           # 연결 시간 제한 (초)
+MAX_BUFFER = 1 << 20            # 응답 버퍼 상한 (완성되지 않는 데이터가 계속 쌓이면 연결 종료)
+
+
+def split_json_objects(buffer: str):
+    """수신 버퍼에서 완성된 JSON 객체들을 꺼냄 - (객체 목록, 남은 버퍼)
+
+    중괄호 짝으로 객체 끝을 찾되 문자열 안의 중괄호/이스케이프는 건너뜀, 완성되지 않은 객체는 남은 버퍼로 유지
+    """
+    objects = []
+    start = buffer.find('{')
+    while start != -1:
+        depth = 0
+        in_string = escaped = False
+        end = -1
+        for i in range(start, len(buffer)):
+            ch = buffer[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == '\\':
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    end = i + 1
+                    break
+        if end == -1:
+            return objects, buffer[start:]  # 나머지가 아직 도착하지 않음
+        try:
+            objects.append(json.loads(buffer[start:end]))
+        except json.JSONDecodeError as e:
+            print(f"❌ 정산 서버 응답 파싱 오류: {e}")
+        start = buffer.find('{', end)
+    return objects, ''
+
+
+class PaymentConnection:
+    """정산 서버 연결 1개 (요청 전송은 잠금으로 직렬화, 응답은 수신 스레드가 Future에 전달)"""
+
+    def __init__(self, host: str, port: int, on_close):
+        self.sock = socket.create_connection((host, port), timeout=CONNECT_TIMEOUT)
+        self.sock.settimeout(None)  # 응답 대기 시간은 요청별 Future에서 처리
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # 작은 요청을 모으지 않고 바로 전송
+        self.pending: 'OrderedDict[int, Future]' = OrderedDict()  # request_id -> Future (보낸 순서)
+        self.echoes_id = None  # 서버가 응답에 request_id를 돌려주는지 (첫 응답으로 판정)
+        self.closed = False
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._on_close = on_close
+        threading.Thread(target=self._read_loop, daemon=True, name="PaymentReader").start()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def send(self, request_id: int, payload: Dict[str, Any], future: Optional[Future] = None):
+        """요청 등록 후 전송 (전송 실패 시 OSError, 등록은 취소) - future가 None이면 응답을 기다리지 않음"""
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        try:
+            # 등록 순서와 전송 순서가 같아야 request_id 없는 응답을 순서로 매칭할 수 있음
+            with self._send_lock:
+                with self._lock:
+                    if self.closed:
+                        raise ConnectionError("정산 서버 연결이 닫혔습니다")
+                    if future is not None:
+                        self.pending[request_id] = future
+                self.sock.sendall(data)
+        except OSError:
+            with self._lock:
+                self.pending.pop(request_id, None)
+            self.close()
+            raise
+
+    def forget(self, request_id: int):
+        """응답 시간 초과된 요청 제거 - 순서 매칭 서버면 이후 응답 순서를 믿을 수 없으므로 연결 종료"""
+        with self._lock:
+            removed = self.pending.pop(request_id, None) is not None
+        if removed and not self.echoes_id:
+            self.close()
+
+    def _read_loop(self):
+        buffer = ''
+        try:
+            while True:
+                chunk = self.sock.recv(4096)
+                if not chunk:
+                    break
+                buffer += chunk.decode('utf-8', errors='replace')
+                responses, buffer = split_json_objects(buffer)
+                for response in responses:
+                    self._deliver(response)
+                if len(buffer) > MAX_BUFFER:
+                    print(f"⚠️ 정산 서버 응답이 완성되지 않음 ({len(buffer)} bytes) - 연결 종료")
+                    break
+        except OSError:
+            pass
+        finally:
+            self.close()
+
+    def _deliver(self, response: Dict[str, Any]):
+        request_id = response.get('request_id')
+        with self._lock:
+            if self.echoes_id is None:
+                self.echoes_id = request_id is not None
+            if request_id is not None:
+                future = self.pending.pop(request_id, None)
+            elif self.pending:
+                future = self.pending.popitem(last=False)[1]
+            else:
+                future = None
+        if future is None:
+            print(f"⚠️ 대기 중인 요청이 없는 정산 서버 응답: {response}")
+        elif not future.done():
+            future.set_result(response)
+
+    def close(self):
+        """연결 종료 - 응답을 기다리던 요청은 ConnectionError로 끝냄"""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            pending = list(self.pending.values())
+            self.pending.clear()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        for future in pending:
+            if not future.done():
+                future.set_exception(ConnectionError("정산 서버 연결이 끊겼습니다"))
+        self._on_close(self)
+
+
+class PaymentClient:
+    """정산 서버 연결 풀 (스레드 안전)
+
+    사용법:
+        client = PaymentClient('localhost', 8888)
+        response = client.request({'type': 'pay', 'parking_spot': 7})    # 응답 dict 또는 None
+        future = client.request_async({'type': 'pay', 'parking_spot': 8}) # 응답 dict로 끝나는 Future
+        client.send({'type': 'payment_confirmation', ...})                # 응답 없는 메시지 (True/False)
+    """
+
+    def __init__(self, host: str, port: int, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.connections: List[PaymentConnection] = []
+        self.stats = {'connects': 0, 'requests': 0, 'retries': 0, 'timeouts': 0}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+
+    def _connection(self) -> PaymentConnection:
+        """진행 중인 요청이 가장 적은 연결 (모두 사용 중이고 풀에 자리가 있으면 새 연결)
+
+        새 연결은 잠금 안에서 열어 풀 크기를 넘지 않음 (연결은 처음 요청/끊긴 뒤에만 열리므로 대기는 드묾)
+        """
+        with self._connect_lock:
+            with self._lock:
+                live = [c for c in self.connections if not c.closed]
+                idle = min(live, key=len, default=None)
+                if idle is not None and (len(idle) == 0 or len(live) >= self.pool_size):
+                    return idle
+            conn = PaymentConnection(self.host, self.port, self._remove)
+            with self._lock:
+                self.connections.append(conn)
+                self.stats['connects'] += 1
+            return conn
+
+    def _remove(self, conn: PaymentConnection):
+        with self._lock:
+            if conn in self.connections:
+                self.connections.remove(conn)
+
+    def request_async(self, payload: Dict[str, Any]) -> Future:
+        """요청 전송 - 응답 dict로 끝나는 Future (연결 실패/끊김은 예외)
+
+        payload에 request_id를 붙여 보냄 (보내기 실패 시 새 연결로 1회 재시도)
+        """
+        request_id = next(self._ids)
+        message = dict(payload, request_id=request_id)
+        future = Future()
+        future.request_id = request_id
+        with self._lock:
+            self.stats['requests'] += 1
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send(request_id, message, future)
+                future.connection = conn
+                return future
+            except OSError as e:
+                if attempt:
+                    future.set_exception(e)
+                else:
+                    with self._lock:
+                        self.stats['retries'] += 1
+        return future
+
+    def send(self, payload: Dict[str, Any]) -> bool:
+        """응답이 없는 메시지 전송 (payment_confirmation 등) - 전송 성공 여부
+
+        응답 대기 목록에 넣지 않으므로 Future/시간 초과가 남지 않음 (보내기 실패 시 새 연결로 1회 재시도)
+        """
+        request_id = next(self._ids)
+        message = dict(payload, request_id=request_id)
+        with self._lock:
+            self.stats['requests'] += 1
+        for attempt in range(2):
+            try:
+                self._connection().send(request_id, message)
+                return True
+            except OSError as e:
+                if attempt:
+                    print(f"❌ 정산 서버 전송 실패: {e} ({self.host}:{self.port})")
+                else:
+                    with self._lock:
+                        self.stats['retries'] += 1
+        return False
+
+    def request(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """요청 후 응답 대기 - 응답 dict (연결 실패, 시간 초과, 연결 끊김이면 None)
+
+        서버가 유휴 연결을 닫은 직후 보낸 요청은 응답 없이 끊기므로 새 연결로 1회 다시 보냄
+        (조회 요청용 - 중복 전송되면 안 되는 요청은 request_async 사용)
+        """
+        for attempt in range(2):
+            future = self.request_async(payload)
+            try:
+                return future.result(self.timeout if timeout is None else timeout)
+            except FutureTimeoutError:
+                with self._lock:
+                    self.stats['timeouts'] += 1
+                conn = getattr(future, 'connection', None)
+                if conn is not None:
+                    conn.forget(future.request_id)
+                print(f"❌ 정산 서버 응답 시간 초과: {self.host}:{self.port} (request_id {future.request_id})")
+            except ConnectionRefusedError:
+                print(f"❌ 정산 서버 연결 거부됨: {self.host}:{self.port}")
+            except socket.timeout:
+                print(f"❌ 정산 서버 연결 시간 초과: {self.host}:{self.port}")
+            except ConnectionError as e:
+                if attempt == 0 and getattr(future, 'connection', None) is not None:
+                    with self._lock:
+                        self.stats['retries'] += 1
+                    continue
+                print(f"❌ 정산 서버 통신 실패: {e}")
+            except OSError as e:
+                print(f"❌ 정산 서버 통신 실패: {e}")
+            return None
+        return None
+
+    def close(self):
+        """모든 연결 종료"""
+        with self._lock:
+            connections = list(self.connections)
+        for conn in connections:
+            conn.close()
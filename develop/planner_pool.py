@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+경로 탐색 프로세스 풀 - 격자 경로 탐색(JPS/A*)을 별도 프로세스에서 실행하여 컨트롤러 수신 스레드를 막지 않음
+
+격자 탐색은 CPU를 쓰는 순수 파이썬 코드라 수신 스레드에서 돌리면 그동안 그 연결의 위치 데이터가 모두 밀리고,
+스레드로 옮겨도 GIL 때문에 다른 수신 스레드가 함께 느려집니다.
+- 작업 프로세스는 시작할 때(initializer) 컴파일된 지도의 점유 격자와 GridPlanner(가장 가까운 열린 칸 표 포함)를
+  한 번 로드해 두므로 요청마다 전달하는 것은 출발/도착 좌표와 정차 차량이 막은 셀 번호뿐입니다.
+- 같은 요청(알고리즘, 출발/도착 셀, 막힌 셀)이 처리 중이면 새로 보내지 않고 같은 Future를 돌려줍니다.
+- 요청마다 기한(deadline)이 있어 기한이 지나면 Future를 취소합니다. 아직 작업 프로세스로 넘어가지 않은 요청은
+  풀에서도 취소하고, 작업 프로세스는 탐색을 시작하기 전에 기한을 확인하며, 기한 뒤에 도착한 결과는 버립니다.
+결과는 concurrent.futures.Future로 돌려주므로 호출한 쪽은 add_done_callback에서 세션 상태에 반영합니다.
+"""
+
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, Future, InvalidStateError, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from grid_planner import GridPlanner, corner_points, smooth_cells
+from lot_map import DEFAULT_CELL, DEFAULT_MARGIN, LOT_MAP_PATH, load_lot_map
+
+Waypoint = List[float]
+
+DEFAULT_WORKERS = 2         # 작업 프로세스 수
+DEFAULT_DEADLINE = 2.0      # 요청 기한 (초)
+ALGORITHMS = ('jps', 'astar')
+
+# ===================================================================
+# 작업 프로세스 (모듈 최상위 함수만 피클로 전달 가능)
+# ===================================================================
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(map_path: str, cell: int, margin: int):
+    """작업 프로세스 시작 시 1회 - 점유 격자와 탐색기 로드 (디스크 캐시가 있으면 컴파일 생략)"""
+    grid = load_lot_map(map_path).occupancy(cell, margin)
+    planner = GridPlanner.from_grid(grid)
+    planner.build_nearest_free()
+    _worker.update(cell=grid.cell, width=grid.width, height=grid.height,
+                   static=bytes(grid.cells), planner=planner)
+
+
+def _ping(_: int = 0) -> int:
+    """작업 프로세스 예열 (initializer 실행 확인용, 여러 프로세스에 고르게 돌도록 잠시 대기)"""
+    time.sleep(0.01)
+    return os.getpid()
+
+
+def _plan(start: Tuple[float, float], goal: Tuple[float, float], blocked: Tuple[int, ...],
+          algorithm: str, deadline: float) -> Optional[Dict[str, Any]]:
+    """격자 경로 1개 - {'waypoints', 'expanded', 'elapsed_ms', 'pid'} (기한 초과/경로 없음이면 None)
+
+    waypoints는 출발 좌표, 시야가 닿는 꺾임 셀 중심들, 도착 좌표 (DistanceFields.waypoints와 같은 형식)
+    """
+    if time.time() > deadline:
+        return None  # 대기열에서 기한이 지난 요청은 탐색하지 않음
+    started = time.perf_counter()
+    cell, w = _worker['cell'], _worker['width']
+    snapper: GridPlanner = _worker['planner']
+    s = snapper.nearest_free(int(start[0] // cell), int(start[1] // cell))
+    g = snapper.nearest_free(int(goal[0] // cell), int(goal[1] // cell))
+    if s is None or g is None:
+        return None
+
+    cells = _worker['static']
+    planner = snapper
+    if blocked:
+        # 정차 차량 칸을 더한 격자 (출발/도착 칸은 열어 둠) - 정적 탐색기의 배열은 건드리지 않음
+        combined = bytearray(cells)
+        for c in blocked:
+            combined[c] = 1
+        combined[s[1] * w + s[0]] = combined[g[1] * w + g[0]] = 0
+        cells = bytes(combined)
+        planner = GridPlanner(w, _worker['height'], cells)
+    path = planner.jps(s, g) if algorithm == 'jps' else planner.astar(s, g)
+    if path is None:
+        return None
+    waypoints = [[float(start[0]), float(start[1])]] + corner_points(smooth_cells(w, cells, path), cell)
+    waypoints.append([float(goal[0]), float(goal[1])])
+    return {'waypoints': waypoints, 'expanded': planner.expanded,
+            'elapsed_ms': (time.perf_counter() - started) * 1e3, 'pid': os.getpid()}
+
+
+# ===================================================================
+# 컨트롤러 쪽 풀
+# ===================================================================
+class PlannerPool:
+    """격자 경로 탐색 프로세스 풀 (중복 요청 합치기 + 기한 초과 취소, 스레드 안전)
+
+    사용법:
+        pool = PlannerPool()
+        pool.start()                                   # 작업 프로세스 예열 (지도 로드)
+        future = pool.submit((x, y), (gx, gy), blocked=cells, deadline=1.0)
+        future.add_done_callback(on_planned)           # 취소되면 future.cancelled()
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, map_path: str = LOT_MAP_PATH,
+                 cell: int = DEFAULT_CELL, margin: int = DEFAULT_MARGIN):
+        self.workers = workers
+        self.cell = cell
+        self.width = load_lot_map(map_path).occupancy(cell, margin).width
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            initargs=(map_path, cell, margin))
+        self.in_flight: Dict[tuple, Future] = {}
+        self.stats = {'submitted': 0, 'deduplicated': 0, 'expired': 0, 'completed': 0}
+        self._lock = threading.Lock()
+        self._deadlines: List[Tuple[float, int, tuple, Future, Future]] = []
+        self._seq = 0
+        self._wakeup = threading.Condition(self._lock)
+        self._running = True
+        self._watchdog = threading.Thread(target=self._watch_deadlines, daemon=True, name="PlannerDeadline")
+        self._watchdog.start()
+
+    def start(self) -> List[int]:
+        """작업 프로세스를 모두 띄우고 지도 로드를 기다림 (첫 요청이 지도 로드 시간을 내지 않도록) - 작업 프로세스 PID"""
+        return sorted(set(self.executor.map(_ping, range(self.workers * 4))))
+
+    def request_key(self, start: Sequence[float], goal: Sequence[float], blocked: Sequence[int],
+                    algorithm: str) -> tuple:
+        """중복 판정 키 - 같은 셀에서 출발/도착하고 막힌 셀이 같으면 같은 경로"""
+        cell = self.cell
+        return (algorithm, int(start[0] // cell), int(start[1] // cell),
+                int(goal[0] // cell), int(goal[1] // cell), tuple(sorted(blocked)))
+
+    def submit(self, start: Sequence[float], goal: Sequence[float], blocked: Sequence[int] = (),
+               algorithm: str = 'jps', deadline: float = DEFAULT_DEADLINE) -> Future:
+        """경로 탐색 요청 - 결과 Future (dict 또는 경로 없음 None, 기한 초과 시 취소됨)"""
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"알 수 없는 탐색 알고리즘: {algorithm!r} (허용: {ALGORITHMS})")
+        key = self.request_key(start, goal, blocked, algorithm)
+        with self._lock:
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.stats['deduplicated'] += 1
+                return future
+            if not self._running:
+                raise RuntimeError("경로 탐색 풀이 종료되었습니다")
+            future = Future()  # 대기(PENDING) 상태로 두어 기한 초과 시 cancel()로 취소
+            self.in_flight[key] = future
+            self.stats['submitted'] += 1
+            expires = time.monotonic() + deadline
+            inner = self.executor.submit(_plan, (float(start[0]), float(start[1])),
+                                         (float(goal[0]), float(goal[1])),
+                                         key[5], algorithm, time.time() + deadline)
+            self._seq += 1
+            heapq.heappush(self._deadlines, (expires, self._seq, key, future, inner))
+            self._wakeup.notify()
+        inner.add_done_callback(lambda f: self._finish(key, future, f))
+        return future
+
+    def _finish(self, key: tuple, future: Future, inner: Future):
+        """작업 결과를 요청 Future로 전달 (이미 기한 초과로 취소된 요청이면 버림)"""
+        with self._lock:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+            if future.done():
+                return
+            self.stats['completed'] += 1
+        try:
+            future.set_result(inner.result())
+        except CancelledError:
+            future.cancel()
+        except InvalidStateError:
+            pass  # 결과 전달 직전에 기한 초과로 취소됨
+        except Exception as e:
+            try:
+                future.set_exception(e)
+            except InvalidStateError:
+                pass
+
+    def _watch_deadlines(self):
+        """기한이 지난 요청 취소 (풀에 아직 남아 있으면 풀에서도 취소)"""
+        while True:
+            expired = []
+            with self._lock:
+                if not self._running:
+                    return
+                now = time.monotonic()
+                while self._deadlines and (self._deadlines[0][0] <= now or self._deadlines[0][3].done()):
+                    _, _, key, future, inner = heapq.heappop(self._deadlines)
+                    if future.done():
+                        continue
+                    if self.in_flight.get(key) is future:
+                        del self.in_flight[key]
+                    self.stats['expired'] += 1
+                    expired.append((future, inner))
+                if not expired:
+                    self._wakeup.wait(self._deadlines[0][0] - now if self._deadlines else None)
+                    continue
+            # 취소 콜백(_finish, 호출한 쪽 콜백)은 잠금 밖에서 실행 - 요청 Future를 먼저 취소해 늦은 결과를 버림
+            for future, inner in expired:
+                future.cancel()
+                inner.cancel()
+
+    def shutdown(self, wait: bool = False):
+        """풀 종료 - 대기 중인 요청은 취소"""
+        with self._lock:
+            self._running = False
+            self._wakeup.notify()
+            pending = [entry[3] for entry in self._deadlines]
+            self._deadlines.clear()
+            self.in_flight.clear()
+        for future in pending:
+            future.cancel()
+        self.executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+포즈 리샘플러 - 불규칙하게(5~50Hz, 끊김 포함) 들어오는 차량 위치를 고정 주기(기본 60Hz) 포즈로 변환
+
+화면은 (현재 시각 - RENDER_DELAY) 시점의 포즈를 받으므로 대부분 수신된 두 위치 사이를 보간하고,
+수신이 늦어지면 마지막 속도로 최대 MAX_EXTRAPOLATION초까지만 외삽한 뒤 제자리에 멈춥니다.
+외삽 길이(horizon)와, 새 위치가 도착했을 때 직전 외삽 예측과의 오차를 지표로 누적합니다.
+"""
+
+import threading
+import time
+from collections import deque
+from math import atan2, degrees, sqrt
+from typing import Any, Dict, Hashable, List, Optional
+
+DEFAULT_RATE_HZ = 60.0
+RENDER_DELAY = 0.1          # 표시 지연 (초) - 10Hz 이상 수신이면 항상 보간
+MAX_EXTRAPOLATION = 0.3     # 최대 외삽 길이 (초), 이후에는 마지막 외삽 위치 유지
+STALE_TIMEOUT = 2.0         # 마지막 수신 후 이 시간이 지나면 포즈 스트림에서 제외 (초)
+HISTORY_SIZE = 8            # 차량별 보관 위치 수
+
+MODE_INTERPOLATE = 'interpolate'
+MODE_EXTRAPOLATE = 'extrapolate'
+MODE_HOLD = 'hold'
+
+
+class _Fix:
+    __slots__ = ('t', 'x', 'y', 'vx', 'vy', 'heading')
+
+    def __init__(self, t: float, x: float, y: float, vx: float, vy: float, heading: float):
+        self.t = t
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.heading = heading
+
+
+def _lerp_angle(a: float, b: float, u: float) -> float:
+    """최단 방향으로 각도 보간 (도)"""
+    diff = (b - a + 180.0) % 360.0 - 180.0
+    return (a + diff * u + 180.0) % 360.0 - 180.0
+
+
+class PoseResampler:
+    """차량별 위치 이력을 고정 주기 포즈로 리샘플링 (수신 스레드와 송신 스레드에서 함께 사용, 스레드 안전)"""
+
+    def __init__(self, rate_hz: float = DEFAULT_RATE_HZ, render_delay: float = RENDER_DELAY,
+                 max_extrapolation: float = MAX_EXTRAPOLATION):
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.render_delay = render_delay
+        self.max_extrapolation = max_extrapolation
+        self.histories: Dict[Hashable, deque] = {}
+        self._lock = threading.Lock()  # 이력/지표는 수신 스레드(add_fix)와 포즈 스트림 스레드(sample)가 함께 사용
+        self.reset_metrics()
+
+    # ---------------------------------------------------------------
+    # 입력
+    # ---------------------------------------------------------------
+    def add_fix(self, vehicle_id: Hashable, x: float, y: float, vx: float = 0.0, vy: float = 0.0,
+                heading: Optional[float] = None, now: Optional[float] = None):
+        """위치 1회 수신 (vx, vy는 픽셀/초, heading은 도)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            history = self.histories.get(vehicle_id)
+            if history is None:
+                history = self.histories[vehicle_id] = deque(maxlen=HISTORY_SIZE)
+
+            if history:
+                last = history[-1]
+                if now <= last.t:
+                    return
+                # 직전 위치에서 외삽했다면 어긋났을 거리 (외삽 오차 지표)
+                dt = min(now - last.t, self.max_extrapolation)
+                error = sqrt((last.x + last.vx * dt - x) ** 2 + (last.y + last.vy * dt - y) ** 2)
+                self.metrics['prediction_count'] += 1
+                self.metrics['prediction_error_sum'] += error
+                self.metrics['prediction_error_max'] = max(self.metrics['prediction_error_max'], error)
+
+            if heading is None:
+                heading = degrees(atan2(vy, vx)) if vx or vy else (history[-1].heading if history else 0.0)
+            history.append(_Fix(now, x, y, vx, vy, heading))
+
+    def remove_vehicle(self, vehicle_id: Hashable):
+        with self._lock:
+            self.histories.pop(vehicle_id, None)
+
+    # ---------------------------------------------------------------
+    # 출력
+    # ---------------------------------------------------------------
+    def pose_at(self, vehicle_id: Hashable, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """(now - render_delay) 시점의 포즈 (이력이 없거나 오래되었으면 None)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._pose_at(vehicle_id, now)
+
+    def _pose_at(self, vehicle_id: Hashable, now: float) -> Optional[Dict[str, Any]]:
+        history = self.histories.get(vehicle_id)
+        if not history or now - history[-1].t > STALE_TIMEOUT:
+            return None
+
+        t = now - self.render_delay
+        last = history[-1]
+        if t <= last.t:
+            # 보간: t를 감싸는 두 위치 탐색 (이력이 짧으므로 뒤에서부터 선형 탐색)
+            older = history[0]
+            if t <= older.t:
+                return self._pose(vehicle_id, older.x, older.y, older.heading, older, MODE_INTERPOLATE, 0.0)
+            for i in range(len(history) - 1, 0, -1):
+                a, b = history[i - 1], history[i]
+                if a.t <= t <= b.t:
+                    u = (t - a.t) / (b.t - a.t)
+                    return self._pose(vehicle_id, a.x + (b.x - a.x) * u, a.y + (b.y - a.y) * u,
+                                      _lerp_angle(a.heading, b.heading, u), b, MODE_INTERPOLATE, 0.0)
+
+        horizon = t - last.t
+        mode = MODE_EXTRAPOLATE
+        if horizon > self.max_extrapolation:
+            horizon, mode = self.max_extrapolation, MODE_HOLD
+        return self._pose(vehicle_id, last.x + last.vx * horizon, last.y + last.vy * horizon,
+                          last.heading, last, mode, horizon)
+
+    def sample(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """틱 1회 - 모든 차량의 포즈 목록 (지표 누적)"""
+        now = time.monotonic() if now is None else now
+        poses = []
+        with self._lock:
+            m = self.metrics
+            for vehicle_id in self.histories:
+                pose = self._pose_at(vehicle_id, now)
+                if pose is None:
+                    continue
+                m['ticks'] += 1
+                m[pose['mode']] += 1
+                if pose['mode'] != MODE_INTERPOLATE:
+                    m['horizon_sum'] += pose['horizon']
+                    m['horizon_max'] = max(m['horizon_max'], pose['horizon'])
+                poses.append(pose)
+        return poses
+
+    @staticmethod
+    def _pose(vehicle_id, x, y, heading, fix: _Fix, mode: str, horizon: float) -> Dict[str, Any]:
+        return {
+            'vehicle_id': vehicle_id,
+            'x': round(x, 2),
+            'y': round(y, 2),
+            'heading': round(heading, 1),
+            'speed': round(sqrt(fix.vx * fix.vx + fix.vy * fix.vy), 2),
+            'mode': mode,
+            'horizon': round(horizon, 3),
+        }
+
+    # ---------------------------------------------------------------
+    # 지표
+    # ---------------------------------------------------------------
+    def reset_metrics(self):
+        metrics = {
+            'ticks': 0, MODE_INTERPOLATE: 0, MODE_EXTRAPOLATE: 0, MODE_HOLD: 0,
+            'horizon_sum': 0.0, 'horizon_max': 0.0,
+            'prediction_count': 0, 'prediction_error_sum': 0.0, 'prediction_error_max': 0.0,
+        }
+        with self._lock:
+            self.metrics = metrics
+
+    def metrics_summary(self) -> Dict[str, Any]:
+        """보간/외삽 비율, 외삽 길이(초), 외삽 예측 오차(픽셀)"""
+        with self._lock:
+            m = dict(self.metrics)
+        extrapolated = m[MODE_EXTRAPOLATE] + m[MODE_HOLD]
+        return {
+            'ticks': m['ticks'],
+            'interpolated_ratio': round(m[MODE_INTERPOLATE] / m['ticks'], 3) if m['ticks'] else 0.0,
+            'extrapolated': m[MODE_EXTRAPOLATE],
+            'held': m[MODE_HOLD],
+            'horizon_mean': round(m['horizon_sum'] / extrapolated, 3) if extrapolated else 0.0,
+            'horizon_max': round(m['horizon_max'], 3),
+            'prediction_error_mean': (round(m['prediction_error_sum'] / m['prediction_count'], 2)
+                                      if m['prediction_count'] else 0.0),
+            'prediction_error_max': round(m['prediction_error_max'], 2),
+        }
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+위치 필터 - 차량별 등속(constant-velocity) 칼만 필터로 UWB 위치를 평활화하고 속도/방향각을 추정
+
+수신 위치의 heading은 대부분 0이고 speed는 송신 측이 임의로 넣은 값(route_sender는 step * 10)이므로,
+main_controller가 위치를 받을 때마다 필터를 갱신하여 추정 속도(픽셀/초)와 방향각(도)으로 대체합니다.
+혁신(innovation) 마할라노비스 거리가 게이트를 넘는 위치는 이상치로 버리고 예측값을 사용합니다.
+
+x/y 축은 서로 독립(대각 잡음)이므로 축마다 2x2 공분산 (위치, 속도)만 유지합니다.
+"""
+
+import time
+from math import atan2, degrees, sqrt
+from typing import Any, Dict, Optional
+
+# 필터 파라미터 (픽셀, 초)
+MEASUREMENT_SIGMA = 30.0    # UWB 위치 오차 표준편차
+ACCEL_SIGMA = 150.0         # 가속도 잡음 표준편차 (픽셀/초², 약 3m/s²)
+INITIAL_SPEED_SIGMA = 200.0 # 초기화 시 속도 불확실성 (픽셀/초)
+GATE_CHI2 = 9.21            # 혁신 게이트 (자유도 2 카이제곱 99%)
+MAX_REJECTS = 3             # 연속 거부가 이 횟수에 도달하면 새 위치로 재초기화 (실제 이동으로 간주)
+MAX_DT = 2.0                # 위치 간격이 이보다 길면 재초기화 (초)
+MIN_DT = 1e-3
+HEADING_MIN_SPEED = 10.0    # 이보다 느리면 방향각을 갱신하지 않음 (픽셀/초, 0.2m/s)
+
+
+class _AxisState:
+    """한 축의 (위치, 속도) 상태와 2x2 공분산"""
+
+    __slots__ = ('p', 'v', 'pp', 'pv', 'vv')
+
+    def __init__(self, p: float, speed_var: float, measurement_var: float):
+        self.p = p
+        self.v = 0.0
+        self.pp = measurement_var
+        self.pv = 0.0
+        self.vv = speed_var
+
+    def predict(self, dt: float, q: float):
+        self.p += self.v * dt
+        dt2 = dt * dt
+        # P = F P F^T + Q (이산 백색 가속도 모델)
+        self.pp += 2.0 * dt * self.pv + dt2 * self.vv + q * dt2 * dt2 / 4.0
+        self.pv += dt * self.vv + q * dt2 * dt / 2.0
+        self.vv += q * dt2
+
+    def innovation(self, z: float, r: float):
+        """(혁신, 혁신 분산)"""
+        return z - self.p, self.pp + r
+
+    def correct(self, y: float, s: float):
+        k0, k1 = self.pp / s, self.pv / s
+        self.p += k0 * y
+        self.v += k1 * y
+        pp, pv = self.pp, self.pv
+        self.pp = (1.0 - k0) * pp
+        self.pv = (1.0 - k0) * pv
+        self.vv -= k1 * pv
+
+
+class VehicleKalmanFilter:
+    """차량 1대의 등속 칼만 필터"""
+
+    def __init__(self, measurement_sigma: float = MEASUREMENT_SIGMA, accel_sigma: float = ACCEL_SIGMA,
+                 gate_chi2: float = GATE_CHI2, max_rejects: int = MAX_REJECTS):
+        self.r = measurement_sigma * measurement_sigma
+        self.q = accel_sigma * accel_sigma
+        self.gate_chi2 = gate_chi2
+        self.max_rejects = max_rejects
+        self.x_axis: Optional[_AxisState] = None
+        self.y_axis: Optional[_AxisState] = None
+        self.last_time: Optional[float] = None
+        self.heading = 0.0
+        self.rejects = 0
+
+    def reset(self, x: float, y: float, now: float):
+        speed_var = INITIAL_SPEED_SIGMA * INITIAL_SPEED_SIGMA
+        self.x_axis = _AxisState(x, speed_var, self.r)
+        self.y_axis = _AxisState(y, speed_var, self.r)
+        self.last_time = now
+        self.rejects = 0
+
+    def update(self, x: float, y: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """위치 1회 반영 - 필터 상태 반환"""
+        now = time.monotonic() if now is None else now
+        if self.x_axis is None or now - self.last_time > MAX_DT:
+            self.reset(x, y, now)
+            return self.state(accepted=True, gate=0.0)
+
+        dt = max(MIN_DT, now - self.last_time)
+        self.last_time = now
+        self.x_axis.predict(dt, self.q)
+        self.y_axis.predict(dt, self.q)
+
+        yx, sx = self.x_axis.innovation(x, self.r)
+        yy, sy = self.y_axis.innovation(y, self.r)
+        gate = yx * yx / sx + yy * yy / sy
+
+        if gate > self.gate_chi2:
+            # 이상치 - 예측값 유지 (공분산이 커지므로 게이트도 점점 넓어짐)
+            self.rejects += 1
+            if self.rejects >= self.max_rejects:
+                self.reset(x, y, now)
+                return self.state(accepted=True, gate=gate)
+            return self.state(accepted=False, gate=gate)
+
+        self.rejects = 0
+        self.x_axis.correct(yx, sx)
+        self.y_axis.correct(yy, sy)
+        return self.state(accepted=True, gate=gate)
+
+    @property
+    def speed(self) -> float:
+        if self.x_axis is None:
+            return 0.0
+        return sqrt(self.x_axis.v ** 2 + self.y_axis.v ** 2)
+
+    def state(self, accepted: bool = True, gate: float = 0.0) -> Dict[str, Any]:
+        """브로드캐스트용 필터 상태 (픽셀, 픽셀/초, 도)"""
+        speed = self.speed
+        if speed >= HEADING_MIN_SPEED:
+            self.heading = degrees(atan2(self.y_axis.v, self.x_axis.v))
+        return {
+            'x': self.x_axis.p,
+            'y': self.y_axis.p,
+            'vx': round(self.x_axis.v, 2),
+            'vy': round(self.y_axis.v, 2),
+            'speed': round(speed, 2),
+            'heading': round(self.heading, 1),
+            'position_std': round(sqrt((self.x_axis.pp + self.y_axis.pp) / 2.0), 2),
+            'accepted': accepted,
+            'gate': round(gate, 2),
+        }
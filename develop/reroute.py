@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 경로 재탐색 - 경로 이탈 시 현재 위치에서 목적지까지 통로 네트워크 최단 경로를 컨트롤러에서 바로 계산
+
+기존에는 탑뷰가 팀원 재할당 서버에 TCP로 요청(타임아웃 10초)한 뒤 새 웨이포인트가 다시
+컨트롤러를 거쳐 돌아올 때까지 기다렸으므로, 재탐색에 수 초가 걸리고 서버가 꺼져 있으면 실패했습니다.
+맵 매칭용 AisleNetwork의 노드 간 최단 거리/다음 노드 표를 그대로 쓰므로 재탐색 1회는
+후보 간선 투영 + 끝점 2개 비교 + 경로 길이만큼의 역추적으로 끝납니다.
+목적지가 통로 노드가 아니면(목적지 입구 등) lot_map이 미리 컴파일한 거리장의 방향표를 따라갑니다.
+"""
+
+from math import sqrt
+from typing import List, Optional, Sequence
+
+from distance_fields import DistanceFields
+from map_matching import AisleNetwork, lot_aisle_network
+from lot_layout import LOT_MAP, SPOT_WAYPOINT_TOLERANCE
+
+Waypoint = List[float]
+
+
+def _collinear(a: Sequence[float], b: Sequence[float], c: Sequence[float]) -> bool:
+    """b가 a-c 직선 위의 중간 점인지 (통로가 축 정렬이므로 외적 0 판정)"""
+    return abs((b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])) < 1e-6
+
+
+def simplify_waypoints(points: List[Waypoint]) -> List[Waypoint]:
+    """직선 위 중간 노드 제거 - route_sender 경로처럼 회전 지점과 목적지만 남김 (안내 스케줄 회전 판정과 일치)"""
+    if len(points) <= 2:
+        return points
+    result = [points[0]]
+    for i in range(1, len(points) - 1):
+        if not _collinear(result[-1], points[i], points[i + 1]):
+            result.append(points[i])
+    result.append(points[-1])
+    return result
+
+
+class LocalRerouter:
+    """현재 위치 → 목적지 통로 최단 경로 (웨이포인트 목록, 첫 점은 통로 위 현재 위치)"""
+
+    def __init__(self, network: Optional[AisleNetwork] = None,
+                 target_tolerance: float = SPOT_WAYPOINT_TOLERANCE,
+                 fields: Optional[DistanceFields] = None, lot=None):
+        self.network = network or lot_aisle_network()
+        self.target_tolerance = target_tolerance
+        self.lot = lot or LOT_MAP  # 거리장을 로드할 지도 (층별 지도면 그 층의 CompiledLotMap)
+        self._fields = fields
+
+    @property
+    def fields(self) -> DistanceFields:
+        """거리장 (처음 사용할 때 지도 캐시에서 로드)"""
+        if self._fields is None:
+            self._fields = self.lot.distance_fields()
+        return self._fields
+
+    def target_node(self, x: float, y: float) -> Optional[int]:
+        """목적지 좌표(주차구역 진입 웨이포인트 등)에 해당하는 노드 (허용 오차 밖이면 None)"""
+        node = self.network.nearest_node(x, y)
+        nx, ny = self.network.node_xy[node]
+        if sqrt((nx - x) ** 2 + (ny - y) ** 2) > self.target_tolerance:
+            return None
+        return node
+
+    def reroute(self, x: float, y: float, target_x: float, target_y: float) -> Optional[List[Waypoint]]:
+        """현재 위치에서 목적지까지 웨이포인트 목록 (통로 노드도 거리장 목표도 아니면 None)"""
+        network = self.network
+        target = self.target_node(target_x, target_y)
+        if target is None:
+            return self.reroute_by_field(x, y, target_x, target_y)
+
+        candidates = network.candidates(x, y, 1)
+        if candidates:
+            # 현재 간선 위 투영점에서 양 끝점 중 목적지까지 더 가까운 쪽으로 진행
+            c = candidates[0]
+            u, v = network.edge_nodes[c.edge]
+            length = network.edge_geom[c.edge][4]
+            along = c.t * length
+            dist = network.node_dist
+            if network.edge_one_way[c.edge]:
+                first = v  # 일방통행 통로에서는 진행 방향 끝점으로만
+            elif along + dist[u][target] <= (length - along) + dist[v][target]:
+                first = u
+            else:
+                first = v
+            start = [c.x, c.y]
+        else:
+            # 통로에서 멀면 가장 가까운 노드로 복귀
+            first = network.nearest_node(x, y)
+            start = [x, y]
+
+        nodes = network.node_path(first, target)
+        if not nodes:
+            return None
+        points = [start] + [list(network.node_xy[n]) for n in nodes]
+        if (points[0][0] - points[1][0]) ** 2 + (points[0][1] - points[1][1]) ** 2 < 1.0:
+            points.pop(0)
+        return simplify_waypoints(points)
+
+    def reroute_by_field(self, x: float, y: float, target_x: float, target_y: float) -> Optional[List[Waypoint]]:
+        """거리장 목표까지 방향표를 따라간 웨이포인트 목록 (목표가 아니거나 도달 불가면 None)"""
+        fields = self.fields
+        name = fields.target_at(target_x, target_y, self.target_tolerance)
+        if name is None:
+            return None
+        points = fields.waypoints(name, x, y)
+        if points is None:
+            return None
+        return simplify_waypoints(points)
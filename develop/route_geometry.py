@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+경로 기하 캐시 - 경로 수신 시 한 번만 계산해 두는 세그먼트 정보
+누적 거리(arc length), 단위 방향 벡터, 세그먼트 길이, 회전 각도를 array로 보관하여
+위치 업데이트마다 전체 경로 길이를 sqrt로 다시 계산하지 않고
+진행률/남은 거리/현재 세그먼트를 캐시된 인덱스 주변의 제한된 탐색으로 구합니다.
+"""
+
+from array import array
+from bisect import bisect_right
+from math import sqrt, atan2, degrees
+from typing import Iterable, Optional, Tuple
+
+from navigation_core import (
+    RoutePath, point_xy, PIXELS_PER_METER, SEGMENT_ADVANCE_RADIUS
+)
+from segment_index import SegmentIndex
+
+# 현재 세그먼트 기준 앞뒤로 탐색할 세그먼트 수
+LOCAL_SEARCH_BEHIND = 2
+LOCAL_SEARCH_AHEAD = 3
+# 제한된 탐색 결과가 이 거리(픽셀)보다 멀면 전체 세그먼트를 다시 탐색 (경로 이탈/재진입 대비)
+GLOBAL_SEARCH_DISTANCE = 200
+# 세그먼트가 이 개수 이상이면 전체 탐색 대신 격자 인덱스(SegmentIndex) 사용
+INDEX_MIN_SEGMENTS = 32
+
+
+class RouteGeometry:
+    """경로 포인트로부터 미리 계산한 세그먼트 기하 정보
+
+    Attributes:
+        xs, ys: 경로 포인트 좌표
+        seg_len: 세그먼트 길이 (픽셀), 길이 n-1
+        cum: 각 포인트까지의 누적 거리 (픽셀), 길이 n (cum[0] = 0)
+        ux, uy: 세그먼트 단위 방향 벡터 (길이 0 세그먼트는 0)
+        turn_angle: 각 포인트에서의 방향 변화 각도 (도, 좌회전 +), 양 끝점은 0
+        total_length: 전체 경로 길이 (픽셀)
+    """
+
+    __slots__ = ('xs', 'ys', 'seg_len', 'cum', 'ux', 'uy', 'turn_angle', 'total_length', '_index')
+
+    def __init__(self, points: Iterable = ()):
+        path = points if isinstance(points, RoutePath) else RoutePath(points)
+        xs, ys = path.xs, path.ys
+        n = len(xs)
+
+        self.xs = xs
+        self.ys = ys
+        self.seg_len = array('d')
+        self.cum = array('d', (0.0,)) if n else array('d')
+        self.ux = array('d')
+        self.uy = array('d')
+        self.turn_angle = array('d', bytes(8 * n))
+
+        headings = []
+        for i in range(n - 1):
+            dx = xs[i + 1] - xs[i]
+            dy = ys[i + 1] - ys[i]
+            length = sqrt(dx * dx + dy * dy)
+            self.seg_len.append(length)
+            self.cum.append(self.cum[-1] + length)
+            if length > 0:
+                self.ux.append(dx / length)
+                self.uy.append(dy / length)
+            else:
+                self.ux.append(0.0)
+                self.uy.append(0.0)
+            headings.append(degrees(atan2(dy, dx)))
+
+        for i in range(1, n - 1):
+            self.turn_angle[i] = (headings[i] - headings[i - 1] + 180) % 360 - 180
+
+        self.total_length = self.cum[-1] if n else 0.0
+        self._index = None
+
+    def __len__(self):
+        return len(self.xs)
+
+    @property
+    def segment_count(self) -> int:
+        return max(0, len(self.xs) - 1)
+
+    @property
+    def path(self) -> RoutePath:
+        return RoutePath.from_arrays(self.xs, self.ys)
+
+    @property
+    def segment_index(self) -> SegmentIndex:
+        """세그먼트 격자 인덱스 (처음 전체 탐색이 필요할 때 생성)"""
+        if self._index is None:
+            self._index = SegmentIndex(self)
+        return self._index
+
+    # ---------------------------------------------------------------
+    # 투영 / 탐색
+    # ---------------------------------------------------------------
+    def project_on_segment(self, i: int, x: float, y: float) -> Tuple[float, float]:
+        """세그먼트 i에 점을 투영 - (클램프된 투영 비율, 거리 제곱) 반환"""
+        x1, y1 = self.xs[i], self.ys[i]
+        length = self.seg_len[i]
+        if length <= 0:
+            return 0.0, (x - x1) ** 2 + (y - y1) ** 2
+        along = (x - x1) * self.ux[i] + (y - y1) * self.uy[i]
+        t = along / length
+        t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+        px = x1 + t * length * self.ux[i]
+        py = y1 + t * length * self.uy[i]
+        return t, (x - px) ** 2 + (y - py) ** 2
+
+    def _search(self, lo: int, hi: int, x: float, y: float):
+        best_seg, best_t, best_sq = lo, 0.0, float('inf')
+        for i in range(lo, hi):
+            if self.seg_len[i] <= 0:
+                continue
+            t, d_sq = self.project_on_segment(i, x, y)
+            if d_sq < best_sq:
+                best_seg, best_t, best_sq = i, t, d_sq
+        return best_seg, best_t, best_sq
+
+    def _search_all(self, x: float, y: float):
+        """전체 세그먼트 중 가장 가까운 세그먼트 - 긴 경로는 격자 인덱스로 주변 셀만 확인"""
+        if self.segment_count < INDEX_MIN_SEGMENTS:
+            return self._search(0, self.segment_count, x, y)
+        seg, t, dist = self.segment_index.nearest(x, y)
+        if seg < 0:
+            return 0, 0.0, float('inf')
+        return seg, t, dist * dist
+
+    def nearest(self, x: float, y: float) -> Tuple[int, float, float]:
+        """경로 전체에서 가장 가까운 세그먼트 (세그먼트 인덱스, 투영 비율, 거리(픽셀))"""
+        if self.segment_count == 0:
+            return 0, 0.0, float('inf')
+        seg, t, d_sq = self._search_all(x, y)
+        return seg, t, sqrt(d_sq)
+
+    def distance_to_route(self, x: float, y: float) -> float:
+        """경로까지 최단 거리 (픽셀) - 길이 0 세그먼트만 있으면 시작점까지 거리"""
+        if len(self.xs) < 2:
+            return float('inf')
+        _, _, dist = self.nearest(x, y)
+        if dist == float('inf'):
+            return sqrt((x - self.xs[0]) ** 2 + (y - self.ys[0]) ** 2)
+        return dist
+
+    def project(self, x: float, y: float) -> Optional[Tuple[float, float, int, float]]:
+        """경로 위 가장 가까운 투영점 (px, py, 세그먼트 인덱스, 투영 비율) - 없으면 None"""
+        seg, t, dist = self.nearest(x, y)
+        if dist == float('inf'):
+            return None
+        along = t * self.seg_len[seg]
+        return self.xs[seg] + self.ux[seg] * along, self.ys[seg] + self.uy[seg] * along, seg, t
+
+    def traveled_at(self, seg: int, t: float) -> float:
+        """세그먼트 인덱스와 투영 비율을 누적 거리(픽셀)로 변환"""
+        return self.cum[seg] + t * self.seg_len[seg] if self.segment_count else 0.0
+
+    def locate(self, x: float, y: float, hint: int = 0) -> Tuple[int, float, float, float]:
+        """캐시된 세그먼트 인덱스(hint) 주변만 탐색해 가장 가까운 투영 위치를 찾음
+
+        Returns:
+            (세그먼트 인덱스, 투영 비율, 경로까지 거리(픽셀), 누적 거리(픽셀))
+        """
+        count = self.segment_count
+        if count == 0:
+            return 0, 0.0, float('inf'), 0.0
+
+        hint = 0 if hint < 0 else (count - 1 if hint >= count else hint)
+        lo = max(0, hint - LOCAL_SEARCH_BEHIND)
+        hi = min(count, hint + LOCAL_SEARCH_AHEAD + 1)
+        seg, t, d_sq = self._search(lo, hi, x, y)
+
+        # 제한 탐색 결과가 멀면 (경로 이탈, 재할당 직후 등) 전체 탐색으로 보정
+        if d_sq > GLOBAL_SEARCH_DISTANCE * GLOBAL_SEARCH_DISTANCE and (lo > 0 or hi < count):
+            g_seg, g_t, g_sq = self._search_all(x, y)
+            if g_sq < d_sq:
+                seg, t, d_sq = g_seg, g_t, g_sq
+
+        if d_sq == float('inf'):
+            # 모든 세그먼트 길이가 0인 경우
+            return seg, 0.0, sqrt((x - self.xs[0]) ** 2 + (y - self.ys[0]) ** 2), 0.0
+
+        return seg, t, sqrt(d_sq), self.cum[seg] + t * self.seg_len[seg]
+
+    def advance_segment(self, segment_index: int, x: float, y: float,
+                        advance_radius: float = SEGMENT_ADVANCE_RADIUS) -> int:
+        """navigation_core.update_current_segment와 같은 규칙을 캐시된 방향/길이로 계산"""
+        count = self.segment_count
+        radius_sq = advance_radius * advance_radius
+        while segment_index < count:
+            nx, ny = self.xs[segment_index + 1], self.ys[segment_index + 1]
+            if (x - nx) ** 2 + (y - ny) ** 2 < radius_sq:
+                segment_index += 1
+                continue
+            length = self.seg_len[segment_index]
+            if length <= 0:
+                segment_index += 1
+                continue
+            along = ((x - self.xs[segment_index]) * self.ux[segment_index] +
+                     (y - self.ys[segment_index]) * self.uy[segment_index])
+            if along > length:
+                segment_index += 1
+            else:
+                break
+        return segment_index
+
+    # ---------------------------------------------------------------
+    # 누적 거리 기반 조회 (O(1) / O(log n))
+    # ---------------------------------------------------------------
+    def segment_at(self, s: float) -> int:
+        """누적 거리 s가 속한 세그먼트 인덱스 (이진 탐색)"""
+        count = self.segment_count
+        if count == 0:
+            return 0
+        i = bisect_right(self.cum, s) - 1
+        return 0 if i < 0 else (count - 1 if i >= count else i)
+
+    def point_at(self, s: float) -> Tuple[float, float]:
+        """누적 거리 s 위치의 좌표"""
+        if self.segment_count == 0:
+            return (self.xs[0], self.ys[0]) if len(self.xs) else (0.0, 0.0)
+        i = self.segment_at(s)
+        along = min(max(s - self.cum[i], 0.0), self.seg_len[i])
+        return self.xs[i] + self.ux[i] * along, self.ys[i] + self.uy[i] * along
+
+    def progress_at(self, s: float) -> float:
+        """누적 거리 s에서의 경로 진행률 (%)"""
+        if self.total_length <= 0:
+            return 0
+        return min(100, (s / self.total_length) * 100)
+
+    def remaining_at(self, s: float) -> float:
+        """누적 거리 s에서 목적지까지 남은 거리 (픽셀)"""
+        return max(0.0, self.total_length - s)
+
+    def remaining_meters_at(self, s: float) -> float:
+        """누적 거리 s에서 목적지까지 남은 거리 (미터)"""
+        return self.remaining_at(s) / PIXELS_PER_METER
+
+
+def build_route_geometry(points) -> RouteGeometry:
+    """튜플/QPointF/RoutePath 어떤 형식이든 RouteGeometry 생성"""
+    if isinstance(points, RouteGeometry):
+        return points
+    return RouteGeometry(points if isinstance(points, RoutePath) else [point_xy(p) for p in points])
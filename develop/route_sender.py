@@ -4,6 +4,8 @@ import time
 import sys
 import math
 
+from lot_layout import PARKING_SPOT_WAYPOINTS, MANDATORY_WAYPOINT, ENTRANCE_POINT
+
 # ====== 플랫폼별 키보드 입력 유틸 ======
 class KeyboardReader:
     """
@@ -331,21 +333,8 @@ class DummyCarClient:
 
     def generate_route_to_parking(self, parking_spot_num, parking_coords):
         """주차구역으로의 경로를 생성합니다."""
-        # sender.py의 MANDATORY_WAYPOINT와 동일
-        MANDATORY_WAYPOINT = [200, 925]
-        
-        # sender.py의 주차구역별 waypoint 좌표와 동일
-        parking_waypoints = {
-            # 주차구역 1-5 (상단, 왼쪽→오른쪽)
-            1: [200, 1475], 2: [550, 1475], 3: [850, 1475], 4: [1150, 1475],
-            5: [1450, 1475],
-            # 주차구역 6-7 (우측, 위→아래)  
-            6: [1475, 1400], 7: [1475, 1000],
-            # 주차구역 8-11 (하단, 오른쪽→왼쪽)
-            8: [1475, 925], 9: [1150, 925], 10: [850, 925], 11: [550, 925]
-        }
-        
-        target_waypoint = parking_waypoints.get(parking_spot_num)
+        # 주차구역별 진입 웨이포인트 (lot_map.json)
+        target_waypoint = PARKING_SPOT_WAYPOINTS.get(parking_spot_num)
         if not target_waypoint:
             print(f"❌ 주차구역 {parking_spot_num}번의 웨이포인트를 찾을 수 없습니다.")
             return []
@@ -363,11 +352,11 @@ class DummyCarClient:
             waypoints.append([1475, 1475])
             waypoints.append(target_waypoint)
         elif parking_spot_num == 7:  # 7번: 입구 -> (200, 925) -> (1475, 925) -> (1475, 1000)
-            waypoints.append([200, 925])
+            waypoints.append(list(MANDATORY_WAYPOINT))
             waypoints.append([1475, 925])
             waypoints.append(target_waypoint)
         elif parking_spot_num in [8, 9, 10, 11]:  # 8~11번: 입구 -> (200, 925) -> 최종 주차구역
-            waypoints.append([200, 925])
+            waypoints.append(list(MANDATORY_WAYPOINT))
             waypoints.append(target_waypoint)
         
         print(f"🗺️ 주차구역 {parking_spot_num}번으로의 경로 생성: {waypoints}")
@@ -375,21 +364,8 @@ class DummyCarClient:
 
     def generate_reroute_waypoints(self, current_position, target_parking_spot):
         """현재 위치에서 목적지로의 재탐색 경로를 생성합니다."""
-        # sender.py의 MANDATORY_WAYPOINT와 동일
-        MANDATORY_WAYPOINT = [200, 925]
-        
-        # sender.py의 주차구역별 waypoint 좌표와 동일
-        parking_waypoints = {
-            # 주차구역 1-5 (상단, 왼쪽→오른쪽)
-            1: [200, 1475], 2: [550, 1475], 3: [850, 1475], 4: [1150, 1475],
-            5: [1450, 1475],
-            # 주차구역 6-7 (우측, 위→아래)  
-            6: [1475, 1400], 7: [1475, 1000],
-            # 주차구역 8-11 (하단, 오른쪽→왼쪽)
-            8: [1475, 925], 9: [1150, 925], 10: [850, 925], 11: [550, 925]
-        }
-        
-        target_waypoint = parking_waypoints.get(target_parking_spot)
+        # 주차구역별 진입 웨이포인트 (lot_map.json)
+        target_waypoint = PARKING_SPOT_WAYPOINTS.get(target_parking_spot)
         if not target_waypoint:
             return None
         
@@ -413,14 +389,14 @@ class DummyCarClient:
                 new_waypoints.append([1475, 1400])
         elif target_parking_spot == 7:  # 7번: 현재위치 -> (200, 925) -> (1475, 925) -> (1475, 1000)
             if current_position[1] > 925:  # 아직 아래로 내려가야 함
-                new_waypoints.append([200, 925])
+                new_waypoints.append(list(MANDATORY_WAYPOINT))
             if current_position[0] < 1475:  # 아직 오른쪽으로 가야 함
                 new_waypoints.append([1475, 925])
             if current_position[1] > 1000:  # 아직 아래로 내려가야 함
                 new_waypoints.append([1475, 1000])
         elif target_parking_spot in [8, 9, 10, 11]:  # 8~11번: 현재위치 -> (200, 925) -> 최종 주차구역
             if current_position[1] > 925:  # 아직 아래로 내려가야 함
-                new_waypoints.append([200, 925])
+                new_waypoints.append(list(MANDATORY_WAYPOINT))
             if current_position[0] < target_waypoint[0]:  # 아직 오른쪽으로 가야 함
                 new_waypoints.append(target_waypoint)
         
@@ -474,8 +450,8 @@ class DummyCarClient:
         # 주차구역 정보와 함께 전송
         self.send_waypoints(waypoints_to_send, parking_spot=parking_spot_num, route_type='entry')
 
-        # 서버와 동일한 '입구' 시작점
-        ENTRANCE = [200, 200]
+        # 서버와 동일한 '입구' 시작점 (lot_map.json)
+        ENTRANCE = list(ENTRANCE_POINT)
 
         if manual:
             print("⏳ 3초 후 키보드 수동 조종을 시작합니다...")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+세그먼트 공간 인덱스 - 경로 세그먼트를 균일 격자(uniform grid)에 등록해 두고
+가장 가까운 세그먼트/투영 위치 질의 시 주변 셀만 확인합니다.
+
+격자는 CSR 형식(셀별 시작 위치 + 세그먼트 번호 배열)의 array('i')로 저장하므로
+waypoint_reassignment로 경로가 바뀌어도 O(세그먼트 수 + 덮는 셀 수)로 다시 만들 수 있습니다.
+"""
+
+from array import array
+from math import sqrt, floor
+from typing import Tuple
+
+DEFAULT_CELL_SIZE = 100  # 픽셀 (2m)
+
+
+class SegmentIndex:
+    """RouteGeometry 세그먼트에 대한 균일 격자 인덱스
+
+    geometry는 xs, ys, seg_len, segment_count, project_on_segment(i, x, y)를 제공해야 합니다.
+    길이 0인 세그먼트는 등록하지 않습니다 (calculate_route_progress와 동일).
+    """
+
+    __slots__ = ('geometry', 'cell_size', 'x0', 'y0', 'gx', 'gy', 'cell_start', 'cell_segments')
+
+    def __init__(self, geometry, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.rebuild(geometry)
+
+    def rebuild(self, geometry):
+        """새 경로로 격자 재구성 (카운팅 정렬 2패스)"""
+        self.geometry = geometry
+        xs, ys, seg_len = geometry.xs, geometry.ys, geometry.seg_len
+        count = geometry.segment_count
+        cell = self.cell_size
+
+        if count == 0:
+            self.x0 = self.y0 = 0.0
+            self.gx = self.gy = 0
+            self.cell_start = array('i', (0,))
+            self.cell_segments = array('i')
+            return
+
+        self.x0, self.y0 = min(xs), min(ys)
+        self.gx = int((max(xs) - self.x0) // cell) + 1
+        self.gy = int((max(ys) - self.y0) // cell) + 1
+
+        # 세그먼트별 덮는 셀 범위 (바운딩 박스 기준)
+        spans = []
+        counts = array('i', bytes(4 * (self.gx * self.gy + 1)))
+        for i in range(count):
+            if seg_len[i] <= 0:
+                continue
+            ix0, ix1 = sorted((self._cell_x(xs[i]), self._cell_x(xs[i + 1])))
+            iy0, iy1 = sorted((self._cell_y(ys[i]), self._cell_y(ys[i + 1])))
+            spans.append((i, ix0, ix1, iy0, iy1))
+            for iy in range(iy0, iy1 + 1):
+                row = iy * self.gx
+                for ix in range(ix0, ix1 + 1):
+                    counts[row + ix + 1] += 1
+
+        for c in range(1, len(counts)):
+            counts[c] += counts[c - 1]
+        self.cell_start = counts
+        self.cell_segments = array('i', bytes(4 * counts[-1]))
+
+        fill = array('i', counts)
+        for i, ix0, ix1, iy0, iy1 in spans:
+            for iy in range(iy0, iy1 + 1):
+                row = iy * self.gx
+                for ix in range(ix0, ix1 + 1):
+                    c = row + ix
+                    self.cell_segments[fill[c]] = i
+                    fill[c] += 1
+
+    def _cell_x(self, x: float) -> int:
+        ix = int(floor((x - self.x0) / self.cell_size))
+        return 0 if ix < 0 else (self.gx - 1 if ix >= self.gx else ix)
+
+    def _cell_y(self, y: float) -> int:
+        iy = int(floor((y - self.y0) / self.cell_size))
+        return 0 if iy < 0 else (self.gy - 1 if iy >= self.gy else iy)
+
+    def _ring(self, cx: int, cy: int, r: int):
+        """(cx, cy)를 중심으로 체비셰프 거리 r인 격자 내부 셀 번호"""
+        gx, gy = self.gx, self.gy
+        if r == 0:
+            yield cy * gx + cx
+            return
+        x_lo, x_hi = max(0, cx - r), min(gx - 1, cx + r)
+        for iy in (cy - r, cy + r):
+            if 0 <= iy < gy:
+                row = iy * gx
+                for ix in range(x_lo, x_hi + 1):
+                    yield row + ix
+        for ix in (cx - r, cx + r):
+            if 0 <= ix < gx:
+                for iy in range(max(0, cy - r + 1), min(gy - 1, cy + r - 1) + 1):
+                    yield iy * gx + ix
+
+    def nearest(self, x: float, y: float, max_distance: float = float('inf')) -> Tuple[int, float, float]:
+        """가장 가까운 세그먼트 (세그먼트 인덱스, 투영 비율, 거리) - 없으면 (-1, 0.0, inf)
+
+        격자 밖의 점도 가장 가까운 격자 셀부터 링 단위로 넓혀 가며 찾고,
+        다음 링까지의 최소 거리가 현재 최단 거리(또는 max_distance)보다 크면 중단합니다.
+        거리가 같은 세그먼트는 전체 탐색과 같도록 인덱스가 작은 쪽을 택합니다.
+        """
+        if self.gx == 0:
+            return -1, 0.0, float('inf')
+
+        project = self.geometry.project_on_segment
+        cell_start, cell_segments = self.cell_start, self.cell_segments
+        cx, cy = self._cell_x(x), self._cell_y(y)
+        max_ring = max(cx, self.gx - 1 - cx, cy, self.gy - 1 - cy)
+
+        best_seg, best_t, best_sq = -1, 0.0, float('inf')
+        for r in range(max_ring + 1):
+            # 링 r의 셀은 질의점에서 최소 (r - 1) * cell_size 이상 떨어져 있음
+            bound = (r - 1) * self.cell_size
+            if bound > 0 and (bound * bound > best_sq or bound > max_distance):
+                break
+            for c in self._ring(cx, cy, r):
+                for k in range(cell_start[c], cell_start[c + 1]):
+                    i = cell_segments[k]
+                    t, d_sq = project(i, x, y)
+                    if d_sq < best_sq or (d_sq == best_sq and i < best_seg):
+                        best_seg, best_t, best_sq = i, t, d_sq
+
+        if best_seg < 0:
+            return -1, 0.0, float('inf')
+        return best_seg, best_t, sqrt(best_sq)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+주차구역 일괄 배정 - 입구에 몰린 차량 여러 대를 한 번에 최소 비용으로 배정 (NumPy 필요)
+
+gui_app의 HyundaiStyleUI.send_final_choice가 보내는 차량별 선택(elec, disabled, preferred, destination)을
+받아, 입구 → 주차구역 주행 거리 + 주차구역 → 목적지 입구 보행 거리의 합이 최소가 되도록 빈 주차구역을 나눠 줍니다.
+- 주행 거리: lot_map이 컴파일한 통로 노드 간 최단 거리표 (일방통행 준수, 입구 → spot_N)
+- 보행 거리: 목적지 입구별 거리장에서 주차구역 진입 웨이포인트의 거리
+- 전기차 충전구역은 전기차만, 장애인 전용 구역은 장애인 차량만 배정 (그 외 조합은 INFEASIBLE)
+- 선호 구역 종류(preferred)와 다르면 PREFERENCE_PENALTY를 더함
+
+선택 항목이 같은 차량은 비용 행이 같으므로 항목 조합(최대 2 x 2 x 3 x 목적지 수)별로 비용을 한 번만 계산하고,
+조합마다 도착 순서대로 빈 구역 수만큼만 후보로 남깁니다 (같은 조합에서는 먼저 온 차량이 배정).
+따라서 배치가 수백 대여도 할당 문제의 크기는 (조합 수 x 빈 구역 수) 이하이며,
+min_cost_assignment(최단 증가 경로 헝가리안 알고리즘)의 열 갱신을 NumPy 벡터 연산으로 처리합니다.
+"""
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lot_layout import ENTRANCE_POINT, PARKING_SPOT_TYPES, PARKING_SPOT_WAYPOINTS, LOT_MAP
+from lot_map import GATE_TARGET
+from distance_fields import DistanceFields
+from map_matching import AisleNetwork, lot_aisle_network
+from reroute import LocalRerouter
+from spot_occupancy import DESTINATION_NAMES, SpotOccupancy, spot_distances
+
+WALK_WEIGHT = 1.0            # 보행 1m의 비용 (주행 1m = 1)
+PREFERENCE_PENALTY = 50.0    # 선호 구역 종류가 아닌 구역에 배정할 때 더하는 비용 (m)
+INFEASIBLE = 1e9             # 배정 불가 (이 비용으로 짝지어진 차량은 대기)
+ORDER_TIE_BREAK = 1e-6       # 도착 순서별 가산 비용 (비용이 같으면 먼저 온 차량 우선)
+
+# preferred 값 → 주차구역 종류 (gui_app preferred_map: 'normal' / 'elec' / 'disabled')
+PREFERRED_TYPES = {'normal': 'general', 'elec': 'ev', 'disabled': 'disabled'}
+
+RequestClass = Tuple[bool, bool, str, int]  # (elec, disabled, preferred, destination)
+
+
+def _flag(value) -> bool:
+    """gui_app은 "true"/"false" 문자열, ESP32(sysy.c)는 JSON bool로 보내므로 둘 다 허용"""
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', '1', 'yes')
+    return bool(value)
+
+
+def request_class(data: Dict) -> RequestClass:
+    """배정 요청 1건 → 비용 계산용 조합 (알 수 없는 preferred는 'normal', 범위 밖 destination은 0)"""
+    preferred = data.get('preferred', 'normal')
+    if preferred not in PREFERRED_TYPES:
+        preferred = 'normal'
+    try:
+        destination = int(data.get('destination', 0))
+    except (TypeError, ValueError):
+        destination = 0
+    if not 0 <= destination < len(DESTINATION_NAMES):
+        destination = 0
+    return _flag(data.get('elec', False)), _flag(data.get('disabled', False)), preferred, destination
+
+
+def min_cost_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """직사각형 비용 행렬의 최소 비용 완전 배정 - (행 번호 배열, 열 번호 배열)
+
+    행/열 중 작은 쪽이 모두 짝지어집니다. 행을 하나씩 추가하며 잠재값(u, v)으로 줄인 비용 위에서
+    최단 증가 경로를 찾는 헝가리안 알고리즘이며, 한 단계의 열 갱신은 길이 (열 수)의 벡터 연산입니다.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+    # 1부터 시작하는 번호, 열 0은 증가 경로의 가상 시작점
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.intp)   # 열 j에 짝지어진 행 (0이면 비어 있음)
+    way = np.zeros(m + 1, dtype=np.intp)     # 증가 경로에서 열 j 직전의 열
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        min_v = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            free = ~used[1:]
+            better = free & (reduced < min_v[1:])
+            min_v[1:][better] = reduced[better]
+            way[1:][better] = j0
+            j1 = int(np.argmin(np.where(free, min_v[1:], np.inf))) + 1
+            delta = min_v[j1]
+            u[match[used]] += delta
+            v[used] -= delta
+            min_v[1:][free] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        # 증가 경로를 따라 짝을 뒤집음
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    cols = np.nonzero(match[1:])[0]
+    rows = match[1:][cols] - 1
+    order = np.argsort(rows)
+    rows, cols = rows[order], cols[order]
+    if transposed:
+        rows, cols = cols, rows
+        order = np.argsort(rows)
+        rows, cols = rows[order], cols[order]
+    return rows, cols
+
+
+class SpotAssigner:
+    """빈 주차구역과 배정 요청 배치를 받아 최소 비용 배정 (배정한 구역은 release 전까지 점유로 기록)
+
+    사용법:
+        assigner = SpotAssigner()
+        result = assigner.assign_batch([{'vehicle_id': 'car_1', 'elec': 'true', 'disabled': 'false',
+                                         'preferred': 'elec', 'destination': 1}, ...])
+        assigner.release(spot)  # 출차 시
+    """
+
+    def __init__(self, network: Optional[AisleNetwork] = None, fields: Optional[DistanceFields] = None,
+                 walk_weight: float = WALK_WEIGHT, preference_penalty: float = PREFERENCE_PENALTY):
+        self.network = network or lot_aisle_network()
+        self.fields = fields or LOT_MAP.distance_fields()
+        self.walk_weight = walk_weight
+        self.preference_penalty = preference_penalty
+        self.rerouter = LocalRerouter(self.network, fields=self.fields)
+
+        self.spots: List[int] = sorted(PARKING_SPOT_WAYPOINTS)
+        self.spot_index = {spot: i for i, spot in enumerate(self.spots)}
+        self.types = np.array([PARKING_SPOT_TYPES.get(s, 'general') for s in self.spots])
+        distances = spot_distances(self.spots, self.network, self.fields)
+        self.drive = np.array(distances[GATE_TARGET])                                  # 미터
+        self.walk = np.array([distances[name] for name in DESTINATION_NAMES]).T.copy()  # 미터, (구역, 목적지)
+        self.occupied = np.zeros(len(self.spots), dtype=bool)
+        self._class_costs: Dict[RequestClass, np.ndarray] = {}
+        self._routes: Dict[int, Optional[List[List[float]]]] = {}
+
+    def class_cost(self, key: RequestClass) -> np.ndarray:
+        """조합별 주차구역 비용 행 (구역 순서는 self.spots, 배정 불가는 INFEASIBLE)"""
+        cost = self._class_costs.get(key)
+        if cost is None:
+            elec, disabled, preferred, destination = key
+            cost = self.drive + self.walk_weight * self.walk[:, destination]
+            cost = cost + np.where(self.types == PREFERRED_TYPES[preferred], 0.0, self.preference_penalty)
+            blocked = ~np.isfinite(cost)
+            if not elec:
+                blocked |= self.types == 'ev'
+            if not disabled:
+                blocked |= self.types == 'disabled'
+            cost[blocked] = INFEASIBLE
+            self._class_costs[key] = cost
+        return cost
+
+    # ---------------------------------------------------------------
+    # 점유 상태
+    # ---------------------------------------------------------------
+    def occupy(self, spot: int):
+        if spot in self.spot_index:
+            self.occupied[self.spot_index[spot]] = True
+
+    def release(self, spot: int):
+        if spot in self.spot_index:
+            self.occupied[self.spot_index[spot]] = False
+
+    def sync_occupancy(self, occupancy: SpotOccupancy):
+        """컨트롤러 점유 비트셋으로 점유 상태 교체 (배치 배정 전에 호출)"""
+        self.occupied[:] = [occupancy.is_occupied(s) for s in self.spots]
+
+    def free_spots(self) -> List[int]:
+        return [s for s, taken in zip(self.spots, self.occupied) if not taken]
+
+    def route(self, spot: int) -> Optional[List[List[float]]]:
+        """입구 → 주차구역 웨이포인트 목록 (구역별 1회 계산)"""
+        if spot not in self._routes:
+            gx, gy = PARKING_SPOT_WAYPOINTS[spot]
+            self._routes[spot] = self.rerouter.reroute(ENTRANCE_POINT[0], ENTRANCE_POINT[1], gx, gy)
+        return self._routes[spot]
+
+    # ---------------------------------------------------------------
+    # 일괄 배정
+    # ---------------------------------------------------------------
+    def assign_batch(self, requests: Sequence[Dict], commit: bool = True) -> Dict:
+        """배정 요청 배치(도착 순서) → {'assignments': [...], 'waiting': [차량 ID], 'total_cost': 합계}
+
+        assignments 항목: vehicle_id, assigned_spot, spot_type, drive_m, walk_m, cost, waypoints
+        빈 구역이 부족하거나 조건에 맞는 구역이 없는 차량은 waiting으로 돌려주며 다음 배치에 다시 넣으면 됩니다.
+        commit=False면 점유 상태를 바꾸지 않습니다 (미리보기).
+        """
+        free = np.nonzero(~self.occupied)[0]
+        waiting: List[Hashable] = []
+        candidates: List[int] = []               # 요청 번호
+        keys: List[RequestClass] = []
+        taken: Dict[RequestClass, int] = {}
+        for i, data in enumerate(requests):
+            key = request_class(data)
+            count = taken.get(key, 0)
+            if count >= len(free):
+                waiting.append(data.get('vehicle_id', i))  # 같은 조합의 앞선 차량이 빈 구역 수만큼 있음
+                continue
+            taken[key] = count + 1
+            candidates.append(i)
+            keys.append(key)
+
+        assignments = []
+        total = 0.0
+        if candidates and len(free):
+            classes = list(taken)
+            class_rows = np.array([self.class_cost(k)[free] for k in classes])
+            class_index = {k: n for n, k in enumerate(classes)}
+            class_of = np.array([class_index[k] for k in keys])
+            cost = class_rows[class_of] + ORDER_TIE_BREAK * np.arange(len(candidates))[:, None]
+            rows, cols = min_cost_assignment(cost)
+            matched = set()
+            for r, c in zip(rows.tolist(), cols.tolist()):
+                if cost[r, c] >= INFEASIBLE:
+                    continue
+                i, s = candidates[r], int(free[c])
+                spot = self.spots[s]
+                destination = keys[r][3]
+                pair_cost = float(class_rows[class_of[r], c])
+                total += pair_cost
+                matched.add(r)
+                assignments.append({
+                    'vehicle_id': requests[i].get('vehicle_id', i),
+                    'assigned_spot': spot,
+                    'spot_type': str(self.types[s]),
+                    'drive_m': round(float(self.drive[s]), 2),
+                    'walk_m': round(float(self.walk[s, destination]), 2),
+                    'cost': round(pair_cost, 2),
+                    'waypoints': self.route(spot),
+                })
+                if commit:
+                    self.occupied[s] = True
+            unmatched = [candidates[r] for r in range(len(candidates)) if r not in matched]
+        else:
+            unmatched = candidates
+        waiting.extend(requests[i].get('vehicle_id', i) for i in unmatched)
+        # 대기 차량은 도착 순서로
+        order = {requests[i].get('vehicle_id', i): i for i in range(len(requests))}
+        waiting.sort(key=lambda vid: order.get(vid, 0))
+        assignments.sort(key=lambda a: order.get(a['vehicle_id'], 0))
+        return {'assignments': assignments, 'waiting': waiting, 'total_cost': round(total, 2)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+    parser = argparse.ArgumentParser(description='주차구역 일괄 배정 (요청 JSON 배열 → 배정 결과 JSON)')
+    parser.add_argument('requests', nargs='?', help='배정 요청 JSON 파일 (생략 시 표준 입력)')
+    parser.add_argument('--occupied', type=int, nargs='*', default=[], help='이미 점유된 주차구역 번호')
+    args = parser.parse_args()
+
+    if args.requests:
+        with open(args.requests, encoding='utf-8') as f:
+            batch = json.load(f)
+    else:
+        batch = json.load(sys.stdin)
+    assigner = SpotAssigner()
+    for occupied_spot in args.occupied:
+        assigner.occupy(occupied_spot)
+    print(json.dumps(assigner.assign_batch(batch), ensure_ascii=False, indent=2))
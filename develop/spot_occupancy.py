@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+주차구역 점유 상태 - 주차구역마다 비트 1개인 비트셋으로 관리하고 주차/출차마다 바뀐 비트만 브로드캐스트
+
+- 비트 i는 주차구역 번호 오름차순 i번째 구역 (main_controller와 탑뷰가 같은 lot_map을 쓰므로 순서가 같음)
+- 종류별 마스크(general/disabled/ev)와 기준 지점별 가까운 순 주차구역 목록을 지도 컴파일 결과에서 한 번 만들어 두므로,
+  "기준 지점 Y에서 가까운 종류 X 빈 구역" 질의는 마스크 연산 1번 + 가까운 순 목록을 앞에서부터 확인하는 것으로 끝납니다.
+- 기준 지점: 입출차 지점('gate', 통로 거리표의 주행 거리)과 목적지 입구(거리장의 보행 거리), 거리는 진입 웨이포인트 기준
+- 변경 메시지는 {version, mask, set, cleared} - mask가 전체 상태이므로 중간 메시지를 놓친 화면도 다음 메시지로 맞춰집니다.
+
+main_controller가 지오펜스 주차구역 이벤트(체류 = 주차, 주차한 구역 이탈 = 출차)와 출차 신호로 갱신합니다.
+"""
+
+import threading
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from lot_layout import (
+    LOT_MAP, ENTRANCE_POINT, ENTRANCE_ZONES, PARKING_SPOT_TYPES, PARKING_SPOT_WAYPOINTS, PIXELS_PER_METER,
+    INITIALLY_OCCUPIED_SPOTS
+)
+from lot_map import GATE_TARGET, SPOT_TYPES
+from map_matching import lot_aisle_network
+
+# destination 번호 → 목적지 입구 이름 (gui_app get_destination_number: 0 백화점 본관, 1 영화관, 2 문화시설)
+DESTINATION_NAMES: List[str] = list(ENTRANCE_ZONES)
+
+
+def spot_distances(spots: Sequence[int], network=None, fields=None) -> Dict[str, List[float]]:
+    """기준 지점 이름 → 주차구역별 거리 (m, 도달 불가면 inf)
+
+    'gate': 입구 → 진입 웨이포인트 주행 거리 (통로 노드가 아니면 거리장)
+    목적지 입구 이름: 진입 웨이포인트 → 목적지 입구 보행 거리 (거리장)
+    """
+    network = network or lot_aisle_network()
+    fields = fields or LOT_MAP.distance_fields()
+    inf = float('inf')
+
+    def to_meters(d: Optional[float]) -> float:
+        return inf if d is None or d == inf else d / PIXELS_PER_METER
+
+    start = network.nearest_node(*ENTRANCE_POINT)
+    drive = []
+    for spot in spots:
+        node = network.node_index.get(f'spot_{spot}')
+        if node is not None:
+            drive.append(to_meters(network.node_dist[start][node]))
+        else:
+            drive.append(to_meters(fields.distance(f'spot_{spot}', *ENTRANCE_POINT)))
+    distances = {GATE_TARGET: drive}
+    for name in DESTINATION_NAMES:
+        if name in fields.targets:
+            distances[name] = [to_meters(fields.distance(name, *PARKING_SPOT_WAYPOINTS[s])) for s in spots]
+        else:
+            distances[name] = [inf] * len(spots)
+    return distances
+
+
+def spots_from_mask(mask: int, spots: Sequence[int]) -> List[int]:
+    """비트셋 → 주차구역 번호 목록 (spots는 비트 순서, 보통 sorted(PARKING_SPOT_TYPES))"""
+    result = []
+    i = 0
+    while mask:
+        if mask & 1:
+            result.append(spots[i])
+        mask >>= 1
+        i += 1
+    return result
+
+
+class SpotOccupancy:
+    """주차구역 점유 비트셋 + 종류별 마스크 + 기준 지점별 가까운 순 목록 (스레드 안전)
+
+    park/leave/leave_vehicle은 상태가 바뀌면 변경 메시지(dict)를, 바뀌지 않으면 None을 반환합니다.
+    """
+
+    def __init__(self, occupied: Iterable[int] = INITIALLY_OCCUPIED_SPOTS,
+                 distances: Optional[Dict[str, List[float]]] = None):
+        self.spots: List[int] = sorted(PARKING_SPOT_TYPES)
+        self.bits: Dict[int, int] = {spot: 1 << i for i, spot in enumerate(self.spots)}
+        self.all_mask = (1 << len(self.spots)) - 1
+        self.type_masks: Dict[str, int] = {t: 0 for t in SPOT_TYPES}
+        for spot in self.spots:
+            self.type_masks[PARKING_SPOT_TYPES[spot]] |= self.bits[spot]
+
+        # 기준 지점별 (비트, 주차구역) 가까운 순 목록 - 도달할 수 없는 구역은 제외
+        if distances is None:
+            distances = spot_distances(self.spots)
+        self.nearest_order: Dict[str, List[Tuple[int, int]]] = {}
+        for name, dist in distances.items():
+            order = sorted((d, spot) for d, spot in zip(dist, self.spots) if d != float('inf'))
+            self.nearest_order[name] = [(self.bits[spot], spot) for _, spot in order]
+
+        self.mask = 0
+        self.version = 0
+        self.spot_vehicle: Dict[int, Hashable] = {}    # 주차구역 → 주차한 차량 (지도 초기 점유는 없음)
+        self.vehicle_spot: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        for spot in occupied:
+            self.mask |= self.bits.get(spot, 0)
+
+    # ---------------------------------------------------------------
+    # 갱신
+    # ---------------------------------------------------------------
+    def park(self, spot: int, vehicle_id: Optional[Hashable] = None) -> Optional[Dict[str, Any]]:
+        """주차 - 차량이 다른 구역에 기록되어 있으면 그 구역은 비움"""
+        bit = self.bits.get(spot)
+        if bit is None:
+            return None
+        with self._lock:
+            cleared = 0
+            if vehicle_id is not None:
+                previous = self.vehicle_spot.get(vehicle_id)
+                if previous is not None and previous != spot:
+                    self.spot_vehicle.pop(previous, None)
+                    cleared = self.bits[previous]
+                self.vehicle_spot[vehicle_id] = spot
+                self.spot_vehicle[spot] = vehicle_id
+            return self._apply(bit, cleared)
+
+    def leave(self, spot: int, vehicle_id: Optional[Hashable] = None) -> Optional[Dict[str, Any]]:
+        """출차 - vehicle_id가 있으면 그 차량이 주차한 구역일 때만 비움 (지나가는 차량은 무시)"""
+        bit = self.bits.get(spot)
+        if bit is None:
+            return None
+        with self._lock:
+            if vehicle_id is not None and self.spot_vehicle.get(spot) != vehicle_id:
+                return None
+            owner = self.spot_vehicle.pop(spot, None)
+            if owner is not None:
+                self.vehicle_spot.pop(owner, None)
+            return self._apply(0, bit)
+
+    def leave_vehicle(self, vehicle_id: Hashable) -> Optional[Dict[str, Any]]:
+        """차량이 주차했던 구역을 비움 (출차 신호)"""
+        spot = self.vehicle_spot.get(vehicle_id)
+        return None if spot is None else self.leave(spot, vehicle_id)
+
+    def _apply(self, set_bits: int, clear_bits: int) -> Optional[Dict[str, Any]]:
+        """비트 반영 후 실제로 바뀐 비트만 변경 메시지로 (잠금 안에서 호출)"""
+        new_mask = (self.mask & ~clear_bits) | set_bits
+        changed = new_mask ^ self.mask
+        if not changed:
+            return None
+        self.mask = new_mask
+        self.version += 1
+        return {
+            'version': self.version,
+            'mask': new_mask,
+            'set': spots_from_mask(changed & new_mask, self.spots),
+            'cleared': spots_from_mask(changed & ~new_mask, self.spots),
+        }
+
+    # ---------------------------------------------------------------
+    # 조회
+    # ---------------------------------------------------------------
+    def is_occupied(self, spot: int) -> bool:
+        return bool(self.mask & self.bits.get(spot, 0))
+
+    def occupied_spots(self) -> List[int]:
+        return spots_from_mask(self.mask, self.spots)
+
+    def free_mask(self, spot_type: Optional[str] = None) -> int:
+        """빈 구역 비트셋 (spot_type이 있으면 그 종류만)"""
+        candidates = self.all_mask if spot_type is None else self.type_masks.get(spot_type, 0)
+        return candidates & ~self.mask
+
+    def free_spots(self, spot_type: Optional[str] = None) -> List[int]:
+        return spots_from_mask(self.free_mask(spot_type), self.spots)
+
+    def nearest_free(self, spot_type: Optional[str] = None, reference: str = GATE_TARGET,
+                     count: int = 1) -> List[int]:
+        """기준 지점에서 가까운 순으로 종류 spot_type의 빈 구역 최대 count개 (알 수 없는 기준 지점이면 빈 목록)"""
+        free = self.free_mask(spot_type)
+        result: List[int] = []
+        if not free:
+            return result
+        for bit, spot in self.nearest_order.get(reference, ()):
+            if free & bit:
+                result.append(spot)
+                if len(result) >= count:
+                    break
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """전체 상태 메시지 (늦게 연결한 화면 동기화용)"""
+        with self._lock:
+            return {'version': self.version, 'mask': self.mask, 'spots': self.spots,
+                    'occupied': spots_from_mask(self.mask, self.spots)}
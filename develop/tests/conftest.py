@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""develop/ 모듈을 테스트에서 바로 import할 수 있도록 경로 추가 (벤치마크와 같은 방식)
+
+실행:
+    cd develop
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
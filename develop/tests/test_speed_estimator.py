@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+SpeedEstimator 수렴 테스트 - 시뮬레이션 주행 기록(불규칙 수신 간격 5~50Hz, 위치 잡음 σ=5픽셀)에서
+실측 속도와 도착 예상 시간이 참값으로 수렴하는지 확인 (benchmarks/bench_speed_estimator.py와 같은 시나리오)
+"""
+
+import random
+
+import pytest
+
+from navigation_core import PIXELS_PER_METER, SPEED_MAX_GAP, SpeedEstimator
+
+ROUTE_METERS = 60.0
+NOISE_PIXELS = 5.0
+SETTLE_SECONDS = 6.0        # 마지막 속도 변화 후 이 시간이 지나면 수렴했다고 봄 (시정수 1.5초의 4배)
+MAX_ERROR = 0.3             # 수렴 후 위치 1회 기준 최대 속도 오차 (m/s, 잡음에 의한 오차는 속도와 무관)
+MEAN_ERROR = 0.1            # 수렴 후 평균 속도 오차 (m/s)
+MEAN_ETA_ERROR = 0.1        # 수렴 후 평균 ETA 상대 오차
+
+# (시작 시각, 속도 m/s) 목록
+PROFILES = {
+    'slow': [(0.0, 1.0)],
+    'cruise': [(0.0, 3.0)],
+    'accelerate': [(0.0, 1.0), (8.0, 4.0)],
+    'decelerate': [(0.0, 4.0), (6.0, 1.5)],
+}
+
+
+def speed_at(profile, t):
+    speed = profile[0][1]
+    for start, v in profile:
+        if t >= start:
+            speed = v
+    return speed
+
+
+def simulate(profile, rng):
+    """(시각, x, y, 참 속도, 참 남은 거리(m)) - 직선 통로를 따라 주행"""
+    t, s = 0.0, 0.0
+    samples = []
+    while s < ROUTE_METERS:
+        v = speed_at(profile, t)
+        samples.append((t, 200.0 + s * PIXELS_PER_METER + rng.gauss(0, NOISE_PIXELS),
+                        925.0 + rng.gauss(0, NOISE_PIXELS), v, ROUTE_METERS - s))
+        dt = rng.uniform(0.02, 0.2)
+        t += dt
+        s += v * dt
+    return samples
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('name', sorted(PROFILES))
+def test_speed_and_eta_converge(name, seed):
+    profile = PROFILES[name]
+    settled = profile[-1][0] + SETTLE_SECONDS
+    estimator = SpeedEstimator()
+    speed_errors, eta_errors = [], []
+    for t, x, y, v, remaining in simulate(profile, random.Random(seed)):
+        speed = estimator.update(x, y, t)
+        eta = estimator.eta_seconds(remaining)
+        if t < settled:
+            continue
+        speed_errors.append(abs(speed - v))
+        assert eta is not None
+        eta_errors.append(abs(eta - remaining / v) / (remaining / v))
+
+    assert speed_errors, "수렴 구간에 위치가 없음 (시나리오가 너무 짧음)"
+    assert max(speed_errors) <= MAX_ERROR
+    assert sum(speed_errors) / len(speed_errors) <= MEAN_ERROR
+    assert sum(eta_errors) / len(eta_errors) <= MEAN_ETA_ERROR
+
+
+def test_stationary_noise_stays_below_eta_threshold():
+    """정지 차량의 위치 잡음은 속도로 누적되지 않음 (ETA 계산 안 함)"""
+    rng = random.Random(0)
+    estimator = SpeedEstimator()
+    t = 0.0
+    while t < 10.0:
+        estimator.update(1000.0 + rng.gauss(0, NOISE_PIXELS), 925.0 + rng.gauss(0, NOISE_PIXELS), t)
+        t += rng.uniform(0.02, 0.2)
+    assert estimator.speed < 0.2
+    assert estimator.eta_seconds(20.0) is None
+
+
+def test_long_gap_restarts_estimate():
+    """수신이 SPEED_MAX_GAP보다 오래 끊기면 이전 속도를 버리고 다시 추정"""
+    estimator = SpeedEstimator()
+    for i in range(30):
+        estimator.update(200.0 + i * 0.1 * 3.0 * PIXELS_PER_METER, 925.0, i * 0.1)
+    assert estimator.speed == pytest.approx(3.0, rel=0.05)
+
+    assert estimator.update(5000.0, 925.0, 2.9 + SPEED_MAX_GAP + 0.1) == 0.0
+    assert estimator.samples == 0
+    assert estimator.eta_seconds(10.0) is None
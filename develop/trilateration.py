@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UWB 삼변측량 - 앵커별 거리(ranges)로 태그 위치를 NumPy 배치 최소제곱 + Gauss-Newton으로 한 번에 계산
+
+기존에는 위치 계산을 상위(UWB 게이트웨이)에서 끝낸 x/y만 받았으므로 측위 품질을 컨트롤러에서 조정할 수 없었습니다.
+앵커 표(lot_map.json의 anchors)는 지도 컴파일 시 한 번 읽어 두고, 틱마다 들어온 여러 태그의 거리 측정을
+(태그 수 x 최대 앵커 수) 배열로 묶어 태그 수만큼의 Python 루프 없이 풉니다.
+- 거리(미터)는 pixels_per_meter로 픽셀로 바꾸고 앵커 높이(태그 평면 기준)를 빼 수평 거리로 환산
+- 초기해: |p - a_i|² = r_i² 식들을 앵커 평균으로 빼서 얻은 선형 최소제곱 (2x2 정규방정식 닫힌 해)
+- 보정: 거리 잔차 |p - a_i| - r_i에 대한 Gauss-Newton (감쇠 항으로 특이 행렬 방지)
+앵커가 3개 미만이거나 앵커가 거의 한 직선 위에 있는 태그는 해를 내지 않습니다(ok=False).
+결과 위치는 기존 position 메시지의 x/y와 같으므로 컨트롤러는 칼만 필터부터 같은 처리를 거칩니다.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MIN_ANCHORS = 3             # 2차원 위치에 필요한 최소 앵커 수
+GN_ITERATIONS = 4           # Gauss-Newton 반복 횟수
+GN_DAMPING = 1e-3           # 정규방정식 대각 감쇠 (앵커 배치가 나쁠 때 발산 방지)
+MIN_CONDITION = 1e-3        # 선형 정규방정식 det / (trace² / 4) 최소값 (앵커가 한 직선 위에 가까우면 0)
+
+
+class TrilaterationResult:
+    """태그별 삼변측량 결과 (모든 속성은 길이 N 배열)
+
+    Attributes:
+        x, y: 위치 (픽셀)
+        residual: 거리 잔차 RMS (픽셀, 측정 품질 - 멀티패스가 섞이면 커짐)
+        anchors: 사용한 앵커 수 (앵커 표에 없는 id는 제외)
+        ok: 해를 구했는지 (앵커 3개 이상, 앵커 배치가 한 직선이 아님)
+    """
+
+    __slots__ = ('x', 'y', 'residual', 'anchors', 'ok')
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, residual: np.ndarray, anchors: np.ndarray, ok: np.ndarray):
+        self.x = x
+        self.y = y
+        self.residual = residual
+        self.anchors = anchors
+        self.ok = ok
+
+    def __len__(self):
+        return len(self.x)
+
+
+def solve_batch(anchor_xy: np.ndarray, ranges: np.ndarray, mask: np.ndarray,
+                iterations: int = GN_ITERATIONS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """배치 삼변측량 - anchor_xy (N, K, 2), ranges (N, K) 수평 거리, mask (N, K) 유효 측정
+
+    Returns:
+        (위치 (N, 2), 잔차 RMS (N,), 해 유효 여부 (N,))
+    """
+    w = mask.astype(np.float64)
+    n = w.sum(axis=1)
+    safe_n = np.maximum(n, 1.0)
+
+    # 선형 초기해: -2 a_i·p + |p|² = r_i² - |a_i|² 를 앵커 평균으로 빼서 |p|² 제거
+    c = ranges * ranges - (anchor_xy * anchor_xy).sum(axis=2)
+    a_mean = (w[:, :, None] * anchor_xy).sum(axis=1) / safe_n[:, None]
+    c_mean = (w * c).sum(axis=1) / safe_n
+    A = -2.0 * (anchor_xy - a_mean[:, None, :]) * w[:, :, None]
+    b = (c - c_mean[:, None]) * w
+    ata = np.einsum('nki,nkj->nij', A, A)
+    atb = np.einsum('nki,nk->ni', A, b)
+    det = ata[:, 0, 0] * ata[:, 1, 1] - ata[:, 0, 1] * ata[:, 1, 0]
+    trace = ata[:, 0, 0] + ata[:, 1, 1]
+    ok = (n >= MIN_ANCHORS) & (det > MIN_CONDITION * trace * trace / 4.0)
+    det = np.where(ok, det, 1.0)
+    p = np.stack(((ata[:, 1, 1] * atb[:, 0] - ata[:, 0, 1] * atb[:, 1]) / det,
+                  (ata[:, 0, 0] * atb[:, 1] - ata[:, 1, 0] * atb[:, 0]) / det), axis=1)
+    p[~ok] = 0.0
+
+    # Gauss-Newton: f_i = |p - a_i| - r_i, J_i = (p - a_i) / |p - a_i|
+    for _ in range(iterations):
+        d = p[:, None, :] - anchor_xy
+        dist = np.maximum(np.sqrt((d * d).sum(axis=2)), 1e-9)
+        J = d / dist[:, :, None] * w[:, :, None]
+        f = (dist - ranges) * w
+        jtj = np.einsum('nki,nkj->nij', J, J)
+        jtf = np.einsum('nki,nk->ni', J, f)
+        damping = GN_DAMPING * (jtj[:, 0, 0] + jtj[:, 1, 1] + 1e-9)
+        j00 = jtj[:, 0, 0] + damping
+        j11 = jtj[:, 1, 1] + damping
+        j01 = jtj[:, 0, 1]
+        det = np.where(ok, j00 * j11 - j01 * j01, 1.0)
+        p[:, 0] -= np.where(ok, (j11 * jtf[:, 0] - j01 * jtf[:, 1]) / det, 0.0)
+        p[:, 1] -= np.where(ok, (j00 * jtf[:, 1] - j01 * jtf[:, 0]) / det, 0.0)
+
+    d = p[:, None, :] - anchor_xy
+    f = (np.sqrt((d * d).sum(axis=2)) - ranges) * w
+    residual = np.sqrt((f * f).sum(axis=1) / safe_n)
+    return p, residual, ok
+
+
+class Trilaterator:
+    """앵커 표를 미리 로드해 두고 틱마다 여러 태그의 거리 측정을 한 번에 푸는 삼변측량 단계
+
+    사용법:
+        trilaterator = Trilaterator()
+        result = trilaterator.solve([(['A1', 'A2', 'A3'], [12.1, 30.4, 25.0]), ...])
+        for i in range(len(result)):
+            if result.ok[i]: ... result.x[i], result.y[i]
+    """
+
+    def __init__(self, anchors: Optional[Dict[str, Tuple[float, float, float]]] = None,
+                 pixels_per_meter: Optional[float] = None, iterations: int = GN_ITERATIONS):
+        if anchors is None or pixels_per_meter is None:
+            from lot_layout import LOT_MAP
+            anchors = LOT_MAP.anchors if anchors is None else anchors
+            pixels_per_meter = LOT_MAP.pixels_per_meter if pixels_per_meter is None else pixels_per_meter
+        self.ids: List[str] = list(anchors)
+        self.index: Dict[str, int] = {aid: i for i, aid in enumerate(self.ids)}
+        table = np.array([anchors[aid] for aid in self.ids], dtype=np.float64).reshape(-1, 3)
+        self.anchor_xy = table[:, :2]
+        self.height_sq = table[:, 2] ** 2
+        self.pixels_per_meter = float(pixels_per_meter)
+        self.iterations = iterations
+
+    @classmethod
+    def from_lot(cls, lot, iterations: int = GN_ITERATIONS) -> 'Trilaterator':
+        """컴파일된 지도(CompiledLotMap)의 앵커 표로 생성 (층별 지도 등)"""
+        return cls(lot.anchors, lot.pixels_per_meter, iterations)
+
+    def pack(self, tags: Sequence[Tuple[Sequence[str], Sequence[float]]]
+             ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(앵커 id 목록, 거리(m) 목록) 태그별 측정 → 앵커 번호 (N, K), 거리 (N, K), 유효 (N, K) 배열
+
+        앵커 표에 없는 id, 음수/NaN 거리는 무효 처리
+        """
+        k = max((len(ids) for ids, _ in tags), default=0)
+        index = np.full((len(tags), max(k, 1)), -1, dtype=np.intp)
+        dist = np.zeros((len(tags), max(k, 1)), dtype=np.float64)
+        lookup = self.index.get
+        for t, (ids, distances) in enumerate(tags):
+            m = min(len(ids), len(distances))
+            index[t, :m] = [lookup(str(aid), -1) for aid in ids[:m]]
+            dist[t, :m] = distances[:m]
+        valid = (index >= 0) & (dist >= 0)  # NaN도 False
+        return index, dist, valid
+
+    def solve(self, tags: Sequence[Tuple[Sequence[str], Sequence[float]]]) -> TrilaterationResult:
+        """태그별 (앵커 id 목록, 거리(m) 목록) → 위치 (픽셀)"""
+        if not tags or not self.ids:
+            empty = np.zeros(len(tags))
+            return TrilaterationResult(empty, empty.copy(), empty.copy(), empty.astype(np.intp), empty.astype(bool))
+        index, dist, valid = self.pack(tags)
+        safe = np.where(valid, index, 0)
+        ranges = dist * self.pixels_per_meter
+        # 앵커 높이만큼 빼서 태그 평면 위 수평 거리로 (높이보다 짧은 측정은 앵커 바로 아래로 봄)
+        ranges = np.sqrt(np.maximum(ranges * ranges - self.height_sq[safe], 0.0))
+        ranges[~valid] = 0.0
+        p, residual, ok = solve_batch(self.anchor_xy[safe], ranges, valid, self.iterations)
+        return TrilaterationResult(p[:, 0], p[:, 1], residual, valid.sum(axis=1), ok)